@@ -0,0 +1,178 @@
+"""
+Admission control: per-client rate limits and load shedding
+
+Without it, a traffic spike queues requests behind the 20-connection pool
+until ``command_timeout`` and clients wait a minute for an error. The
+middleware turns requests away up front instead:
+
+* 429 when a client has used up its token bucket
+  (``RATE_LIMIT_PER_SECOND`` refill, ``RATE_LIMIT_BURST`` capacity);
+* 503 when more than ``ADMISSION_MAX_POOL_WAITERS`` queries are already
+  waiting for a pool connection;
+* 503 when ``ADMISSION_CONCURRENCY`` requests are in flight and the
+  ``ADMISSION_QUEUE`` waiting behind them is full, or a queued request
+  does not get a slot within ``ADMISSION_QUEUE_TIMEOUT`` seconds.
+
+Both carry a ``Retry-After`` header. Limits are read from ``settings`` on
+every request, so a zero disables that check.
+"""
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Deque, Optional
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from .config import settings
+from .database import db
+
+# Paths that are never limited: platform health checks must get through
+EXEMPT_PATHS = {"/", "/health"}
+
+# Client buckets kept; the least recently seen are dropped first
+MAX_CLIENTS = 10000
+
+
+@dataclass
+class TokenBucket:
+    tokens: float
+    updated: float
+
+    def take(self, rate: float, burst: float, now: float) -> float:
+        """Spend a token; return 0, or the seconds until one is available"""
+        self.tokens = min(burst, self.tokens + (now - self.updated) * rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / rate
+
+
+class ConcurrencyLimit:
+    """In-flight request limit with a bounded FIFO queue.
+
+    A released slot is handed straight to the longest waiting request, so
+    queued requests cannot be overtaken by new arrivals.
+    """
+
+    def __init__(self):
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self, limit: int, queue: int, timeout: float) -> bool:
+        if self.active < limit and not self._waiters:
+            self.active += 1
+            return True
+        if len(self._waiters) >= queue:
+            return False
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, timeout)
+            return True
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                return True  # handed a slot as the wait timed out
+            return False
+        except asyncio.CancelledError:
+            # Client went away; pass on a slot it was already handed
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+
+class AdmissionMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.buckets: "OrderedDict[str, TokenBucket]" = OrderedDict()
+        self.concurrency = ConcurrencyLimit()
+
+    def _client(self, scope: Scope) -> str:
+        if settings.rate_limit_trust_proxy:
+            for name, value in scope["headers"]:
+                if name == b"x-forwarded-for":
+                    return value.decode("latin-1").split(",")[0].strip()
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    def _rate_limit(self, scope: Scope) -> Optional[float]:
+        """Seconds the client must wait, or None if it has a token"""
+        rate = settings.rate_limit_per_second
+        if rate <= 0:
+            return None
+        burst = max(1.0, settings.rate_limit_burst)
+        now = time.monotonic()
+        client = self._client(scope)
+        bucket = self.buckets.get(client)
+        if bucket is None:
+            bucket = self.buckets[client] = TokenBucket(burst, now)
+            if len(self.buckets) > MAX_CLIENTS:
+                self.buckets.popitem(last=False)
+        else:
+            self.buckets.move_to_end(client)
+        wait = bucket.take(rate, burst, now)
+        return wait or None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] == "OPTIONS"
+            or scope["path"] in EXEMPT_PATHS
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        wait = self._rate_limit(scope)
+        if wait is not None:
+            await _reject(429, "Too many requests", wait, scope, receive, send)
+            return
+
+        retry = settings.admission_queue_timeout
+        waiters = settings.admission_max_pool_waiters
+        if waiters and db.waiting > waiters:
+            await _reject(503, "Server busy", retry, scope, receive, send)
+            return
+
+        limit = settings.admission_concurrency
+        if not limit:
+            await self.app(scope, receive, send)
+            return
+        admitted = await self.concurrency.acquire(
+            limit, settings.admission_queue, settings.admission_queue_timeout
+        )
+        if not admitted:
+            await _reject(503, "Server busy", retry, scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.concurrency.release()
+
+
+async def _reject(
+    status: int, detail: str, retry: float, scope: Scope, receive: Receive, send: Send
+) -> None:
+    response = JSONResponse(
+        {"detail": detail},
+        status_code=status,
+        headers={"Retry-After": str(max(1, math.ceil(retry)))},
+    )
+    await response(scope, receive, send)
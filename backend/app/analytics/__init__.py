@@ -0,0 +1,3 @@
+"""
+Bulk analytics over the match history
+"""
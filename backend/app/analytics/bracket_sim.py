@@ -0,0 +1,335 @@
+"""
+Monte Carlo bracket prediction
+
+A weight class's seeded bracket is read from the snapshot: the championship
+round with the most bouts is the main first round, its bouts ordered by
+``bracket_order`` give the slots, and pigtail bouts (earlier championship
+rounds) feed into the slot their ``next_match_id`` points at. Slots are padded
+with byes to a power of two.
+
+Every simulated run plays the whole tournament at once for all runs: each
+round is a handful of array operations over a ``(runs, bouts)`` matrix. Win
+probabilities come from the Elo ratings where a wrestler has one, otherwise
+from the seed. The consolation bracket follows the NCAA true-second-place
+layout: first-round losers wrestle back, later championship losers drop in
+from the opposite half, the blood-round winners place, consolation
+quarterfinal losers wrestle for 7th, consolation semifinal losers for 5th and
+the winners for 3rd. Pigtail losers are eliminated.
+
+Runs are split into chunks spread across a process pool. Expected team points
+cover advancement and placement; bonus points are not simulated.
+"""
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..config import settings
+from ..database import Database
+from .brackets import PLACEMENT_POINTS, Bracket, classify_rounds
+from .ratings import BASE_RATING, RatingBook, expected_score, rating_store
+from .snapshot import NO_SEED, MatchSnapshot, snapshot_cache
+
+SEED_STEP = 15.0
+MIN_CHUNK = 10_000
+PLACES = max(PLACEMENT_POINTS)
+
+_PLACE_POINTS = np.zeros(PLACES + 1)
+for _place, _points in PLACEMENT_POINTS.items():
+    _PLACE_POINTS[_place] = _points
+
+
+@dataclass
+class SeededBracket:
+    """Entrants plus slot layout; entrant ``len(entrants)`` is the bye"""
+
+    participants: List[str]
+    persons: List[str]
+    schools: List[str]
+    seeds: List[Optional[int]]
+    ratings: np.ndarray
+    slots: np.ndarray  # (slots, 2) entrant indexes; a pigtail fills both columns
+
+    @property
+    def bye(self) -> int:
+        return len(self.participants)
+
+    def win_matrix(self) -> np.ndarray:
+        """P[i, j]: probability entrant ``i`` beats entrant ``j``"""
+        ratings = np.append(self.ratings, -np.inf)
+        with np.errstate(over="ignore", invalid="ignore"):
+            matrix = expected_score(ratings[:, None], ratings[None, :])
+        matrix[self.bye, :] = 0.0
+        matrix[:, self.bye] = 1.0
+        matrix[self.bye, self.bye] = 1.0
+        return matrix
+
+
+def seeded_bracket(
+    snapshot: MatchSnapshot, book: Optional[RatingBook] = None
+) -> Optional[SeededBracket]:
+    """Bracket for a snapshot holding one tournament's weight class"""
+    bracket, _ = classify_rounds(snapshot.rounds)
+    championship = np.flatnonzero(bracket[snapshot.round] == Bracket.CHAMPIONSHIP)
+    if not len(championship):
+        return None
+    orders, counts = np.unique(snapshot.round_order[championship], return_counts=True)
+    main_order = orders[np.argmax(counts)]
+    first_round = championship[snapshot.round_order[championship] == main_order]
+    first_round = first_round[np.argsort(snapshot.bracket_order[first_round])]
+
+    size = 1 << max(1, int(np.ceil(np.log2(2 * len(first_round)))))
+    slots = np.full((size, 2), -1, dtype=np.int32)
+    slots[: 2 * len(first_round), 0] = np.stack(
+        [snapshot.participant_a[first_round], snapshot.participant_b[first_round]],
+        axis=1,
+    ).reshape(-1)
+
+    position = {int(m): i for i, m in enumerate(first_round)}
+    for pigtail in championship[snapshot.round_order[championship] < main_order]:
+        links = (snapshot.next_match_a[pigtail], snapshot.next_match_b[pigtail])
+        if snapshot.winner[pigtail] == 1:
+            links = links[::-1]
+        targets = [position[int(m)] for m in links if int(m) in position]
+        if not targets:
+            continue
+        target = targets[0]
+        pair = (snapshot.participant_a[pigtail], snapshot.participant_b[pigtail])
+        side = 2 * target
+        if slots[side, 0] not in pair and slots[side + 1, 0] in (-1, *pair):
+            side += 1
+        slots[side] = pair
+
+    used = np.unique(slots[slots >= 0])
+    remap = np.full(len(snapshot.participants) + 1, len(used), dtype=np.int32)
+    remap[used] = np.arange(len(used))
+    slots = np.where(slots >= 0, remap[slots], -1)
+    slots[:, 0] = np.where(slots[:, 0] < 0, len(used), slots[:, 0])
+
+    person, school, seed = _participant_columns(snapshot)
+    persons = [snapshot.persons[person[p]] for p in used]
+    seeds = [None if seed[p] == NO_SEED else int(seed[p]) for p in used]
+    return SeededBracket(
+        participants=[snapshot.participants[p] for p in used],
+        persons=persons,
+        schools=[snapshot.schools[school[p]] for p in used],
+        seeds=seeds,
+        ratings=_strengths(persons, seeds, book),
+        slots=slots,
+    )
+
+
+def _participant_columns(snapshot: MatchSnapshot):
+    n = len(snapshot.participants)
+    person = np.full(n, -1, dtype=np.int32)
+    school = np.full(n, -1, dtype=np.int32)
+    seed = np.zeros(n, dtype=np.int16)
+    for side in ("a", "b"):
+        codes = getattr(snapshot, f"participant_{side}")
+        present = codes >= 0
+        person[codes[present]] = getattr(snapshot, f"person_{side}")[present]
+        school[codes[present]] = getattr(snapshot, f"school_{side}")[present]
+        seed[codes[present]] = getattr(snapshot, f"seed_{side}")[present]
+    return person, school, seed
+
+
+def _strengths(
+    persons: List[str], seeds: List[Optional[int]], book: Optional[RatingBook]
+) -> np.ndarray:
+    """Elo rating when known, otherwise a rating implied by the seed"""
+    seeded = [s for s in seeds if s is not None]
+    worst = max(seeded) + 1 if seeded else 1
+    ratings = np.empty(len(persons))
+    for i, (person_id, seed) in enumerate(zip(persons, seeds)):
+        rating = book.rating(person_id) if book else None
+        if rating is None:
+            rating = BASE_RATING + SEED_STEP * (worst - (seed or worst))
+        ratings[i] = rating
+    return ratings
+
+
+def simulate(
+    win: np.ndarray, slots: np.ndarray, runs: int, seed: Any
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Play ``runs`` tournaments.
+
+    Returns per-entrant counts of each place (column 0 = did not place) and the
+    summed advancement + placement points over all runs.
+    """
+    rng = np.random.default_rng(seed)
+    n = win.shape[0]
+    bye = n - 1
+    advancement = np.zeros((runs, n))
+    rows = np.arange(runs)[:, None]
+
+    def play(a: np.ndarray, b: np.ndarray, points: float):
+        a_wins = rng.random(a.shape, dtype=np.float32) < win[a, b]
+        winner = np.where(a_wins, a, b)
+        loser = np.where(a_wins, b, a)
+        if points:
+            # Each entrant wrestles at most once per call, so plain fancy-index
+            # addition is safe; only the bye repeats and it never scores.
+            real = (a != bye) & (b != bye)
+            advancement[np.broadcast_to(rows, winner.shape), winner] += points * real
+        return winner, loser
+
+    first = np.broadcast_to(slots[:, 0], (runs, len(slots))).copy()
+    pigtails = np.flatnonzero(slots[:, 1] >= 0)
+    if len(pigtails):
+        winners, _ = play(
+            np.broadcast_to(slots[pigtails, 0], (runs, len(pigtails))),
+            np.broadcast_to(slots[pigtails, 1], (runs, len(pigtails))),
+            1.0,
+        )
+        first[:, pigtails] = winners
+
+    state, losers = first, []
+    rounds = int(np.log2(state.shape[1]))
+    for r in range(rounds):
+        points = 1.0 if r < rounds - 1 else 0.0  # the final scores as placement
+        state, lost = play(state[:, 0::2], state[:, 1::2], points)
+        losers.append(lost)
+
+    place = np.zeros((runs, n), dtype=np.int8)
+
+    def assign(entrants: np.ndarray, value: int) -> None:
+        place[np.broadcast_to(rows, entrants.shape), entrants] = value
+
+    assign(state, 1)
+    assign(losers[-1], 2)
+    if rounds >= 4:
+        survivors, _ = play(losers[0][:, 0::2], losers[0][:, 1::2], 0.5)
+        for r in range(1, rounds - 2):
+            survivors, _ = play(survivors, losers[r][:, ::-1], 0.5)
+            if r < rounds - 3:
+                survivors, _ = play(survivors[:, 0::2], survivors[:, 1::2], 0.5)
+        survivors, seventh = play(survivors[:, 0::2], survivors[:, 1::2], 0.5)
+        survivors, fifth = play(survivors, losers[rounds - 2][:, ::-1], 0.5)
+        third, fourth = play(survivors[:, :1], survivors[:, 1:], 0.0)
+        fifth_place, sixth = play(fifth[:, :1], fifth[:, 1:], 0.0)
+        seventh_place, eighth = play(seventh[:, :1], seventh[:, 1:], 0.0)
+        for entrants, value in (
+            (third, 3),
+            (fourth, 4),
+            (fifth_place, 5),
+            (sixth, 6),
+            (seventh_place, 7),
+            (eighth, 8),
+        ):
+            assign(entrants, value)
+    elif rounds >= 2:
+        third, fourth = play(losers[-2][:, :1], losers[-2][:, 1:], 0.0)
+        assign(third, 3)
+        assign(fourth, 4)
+
+    place[:, bye] = 0
+    advancement[:, bye] = 0.0
+    counts = np.stack(
+        [np.count_nonzero(place == p, axis=0) for p in range(PLACES + 1)], axis=1
+    )
+    points = advancement.sum(axis=0) + _PLACE_POINTS[place].sum(axis=0)
+    return counts, points
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(max_workers=settings.simulation_workers or None)
+    return _pool
+
+
+def shutdown_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+        _pool = None
+
+
+async def run_simulations(
+    bracket: SeededBracket, simulations: int, seed: Optional[int] = None
+) -> Dict[str, Any]:
+    """Simulate ``bracket`` in chunks spread across the process pool"""
+    win = bracket.win_matrix()
+    workers = settings.simulation_workers or os.cpu_count() or 1
+    chunks = max(1, min(workers, simulations // MIN_CHUNK))
+    sizes = [simulations // chunks + (i < simulations % chunks) for i in range(chunks)]
+    seeds = np.random.SeedSequence(seed).spawn(chunks)
+    loop = asyncio.get_running_loop()
+    if chunks == 1:
+        result = await asyncio.to_thread(
+            simulate, win, bracket.slots, sizes[0], seeds[0]
+        )
+        results = [result]
+    else:
+        pool = _get_pool()
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(pool, simulate, win, bracket.slots, size, s)
+                for size, s in zip(sizes, seeds)
+            )
+        )
+    counts = sum(r[0] for r in results)
+    points = sum(r[1] for r in results)
+    return _summarize(bracket, counts, points, simulations)
+
+
+def _summarize(
+    bracket: SeededBracket, counts: np.ndarray, points: np.ndarray, runs: int
+) -> Dict[str, Any]:
+    probabilities = counts / runs
+    wrestlers = []
+    teams: Dict[str, float] = {}
+    for i, participant_id in enumerate(bracket.participants):
+        expected = float(points[i]) / runs
+        teams[bracket.schools[i]] = teams.get(bracket.schools[i], 0.0) + expected
+        wrestlers.append(
+            {
+                "participant_id": participant_id,
+                "person_id": bracket.persons[i],
+                "school_id": bracket.schools[i],
+                "seed": bracket.seeds[i],
+                "rating": round(float(bracket.ratings[i]), 1),
+                "champion_probability": round(float(probabilities[i, 1]), 4),
+                "placement_probabilities": [
+                    round(float(p), 4) for p in probabilities[i, 1:]
+                ],
+                "all_american_probability": round(float(probabilities[i, 1:].sum()), 4),
+                "expected_points": round(expected, 2),
+            }
+        )
+    wrestlers.sort(key=lambda w: (-w["champion_probability"], w["seed"] or 1 << 15))
+    return {
+        "simulations": runs,
+        "wrestlers": wrestlers,
+        "teams": [
+            {"school_id": school, "expected_points": round(total, 2)}
+            for school, total in sorted(teams.items(), key=lambda t: -t[1])
+        ],
+    }
+
+
+async def predict_bracket(
+    db: Database, tournament_id: str, weight_class: str, simulations: int
+) -> Optional[Dict[str, Any]]:
+    """Cached prediction for one tournament weight class"""
+
+    async def compute(snapshot: MatchSnapshot) -> Optional[Dict[str, Any]]:
+        matches = snapshot.for_tournament(tournament_id)
+        if weight_class not in matches.weight_classes:
+            return None
+        code = matches.weight_classes.index(weight_class)
+        matches = matches.take(matches.weight_class == code).compact()
+        bracket = seeded_bracket(matches, rating_store.get())
+        if bracket is None:
+            return None
+        result = await run_simulations(bracket, simulations)
+        return {"tournament_id": tournament_id, "weight_class": weight_class, **result}
+
+    key = ("prediction", tournament_id, weight_class, simulations)
+    return await snapshot_cache.derived(db, key, compute)
@@ -0,0 +1,47 @@
+"""
+Bracket structure helpers shared by the tournament analytics
+"""
+import re
+from enum import IntEnum
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class Bracket(IntEnum):
+    CHAMPIONSHIP = 0
+    CONSOLATION = 1
+    PLACEMENT = 2
+
+
+# NCAA championship placement points, 1st through 8th
+PLACEMENT_POINTS = {1: 16.0, 2: 12.0, 3: 10.0, 4: 9.0, 5: 7.0, 6: 6.0, 7: 4.0, 8: 3.0}
+
+_PLACE_BOUT = re.compile(r"\b(1st|3rd|5th|7th|9th|11th)\b.*\bplace\b")
+_FINAL = re.compile(r"\bfinals?\b|^championship$")
+_CONSOLATION = re.compile(r"\b(cons\w*|wrestle\s*backs?|blood)\b")
+
+
+def classify_round(label: Optional[str]) -> Tuple[Bracket, int]:
+    """Bracket of a round label plus the winner's place for placement bouts.
+
+    Returns ``(Bracket.PLACEMENT, place)`` for finals and place bouts (the
+    loser takes ``place + 1``) and ``(bracket, 0)`` otherwise.
+    """
+    text = " ".join((label or "").lower().split())
+    place = _PLACE_BOUT.search(text)
+    if place:
+        return Bracket.PLACEMENT, int(re.sub(r"\D", "", place.group(1)))
+    if _CONSOLATION.search(text):
+        return Bracket.CONSOLATION, 0
+    if _FINAL.search(text):
+        return Bracket.PLACEMENT, 1
+    return Bracket.CHAMPIONSHIP, 0
+
+
+def classify_rounds(labels: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorizable lookup tables: bracket and winner place per round code"""
+    classified = [classify_round(label) for label in labels]
+    brackets = np.array([c[0] for c in classified], dtype=np.int8)
+    places = np.array([c[1] for c in classified], dtype=np.int8)
+    return brackets, places
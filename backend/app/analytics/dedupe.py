@@ -0,0 +1,343 @@
+"""
+Duplicate person detection
+
+Imports from different sources can create several ``person`` rows for one
+wrestler, splitting their record across ids. This job lists likely
+duplicates for review; it never merges anything itself.
+
+People are first split into blocks that share a school (or, for people
+never entered by a school, a first initial) and either a last-name sound
+(either Double Metaphone key of the folded last name) or a first-name
+sound and the last name's first two letters. Only pairs within a block are
+compared, so the work grows with block sizes rather than the square of the
+table. A block larger than ``MAX_BLOCK`` is sorted by first name and cut
+into overlapping windows.
+
+Each block is scored as matrices: cosine similarity of hashed character
+trigrams for first and last names, nickname-aware first-name sound
+agreement, whether the combined seasons fit one career, and date of birth
+where both rows have it. Two people who wrestled in the same tournament are
+never duplicates. Blocks are packed into chunks scored across a process
+pool.
+
+Usage (from the backend directory):
+    python -m app.analytics.dedupe run [--threshold 0.85] [--workers N]
+"""
+import argparse
+import asyncio
+import csv
+import os
+import tempfile
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import lru_cache
+from itertools import repeat
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..config import settings
+from ..database import Database, db
+from ..names import fold, phonetic_keys, word_keys
+
+DEFAULT_THRESHOLD = 0.85
+MAX_BLOCK = 1000
+# Pairs per chunk handed to a worker
+CHUNK_PAIRS = 250_000
+# Hashed trigram and sound-key dimensions
+DIMENSIONS = 256
+# Most seasons one wrestler's rows can span, redshirt years included
+MAX_CAREER_YEARS = 6
+
+LAST_WEIGHT, FIRST_WEIGHT, CAREER_WEIGHT = 0.4, 0.4, 0.2
+
+PEOPLE_QUERY = """
+SELECT
+    p.person_id,
+    p.first_name,
+    p.last_name,
+    p.date_of_birth,
+    array_remove(array_agg(DISTINCT part.school_id), NULL) AS schools,
+    min(part.year) AS first_year,
+    max(part.year) AS last_year,
+    array_remove(array_agg(DISTINCT m.tournament_id), NULL) AS tournaments
+FROM person p
+LEFT JOIN role r ON r.person_id = p.person_id AND r.role_type = 'wrestler'
+LEFT JOIN participant part ON part.role_id = r.role_id
+LEFT JOIN participant_match pm ON pm.participant_id = part.participant_id
+LEFT JOIN match m ON m.match_id = pm.match_id
+GROUP BY p.person_id
+"""
+
+
+class Person(NamedTuple):
+    person_id: str
+    first_name: str
+    last_name: str
+    date_of_birth: Optional[date] = None
+    schools: Tuple[str, ...] = ()
+    first_year: Optional[int] = None
+    last_year: Optional[int] = None
+    tournaments: Tuple[str, ...] = ()
+
+
+class Candidate(NamedTuple):
+    person_id: str
+    duplicate_id: str
+    score: float
+
+
+# Names repeat across people and blocks, so their features are computed once
+# per process
+
+
+@lru_cache(maxsize=None)
+def _words(name: str) -> Tuple[str, ...]:
+    return tuple(fold(name))
+
+
+@lru_cache(maxsize=None)
+def _last_sounds(last_name: str) -> Tuple[str, ...]:
+    last = "".join(_words(last_name))
+    return tuple(phonetic_keys(last)) or (last,)
+
+
+@lru_cache(maxsize=None)
+def _first_keys(first_name: str) -> Tuple[str, ...]:
+    """Sounds of the first name's words, nickname groups included"""
+    return tuple(key for word in _words(first_name) for key in word_keys(word))
+
+
+def _buckets(features: Sequence[str]) -> np.ndarray:
+    return np.array(
+        [zlib.crc32(feature.encode()) % DIMENSIONS for feature in features],
+        dtype=np.int64,
+    )
+
+
+@lru_cache(maxsize=None)
+def _trigram_buckets(name: str) -> np.ndarray:
+    text = f"  {' '.join(_words(name))} "
+    return _buckets([text[i : i + 3] for i in range(len(text) - 2)])
+
+
+@lru_cache(maxsize=None)
+def _sound_buckets(first_name: str) -> np.ndarray:
+    return _buckets(_first_keys(first_name))
+
+
+def block_keys(person: Person) -> List[str]:
+    first = _words(person.first_name)
+    last = "".join(_words(person.last_name))
+    # A misspelt last name can change its sound; the second key family
+    # pairs the first name's sound with the last name's opening letters
+    first_sound = min(_first_keys(person.first_name), default=first[0] if first else "")
+    names = [f"{sound}|" for sound in _last_sounds(person.last_name)]
+    names.append(f"{first_sound}|{last[:2]}|")
+    if person.schools:
+        places = list(person.schools)
+    else:
+        places = [f"~{first[0][0] if first else ''}"]
+    return [name + place for name in names for place in places]
+
+
+def build_blocks(people: Sequence[Person]) -> List[List[Person]]:
+    """Blocks of two or more people that may be the same person"""
+    grouped: Dict[str, List[Person]] = {}
+    for person in people:
+        for key in block_keys(person):
+            grouped.setdefault(key, []).append(person)
+    blocks = []
+    for members in grouped.values():
+        if len(members) <= MAX_BLOCK:
+            if len(members) > 1:
+                blocks.append(members)
+            continue
+        members = sorted(members, key=lambda p: _words(p.first_name))
+        step = MAX_BLOCK // 2
+        for start in range(0, len(members) - step, step):
+            blocks.append(members[start : start + MAX_BLOCK])
+    return blocks
+
+
+def _hashed(buckets: Sequence[np.ndarray]) -> np.ndarray:
+    """Row-normalized bucket counts, one row per bucket array"""
+    rows = np.repeat(np.arange(len(buckets)), [len(b) for b in buckets])
+    matrix = np.zeros((len(buckets), DIMENSIONS), dtype=np.float32)
+    if len(rows):
+        np.add.at(matrix, (rows, np.concatenate(buckets)), 1)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def score_block(people: Sequence[Person]) -> np.ndarray:
+    """Pairwise duplicate scores in [0, 1]; the diagonal is zero"""
+    firsts = [_words(p.first_name) for p in people]
+
+    last = _hashed([_trigram_buckets(p.last_name) for p in people])
+    last_similarity = last @ last.T
+    first = _hashed([_trigram_buckets(p.first_name) for p in people])
+    sounds = _hashed([_sound_buckets(p.first_name) for p in people])
+    first_similarity = np.maximum(first @ first.T, 0.9 * ((sounds @ sounds.T) > 0))
+    # "J. Smith" against "John Smith"
+    initials = np.array([words[0][0] if words else "" for words in firsts])
+    initial_only = np.array(
+        [len(words) == 1 and len(words[0]) == 1 for words in firsts]
+    )
+    same_initial = (initials[:, None] == initials[None, :]) & (initials[:, None] != "")
+    abbreviated = same_initial & (initial_only[:, None] | initial_only[None, :])
+    first_similarity = np.where(
+        abbreviated, np.maximum(first_similarity, 0.8), first_similarity
+    )
+
+    lo = np.array([p.first_year or np.nan for p in people], dtype=np.float64)
+    hi = np.array([p.last_year or np.nan for p in people], dtype=np.float64)
+    span = np.fmax(hi[:, None], hi[None, :]) - np.fmin(lo[:, None], lo[None, :]) + 1
+    career = np.where(np.isnan(span), 0.5, span <= MAX_CAREER_YEARS)
+
+    scores = (
+        LAST_WEIGHT * last_similarity
+        + FIRST_WEIGHT * first_similarity
+        + CAREER_WEIGHT * career
+    )
+
+    born = np.array(
+        [p.date_of_birth.toordinal() if p.date_of_birth else 0 for p in people]
+    )
+    known = (born[:, None] > 0) & (born[None, :] > 0)
+    same_birthday = born[:, None] == born[None, :]
+    scores = np.where(known & same_birthday, np.minimum(scores + 0.1, 1.0), scores)
+    scores[known & ~same_birthday] = 0
+
+    tournaments = sorted({t for p in people for t in p.tournaments})
+    if tournaments:
+        index = {t: i for i, t in enumerate(tournaments)}
+        entered = np.zeros((len(people), len(tournaments)), dtype=np.float32)
+        for i, person in enumerate(people):
+            entered[i, [index[t] for t in person.tournaments]] = 1
+        scores[(entered @ entered.T) > 0] = 0
+
+    np.fill_diagonal(scores, 0)
+    return np.clip(scores, 0, 1)
+
+
+def _score_chunk(
+    blocks: List[List[Person]], threshold: float
+) -> List[Tuple[str, str, float]]:
+    pairs = []
+    for block in blocks:
+        scores = score_block(block)
+        for i, j in zip(*np.nonzero(np.triu(scores >= threshold, 1))):
+            a, b = sorted((block[i].person_id, block[j].person_id))
+            pairs.append((a, b, float(scores[i, j])))
+    return pairs
+
+
+def _chunks(blocks: List[List[Person]]) -> Iterator[List[List[Person]]]:
+    chunk: List[List[Person]] = []
+    pairs = 0
+    for block in blocks:
+        chunk.append(block)
+        pairs += len(block) * (len(block) - 1) // 2
+        if pairs >= CHUNK_PAIRS:
+            yield chunk
+            chunk, pairs = [], 0
+    if chunk:
+        yield chunk
+
+
+def find_candidates(
+    people: Sequence[Person], threshold: float = DEFAULT_THRESHOLD, workers: int = 0
+) -> List[Candidate]:
+    """Likely duplicate pairs, best first.
+
+    ``workers`` is the process pool size (0 = one per CPU, 1 = no pool).
+    """
+    chunks = list(_chunks(build_blocks(people)))
+    if workers == 1 or len(chunks) <= 1:
+        results = map(_score_chunk, chunks, repeat(threshold))
+        best = _best_pairs(results)
+    else:
+        with ProcessPoolExecutor(max_workers=workers or None) as pool:
+            best = _best_pairs(pool.map(_score_chunk, chunks, repeat(threshold)))
+    candidates = [Candidate(a, b, round(score, 4)) for (a, b), score in best.items()]
+    return sorted(candidates, key=lambda c: (-c.score, c.person_id, c.duplicate_id))
+
+
+def _best_pairs(results) -> Dict[Tuple[str, str], float]:
+    # A pair sharing two schools or sounds is scored in both blocks
+    best: Dict[Tuple[str, str], float] = {}
+    for pairs in results:
+        for a, b, score in pairs:
+            if score > best.get((a, b), -1.0):
+                best[(a, b)] = score
+    return best
+
+
+async def load_people(database: Database = db) -> List[Person]:
+    rows = await database.fetch_all(PEOPLE_QUERY)
+    return [
+        Person(
+            row["person_id"],
+            row["first_name"] or "",
+            row["last_name"] or "",
+            row["date_of_birth"],
+            tuple(row["schools"]),
+            row["first_year"],
+            row["last_year"],
+            tuple(row["tournaments"]),
+        )
+        for row in rows
+    ]
+
+
+def write_candidates(
+    path: str, candidates: Sequence[Candidate], people: Sequence[Person]
+) -> None:
+    """Write the candidates, with both names, as a review CSV"""
+    names = {p.person_id: f"{p.first_name} {p.last_name}" for p in people}
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w", newline="") as fh:
+        writer = csv.writer(fh)
+        writer.writerow(["score", "person_id", "name", "duplicate_id", "duplicate"])
+        for c in candidates:
+            writer.writerow(
+                [
+                    c.score,
+                    c.person_id,
+                    names[c.person_id],
+                    c.duplicate_id,
+                    names[c.duplicate_id],
+                ]
+            )
+    os.replace(tmp, path)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    try:
+        started = time.perf_counter()
+        people = await load_people()
+        loaded = time.perf_counter()
+        candidates = find_candidates(people, args.threshold, args.workers)
+        write_candidates(args.output, candidates, people)
+        print(
+            f"✅ {len(candidates)} merge candidates among {len(people)} people "
+            f"-> {args.output} (load {loaded - started:.1f}s, "
+            f"score {time.perf_counter() - loaded:.1f}s)"
+        )
+    finally:
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Duplicate person detection")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="Write merge candidates to a CSV")
+    run.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    run.add_argument("--workers", type=int, default=0, help="0 = one per CPU")
+    run.add_argument("--output", default=settings.merge_candidates_path)
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,450 @@
+"""
+Shared, memory-mapped snapshot of read-mostly dimension data
+
+Wrestler names (with each wrestler's latest school, season and weight class),
+schools and tournament metadata are written once to a single file, together
+with substring-search indexes over them. Every uvicorn worker maps the file
+read-only: columns are NumPy views and text stays UTF-8 bytes in the mapping
+until a result row is decoded. The pages are shared through the OS page
+cache, so memory does not grow with the number of workers.
+
+A rebuild writes a new file next to the old one and renames it into place.
+Workers notice the new inode on their next lookup and map it. Requests that
+are still using the old mapping keep it alive until they finish, and the
+kernel frees the old file then.
+
+File layout: 8-byte magic, little-endian uint64 header length, JSON header,
+then the column data, each segment aligned to 64 bytes. Text columns are
+stored as one NUL-terminated blob plus an int64 array of entry starts, which
+lets a search index run ``mmap.find`` straight over the mapped bytes.
+
+Usage (from the backend directory):
+    python -m app.analytics.dimensions rebuild
+"""
+import argparse
+import asyncio
+import json
+import mmap
+import os
+import tempfile
+import time
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..config import settings
+from ..database import Database, db
+
+MAGIC = b"WDIM\x01\x00\x00\x00"
+ALIGN = 64
+_SEPARATOR = b"\x00"
+
+PERSONS_QUERY = """
+SELECT
+    p.person_id,
+    p.first_name,
+    p.last_name,
+    latest.last_school,
+    latest.last_year,
+    latest.last_weight_class,
+    row_number() OVER (
+        ORDER BY p.first_name || ' ' || p.last_name, p.person_id
+    ) - 1 AS name_rank
+FROM person p
+LEFT JOIN LATERAL (
+    SELECT
+        s.name as last_school,
+        part.year as last_year,
+        part.weight_class as last_weight_class
+    FROM role r
+    JOIN participant part ON r.role_id = part.role_id
+    JOIN school s ON part.school_id = s.school_id
+    WHERE r.person_id = p.person_id AND r.role_type = 'wrestler'
+    ORDER BY part.year DESC
+    LIMIT 1
+) latest ON true
+WHERE EXISTS (
+    SELECT 1 FROM role r
+    WHERE r.person_id = p.person_id AND r.role_type = 'wrestler'
+)
+ORDER BY p.last_name, p.first_name, p.person_id
+"""
+
+SCHOOLS_QUERY = """
+SELECT school_id, name, location
+FROM school
+ORDER BY name, school_id
+"""
+
+TOURNAMENTS_QUERY = """
+SELECT tournament_id, name, year, location, date
+FROM tournament
+ORDER BY year DESC, name, tournament_id
+"""
+
+
+def _search_key(*parts: Optional[str]) -> str:
+    # Matching is case-insensitive, like ILIKE; NUL separates entries
+    return " ".join(p or "" for p in parts).lower().replace("\x00", "")
+
+
+class _Writer:
+    """Lays out segments and the header describing them"""
+
+    def __init__(self):
+        self.segments: List[bytes] = []
+        self.size = 0
+
+    def _add(self, data: bytes) -> int:
+        offset = self.size
+        padding = -len(data) % ALIGN
+        self.segments.append(data + b"\x00" * padding)
+        self.size += len(data) + padding
+        return offset
+
+    def array(self, values: np.ndarray) -> Dict[str, Any]:
+        values = np.ascontiguousarray(values)
+        return {
+            "kind": "array",
+            "dtype": values.dtype.str,
+            "length": len(values),
+            "offset": self._add(values.tobytes()),
+        }
+
+    def text(self, values: Sequence[Optional[str]]) -> Dict[str, Any]:
+        encoded = [(v or "").encode() + _SEPARATOR for v in values]
+        starts = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(e) for e in encoded], out=starts[1:])
+        column = {
+            "kind": "text",
+            "starts": self.array(starts),
+            "blob": self._add(b"".join(encoded)),
+        }
+        nulls = np.array([v is None for v in values], dtype=bool)
+        if nulls.any():
+            column["nulls"] = self.array(nulls)
+        return column
+
+    def index(self, keys: Sequence[str], rows: Sequence[int]) -> Dict[str, Any]:
+        return {"keys": self.text(keys), "rows": self.array(np.asarray(rows, np.int32))}
+
+    def write(self, path: str, header: Dict[str, Any]) -> None:
+        """Write the file, replacing ``path`` atomically"""
+        encoded = json.dumps(header).encode()
+        prefix = MAGIC + len(encoded).to_bytes(8, "little") + encoded
+        prefix += b"\x00" * (-len(prefix) % ALIGN)
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".snap")
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(prefix)
+            for segment in self.segments:
+                fh.write(segment)
+        os.replace(tmp, path)
+
+
+def write_dimensions(
+    path: str,
+    persons: Sequence[Mapping[str, Any]],
+    schools: Sequence[Mapping[str, Any]],
+    tournaments: Sequence[Mapping[str, Any]],
+) -> None:
+    """Write a snapshot from rows shaped like the ``*_QUERY`` results.
+
+    Rows must already be in the queries' order; the search indexes return
+    matches in that order.
+    """
+    out = _Writer()
+
+    person_columns = (
+        "person_id",
+        "first_name",
+        "last_name",
+        "last_school",
+        "last_weight_class",
+    )
+    by_name = sorted(range(len(persons)), key=lambda i: persons[i]["name_rank"])
+    has_latest = [i for i, p in enumerate(persons) if p["last_year"] is not None]
+    person_table = {
+        "rows": len(persons),
+        "columns": {
+            **{c: out.text([p[c] for p in persons]) for c in person_columns},
+            "last_year": out.array(
+                np.array([p["last_year"] or 0 for p in persons], dtype=np.int16)
+            ),
+        },
+        "indexes": {
+            # Everyone, in "first last" order
+            "by_name": out.index(
+                [
+                    _search_key(persons[i]["first_name"], persons[i]["last_name"])
+                    for i in by_name
+                ],
+                by_name,
+            ),
+            # Wrestlers with a season, in last-name order
+            "with_season": out.index(
+                [
+                    _search_key(persons[i]["first_name"], persons[i]["last_name"])
+                    for i in has_latest
+                ],
+                has_latest,
+            ),
+        },
+    }
+
+    # A school matches on its name or location: two keys for the same row
+    school_keys, school_rows = [], []
+    for i, school in enumerate(schools):
+        school_keys += [_search_key(school["name"]), _search_key(school["location"])]
+        school_rows += [i, i]
+    school_table = {
+        "rows": len(schools),
+        "columns": {
+            c: out.text([s[c] for s in schools])
+            for c in ("school_id", "name", "location")
+        },
+        "indexes": {"by_name": out.index(school_keys, school_rows)},
+    }
+
+    tournament_table = {
+        "rows": len(tournaments),
+        "columns": {
+            **{
+                c: out.text([t[c] for t in tournaments])
+                for c in ("tournament_id", "name", "location")
+            },
+            "year": out.array(
+                np.array([t["year"] or 0 for t in tournaments], dtype=np.int16)
+            ),
+            "date": out.array(
+                np.array([t["date"] for t in tournaments], dtype="datetime64[D]")
+            ),
+        },
+        "indexes": {
+            "by_year": out.index(
+                [_search_key(t["name"]) for t in tournaments], range(len(tournaments))
+            ),
+        },
+    }
+
+    out.write(
+        path,
+        {
+            "built_at": time.time(),
+            "tables": {
+                "persons": person_table,
+                "schools": school_table,
+                "tournaments": tournament_table,
+            },
+        },
+    )
+
+
+class _Text:
+    """A text column: entries decoded on access, searchable in place"""
+
+    def __init__(self, buffer: mmap.mmap, starts: np.ndarray, blob: int, nulls):
+        self.buffer = buffer
+        self.starts = starts
+        self.blob = blob
+        self.nulls = nulls
+
+    def __len__(self) -> int:
+        return len(self.starts) - 1
+
+    def __getitem__(self, i: int) -> Optional[str]:
+        if self.nulls is not None and self.nulls[i]:
+            return None
+        start = self.blob + int(self.starts[i])
+        return self.buffer[start : self.blob + int(self.starts[i + 1]) - 1].decode()
+
+    def find(self, needle: bytes) -> Iterator[int]:
+        """Entries containing ``needle``, in order"""
+        end = self.blob + int(self.starts[-1])
+        position = self.buffer.find(needle, self.blob, end)
+        while position != -1:
+            entry = int(np.searchsorted(self.starts, position - self.blob, "right")) - 1
+            yield entry
+            position = self.buffer.find(
+                needle, self.blob + int(self.starts[entry + 1]), end
+            )
+
+
+class _Table:
+    def __init__(self, rows: int, columns: Dict[str, Any], indexes: Dict[str, Any]):
+        self.rows = rows
+        self.columns = columns
+        self.indexes = indexes
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, column: str):
+        return self.columns[column]
+
+    def search(self, index: str, query: str, limit: int) -> List[int]:
+        """Rows with a key containing ``query``, in index order"""
+        needle = _search_key(query).encode()
+        if not needle:
+            return []
+        keys, rows = self.indexes[index]
+        found: List[int] = []
+        for entry in keys.find(needle):
+            row = int(rows[entry])
+            if row not in found:
+                found.append(row)
+                if len(found) >= limit:
+                    break
+        return found
+
+
+class Dimensions:
+    """A mapped snapshot file; see the module docstring for the layout"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as fh:
+            self._buffer = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._buffer[: len(MAGIC)] != MAGIC:
+            raise ValueError(f"{path} is not a dimensions snapshot")
+        length = int.from_bytes(self._buffer[len(MAGIC) : len(MAGIC) + 8], "little")
+        start = len(MAGIC) + 8
+        header = json.loads(self._buffer[start : start + length])
+        self._base = start + length + (-(start + length) % ALIGN)
+        self.built_at: float = header["built_at"]
+        self.tables: Dict[str, _Table] = {
+            name: _Table(
+                table["rows"],
+                {c: self._column(spec) for c, spec in table["columns"].items()},
+                {
+                    i: (self._column(spec["keys"]), self._column(spec["rows"]))
+                    for i, spec in table["indexes"].items()
+                },
+            )
+            for name, table in header["tables"].items()
+        }
+
+    def _column(self, spec: Dict[str, Any]):
+        if spec["kind"] == "text":
+            nulls = self._column(spec["nulls"]) if "nulls" in spec else None
+            return _Text(
+                self._buffer,
+                self._column(spec["starts"]),
+                self._base + spec["blob"],
+                nulls,
+            )
+        return np.frombuffer(
+            self._buffer,
+            dtype=np.dtype(spec["dtype"]),
+            count=spec["length"],
+            offset=self._base + spec["offset"],
+        )
+
+    # Lookups shaped like the search routes' SQL rows
+
+    def wrestlers(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        """Wrestlers with their latest school, season and weight class"""
+        persons = self.tables["persons"]
+        return [
+            {
+                "person_id": persons["person_id"][row],
+                "first_name": persons["first_name"][row],
+                "last_name": persons["last_name"][row],
+                "last_school": persons["last_school"][row],
+                "last_year": int(persons["last_year"][row]),
+                "last_weight_class": persons["last_weight_class"][row],
+            }
+            for row in persons.search("with_season", query, limit)
+        ]
+
+    def wrestler_names(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        persons = self.tables["persons"]
+        return [
+            {
+                "id": persons["person_id"][row],
+                "name": f"{persons['first_name'][row]} {persons['last_name'][row]}",
+                "additional_info": persons["last_school"][row],
+            }
+            for row in persons.search("by_name", query, limit)
+        ]
+
+    def schools(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        schools = self.tables["schools"]
+        return [
+            {
+                "id": schools["school_id"][row],
+                "name": schools["name"][row],
+                "additional_info": schools["location"][row],
+            }
+            for row in schools.search("by_name", query, limit)
+        ]
+
+    def tournaments(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        tournaments = self.tables["tournaments"]
+        rows = []
+        for row in tournaments.search("by_year", query, limit):
+            location = tournaments["location"][row]
+            year = int(tournaments["year"][row])
+            rows.append(
+                {
+                    "id": tournaments["tournament_id"][row],
+                    "name": tournaments["name"][row],
+                    "additional_info": None
+                    if location is None
+                    else f"{year} - {location}",
+                }
+            )
+        return rows
+
+
+class DimensionStore:
+    """Process-wide access to the mapped snapshot.
+
+    Each lookup stats the file and maps it again when a rebuild has replaced
+    it. The previous mapping is not closed explicitly: NumPy views handed to
+    in-flight requests keep it alive until they are dropped.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._dimensions: Optional[Dimensions] = None
+        self._identity: Optional[Tuple[int, int, int]] = None
+
+    def get(self) -> Optional[Dimensions]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        identity = (stat.st_dev, stat.st_ino, stat.st_mtime_ns)
+        if self._dimensions is None or identity != self._identity:
+            self._dimensions = Dimensions(self.path)
+            self._identity = identity
+        return self._dimensions
+
+
+dimension_store = DimensionStore(settings.dimensions_path)
+
+
+async def rebuild_dimensions(database: Database = db) -> Dimensions:
+    """Read the dimension tables and swap in a new snapshot"""
+    persons = await database.fetch_all(PERSONS_QUERY)
+    schools = await database.fetch_all(SCHOOLS_QUERY)
+    tournaments = await database.fetch_all(TOURNAMENTS_QUERY)
+    write_dimensions(dimension_store.path, persons, schools, tournaments)
+    return dimension_store.get()
+
+
+async def _main(args: argparse.Namespace) -> None:
+    try:
+        dimensions = await rebuild_dimensions()
+        counts = ", ".join(f"{len(t)} {n}" for n, t in dimensions.tables.items())
+        print(f"✅ Wrote {counts} -> {dimension_store.path}")
+    finally:
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the dimensions snapshot")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("rebuild", help="Snapshot persons, schools and tournaments")
+    asyncio.run(_main(parser.parse_args()))
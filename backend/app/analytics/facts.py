@@ -0,0 +1,362 @@
+"""
+Columnar bout facts in Parquet, queried with DuckDB
+
+Each wrestler's side of each bout is one fact row. The row carries the
+tournament, season, round, weight class, the wrestler's school and seed, the
+opponent, and how the bout was decided. Facts are kept as one Parquet file
+per tournament under ``FACTS_DIR``. Ad-hoc group-bys ("win rate by weight
+class and decade for one conference") run on DuckDB's vectorized engine
+over those files, so analytical reads never reach Postgres.
+
+Refreshing is incremental: ingesting a tournament rewrites only that
+tournament's file. Rows are exported with ``COPY ... CSV`` and converted to
+Parquet by DuckDB. Each file is renamed into place, so queries see either
+the old facts or the new ones.
+
+A school's conference in a season is the conference tournament it wrestled
+in that season, i.e. any tournament that is not the NCAA championships. The
+label is the tournament name without its year and the word "Championships".
+
+Usage (from the backend directory):
+    python -m app.analytics.facts rebuild
+    python -m app.analytics.facts refresh TOURNAMENT_ID [TOURNAMENT_ID ...]
+"""
+import argparse
+import asyncio
+import glob
+import os
+import tempfile
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import quote
+
+import duckdb
+
+from ..codes import result_type_code
+from ..config import settings
+from ..database import Database, db
+
+# Tournaments exported per COPY round trip
+REFRESH_BATCH = 50
+
+FACTS_QUERY = """
+SELECT
+    m.match_id,
+    m.tournament_id,
+    t.name AS tournament_name,
+    t.date AS tournament_date,
+    COALESCE(part.year, t.year) AS year,
+    m.round,
+    m.round_order,
+    m.result_type,
+    part.weight_class,
+    part.seed,
+    r.person_id,
+    part.school_id,
+    pm.score,
+    COALESCE(pm.is_winner, false)
+        OR pm.participant_id IS NOT DISTINCT FROM m.winner_id AS won,
+    opponent_role.person_id AS opponent_id,
+    opponent.school_id AS opponent_school_id,
+    opponent.seed AS opponent_seed,
+    opponent_match.score AS opponent_score
+FROM match m
+JOIN tournament t ON m.tournament_id = t.tournament_id
+JOIN participant_match pm ON m.match_id = pm.match_id
+JOIN participant part ON pm.participant_id = part.participant_id
+JOIN role r ON part.role_id = r.role_id
+LEFT JOIN participant_match opponent_match
+    ON opponent_match.match_id = m.match_id
+   AND opponent_match.participant_id <> pm.participant_id
+LEFT JOIN participant opponent
+    ON opponent_match.participant_id = opponent.participant_id
+LEFT JOIN role opponent_role ON opponent.role_id = opponent_role.role_id
+WHERE m.tournament_id = ANY($1::text[])
+"""
+
+_CSV_COLUMNS = {
+    "match_id": "VARCHAR",
+    "tournament_id": "VARCHAR",
+    "tournament_name": "VARCHAR",
+    "tournament_date": "DATE",
+    "year": "INTEGER",
+    "round": "VARCHAR",
+    "round_order": "INTEGER",
+    "result_type": "VARCHAR",
+    "weight_class": "VARCHAR",
+    "seed": "INTEGER",
+    "person_id": "VARCHAR",
+    "school_id": "VARCHAR",
+    "score": "INTEGER",
+    "won": "BOOLEAN",
+    "opponent_id": "VARCHAR",
+    "opponent_school_id": "VARCHAR",
+    "opponent_seed": "INTEGER",
+    "opponent_score": "INTEGER",
+}
+
+_CSV_SCHEMA = "{%s}" % ", ".join(
+    f"'{name}': '{kind}'" for name, kind in _CSV_COLUMNS.items()
+)
+
+# Raw rows -> fact rows; ``results`` maps stored result_type text to a name
+_FACTS_SELECT = """
+SELECT
+    f.* EXCLUDE (result_type),
+    coalesce(results.result, 'unknown') AS result,
+    f.year // 10 * 10 AS decade,
+    f.tournament_name ILIKE '%NCAA%' AS championship,
+    f.opponent_id IS NOT NULL AND coalesce(results.result, '') <> 'bye' AS bout
+FROM raw f
+LEFT JOIN results ON f.result_type IS NOT DISTINCT FROM results.result_type
+"""
+
+# Query-parameter name -> fact column
+GROUPINGS = {
+    "weight_class": "weight_class",
+    "year": "year",
+    "decade": "decade",
+    "conference": "conference",
+    "school": "school_id",
+    "tournament": "tournament_id",
+    "round": "round",
+    "result": "result",
+    "seed": "seed",
+}
+
+FILTERS = {
+    "weight_class": "weight_class",
+    "conference": "conference",
+    "school_id": "school_id",
+    "person_id": "person_id",
+    "tournament_id": "tournament_id",
+    "round": "round",
+}
+
+_STATS_QUERY = """
+WITH facts AS (
+    SELECT * FROM read_parquet({files}, union_by_name = true)
+),
+conferences AS (
+    SELECT
+        school_id,
+        year,
+        min(regexp_replace(
+            regexp_replace(tournament_name, '^\\d{{4}}\\s+', ''),
+            '\\s+Championships$', ''
+        )) AS conference
+    FROM facts
+    WHERE NOT championship
+    GROUP BY school_id, year
+)
+SELECT
+    {keys}
+    count(*) AS bouts,
+    count(*) FILTER (WHERE won) AS wins,
+    count(*) FILTER (WHERE NOT won) AS losses,
+    round(100 * count(*) FILTER (WHERE won)::DOUBLE / count(*), 1) AS win_percentage,
+    count(*) FILTER (WHERE won AND result = 'fall') AS falls,
+    count(*) FILTER (WHERE won AND result = 'tech_fall') AS tech_falls,
+    count(*) FILTER (WHERE won AND result = 'major_decision') AS major_decisions,
+    round(100 * count(*) FILTER (
+        WHERE won AND result IN ('fall', 'tech_fall', 'major_decision')
+    )::DOUBLE / greatest(count(*) FILTER (WHERE won), 1), 1) AS bonus_rate,
+    count(DISTINCT person_id) AS wrestlers
+FROM facts
+LEFT JOIN conferences USING (school_id, year)
+WHERE {where}
+{group_by}
+ORDER BY {order}
+LIMIT {limit}
+"""
+
+
+def _file_name(tournament_id: str) -> str:
+    return f"{quote(tournament_id, safe='')}.parquet"
+
+
+def _sql_string(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+class FactStore:
+    """Parquet fact files plus the DuckDB engine that queries them"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._connection = duckdb.connect()
+
+    def files(self) -> List[str]:
+        return sorted(glob.glob(os.path.join(self.directory, "*.parquet")))
+
+    def write(self, csv: str, tournament_ids: Sequence[str]) -> None:
+        """Replace the given tournaments' files with the rows in ``csv``.
+
+        ``csv`` holds ``FACTS_QUERY`` output; a tournament without rows loses
+        its file.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        cursor = self._connection.cursor()
+        try:
+            cursor.execute(
+                "CREATE TEMP TABLE raw AS SELECT * FROM read_csv("
+                f"{_sql_string(csv)}, header = false, nullstr = '\\N', "
+                # Fixed dialect: an empty export has nothing to sniff
+                "auto_detect = false, delim = ',', quote = '\"', "
+                f"columns = {_CSV_SCHEMA})"
+            )
+            stored = [
+                row[0]
+                for row in cursor.execute(
+                    "SELECT DISTINCT result_type FROM raw"
+                ).fetchall()
+            ]
+            cursor.execute(
+                "CREATE TEMP TABLE results (result_type VARCHAR, result VARCHAR)"
+            )
+            if stored:
+                cursor.executemany(
+                    "INSERT INTO results VALUES ($1, $2)",
+                    [[text, result_type_code(text).name.lower()] for text in stored],
+                )
+            cursor.execute(f"CREATE TEMP TABLE facts AS {_FACTS_SELECT}")
+
+            for tournament_id in tournament_ids:
+                path = os.path.join(self.directory, _file_name(tournament_id))
+                count = cursor.execute(
+                    "SELECT count(*) FROM facts WHERE tournament_id = $1",
+                    [tournament_id],
+                ).fetchone()[0]
+                if not count:
+                    if os.path.exists(path):
+                        os.remove(path)
+                    continue
+                fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+                os.close(fd)
+                cursor.execute(
+                    "COPY (SELECT * FROM facts WHERE tournament_id = "
+                    f"{_sql_string(tournament_id)} ORDER BY match_id, person_id) "
+                    f"TO {_sql_string(tmp)} (FORMAT parquet)"
+                )
+                os.replace(tmp, path)
+        finally:
+            cursor.close()
+
+    def prune(self, tournament_ids: Sequence[str]) -> None:
+        """Drop files of tournaments that are not in ``tournament_ids``"""
+        keep = {_file_name(t) for t in tournament_ids}
+        for path in self.files():
+            if os.path.basename(path) not in keep:
+                os.remove(path)
+
+    def stats(
+        self,
+        group_by: Sequence[str],
+        filters: Optional[Dict[str, Any]] = None,
+        year_from: Optional[int] = None,
+        year_to: Optional[int] = None,
+        limit: int = 1000,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Bout statistics per group, ``None`` when no facts are built yet.
+
+        Each group is ``{"key": {grouping: value}, <metrics>}``. ``bouts``
+        counts wrestler-bouts: a bout between two wrestlers in the group
+        counts twice, once per side.
+        """
+        unknown = [g for g in group_by if g not in GROUPINGS]
+        if unknown:
+            raise ValueError(
+                f"Unknown grouping {unknown[0]!r}; expected {list(GROUPINGS)}"
+            )
+        files = self.files()
+        if not files:
+            return None
+
+        conditions, params = ["bout"], []
+        for name, value in (filters or {}).items():
+            if value is not None:
+                params.append(value)
+                conditions.append(f"{FILTERS[name]} = ${len(params)}")
+        for operator, year in ((">=", year_from), ("<=", year_to)):
+            if year is not None:
+                params.append(year)
+                conditions.append(f"year {operator} ${len(params)}")
+
+        columns = [GROUPINGS[g] for g in group_by]
+        keys = "".join(f"{c} AS {g},\n    " for g, c in zip(group_by, columns))
+        positions = ", ".join(str(i + 1) for i in range(len(columns)))
+        query = _STATS_QUERY.format(
+            files="[" + ", ".join(_sql_string(f) for f in files) + "]",
+            keys=keys,
+            where=" AND ".join(conditions),
+            group_by=f"GROUP BY {positions}" if columns else "",
+            order=f"{positions} NULLS LAST" if columns else "bouts",
+            limit=int(limit),
+        )
+        cursor = self._connection.cursor()
+        try:
+            cursor.execute(query, params)
+            names = [column[0] for column in cursor.description]
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+        groups = []
+        for row in rows:
+            group = dict(zip(names, row))
+            groups.append({"key": {g: group.pop(g) for g in group_by}, **group})
+        return groups
+
+
+fact_store = FactStore(settings.facts_dir)
+
+
+async def refresh_facts(
+    tournament_ids: Sequence[str],
+    database: Database = db,
+    store: Optional[FactStore] = None,
+) -> None:
+    """Re-export the facts of the given tournaments"""
+    store = store or fact_store
+    with tempfile.TemporaryDirectory() as scratch:
+        for start in range(0, len(tournament_ids), REFRESH_BATCH):
+            batch = list(tournament_ids[start : start + REFRESH_BATCH])
+            csv = os.path.join(scratch, f"facts-{start}.csv")
+            async with database.acquire() as connection:
+                await connection.copy_from_query(
+                    FACTS_QUERY, batch, output=csv, format="csv", null="\\N"
+                )
+            await asyncio.to_thread(store.write, csv, batch)
+
+
+async def rebuild_facts(
+    database: Database = db, store: Optional[FactStore] = None
+) -> int:
+    """Export every tournament's facts and drop files of deleted ones"""
+    store = store or fact_store
+    rows = await database.fetch_all(
+        "SELECT tournament_id FROM tournament ORDER BY date, tournament_id"
+    )
+    tournament_ids = [row["tournament_id"] for row in rows]
+    await refresh_facts(tournament_ids, database, store)
+    store.prune(tournament_ids)
+    return len(tournament_ids)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    try:
+        if args.command == "rebuild":
+            count = await rebuild_facts()
+            print(f"✅ Wrote facts for {count} tournaments -> {fact_store.directory}")
+        else:
+            await refresh_facts(args.tournament_ids)
+            print(f"✅ Refreshed facts for {len(args.tournament_ids)} tournaments")
+    finally:
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Columnar bout facts")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("rebuild", help="Export every tournament")
+    refresh = commands.add_parser("refresh", help="Re-export some tournaments")
+    refresh.add_argument("tournament_ids", nargs="+")
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,70 @@
+"""
+Post-ingest maintenance of the precomputed analytics
+
+After new tournaments are loaded into the database their matches are read
+once and folded into every precomputed structure: ratings and leaderboards
+are updated incrementally, the entrants' search names are normalized, the
+tournaments' Parquet facts are exported, cached team scores for those
+tournaments and cached wrestler profile sections are dropped, the in-memory
+snapshot is invalidated and the shared dimensions snapshot used by search is
+rebuilt. (Weight class, round and result codes are filled by database
+triggers as the rows are written.)
+
+Usage (from the backend directory):
+    python -m app.analytics.ingest TOURNAMENT_ID [TOURNAMENT_ID ...]
+"""
+import argparse
+import asyncio
+from typing import Sequence
+
+from ..config import settings
+from ..database import Database, db
+from ..names import refresh_search_names
+from ..sections import invalidate_sections
+from .dimensions import rebuild_dimensions
+from .facts import refresh_facts
+from .leaderboards import build_leaderboards, leaderboard_store
+from .ratings import EloEngine, rating_store
+from .snapshot import load_snapshot, snapshot_cache
+from .team_scores import team_score_store
+
+
+async def ingest_tournaments(tournament_ids: Sequence[str], database: Database = db):
+    """Update the precomputed analytics for newly ingested tournaments"""
+    book = rating_store.get()
+    boards = leaderboard_store.get()
+    if book is None or boards is None:
+        # Nothing to update incrementally yet; build from the full history
+        full = await load_snapshot(database)
+        if book is None:
+            rating_store.save(EloEngine().rebuild(full))
+        if boards is None:
+            leaderboard_store.save(build_leaderboards(full, settings.leaderboard_size))
+    if book is not None or boards is not None:
+        snapshot = await load_snapshot(database, tournament_ids)
+        if book is not None:
+            rating_store.save(EloEngine().apply(book, snapshot))
+        if boards is not None:
+            leaderboard_store.save(boards.apply(snapshot))
+
+    await refresh_search_names(database, tournament_ids)
+    await refresh_facts(tournament_ids, database)
+    for tournament_id in tournament_ids:
+        team_score_store.invalidate(tournament_id)
+    invalidate_sections()
+    snapshot_cache.invalidate()
+    await rebuild_dimensions(database)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    try:
+        await ingest_tournaments(args.tournament_ids)
+        print(f"✅ Updated analytics for {len(args.tournament_ids)} tournaments")
+    finally:
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Update analytics after ingest")
+    parser.add_argument("tournament_ids", nargs="+")
+    asyncio.run(_main(parser.parse_args()))
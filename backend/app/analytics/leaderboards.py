@@ -0,0 +1,538 @@
+"""
+Precomputed wrestler leaderboards
+
+Leaderboards ("most career pins", "best win percentage", "most tech falls in
+a season", ...) are kept as top-N lists per metric and scope, where a scope
+is a season, a weight class, both, or the whole career (``ALL`` for either).
+
+The underlying tally has one row per (wrestler, season, weight class) with
+the wrestler's bout counters. A full build rolls the tally up to every scope
+with vectorized group-bys and keeps the best ``size`` entries of each. When
+tournaments are ingested later only the wrestlers they touch are re-totalled
+and inserted into the affected boards; a board is re-ranked from the tally
+only if one of its members could have dropped below a non-member.
+
+Usage (from the backend directory):
+    python -m app.analytics.leaderboards rebuild
+"""
+import argparse
+import asyncio
+import bisect
+import os
+import tempfile
+from dataclasses import dataclass, field
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..codes import ResultType
+from ..config import settings
+from ..database import Database, db
+from .snapshot import MatchSnapshot, load_snapshot
+
+ALL = -1
+NO_SEASON = 0
+
+# Tally columns
+COUNTERS = ("matches", "wins", "falls", "tech_falls", "major_decisions")
+MATCHES, WINS, FALLS, TECH_FALLS, MAJOR_DECISIONS = range(len(COUNTERS))
+
+
+class Metric(NamedTuple):
+    label: str
+    numerator: Tuple[int, ...]
+    percentage: bool = False
+
+    def values(self, counts: np.ndarray) -> np.ndarray:
+        """Metric value for each row of a counter matrix"""
+        values = counts[:, list(self.numerator)].sum(axis=1).astype(np.float64)
+        if self.percentage:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                values = np.where(
+                    counts[:, MATCHES] > 0, values / counts[:, MATCHES] * 100, 0.0
+                )
+        return values
+
+    def score(self, totals: Sequence[int]) -> Optional[float]:
+        """Value for one wrestler's counter totals, ``None`` if not eligible"""
+        value = sum(totals[i] for i in self.numerator)
+        if self.percentage:
+            if totals[MATCHES] < settings.leaderboard_min_matches:
+                return None
+            return round(value / totals[MATCHES] * 100, 3)
+        return float(value) if value > 0 else None
+
+    def eligible(self, counts: np.ndarray) -> np.ndarray:
+        if self.percentage:
+            return counts[:, MATCHES] >= settings.leaderboard_min_matches
+        return self.values(counts) > 0
+
+
+METRICS: Dict[str, Metric] = {
+    "wins": Metric("Wins", (WINS,)),
+    "pins": Metric("Pins", (FALLS,)),
+    "tech_falls": Metric("Tech falls", (TECH_FALLS,)),
+    "major_decisions": Metric("Major decisions", (MAJOR_DECISIONS,)),
+    "bonus_wins": Metric("Bonus-point wins", (FALLS, TECH_FALLS, MAJOR_DECISIONS)),
+    "win_percentage": Metric("Win percentage", (WINS,), percentage=True),
+}
+METRIC_NAMES = list(METRICS)
+
+BoardKey = Tuple[str, int, int]  # (metric, season, weight class code)
+
+
+class Entry(NamedTuple):
+    person: int
+    value: float
+    matches: int
+    wins: int
+
+
+@dataclass
+class LeaderboardBook:
+    """Tally of bout counters plus the top-N boards derived from it"""
+
+    size: int = 100
+    persons: List[str] = field(default_factory=list)
+    weight_classes: List[str] = field(default_factory=list)
+    person: np.ndarray = field(default_factory=lambda: np.empty(0, np.int32))
+    season: np.ndarray = field(default_factory=lambda: np.empty(0, np.int16))
+    weight: np.ndarray = field(default_factory=lambda: np.empty(0, np.int32))
+    counts: np.ndarray = field(
+        default_factory=lambda: np.empty((0, len(COUNTERS)), np.int32)
+    )
+    tournaments: List[str] = field(default_factory=list)
+    boards: Dict[BoardKey, List[Entry]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self._person_index = {p: i for i, p in enumerate(self.persons)}
+        self._weight_index = {w: i for i, w in enumerate(self.weight_classes)}
+        self._rows: Optional[Dict[Tuple[int, int, int], int]] = None
+        self._person_rows: Optional[Dict[int, List[int]]] = None
+        self._member_sets: Optional[Dict[BoardKey, set]] = None
+
+    # Reading
+
+    def board(
+        self,
+        metric: str,
+        season: Optional[int] = None,
+        weight_class: Optional[str] = None,
+    ) -> Optional[List[Entry]]:
+        """Entries of one board, best first; ``None`` for an unknown scope"""
+        weight = ALL
+        if weight_class is not None:
+            weight = self._weight_index.get(weight_class)
+            if weight is None:
+                return None
+        return self.boards.get((metric, ALL if season is None else season, weight))
+
+    def seasons(self) -> List[int]:
+        return sorted(int(s) for s in np.unique(self.season) if s != NO_SEASON)
+
+    # Full build
+
+    def rebuild_boards(self) -> None:
+        self.boards = {}
+        self._member_sets = None
+        for by_season in (False, True):
+            for by_weight in (False, True):
+                self._rank_scopes(by_season, by_weight)
+
+    def _rank_scopes(
+        self,
+        by_season: bool,
+        by_weight: bool,
+        metrics: Sequence[str] = METRIC_NAMES,
+        rows: Optional[np.ndarray] = None,
+    ) -> None:
+        """Roll the tally up to scopes and keep each scope's top entries"""
+        if rows is None:
+            rows = np.arange(len(self.person))
+        if by_season:
+            rows = rows[self.season[rows] != NO_SEASON]
+        if not len(rows):
+            return
+        season = self.season[rows].astype(np.int64) if by_season else None
+        weight = self.weight[rows].astype(np.int64) if by_weight else None
+        scope = np.zeros(len(rows), dtype=np.int64)
+        if season is not None:
+            scope = season
+        if weight is not None:
+            scope = scope * (len(self.weight_classes) + 1) + weight
+
+        packed = scope * len(self.persons) + self.person[rows]
+        order = np.argsort(packed, kind="stable")
+        packed = packed[order]
+        starts = np.flatnonzero(np.r_[True, packed[1:] != packed[:-1]])
+        counts = np.add.reduceat(self.counts[rows][order], starts, axis=0)
+        first = rows[order][starts]
+        person = self.person[first]
+        group = packed[starts] // len(self.persons)
+        season_of = self.season[first] if by_season else np.full(len(first), ALL)
+        weight_of = self.weight[first] if by_weight else np.full(len(first), ALL)
+        name_rank = _name_ranks(self.persons)[person]
+
+        # Rows are sorted by scope, so each scope is one contiguous segment
+        bounds = np.flatnonzero(np.r_[True, group[1:] != group[:-1], True])
+        lengths = np.diff(bounds)
+
+        for metric in metrics:
+            values = METRICS[metric].values(counts)
+            eligible = METRICS[metric].eligible(counts)
+            # Only rows at or above their scope's size-th best value can rank
+            candidates = np.where(eligible, values, -np.inf)
+            cutoff = np.full(len(lengths), -np.inf)
+            for i in np.flatnonzero(lengths > self.size).tolist():
+                segment = candidates[bounds[i] : bounds[i + 1]]
+                cut = len(segment) - self.size
+                cutoff[i] = np.partition(segment, cut)[cut]
+            keep = np.flatnonzero(eligible & (candidates >= np.repeat(cutoff, lengths)))
+            ranked = keep[
+                np.lexsort(
+                    (
+                        name_rank[keep],
+                        -counts[keep, MATCHES],
+                        -values[keep],
+                        group[keep],
+                    )
+                )
+            ]
+            group_start = np.r_[True, group[ranked][1:] != group[ranked][:-1]]
+            position = np.arange(len(ranked))
+            first_of_group = np.maximum.accumulate(np.where(group_start, position, 0))
+            ranked = ranked[position - first_of_group < self.size]
+            for i in ranked.tolist():
+                key = (metric, int(season_of[i]), int(weight_of[i]))
+                self.boards.setdefault(key, []).append(
+                    Entry(
+                        int(person[i]),
+                        round(float(values[i]), 3),
+                        int(counts[i, MATCHES]),
+                        int(counts[i, WINS]),
+                    )
+                )
+
+    # Incremental maintenance
+
+    def apply(self, snapshot: MatchSnapshot) -> "LeaderboardBook":
+        """Fold newly ingested tournaments into the tally and boards"""
+        rated_before = set(self.tournaments)
+        done = np.array([t in rated_before for t in snapshot.tournaments], dtype=bool)
+        new = snapshot.take(~done[snapshot.tournament]) if done.any() else snapshot
+        person, season, weight, counts = _tally(new)
+        if not len(person):
+            return self
+        person = self._codes(new.persons, self._person_index, self.persons)[person]
+        weight = self._codes(
+            new.weight_classes, self._weight_index, self.weight_classes
+        )[weight]
+
+        rows_index, person_rows = self._indexes()
+        touched = set()
+        appended = []
+        for key, delta in zip(
+            zip(person.tolist(), season.tolist(), weight.tolist()), counts
+        ):
+            row = rows_index.get(key)
+            if row is None:
+                row = rows_index[key] = len(self.person) + len(appended)
+                person_rows.setdefault(key[0], []).append(row)
+                appended.append((key, delta))
+            else:
+                self.counts[row] += delta
+            touched.add(key)
+        if appended:
+            keys, deltas = zip(*appended)
+            p, s, w = (np.array(column) for column in zip(*keys))
+            self.person = np.concatenate([self.person, p.astype(np.int32)])
+            self.season = np.concatenate([self.season, s.astype(np.int16)])
+            self.weight = np.concatenate([self.weight, w.astype(np.int32)])
+            self.counts = np.concatenate([self.counts, np.array(deltas, np.int32)])
+
+        scopes = set()
+        for p, s, w in touched:
+            seasons = (ALL, s) if s != NO_SEASON else (ALL,)
+            for scope in ((a, b) for a in seasons for b in (ALL, w)):
+                scopes.add((scope, p))
+        stale = set()
+        for (scope_season, scope_weight), p in scopes:
+            rows = np.array(person_rows[p])
+            if scope_season != ALL:
+                rows = rows[self.season[rows] == scope_season]
+            if scope_weight != ALL:
+                rows = rows[self.weight[rows] == scope_weight]
+            totals = self.counts[rows].sum(axis=0).tolist()
+            for metric in METRIC_NAMES:
+                key = (metric, scope_season, scope_weight)
+                if self._offer(key, p, totals):
+                    stale.add(key)
+        for key in stale:
+            self._rerank(key)
+
+        self.tournaments.extend(new.tournaments[t] for t in np.unique(new.tournament))
+        return self
+
+    def _offer(self, key: BoardKey, person: int, totals: List[int]) -> bool:
+        """Place ``person`` on a board; True when the board must be re-ranked"""
+        board = self.boards.get(key, [])
+        members = self._members(key)
+        value = METRICS[key[0]].score(totals)
+        entry = None
+        if value is not None:
+            entry = Entry(person, value, totals[MATCHES], totals[WINS])
+        full = len(board) >= self.size
+        if person not in members:
+            # Common case: the wrestler is nowhere near this board
+            if entry is None or (
+                full and self._sort_key(entry) >= self._sort_key(board[-1])
+            ):
+                return False
+            previous = None
+        else:
+            previous = next(i for i, e in enumerate(board) if e.person == person)
+            before = board.pop(previous)
+            members.discard(person)
+
+        position = self.size
+        if entry is not None:
+            position = bisect.bisect(board, self._sort_key(entry), key=self._sort_key)
+            if position < self.size:
+                self.boards[key] = board
+                board.insert(position, entry)
+                members.add(person)
+                for dropped in board[self.size :]:
+                    members.discard(dropped.person)
+                del board[self.size :]
+        if not board:
+            self.boards.pop(key, None)
+        # A member of a full board that fell back, even if it kept its slot,
+        # may now rank below someone off the board
+        return (
+            full
+            and previous is not None
+            and (
+                position >= self.size or self._sort_key(entry) > self._sort_key(before)
+            )
+        )
+
+    def _members(self, key: BoardKey) -> set:
+        if self._member_sets is None:
+            self._member_sets = {}
+        members = self._member_sets.get(key)
+        if members is None:
+            members = {e.person for e in self.boards.get(key, [])}
+            self._member_sets[key] = members
+        return members
+
+    def _rerank(self, key: BoardKey) -> None:
+        metric, season, weight = key
+        self.boards.pop(key, None)
+        self._member_sets.pop(key, None)
+        rows = np.arange(len(self.person))
+        if season != ALL:
+            rows = rows[self.season == season]
+        if weight != ALL:
+            rows = rows[self.weight[rows] == weight]
+        self._rank_scopes(season != ALL, weight != ALL, [metric], rows)
+
+    def _sort_key(self, entry: Entry):
+        return (-entry.value, -entry.matches, self.persons[entry.person])
+
+    def _indexes(self):
+        if self._rows is None:
+            keys = zip(self.person.tolist(), self.season.tolist(), self.weight.tolist())
+            self._rows = {key: row for row, key in enumerate(keys)}
+            self._person_rows = {}
+            for row, p in enumerate(self.person.tolist()):
+                self._person_rows.setdefault(p, []).append(row)
+        return self._rows, self._person_rows
+
+    @staticmethod
+    def _codes(values: Sequence[str], index: Dict[str, int], known: List[str]):
+        codes = np.empty(len(values), dtype=np.int32)
+        for i, value in enumerate(values):
+            code = index.get(value)
+            if code is None:
+                code = index[value] = len(known)
+                known.append(value)
+            codes[i] = code
+        return codes
+
+    # Persistence
+
+    def save(self, path: str) -> None:
+        """Write the tally and boards, replacing ``path`` atomically"""
+        keys = list(self.boards)
+        entries = [e for key in keys for e in self.boards[key]]
+        lengths = [len(self.boards[key]) for key in keys]
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".npz")
+        with os.fdopen(fd, "wb") as fh:
+            np.savez(
+                fh,
+                size=np.asarray(self.size),
+                persons=np.asarray(self.persons, dtype=str),
+                weight_classes=np.asarray(self.weight_classes, dtype=str),
+                person=self.person,
+                season=self.season,
+                weight=self.weight,
+                counts=self.counts,
+                tournaments=np.asarray(self.tournaments, dtype=str),
+                board_metric=np.array(
+                    [METRIC_NAMES.index(k[0]) for k in keys], dtype=np.int8
+                ),
+                board_season=np.array([k[1] for k in keys], dtype=np.int16),
+                board_weight=np.array([k[2] for k in keys], dtype=np.int32),
+                board_length=np.array(lengths, dtype=np.int32),
+                entries=np.array(entries, dtype=np.float64).reshape(
+                    -1, len(Entry._fields)
+                ),
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "LeaderboardBook":
+        with np.load(path) as data:
+            book = cls(
+                size=int(data["size"]),
+                persons=data["persons"].tolist(),
+                weight_classes=data["weight_classes"].tolist(),
+                person=data["person"],
+                season=data["season"],
+                weight=data["weight"],
+                counts=data["counts"],
+                tournaments=data["tournaments"].tolist(),
+            )
+            ends = np.cumsum(data["board_length"])
+            entries = data["entries"].tolist()
+            for metric, season, weight, end, length in zip(
+                data["board_metric"].tolist(),
+                data["board_season"].tolist(),
+                data["board_weight"].tolist(),
+                ends.tolist(),
+                data["board_length"].tolist(),
+            ):
+                book.boards[(METRIC_NAMES[metric], season, weight)] = [
+                    Entry(int(p), v, int(m), int(w))
+                    for p, v, m, w in entries[end - length : end]
+                ]
+        return book
+
+
+def build_leaderboards(snapshot: MatchSnapshot, size: int) -> LeaderboardBook:
+    """Tally the full history and rank every scope"""
+    person, season, weight, counts = _tally(snapshot)
+    book = LeaderboardBook(
+        size=size,
+        persons=list(snapshot.persons),
+        weight_classes=list(snapshot.weight_classes),
+        person=person.astype(np.int32),
+        season=season.astype(np.int16),
+        weight=weight.astype(np.int32),
+        counts=counts,
+        tournaments=[snapshot.tournaments[t] for t in np.unique(snapshot.tournament)],
+    )
+    book.rebuild_boards()
+    return book
+
+
+def _tally(snapshot: MatchSnapshot):
+    """Counters per (person, season, weight class) over the snapshot's bouts"""
+    bout = (
+        (snapshot.person_a >= 0)
+        & (snapshot.person_b >= 0)
+        & (snapshot.winner >= 0)
+        & (snapshot.result != ResultType.BYE)
+    )
+    rows = np.flatnonzero(bout)
+    if not len(rows):
+        empty = np.empty(0, np.int64)
+        return empty, empty, empty, np.empty((0, len(COUNTERS)), np.int32)
+    a_won = snapshot.winner[rows] == 0
+    person = np.concatenate([snapshot.person_a[rows], snapshot.person_b[rows]])
+    won = np.concatenate([a_won, ~a_won])
+    result = np.tile(snapshot.result[rows], 2)
+    season = np.tile(snapshot.year[rows], 2).astype(np.int64)
+    weight = np.tile(snapshot.weight_class[rows], 2).astype(np.int64)
+
+    events = np.zeros((len(person), len(COUNTERS)), dtype=np.int32)
+    events[:, MATCHES] = 1
+    events[:, WINS] = won
+    events[:, FALLS] = won & (result == ResultType.FALL)
+    events[:, TECH_FALLS] = won & (result == ResultType.TECH_FALL)
+    events[:, MAJOR_DECISIONS] = won & (result == ResultType.MAJOR_DECISION)
+
+    seasons = int(season.max()) + 1
+    packed = (person.astype(np.int64) * seasons + season) * (
+        len(snapshot.weight_classes) + 1
+    ) + weight
+    order = np.argsort(packed, kind="stable")
+    packed = packed[order]
+    starts = np.flatnonzero(np.r_[True, packed[1:] != packed[:-1]])
+    first = order[starts]
+    counts = np.add.reduceat(events[order], starts, axis=0)
+    return person[first], season[first], weight[first], counts
+
+
+def _name_ranks(persons: Sequence[str]) -> np.ndarray:
+    ranks = np.empty(len(persons), dtype=np.int64)
+    ranks[np.argsort(np.asarray(persons, dtype=str), kind="stable")] = np.arange(
+        len(persons)
+    )
+    return ranks
+
+
+class LeaderboardStore:
+    """Process-wide access to the persisted leaderboards.
+
+    Reloaded when the file on disk changes, so boards updated by an ingest
+    run elsewhere are served without a restart.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._book: Optional[LeaderboardBook] = None
+        self._mtime: Optional[float] = None
+
+    def get(self) -> Optional[LeaderboardBook]:
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return None
+        if self._book is None or mtime != self._mtime:
+            self._book = LeaderboardBook.load(self.path)
+            self._mtime = mtime
+        return self._book
+
+    def save(self, book: LeaderboardBook) -> None:
+        book.save(self.path)
+        self._book = book
+        self._mtime = os.path.getmtime(self.path)
+
+
+leaderboard_store = LeaderboardStore(settings.leaderboards_path)
+
+
+async def rebuild_leaderboards(database: Database = db) -> LeaderboardBook:
+    """Rank the entire match history and persist the result"""
+    snapshot = await load_snapshot(database)
+    book = build_leaderboards(snapshot, settings.leaderboard_size)
+    leaderboard_store.save(book)
+    return book
+
+
+async def _main(args: argparse.Namespace) -> None:
+    try:
+        book = await rebuild_leaderboards()
+        print(f"✅ Built {len(book.boards)} leaderboards -> {leaderboard_store.path}")
+    finally:
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build wrestler leaderboards")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("rebuild", help="Rank the full match history")
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,325 @@
+"""
+Elo ratings over the full match history
+
+Matches are processed chronologically in batches of ``(tournament date,
+round_order)``. Within a batch each wrestler normally wrestles once, so all of
+the batch's rating updates are computed in one vectorized step; a batch that
+does contain the same wrestler twice is split into conflict-free passes.
+
+The rating change is scaled by how the bout was decided (a fall moves ratings
+more than a decision); forfeits, disqualifications, injury defaults and byes
+are not rated. Ratings are kept per person across seasons and weight classes.
+
+Usage (from the backend directory):
+    python -m app.analytics.ratings rebuild
+    python -m app.analytics.ratings update TOURNAMENT_ID [TOURNAMENT_ID ...]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..codes import ResultType
+from ..config import settings
+from ..database import Database, db
+from ..sections import invalidate_sections
+from .snapshot import MatchSnapshot, load_snapshot
+
+BASE_RATING = 1500.0
+K_FACTOR = 32.0
+SCALE = 400.0
+
+# Multiplier on the rating change by result type; 0 means "not rated"
+RESULT_WEIGHTS = np.zeros(max(ResultType) + 1, dtype=np.float64)
+RESULT_WEIGHTS[ResultType.UNKNOWN] = 1.0
+RESULT_WEIGHTS[ResultType.DECISION] = 1.0
+RESULT_WEIGHTS[ResultType.MAJOR_DECISION] = 1.25
+RESULT_WEIGHTS[ResultType.TECH_FALL] = 1.5
+RESULT_WEIGHTS[ResultType.FALL] = 1.75
+
+
+def expected_score(rating: np.ndarray, opponent: np.ndarray) -> np.ndarray:
+    """Probability that ``rating`` beats ``opponent``"""
+    return 1.0 / (1.0 + 10.0 ** ((opponent - rating) / SCALE))
+
+
+@dataclass
+class RatingBook:
+    """Current ratings plus the per-wrestler rating time series.
+
+    The series is stored as three parallel arrays with one entry per rated
+    bout per wrestler (person index, date, rating after the bout).
+    """
+
+    persons: List[str] = field(default_factory=list)
+    ratings: np.ndarray = field(default_factory=lambda: np.empty(0, np.float64))
+    peaks: np.ndarray = field(default_factory=lambda: np.empty(0, np.float64))
+    bouts: np.ndarray = field(default_factory=lambda: np.empty(0, np.int32))
+    history_person: np.ndarray = field(default_factory=lambda: np.empty(0, np.int32))
+    history_date: np.ndarray = field(
+        default_factory=lambda: np.empty(0, "datetime64[D]")
+    )
+    history_rating: np.ndarray = field(default_factory=lambda: np.empty(0, np.float32))
+    tournaments: List[str] = field(default_factory=list)
+    last_date: Optional[np.datetime64] = None
+
+    def __post_init__(self):
+        self._index: Dict[str, int] = {p: i for i, p in enumerate(self.persons)}
+        self._series_order: Optional[np.ndarray] = None
+
+    def index(self, person_id: str) -> Optional[int]:
+        return self._index.get(person_id)
+
+    def rating(self, person_id: str) -> Optional[float]:
+        i = self.index(person_id)
+        return None if i is None else round(float(self.ratings[i]), 1)
+
+    def peak(self, person_id: str) -> Optional[float]:
+        i = self.index(person_id)
+        return None if i is None else round(float(self.peaks[i]), 1)
+
+    def series(self, person_id: str) -> List[Tuple[date, float]]:
+        """Rating after each rated bout, oldest first"""
+        i = self.index(person_id)
+        if i is None:
+            return []
+        if self._series_order is None:
+            self._series_order = np.argsort(self.history_person, kind="stable")
+        order = self._series_order
+        sorted_people = self.history_person[order]
+        lo, hi = np.searchsorted(sorted_people, [i, i + 1])
+        rows = order[lo:hi]
+        return [
+            (d.item(), round(float(r), 1))
+            for d, r in zip(self.history_date[rows], self.history_rating[rows])
+        ]
+
+    def person_codes(self, persons: Sequence[str]) -> np.ndarray:
+        """Map snapshot person ids to book indexes, adding new wrestlers"""
+        codes = np.empty(len(persons), dtype=np.int32)
+        added = 0
+        for i, person_id in enumerate(persons):
+            code = self._index.get(person_id)
+            if code is None:
+                code = self._index[person_id] = len(self.persons)
+                self.persons.append(person_id)
+                added += 1
+            codes[i] = code
+        if added:
+            self.ratings = np.concatenate([self.ratings, np.full(added, BASE_RATING)])
+            self.peaks = np.concatenate([self.peaks, np.full(added, BASE_RATING)])
+            self.bouts = np.concatenate([self.bouts, np.zeros(added, np.int32)])
+        return codes
+
+    def save(self, path: str) -> None:
+        """Write the book compactly, replacing ``path`` atomically"""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".npz")
+        with os.fdopen(fd, "wb") as fh:
+            np.savez_compressed(
+                fh,
+                persons=np.asarray(self.persons, dtype=str),
+                ratings=self.ratings,
+                peaks=self.peaks,
+                bouts=self.bouts,
+                history_person=self.history_person,
+                history_date=self.history_date,
+                history_rating=self.history_rating,
+                tournaments=np.asarray(self.tournaments, dtype=str),
+                last_date=np.asarray(
+                    [] if self.last_date is None else [self.last_date],
+                    dtype="datetime64[D]",
+                ),
+            )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "RatingBook":
+        with np.load(path) as data:
+            last_date = data["last_date"]
+            return cls(
+                persons=data["persons"].tolist(),
+                ratings=data["ratings"],
+                peaks=data["peaks"],
+                bouts=data["bouts"],
+                history_person=data["history_person"],
+                history_date=data["history_date"],
+                history_rating=data["history_rating"],
+                tournaments=data["tournaments"].tolist(),
+                last_date=last_date[0] if len(last_date) else None,
+            )
+
+
+class EloEngine:
+    """Applies a match snapshot to a rating book"""
+
+    def __init__(self, k_factor: float = K_FACTOR, weights=RESULT_WEIGHTS):
+        self.k_factor = k_factor
+        self.weights = weights
+
+    def rebuild(self, snapshot: MatchSnapshot) -> RatingBook:
+        """Rate the full history from scratch"""
+        book = RatingBook()
+        self.apply(book, snapshot)
+        return book
+
+    def apply(self, book: RatingBook, snapshot: MatchSnapshot) -> RatingBook:
+        """Fold newly ingested tournaments into ``book``.
+
+        Tournaments already in the book are skipped. New tournaments must not
+        predate the latest one already rated; otherwise rebuild instead.
+        """
+        rated_before = set(book.tournaments)
+        done = np.array([t in rated_before for t in snapshot.tournaments], dtype=bool)
+        new = snapshot.take(~done[snapshot.tournament]) if done.any() else snapshot
+        if not len(new):
+            return book
+        first_date = new.tournament_date.min()
+        if book.last_date is not None and first_date < book.last_date:
+            raise ValueError(
+                "Tournament predates rated history; run a full rebuild instead"
+            )
+
+        codes = book.person_codes(new.persons)
+        person_a = np.where(new.person_a >= 0, codes[new.person_a], -1)
+        person_b = np.where(new.person_b >= 0, codes[new.person_b], -1)
+        weight = self.weights[new.result]
+        rated = (person_a >= 0) & (person_b >= 0) & (new.winner >= 0) & (weight > 0)
+
+        order = np.lexsort((new.round_order, new.tournament_date))
+        order = order[rated[order]]
+        batch_keys = np.stack(
+            [new.tournament_date[order].astype(np.int64), new.round_order[order]]
+        )
+        boundaries = np.flatnonzero(np.any(np.diff(batch_keys, axis=1), axis=0)) + 1
+
+        history = []
+        for batch in np.split(order, boundaries):
+            for rows in _conflict_free(batch, person_a, person_b):
+                history.append(self._rate(book, rows, new, person_a, person_b, weight))
+
+        if history:
+            people, dates, ratings = zip(*history)
+            book.history_person = np.concatenate([book.history_person, *people])
+            book.history_date = np.concatenate([book.history_date, *dates])
+            book.history_rating = np.concatenate([book.history_rating, *ratings])
+            book._series_order = None
+        book.tournaments.extend(
+            snapshot.tournaments[t] for t in np.unique(new.tournament)
+        )
+        book.last_date = new.tournament_date.max()
+        return book
+
+    def _rate(self, book, rows, snapshot, person_a, person_b, weight):
+        a, b = person_a[rows], person_b[rows]
+        ra, rb = book.ratings[a], book.ratings[b]
+        actual = (snapshot.winner[rows] == 0).astype(np.float64)
+        delta = self.k_factor * weight[rows] * (actual - expected_score(ra, rb))
+        book.ratings[a] = ra + delta
+        book.ratings[b] = rb - delta
+        book.peaks[a] = np.maximum(book.peaks[a], book.ratings[a])
+        book.peaks[b] = np.maximum(book.peaks[b], book.ratings[b])
+        book.bouts[a] += 1
+        book.bouts[b] += 1
+        dates = snapshot.tournament_date[rows]
+        return (
+            np.concatenate([a, b]),
+            np.concatenate([dates, dates]),
+            np.concatenate([book.ratings[a], book.ratings[b]]).astype(np.float32),
+        )
+
+
+def _conflict_free(batch: np.ndarray, person_a: np.ndarray, person_b: np.ndarray):
+    """Split a batch into passes in which every wrestler appears at most once"""
+    people = np.concatenate([person_a[batch], person_b[batch]])
+    if len(np.unique(people)) == len(people):
+        yield batch
+        return
+    level_of: Dict[int, int] = {}
+    levels = np.empty(len(batch), dtype=np.int32)
+    for i, row in enumerate(batch):
+        a, b = int(person_a[row]), int(person_b[row])
+        level = max(level_of.get(a, -1), level_of.get(b, -1)) + 1
+        level_of[a] = level_of[b] = levels[i] = level
+    for level in range(levels.max() + 1):
+        yield batch[levels == level]
+
+
+class RatingStore:
+    """Process-wide access to the persisted rating book.
+
+    The book is reloaded when the file on disk changes, so a rebuild or update
+    run from the command line is picked up by running API workers.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._book: Optional[RatingBook] = None
+        self._mtime: Optional[float] = None
+
+    def get(self) -> Optional[RatingBook]:
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return None
+        if self._book is None or mtime != self._mtime:
+            self._book = RatingBook.load(self.path)
+            self._mtime = mtime
+        return self._book
+
+    def save(self, book: RatingBook) -> None:
+        book.save(self.path)
+        self._book = book
+        self._mtime = os.path.getmtime(self.path)
+        # Cached profiles and stats carry the ratings they were built with
+        invalidate_sections()
+
+
+rating_store = RatingStore(settings.ratings_path)
+
+
+async def rebuild_ratings(database: Database = db) -> RatingBook:
+    """Rate the entire match history and persist the result"""
+    snapshot = await load_snapshot(database)
+    book = EloEngine().rebuild(snapshot)
+    rating_store.save(book)
+    return book
+
+
+async def update_ratings(
+    tournament_ids: Sequence[str], database: Database = db
+) -> RatingBook:
+    """Fold newly ingested tournaments into the persisted ratings"""
+    book = rating_store.get()
+    if book is None:
+        return await rebuild_ratings(database)
+    snapshot = await load_snapshot(database, tournament_ids)
+    EloEngine().apply(book, snapshot)
+    rating_store.save(book)
+    return book
+
+
+async def _main(args: argparse.Namespace) -> None:
+    try:
+        if args.command == "rebuild":
+            book = await rebuild_ratings()
+        else:
+            book = await update_ratings(args.tournament_ids)
+        print(f"✅ Rated {len(book.persons)} wrestlers -> {rating_store.path}")
+    finally:
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build wrestler Elo ratings")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("rebuild", help="Rate the full match history")
+    update = commands.add_parser("update", help="Add newly ingested tournaments")
+    update.add_argument("tournament_ids", nargs="+")
+    asyncio.run(_main(parser.parse_args()))
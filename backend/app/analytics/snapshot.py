@@ -0,0 +1,370 @@
+"""
+Columnar snapshot of match history
+
+Loads ``match`` + ``participant_match`` (with the participant, role and
+tournament columns analytics need) into NumPy arrays, one element per match.
+Text identifiers are dictionary-encoded into small integer codes; the lookup
+lists map codes back to ids. Each match has two sides, ``a`` and ``b``; a side
+is ``-1`` when the bout was a bye.
+"""
+import asyncio
+import inspect
+import time
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+)
+
+import numpy as np
+
+from ..codes import ResultType, result_type_code
+from ..config import settings
+from ..database import Database
+
+SNAPSHOT_QUERY = """
+SELECT
+    m.match_id,
+    m.tournament_id,
+    t.date AS tournament_date,
+    m.round,
+    m.round_order,
+    m.bracket_order,
+    m.result_type,
+    m.winner_id,
+    pm.participant_id,
+    pm.is_winner,
+    pm.score,
+    pm.next_match_id,
+    r.person_id,
+    part.school_id,
+    part.weight_class,
+    part.seed,
+    part.year
+FROM match m
+JOIN tournament t ON m.tournament_id = t.tournament_id
+JOIN participant_match pm ON m.match_id = pm.match_id
+JOIN participant part ON pm.participant_id = part.participant_id
+JOIN role r ON part.role_id = r.role_id
+{where}
+ORDER BY t.date, m.tournament_id, m.round_order, m.match_id, pm.participant_id
+"""
+
+NO_SEED = 0
+
+
+_DTYPES = {
+    "match_ids": object,
+    "tournament": np.int32,
+    "tournament_date": "datetime64[D]",
+    "round": np.int16,
+    "round_order": np.int16,
+    "bracket_order": np.int16,
+    "result": np.int8,
+    "weight_class": np.int16,
+    "year": np.int16,
+    "winner": np.int8,
+    "participant_a": np.int32,
+    "participant_b": np.int32,
+    "person_a": np.int32,
+    "person_b": np.int32,
+    "school_a": np.int32,
+    "school_b": np.int32,
+    "seed_a": np.int16,
+    "seed_b": np.int16,
+    "score_a": np.int16,
+    "score_b": np.int16,
+    "next_match_a": np.int32,
+    "next_match_b": np.int32,
+}
+
+ARRAY_COLUMNS = tuple(_DTYPES)
+LOOKUP_COLUMNS = (
+    "tournaments",
+    "rounds",
+    "weight_classes",
+    "participants",
+    "persons",
+    "schools",
+)
+
+# Which code columns index into which lookup list
+_CODED_COLUMNS = {
+    "tournaments": ("tournament",),
+    "rounds": ("round",),
+    "weight_classes": ("weight_class",),
+    "participants": ("participant_a", "participant_b"),
+    "persons": ("person_a", "person_b"),
+    "schools": ("school_a", "school_b"),
+}
+
+_SIDE_EMPTY = {
+    "participant": -1,
+    "person": -1,
+    "school": -1,
+    "seed": NO_SEED,
+    "score": -1,
+    "next_match": -1,
+}
+
+
+class _Encoder:
+    """Assigns consecutive integer codes to values in first-seen order"""
+
+    def __init__(self, values: Sequence[Any] = ()):
+        self.values: List[Any] = list(values)
+        self.codes: Dict[Any, int] = {v: i for i, v in enumerate(self.values)}
+
+    def __call__(self, value: Any) -> int:
+        if value is None:
+            return -1
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+@dataclass
+class MatchSnapshot:
+    """Match history as parallel NumPy columns"""
+
+    match_ids: np.ndarray  # object
+    tournament: np.ndarray  # int32 code
+    tournament_date: np.ndarray  # datetime64[D]
+    round: np.ndarray  # int16 code
+    round_order: np.ndarray  # int16
+    bracket_order: np.ndarray  # int16
+    result: np.ndarray  # int8 ResultType
+    weight_class: np.ndarray  # int16 code
+    year: np.ndarray  # int16
+    winner: np.ndarray  # int8: 0 = side a, 1 = side b, -1 = undecided
+    participant_a: np.ndarray  # int32 code
+    participant_b: np.ndarray
+    person_a: np.ndarray  # int32 code
+    person_b: np.ndarray
+    school_a: np.ndarray  # int32 code
+    school_b: np.ndarray
+    seed_a: np.ndarray  # int16, NO_SEED when unseeded
+    seed_b: np.ndarray
+    score_a: np.ndarray  # int16, -1 when missing
+    score_b: np.ndarray
+    next_match_a: np.ndarray  # int32 row index of the winner's next bout, -1
+    next_match_b: np.ndarray
+    tournaments: List[str]
+    rounds: List[str]
+    weight_classes: List[str]
+    participants: List[str]
+    persons: List[str]
+    schools: List[str]
+
+    def __len__(self) -> int:
+        return len(self.match_ids)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping[str, Any]]) -> "MatchSnapshot":
+        """Pivot one-row-per-participant query output into per-match columns.
+
+        ``rows`` must be grouped by match (the snapshot query orders them so).
+        """
+        tournaments, rounds, weights = _Encoder(), _Encoder(), _Encoder()
+        participants, persons, schools = _Encoder(), _Encoder(), _Encoder()
+        match_index: Dict[str, int] = {}
+        columns: Dict[str, list] = {name: [] for name in ARRAY_COLUMNS}
+        next_ids: List[List[Optional[str]]] = []
+
+        def side(row: Optional[Mapping[str, Any]], suffix: str) -> None:
+            if row is None:
+                for name, empty in _SIDE_EMPTY.items():
+                    columns[f"{name}_{suffix}"].append(empty)
+                next_ids[-1].append(None)
+                return
+            columns[f"participant_{suffix}"].append(participants(row["participant_id"]))
+            columns[f"person_{suffix}"].append(persons(row["person_id"]))
+            columns[f"school_{suffix}"].append(schools(row["school_id"]))
+            columns[f"seed_{suffix}"].append(row["seed"] or NO_SEED)
+            score = row["score"]
+            columns[f"score_{suffix}"].append(-1 if score is None else score)
+            columns[f"next_match_{suffix}"].append(-1)
+            next_ids[-1].append(row["next_match_id"])
+
+        for match_rows in _group_by_match(rows):
+            first = match_rows[0]
+            match_index[first["match_id"]] = len(columns["match_ids"])
+            columns["match_ids"].append(first["match_id"])
+            columns["tournament"].append(tournaments(first["tournament_id"]))
+            columns["tournament_date"].append(first["tournament_date"])
+            columns["round"].append(rounds(first["round"]))
+            columns["round_order"].append(first["round_order"] or 0)
+            columns["bracket_order"].append(first["bracket_order"] or 0)
+            columns["result"].append(result_type_code(first["result_type"]))
+            columns["weight_class"].append(weights(first["weight_class"]))
+            columns["year"].append(first["year"] or 0)
+            columns["winner"].append(_winner_side(match_rows))
+            next_ids.append([])
+            side(match_rows[0], "a")
+            side(match_rows[1] if len(match_rows) > 1 else None, "b")
+
+        for i, (next_a, next_b) in enumerate(next_ids):
+            columns["next_match_a"][i] = match_index.get(next_a, -1)
+            columns["next_match_b"][i] = match_index.get(next_b, -1)
+
+        arrays = {
+            name: np.asarray(values, dtype=_DTYPES[name])
+            for name, values in columns.items()
+        }
+        return cls(
+            **arrays,
+            tournaments=tournaments.values,
+            rounds=rounds.values,
+            weight_classes=weights.values,
+            participants=participants.values,
+            persons=persons.values,
+            schools=schools.values,
+        )
+
+    @classmethod
+    def empty(cls) -> "MatchSnapshot":
+        return cls.from_rows([])
+
+    def take(self, index: np.ndarray) -> "MatchSnapshot":
+        """Select matches by boolean mask or positions, keeping lookup lists.
+
+        ``next_match`` indexes are remapped; links leaving the selection become
+        ``-1``.
+        """
+        positions = np.flatnonzero(index) if index.dtype == bool else index
+        # One spare slot at the end so that -1 ("no next match") maps to -1
+        remap = np.full(len(self) + 1, -1, dtype=np.int32)
+        remap[positions] = np.arange(len(positions), dtype=np.int32)
+        arrays = {name: getattr(self, name)[positions] for name in ARRAY_COLUMNS}
+        arrays["next_match_a"] = remap[arrays["next_match_a"]]
+        arrays["next_match_b"] = remap[arrays["next_match_b"]]
+        lookups = {name: getattr(self, name) for name in LOOKUP_COLUMNS}
+        return MatchSnapshot(**arrays, **lookups)
+
+    def compact(self) -> "MatchSnapshot":
+        """Re-encode codes so lookup lists only hold values still referenced.
+
+        Useful before shipping a slice of a large snapshot to another process.
+        """
+        arrays = {name: getattr(self, name) for name in ARRAY_COLUMNS}
+        lookups = {}
+        for lookup, columns in _CODED_COLUMNS.items():
+            values = getattr(self, lookup)
+            used = np.unique(np.concatenate([arrays[c] for c in columns]))
+            used = used[used >= 0]
+            remap = np.full(len(values) + 1, -1, dtype=np.int32)
+            remap[used] = np.arange(len(used), dtype=np.int32)
+            for column in columns:
+                arrays[column] = remap[arrays[column]].astype(_DTYPES[column])
+            lookups[lookup] = [values[code] for code in used.tolist()]
+        return MatchSnapshot(**arrays, **lookups)
+
+    def for_tournament(self, tournament_id: str) -> "MatchSnapshot":
+        """Matches of one tournament (empty when the id is unknown)"""
+        if tournament_id not in self.tournaments:
+            return self.take(np.zeros(len(self), dtype=bool))
+        return self.take(self.tournament == self.tournaments.index(tournament_id))
+
+    def tournament_order(self) -> np.ndarray:
+        """Tournament codes in chronological order"""
+        codes, starts = np.unique(self.tournament, return_index=True)
+        return codes[np.argsort(self.tournament_date[starts], kind="stable")]
+
+
+def _group_by_match(rows: Iterable[Mapping[str, Any]]) -> Iterable[List[Mapping]]:
+    group: List[Mapping[str, Any]] = []
+    for row in rows:
+        if group and row["match_id"] != group[0]["match_id"]:
+            yield group
+            group = []
+        group.append(row)
+    if group:
+        yield group
+
+
+def _winner_side(match_rows: List[Mapping[str, Any]]) -> int:
+    for side, row in enumerate(match_rows[:2]):
+        if row["is_winner"] or row["participant_id"] == row["winner_id"]:
+            return side
+    if len(match_rows) == 1 and result_type_code(match_rows[0]["result_type"]) in (
+        ResultType.BYE,
+        ResultType.UNKNOWN,
+    ):
+        return 0
+    return -1
+
+
+async def load_snapshot(
+    db: Database, tournament_ids: Optional[Sequence[str]] = None
+) -> MatchSnapshot:
+    """Load the full match history, or only the given tournaments"""
+    if tournament_ids is None:
+        rows = await db.fetch_all(SNAPSHOT_QUERY.format(where=""))
+    else:
+        where = "WHERE m.tournament_id = ANY($1::text[])"
+        rows = await db.fetch_all(
+            SNAPSHOT_QUERY.format(where=where), list(tournament_ids)
+        )
+    return MatchSnapshot.from_rows(rows)
+
+
+class SnapshotCache:
+    """Keeps the full-history snapshot in memory, reloading it after ``ttl``.
+
+    Results derived from the snapshot are memoized alongside it and dropped
+    whenever the snapshot is reloaded or invalidated.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._snapshot: Optional[MatchSnapshot] = None
+        self._loaded_at = 0.0
+        self._derived: Dict[Hashable, Any] = {}
+        self._lock = asyncio.Lock()
+
+    def _fresh(self) -> bool:
+        return (
+            self._snapshot is not None and time.monotonic() - self._loaded_at < self.ttl
+        )
+
+    async def get(self, db: Database) -> MatchSnapshot:
+        if not self._fresh():
+            async with self._lock:
+                if not self._fresh():
+                    self._snapshot = await load_snapshot(db)
+                    self._loaded_at = time.monotonic()
+                    self._derived.clear()
+        return self._snapshot
+
+    async def derived(
+        self, db: Database, key: Hashable, compute: Callable[[MatchSnapshot], Any]
+    ) -> Any:
+        """Memoize ``compute(snapshot)`` under ``key`` for the current snapshot.
+
+        ``compute`` may be a coroutine function.
+        """
+        snapshot = await self.get(db)
+        if key not in self._derived:
+            value = compute(snapshot)
+            if inspect.isawaitable(value):
+                value = await value
+            if snapshot is self._snapshot:
+                self._derived[key] = value
+            return value
+        return self._derived[key]
+
+    def invalidate(self) -> None:
+        self._snapshot = None
+        self._derived.clear()
+
+
+snapshot_cache = SnapshotCache(settings.analytics_ttl_seconds)
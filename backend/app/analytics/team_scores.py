@@ -0,0 +1,282 @@
+"""
+NCAA team scoring
+
+Team standings for a tournament are built in one vectorized pass over its
+matches, using NCAA championship scoring:
+
+* advancement: 1 point per championship-bracket win, 0.5 per consolation win
+  (placement bouts and finals award placement points instead); a bye earns
+  advancement only if the wrestler wins the bout it advanced to, found
+  through ``next_match_id``;
+* bonus: 2 for a fall, forfeit, default or disqualification, 1.5 for a tech
+  fall, 1 for a major decision;
+* placement: 16-12-10-9-7-6-4-3 for 1st through 8th, from the finals and place
+  bouts. A weight class without place bouts falls back to its final: the
+  last championship-bracket bout with no ``next_match_id``.
+
+Standings are cached per tournament in memory and on disk. Ingest, which
+runs after new ``match`` rows are loaded, invalidates a tournament by
+replacing its file with an empty one; every lookup compares the file's
+identity with the one the memory copy was read under, so the invalidation
+reaches the API workers too. The full-history backfill scores tournaments in
+parallel across a process pool.
+
+Usage (from the backend directory):
+    python -m app.analytics.team_scores backfill [--workers N]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+import numpy as np
+import orjson
+
+from ..codes import ResultType
+from ..config import settings
+from ..database import Database, db
+from .brackets import PLACEMENT_POINTS, Bracket, classify_rounds
+from .snapshot import MatchSnapshot, load_snapshot
+
+BONUS_POINTS = np.zeros(max(ResultType) + 1, dtype=np.float64)
+BONUS_POINTS[ResultType.MAJOR_DECISION] = 1.0
+BONUS_POINTS[ResultType.TECH_FALL] = 1.5
+BONUS_POINTS[ResultType.FALL] = 2.0
+BONUS_POINTS[ResultType.FORFEIT] = 2.0
+BONUS_POINTS[ResultType.DISQUALIFICATION] = 2.0
+BONUS_POINTS[ResultType.INJURY_DEFAULT] = 2.0
+
+ADVANCEMENT_POINTS = np.array([1.0, 0.5, 0.0])  # indexed by Bracket
+
+_PLACE_POINTS = np.zeros(max(PLACEMENT_POINTS) + 2, dtype=np.float64)
+for _place, _points in PLACEMENT_POINTS.items():
+    _PLACE_POINTS[_place] = _points
+
+
+def score_tournament(snapshot: MatchSnapshot) -> Dict[str, Any]:
+    """Team standings for the matches of a single tournament"""
+    n_participants = len(snapshot.participants)
+    bracket, win_place = classify_rounds(snapshot.rounds)
+    kind = bracket[snapshot.round]
+    a_won = snapshot.winner == 0
+    winner = np.where(a_won, snapshot.participant_a, snapshot.participant_b)
+    loser = np.where(a_won, snapshot.participant_b, snapshot.participant_a)
+    bout = (
+        (snapshot.winner >= 0)
+        & (snapshot.participant_a >= 0)
+        & (snapshot.participant_b >= 0)
+        & (snapshot.result != ResultType.BYE)
+    )
+
+    advancement = np.zeros(n_participants)
+    bonus = np.zeros(n_participants)
+    np.add.at(advancement, winner[bout], ADVANCEMENT_POINTS[kind[bout]])
+    np.add.at(bonus, winner[bout], BONUS_POINTS[snapshot.result[bout]])
+
+    # Byes count as advancement when the wrestler wins the bout they advance to
+    bye = ~bout & (snapshot.participant_a >= 0) & (snapshot.participant_b < 0)
+    next_bout = snapshot.next_match_a[bye]
+    advanced = snapshot.participant_a[bye]
+    linked = next_bout >= 0
+    won_next = np.zeros(len(advanced), dtype=bool)
+    won_next[linked] = bout[next_bout[linked]] & (
+        winner[next_bout[linked]] == advanced[linked]
+    )
+    np.add.at(advancement, advanced[won_next], ADVANCEMENT_POINTS[kind[bye][won_next]])
+
+    place = np.zeros(n_participants, dtype=np.int16)
+    placement_bout = bout & (kind == Bracket.PLACEMENT)
+    for weight in np.unique(snapshot.weight_class):
+        in_weight = snapshot.weight_class == weight
+        rows = np.flatnonzero(placement_bout & in_weight)
+        if not len(rows):
+            rows = _final(snapshot, bout & in_weight & (kind == Bracket.CHAMPIONSHIP))
+            places = np.ones(len(rows), dtype=np.int16)
+        else:
+            places = win_place[snapshot.round[rows]].astype(np.int16)
+        place[winner[rows]] = places
+        place[loser[rows]] = places + 1
+    placement = _PLACE_POINTS[np.minimum(place, len(_PLACE_POINTS) - 1)]
+
+    return _standings(snapshot, advancement, bonus, placement, place)
+
+
+def _final(snapshot: MatchSnapshot, candidates: np.ndarray) -> np.ndarray:
+    """The last championship bout whose winner advances nowhere"""
+    rows = np.flatnonzero(
+        candidates & (snapshot.next_match_a < 0) & (snapshot.next_match_b < 0)
+    )
+    if not len(rows):
+        return rows
+    last = snapshot.round_order[rows].max()
+    rows = rows[snapshot.round_order[rows] == last]
+    return rows if len(rows) == 1 else rows[:0]
+
+
+def _standings(snapshot, advancement, bonus, placement, place) -> Dict[str, Any]:
+    n_participants = len(snapshot.participants)
+    school = np.full(n_participants, -1, dtype=np.int32)
+    person = np.full(n_participants, -1, dtype=np.int32)
+    weight = np.full(n_participants, -1, dtype=np.int32)
+    for side in ("a", "b"):
+        present = getattr(snapshot, f"participant_{side}") >= 0
+        codes = getattr(snapshot, f"participant_{side}")[present]
+        school[codes] = getattr(snapshot, f"school_{side}")[present]
+        person[codes] = getattr(snapshot, f"person_{side}")[present]
+        weight[codes] = snapshot.weight_class[present]
+
+    teams = np.flatnonzero(np.bincount(school[school >= 0], minlength=1))
+    n_schools = len(snapshot.schools)
+    has_school = school >= 0
+
+    def team_sum(points: np.ndarray) -> np.ndarray:
+        return np.bincount(
+            school[has_school], weights=points[has_school], minlength=n_schools
+        )
+
+    adv, bon, plc = team_sum(advancement), team_sum(bonus), team_sum(placement)
+    total = adv + bon + plc
+
+    placers: Dict[int, List[Dict[str, Any]]] = {}
+    for code in np.flatnonzero((place > 0) & (place <= max(PLACEMENT_POINTS))):
+        placers.setdefault(int(school[code]), []).append(
+            {
+                "person_id": snapshot.persons[person[code]],
+                "weight_class": snapshot.weight_classes[weight[code]],
+                "place": int(place[code]),
+            }
+        )
+
+    order = teams[np.lexsort((teams, -total[teams]))]
+    standings = []
+    for rank, code in enumerate(order.tolist(), start=1):
+        standings.append(
+            {
+                "rank": rank,
+                "school_id": snapshot.schools[code],
+                "points": round(float(total[code]), 1),
+                "advancement_points": round(float(adv[code]), 1),
+                "bonus_points": round(float(bon[code]), 1),
+                "placement_points": round(float(plc[code]), 1),
+                "placers": sorted(
+                    placers.get(code, []), key=lambda p: (p["place"], p["person_id"])
+                ),
+            }
+        )
+    return {
+        "tournament_id": snapshot.tournaments[0] if snapshot.tournaments else None,
+        "teams": standings,
+    }
+
+
+Version = Optional[Tuple[int, int, int]]
+
+
+class TeamScoreStore:
+    """Per-tournament standings cached in memory and as JSON files on disk.
+
+    An empty file marks invalidated standings. Files are always replaced,
+    never rewritten, so each write gets a new identity.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._memory: Dict[str, Tuple[Version, Dict[str, Any]]] = {}
+
+    def _path(self, tournament_id: str) -> str:
+        return os.path.join(self.directory, f"{quote(tournament_id, safe='')}.json")
+
+    def version(self, tournament_id: str) -> Version:
+        """Identity of the tournament's file, ``None`` when there is none"""
+        try:
+            stat = os.stat(self._path(tournament_id))
+        except OSError:
+            return None
+        return (stat.st_dev, stat.st_ino, stat.st_mtime_ns)
+
+    def get(self, tournament_id: str) -> Optional[Dict[str, Any]]:
+        version = self.version(tournament_id)
+        cached = self._memory.get(tournament_id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        self._memory.pop(tournament_id, None)
+        try:
+            with open(self._path(tournament_id), "rb") as fh:
+                data = fh.read()
+        except OSError:
+            return None
+        if not data:
+            return None
+        standings = orjson.loads(data)
+        self._memory[tournament_id] = (version, standings)
+        return standings
+
+    def _replace(self, tournament_id: str, data: bytes) -> Version:
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".json")
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, self._path(tournament_id))
+        return self.version(tournament_id)
+
+    def put(self, tournament_id: str, standings: Dict[str, Any]) -> None:
+        version = self._replace(tournament_id, orjson.dumps(standings))
+        self._memory[tournament_id] = (version, standings)
+
+    def invalidate(self, tournament_id: str) -> None:
+        self._memory.pop(tournament_id, None)
+        self._replace(tournament_id, b"")
+
+
+team_score_store = TeamScoreStore(settings.team_scores_dir)
+
+
+async def get_team_scores(
+    database: Database, tournament_id: str
+) -> Optional[Dict[str, Any]]:
+    """Cached standings, scoring the tournament's current matches on a miss"""
+    version = team_score_store.version(tournament_id)
+    standings = team_score_store.get(tournament_id)
+    if standings is None:
+        snapshot = await load_snapshot(database, [tournament_id])
+        if tournament_id not in snapshot.tournaments:
+            return None
+        standings = score_tournament(snapshot)
+        # Not cached if a write invalidated the tournament while it loaded
+        if team_score_store.version(tournament_id) == version:
+            team_score_store.put(tournament_id, standings)
+    return standings
+
+
+def backfill(snapshot: MatchSnapshot, workers: Optional[int] = None) -> int:
+    """Score every tournament in ``snapshot`` across a process pool"""
+    slices = (
+        snapshot.take(snapshot.tournament == code).compact()
+        for code in snapshot.tournament_order()
+    )
+    count = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for standings in pool.map(score_tournament, slices, chunksize=8):
+            team_score_store.put(standings["tournament_id"], standings)
+            count += 1
+    return count
+
+
+async def _main(args: argparse.Namespace) -> None:
+    try:
+        snapshot = await load_snapshot(db)
+    finally:
+        await db.disconnect()
+    count = backfill(snapshot, args.workers)
+    print(f"✅ Scored {count} tournaments -> {team_score_store.directory}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compute NCAA team scores")
+    commands = parser.add_subparsers(dest="command", required=True)
+    backfill_parser = commands.add_parser("backfill", help="Score every tournament")
+    backfill_parser.add_argument("--workers", type=int, default=None)
+    asyncio.run(_main(parser.parse_args()))
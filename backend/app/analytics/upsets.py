@@ -0,0 +1,155 @@
+"""
+Seed-vs-outcome upset analytics
+
+A bout has a favorite when the two wrestlers carry different seeds; unseeded
+wrestlers rank below every seeded one. An upset is a win by the worse-seeded
+wrestler. Rates are computed for the whole history at once with vectorized
+group-bys over the columnar match snapshot.
+"""
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ..codes import ResultType
+from .snapshot import NO_SEED, MatchSnapshot
+
+UNSEEDED = np.iinfo(np.int16).max
+
+GROUPINGS = ("seed", "round", "weight_class")
+
+
+class UpsetAnalytics:
+    """Upset rates by seed pairing, round and weight class"""
+
+    def __init__(self, snapshot: MatchSnapshot):
+        self.snapshot = snapshot
+        seed_a = np.where(snapshot.seed_a == NO_SEED, UNSEEDED, snapshot.seed_a)
+        seed_b = np.where(snapshot.seed_b == NO_SEED, UNSEEDED, snapshot.seed_b)
+        a_won = snapshot.winner == 0
+        winner_seed = np.where(a_won, seed_a, seed_b)
+        loser_seed = np.where(a_won, seed_b, seed_a)
+
+        self.contested = (
+            (snapshot.person_a >= 0)
+            & (snapshot.person_b >= 0)
+            & (snapshot.winner >= 0)
+            & (snapshot.result != ResultType.BYE)
+            & (seed_a != seed_b)
+        )
+        self.favorite = np.minimum(seed_a, seed_b)
+        self.underdog = np.maximum(seed_a, seed_b)
+        self.upset = winner_seed > loser_seed
+
+    def report(self, by: str, weight_class: Optional[str] = None) -> Dict[str, Any]:
+        """Upset rates grouped ``by`` one of ``GROUPINGS``"""
+        if by not in GROUPINGS:
+            raise ValueError(f"Unknown grouping {by!r}; expected one of {GROUPINGS}")
+        mask = self.contested.copy()
+        if weight_class is not None:
+            codes = self.snapshot.weight_classes
+            code = codes.index(weight_class) if weight_class in codes else -2
+            mask &= self.snapshot.weight_class == code
+        rows = np.flatnonzero(mask)
+        upsets = self.upset[rows]
+
+        groups = getattr(self, f"_by_{by}")(rows, upsets)
+        total, total_upsets = len(rows), int(upsets.sum())
+        return {
+            "by": by,
+            "weight_class": weight_class,
+            "matches": total,
+            "upsets": total_upsets,
+            "upset_rate": _rate(total_upsets, total),
+            "groups": groups,
+        }
+
+    def _by_seed(self, rows: np.ndarray, upsets: np.ndarray) -> List[Dict]:
+        keys = [self.favorite[rows], self.underdog[rows]]
+        return [
+            {
+                "favorite_seed": _seed(favorite),
+                "underdog_seed": _seed(underdog),
+                "matches": matches,
+                "upsets": upset_count,
+                "upset_rate": _rate(upset_count, matches),
+            }
+            for (favorite, underdog), matches, upset_count in _group(keys, upsets)
+        ]
+
+    def _by_round(self, rows: np.ndarray, upsets: np.ndarray) -> List[Dict]:
+        keys = [self.snapshot.round[rows]]
+        order = _first_round_order(self.snapshot)
+        groups = sorted(_group(keys, upsets), key=lambda g: (order[g[0][0]], g[0][0]))
+        return [
+            {
+                "round": self.snapshot.rounds[code],
+                "matches": matches,
+                "upsets": upset_count,
+                "upset_rate": _rate(upset_count, matches),
+            }
+            for (code,), matches, upset_count in groups
+        ]
+
+    def _by_weight_class(self, rows: np.ndarray, upsets: np.ndarray) -> List[Dict]:
+        keys = [self.snapshot.weight_class[rows]]
+        labels = self.snapshot.weight_classes
+        groups = sorted(
+            _group(keys, upsets), key=lambda g: _weight_key(labels[g[0][0]])
+        )
+        return [
+            {
+                "weight_class": labels[code],
+                "matches": matches,
+                "upsets": upset_count,
+                "upset_rate": _rate(upset_count, matches),
+            }
+            for (code,), matches, upset_count in groups
+        ]
+
+
+def _group(columns: List[np.ndarray], upsets: np.ndarray):
+    """``(key tuple, matches, upsets)`` for each distinct combination of columns.
+
+    The key columns are packed into one int64 so the group-by is a single 1-D
+    ``np.unique`` plus two ``np.bincount`` calls.
+    """
+    if not len(upsets):
+        return []
+    bases = [int(column.max()) + 1 for column in columns]
+    packed = np.zeros(len(upsets), dtype=np.int64)
+    for column, base in zip(columns, bases):
+        packed = packed * base + column
+    unique, inverse = np.unique(packed, return_inverse=True)
+    matches = np.bincount(inverse, minlength=len(unique))
+    upset_counts = np.bincount(inverse, weights=upsets, minlength=len(unique))
+
+    keys = []
+    for value in unique.tolist():
+        key = []
+        for base in reversed(bases):
+            value, part = divmod(value, base)
+            key.append(part)
+        keys.append(tuple(reversed(key)))
+    return [
+        (key, int(m), int(u))
+        for key, m, u in zip(keys, matches.tolist(), upset_counts.tolist())
+    ]
+
+
+def _first_round_order(snapshot: MatchSnapshot) -> np.ndarray:
+    """Smallest ``round_order`` seen for each round code"""
+    order = np.full(len(snapshot.rounds), np.iinfo(np.int16).max, dtype=np.int32)
+    np.minimum.at(order, snapshot.round, snapshot.round_order)
+    return order
+
+
+def _seed(value: int) -> Optional[int]:
+    return None if value == UNSEEDED else value
+
+
+def _rate(upsets: int, matches: int) -> float:
+    return round(upsets / matches * 100, 1) if matches else 0.0
+
+
+def _weight_key(label: str):
+    return (0, int(label), label) if label.isdigit() else (1, 0, label)
@@ -0,0 +1,356 @@
+"""
+Small-integer codes for free-text match attributes
+
+``participant.weight_class``, ``match.round`` and ``match.result_type`` are
+free text written by the importers. Each has a SMALLINT code column next to
+it (``weight_class_code``, ``round_code``, ``result_type_code``) backed by a
+lookup table, so sorts and group-bys compare integers and sort in the right
+order: weight classes by pounds, rounds in the order a bracket is wrestled.
+The mapping lives here and, as SQL functions, in the migration that installs
+triggers to fill the codes on every insert or update, whichever process
+writes the row; the two must agree. ``refresh_codes`` rewrites the codes with
+this mapping. Routers map codes back to labels, falling back to the stored
+text for a row without a code.
+
+Usage (from the backend directory):
+    python -m app.codes backfill
+"""
+import argparse
+import asyncio
+import re
+from enum import IntEnum
+from typing import Dict, Optional, Sequence
+
+from .database import Database, db
+
+
+class ResultType(IntEnum):
+    """How a bout was decided"""
+
+    UNKNOWN = 0
+    DECISION = 1
+    MAJOR_DECISION = 2
+    TECH_FALL = 3
+    FALL = 4
+    FORFEIT = 5
+    DISQUALIFICATION = 6
+    INJURY_DEFAULT = 7
+    BYE = 8
+
+    @property
+    def label(self) -> str:
+        return RESULT_TYPE_LABELS[self]
+
+
+RESULT_TYPE_LABELS = {
+    ResultType.UNKNOWN: "Unknown",
+    ResultType.DECISION: "Decision",
+    ResultType.MAJOR_DECISION: "Major Decision",
+    ResultType.TECH_FALL: "Tech Fall",
+    ResultType.FALL: "Fall",
+    ResultType.FORFEIT: "Forfeit",
+    ResultType.DISQUALIFICATION: "Disqualification",
+    ResultType.INJURY_DEFAULT: "Injury Default",
+    ResultType.BYE: "Bye",
+}
+
+_RESULT_TYPE_ALIASES = {
+    "dec": ResultType.DECISION,
+    "decision": ResultType.DECISION,
+    "sv": ResultType.DECISION,
+    "tb": ResultType.DECISION,
+    "md": ResultType.MAJOR_DECISION,
+    "major": ResultType.MAJOR_DECISION,
+    "major decision": ResultType.MAJOR_DECISION,
+    "tf": ResultType.TECH_FALL,
+    "tech": ResultType.TECH_FALL,
+    "tech fall": ResultType.TECH_FALL,
+    "technical fall": ResultType.TECH_FALL,
+    "f": ResultType.FALL,
+    "fall": ResultType.FALL,
+    "pin": ResultType.FALL,
+    "ff": ResultType.FORFEIT,
+    "fft": ResultType.FORFEIT,
+    "forfeit": ResultType.FORFEIT,
+    "med fft": ResultType.FORFEIT,
+    "medical forfeit": ResultType.FORFEIT,
+    "dq": ResultType.DISQUALIFICATION,
+    "disqualification": ResultType.DISQUALIFICATION,
+    "inj": ResultType.INJURY_DEFAULT,
+    "injury default": ResultType.INJURY_DEFAULT,
+    "bye": ResultType.BYE,
+}
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.replace("-", " ").replace(".", "").lower().split())
+
+
+def result_type_code(text: Optional[str]) -> ResultType:
+    """Map a stored ``result_type`` string to its code"""
+    if not text:
+        return ResultType.UNKNOWN
+    return _RESULT_TYPE_ALIASES.get(_normalize(text), ResultType.UNKNOWN)
+
+
+class Round(IntEnum):
+    """Bracket rounds, numbered in the order NCAA sessions wrestle them.
+
+    Brackets bigger than the NCAA's 33 add numbered championship rounds
+    before the quarterfinals and numbered consolation rounds after
+    ``CONS_ROUND_5``. Changing a code needs a migration that updates
+    ``round_lookup`` and the SQL mapping functions (see
+    ``src/migrations/versions/f2b7c4e9a613_attribute_code_triggers.py``).
+    """
+
+    UNKNOWN = 0
+    PIGTAIL = 1
+    CHAMP_ROUND_1 = 2
+    CHAMP_ROUND_2 = 3
+    CHAMP_ROUND_3 = 4
+    CHAMP_ROUND_4 = 5
+    CHAMP_ROUND_5 = 6
+    CONS_ROUND_1 = 7
+    QUARTERFINAL = 8
+    CONS_ROUND_2 = 9
+    CONS_ROUND_3 = 10
+    SEMIFINAL = 11
+    CONS_ROUND_4 = 12
+    CONS_ROUND_5 = 13
+    CONS_ROUND_6 = 14
+    CONS_ROUND_7 = 15
+    CONS_ROUND_8 = 16
+    CONS_ROUND_9 = 17
+    CONS_ROUND_10 = 18
+    CONS_QUARTERFINAL = 19
+    CONS_SEMIFINAL = 20
+    SEVENTH_PLACE = 21
+    FIFTH_PLACE = 22
+    THIRD_PLACE = 23
+    FINAL = 24
+
+    @property
+    def label(self) -> str:
+        return ROUND_LABELS[self]
+
+
+_CHAMP_ROUNDS = {k: Round[f"CHAMP_ROUND_{k}"] for k in range(1, 6)}
+_CONS_ROUNDS = {k: Round[f"CONS_ROUND_{k}"] for k in range(1, 11)}
+
+ROUND_LABELS = {
+    Round.UNKNOWN: "Unknown",
+    Round.PIGTAIL: "Pigtail",
+    **{code: f"Champ. Round {k}" for k, code in _CHAMP_ROUNDS.items()},
+    **{code: f"Cons. Round {k}" for k, code in _CONS_ROUNDS.items()},
+    Round.QUARTERFINAL: "Quarterfinal",
+    Round.SEMIFINAL: "Semifinal",
+    Round.CONS_QUARTERFINAL: "Cons. Quarters",
+    Round.CONS_SEMIFINAL: "Cons. Semis",
+    Round.SEVENTH_PLACE: "7th Place Match",
+    Round.FIFTH_PLACE: "5th Place Match",
+    Round.THIRD_PLACE: "3rd Place Match",
+    Round.FINAL: "1st Place Match",
+}
+
+_PLACE_ROUNDS = {
+    "1st": Round.FINAL,
+    "3rd": Round.THIRD_PLACE,
+    "5th": Round.FIFTH_PLACE,
+    "7th": Round.SEVENTH_PLACE,
+}
+
+
+def round_code(text: Optional[str]) -> Round:
+    """Map a stored ``round`` string ("Cons. Quarters", "R1", ...) to its code"""
+    if not text:
+        return Round.UNKNOWN
+    key = _normalize(text)
+    place = re.search(r"\b(1st|3rd|5th|7th)\b.*\bplace\b", key)
+    if place:
+        return _PLACE_ROUNDS[place.group(1)]
+    if re.search(r"\bfinals?\b|^championship$", key) and "semi" not in key:
+        return Round.FINAL
+    if re.search(r"\b(pigtail|prelim\w*)\b", key):
+        return Round.PIGTAIL
+    consolation = re.search(r"\bcons\w*\b", key) is not None
+    if "semi" in key:
+        return Round.CONS_SEMIFINAL if consolation else Round.SEMIFINAL
+    if "quarter" in key:
+        return Round.CONS_QUARTERFINAL if consolation else Round.QUARTERFINAL
+    number = re.search(r"\b(?:round |r)(\d{1,2})\b", key)
+    if number:
+        rounds = _CONS_ROUNDS if consolation else _CHAMP_ROUNDS
+        return rounds.get(int(number.group(1)), Round.UNKNOWN)
+    return Round.UNKNOWN
+
+
+# Unlimited heavyweight (before 1988) is coded with today's 285
+HEAVYWEIGHT = 285
+_HEAVYWEIGHT_ALIASES = {"hwt", "hvy", "heavyweight", "unl", "unlimited"}
+
+
+def weight_class_code(text: Optional[str]) -> Optional[int]:
+    """Pounds for a stored ``weight_class`` ("125", "125 lbs", "HWT")"""
+    if not text:
+        return None
+    key = _normalize(text)
+    if key in _HEAVYWEIGHT_ALIASES:
+        return HEAVYWEIGHT
+    pounds = re.match(r"(\d{2,3})\b", key)
+    return int(pounds.group(1)) if pounds else None
+
+
+def weight_class_label(
+    code: Optional[int], stored: Optional[str] = None
+) -> Optional[str]:
+    """Display label for a weight class; the stored text when it has no code"""
+    return stored if code is None else str(code)
+
+
+def round_label(code: Optional[int], stored: Optional[str] = None) -> str:
+    """Display label for a round; the stored text when it has no code"""
+    return _label(Round, code, stored)
+
+
+def result_type_label(code: Optional[int], stored: Optional[str] = None) -> str:
+    """Display label for a result type; the stored text when it has no code"""
+    return _label(ResultType, code, stored)
+
+
+def _label(codes, code: Optional[int], stored: Optional[str]) -> str:
+    try:
+        member = codes(code or 0)
+    except ValueError:  # a code from a newer migration
+        member = codes(0)
+    if member or not stored:
+        return member.label
+    return stored
+
+
+# Distinct stored labels, for everything or for the given tournaments
+_WEIGHT_CLASSES_QUERY = "SELECT DISTINCT weight_class AS label FROM participant"
+_TOURNAMENT_WEIGHT_CLASSES_QUERY = """
+SELECT DISTINCT part.weight_class AS label
+FROM match m
+JOIN participant_match pm ON pm.match_id = m.match_id
+JOIN participant part ON part.participant_id = pm.participant_id
+WHERE m.tournament_id = ANY($1::text[])
+"""
+_MATCH_LABELS_QUERY = "SELECT DISTINCT {column} AS label FROM match"
+_TOURNAMENT_MATCH_LABELS_QUERY = """
+SELECT DISTINCT {column} AS label FROM match WHERE tournament_id = ANY($1::text[])
+"""
+
+_UPDATE_PARTICIPANTS = """
+UPDATE participant part
+SET weight_class_code = v.code
+FROM unnest($1::text[], $2::smallint[]) AS v(label, code)
+WHERE part.weight_class = v.label
+  AND part.weight_class_code IS DISTINCT FROM v.code
+"""
+_TOURNAMENT_PARTICIPANTS = """
+  AND part.participant_id IN (
+    SELECT pm.participant_id
+    FROM participant_match pm
+    JOIN match m ON m.match_id = pm.match_id
+    WHERE m.tournament_id = ANY($3::text[])
+  )
+"""
+_UPDATE_MATCHES = """
+UPDATE match m
+SET {code_column} = v.code
+FROM unnest($1::text[], $2::smallint[]) AS v(label, code)
+WHERE m.{column} = v.label
+  AND m.{code_column} IS DISTINCT FROM v.code
+"""
+_TOURNAMENT_MATCHES = "  AND m.tournament_id = ANY($3::text[])\n"
+
+_INSERT_WEIGHT_CLASSES = """
+INSERT INTO weight_class_lookup (code, label)
+SELECT code, code::text FROM unnest($1::smallint[]) AS v(code)
+ON CONFLICT (code) DO NOTHING
+"""
+
+
+async def _labels(
+    database: Database, query: str, scoped: str, tournament_ids
+) -> Sequence[str]:
+    if tournament_ids is None:
+        rows = await database.fetch_all(query)
+    else:
+        rows = await database.fetch_all(scoped, list(tournament_ids))
+    return [row["label"] for row in rows if row["label"] is not None]
+
+
+async def _update(
+    database: Database,
+    query: str,
+    scope: str,
+    mapping: Dict[str, Optional[int]],
+    tournament_ids,
+) -> None:
+    args = [list(mapping), list(mapping.values())]
+    if tournament_ids is not None:
+        query += scope
+        args.append(list(tournament_ids))
+    await database.execute(query, *args)
+
+
+async def refresh_codes(
+    database: Database = db, tournament_ids: Optional[Sequence[str]] = None
+) -> Dict[str, int]:
+    """Write the code columns for everything, or the given tournaments' rows.
+
+    Returns how many distinct labels were mapped per column.
+    """
+    weights = {
+        label: weight_class_code(label)
+        for label in await _labels(
+            database,
+            _WEIGHT_CLASSES_QUERY,
+            _TOURNAMENT_WEIGHT_CLASSES_QUERY,
+            tournament_ids,
+        )
+    }
+    codes = sorted({code for code in weights.values() if code is not None})
+    await database.execute(_INSERT_WEIGHT_CLASSES, codes)
+    await _update(
+        database,
+        _UPDATE_PARTICIPANTS,
+        _TOURNAMENT_PARTICIPANTS,
+        weights,
+        tournament_ids,
+    )
+
+    mapped = {"weight_class": len(weights)}
+    for column, code_column, to_code in (
+        ("round", "round_code", round_code),
+        ("result_type", "result_type_code", result_type_code),
+    ):
+        labels = await _labels(
+            database,
+            _MATCH_LABELS_QUERY.format(column=column),
+            _TOURNAMENT_MATCH_LABELS_QUERY.format(column=column),
+            tournament_ids,
+        )
+        mapping = {label: int(to_code(label)) for label in labels}
+        query = _UPDATE_MATCHES.format(column=column, code_column=code_column)
+        await _update(database, query, _TOURNAMENT_MATCHES, mapping, tournament_ids)
+        mapped[column] = len(mapping)
+    return mapped
+
+
+async def _main(args: argparse.Namespace) -> None:
+    try:
+        mapped = await refresh_codes()
+        summary = ", ".join(f"{count} {column}" for column, count in mapped.items())
+        print(f"✅ Coded {summary} labels")
+    finally:
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Match attribute codes")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("backfill", help="Write every code column")
+    asyncio.run(_main(parser.parse_args()))
@@ -32,6 +32,65 @@ class Settings(BaseSettings):
     api_version: str = "1.0.0"
     api_description: str = "NCAA D1 Wrestling Championship data platform"
 
+    # Serialization: skip response-model re-validation for rows from our schema
+    trusted_output: bool = os.getenv("TRUSTED_OUTPUT", "true").lower() == "true"
+    # Comma-separated route names (e.g. search_wrestlers) that validate anyway
+    validated_routes: str = os.getenv("VALIDATED_ROUTES", "")
+
+    # Analytics: persisted wrestler ratings
+    ratings_path: str = os.getenv("RATINGS_PATH", "data/ratings.npz")
+    team_scores_dir: str = os.getenv("TEAM_SCORES_DIR", "data/team_scores")
+    # Analytics: precomputed leaderboards
+    leaderboards_path: str = os.getenv("LEADERBOARDS_PATH", "data/leaderboards.npz")
+    leaderboard_size: int = int(os.getenv("LEADERBOARD_SIZE", "100"))
+    # Minimum bouts to appear on percentage leaderboards
+    leaderboard_min_matches: int = int(os.getenv("LEADERBOARD_MIN_MATCHES", "20"))
+    # Bracket simulation worker processes (0 = one per CPU)
+    simulation_workers: int = int(os.getenv("SIMULATION_WORKERS", "0"))
+    # Seconds before the in-memory match-history snapshot is reloaded
+    analytics_ttl_seconds: int = int(os.getenv("ANALYTICS_TTL_SECONDS", "3600"))
+
+    # Cached wrestler profile sections (app/sections.py); 0 seconds disables
+    profile_cache_seconds: float = float(os.getenv("PROFILE_CACHE_SECONDS", "300"))
+    profile_cache_size: int = int(os.getenv("PROFILE_CACHE_SIZE", "10000"))
+    # Replaced by ingest in any process; workers drop their sections when it is
+    profile_cache_stamp_path: str = os.getenv(
+        "PROFILE_CACHE_STAMP_PATH", "data/profile_cache.stamp"
+    )
+
+    # Duplicate person review list written by app/analytics/dedupe.py
+    merge_candidates_path: str = os.getenv(
+        "MERGE_CANDIDATES_PATH", "data/merge_candidates.csv"
+    )
+    # Analytics: per-tournament Parquet bout facts for ad-hoc stats
+    facts_dir: str = os.getenv("FACTS_DIR", "data/facts")
+    # Memory-mapped snapshot of names, schools and tournaments shared by workers
+    dimensions_path: str = os.getenv("DIMENSIONS_PATH", "data/dimensions.snap")
+
+    # Router reads: "postgres", "embedded" (local snapshot only) or "fallback"
+    # (Postgres, with the snapshot while Postgres is unreachable)
+    database_backend: str = os.getenv("DATABASE_BACKEND", "postgres")
+    embedded_path: str = os.getenv("EMBEDDED_PATH", "data/snapshot.duckdb")
+    # Seconds before an unreachable Postgres is tried again in fallback mode
+    fallback_retry_seconds: float = float(os.getenv("FALLBACK_RETRY_SECONDS", "30"))
+
+    # Admission control (app/admission.py); 0 disables a check.
+    # Per-client token bucket: sustained requests per second and burst size.
+    # Off by default: behind a proxy, or for server-side rendered pages, every
+    # user arrives from the same address and would share one bucket
+    rate_limit_per_second: float = float(os.getenv("RATE_LIMIT_PER_SECOND", "0"))
+    rate_limit_burst: float = float(os.getenv("RATE_LIMIT_BURST", "40"))
+    # Key clients by X-Forwarded-For; only safe behind a proxy that sets it
+    rate_limit_trust_proxy: bool = (
+        os.getenv("RATE_LIMIT_TRUST_PROXY", "false").lower() == "true"
+    )
+    # Requests in flight, and how many may queue (and for how long) behind them
+    admission_concurrency: int = int(os.getenv("ADMISSION_CONCURRENCY", "40"))
+    admission_queue: int = int(os.getenv("ADMISSION_QUEUE", "100"))
+    admission_queue_timeout: float = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "2"))
+    # Shed new requests while more queries than this wait for a pool connection
+    admission_max_pool_waiters: int = int(os.getenv("ADMISSION_MAX_POOL_WAITERS", "20"))
+
     # CORS
     cors_origins: list = ["http://localhost:3000", "http://127.0.0.1:3000"]
 
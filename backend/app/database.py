@@ -1,16 +1,29 @@
 """
 Database connection utilities for Wrestling Data Hub
 """
-from typing import Any, Dict, List, Optional
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import asyncpg
 
 from .config import settings
+from .timing import record_query
+
+# Errors that mean Postgres cannot be reached, as opposed to a failing query.
+# Includes TimeoutError, an OSError subclass.
+UNAVAILABLE = (
+    OSError,
+    asyncpg.exceptions.CannotConnectNowError,
+    asyncpg.exceptions.ConnectionDoesNotExistError,
+)
 
 
 class Database:
     def __init__(self):
         self.pool = None
+        # Queries waiting for a pool connection, read by admission control
+        self.waiting = 0
 
     async def connect(self):
         """Create database connection pool"""
@@ -30,24 +43,41 @@ class Database:
         if self.pool:
             await self.pool.close()
 
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[asyncpg.Connection]:
+        """Pool connection, timing the wait for it and the time it is held"""
+        pool = await self.connect()
+        started = time.perf_counter()
+        self.waiting += 1
+        waiting = True
+        try:
+            async with pool.acquire() as connection:
+                self.waiting -= 1
+                waiting = False
+                acquired = time.perf_counter()
+                try:
+                    yield connection
+                finally:
+                    record_query(acquired - started, time.perf_counter() - acquired)
+        finally:
+            if waiting:
+                self.waiting -= 1
+
     async def fetch_all(self, query: str, *args) -> List[Dict[str, Any]]:
         """Execute query and return all rows"""
-        pool = await self.connect()
-        async with pool.acquire() as connection:
+        async with self.acquire() as connection:
             rows = await connection.fetch(query, *args)
             return [dict(row) for row in rows]
 
     async def fetch_one(self, query: str, *args) -> Optional[Dict[str, Any]]:
         """Execute query and return one row"""
-        pool = await self.connect()
-        async with pool.acquire() as connection:
+        async with self.acquire() as connection:
             row = await connection.fetchrow(query, *args)
             return dict(row) if row else None
 
     async def execute(self, query: str, *args) -> str:
         """Execute query and return status"""
-        pool = await self.connect()
-        async with pool.acquire() as connection:
+        async with self.acquire() as connection:
             return await connection.execute(query, *args)
 
 
@@ -57,4 +87,8 @@ db = Database()
 
 # Dependency for FastAPI
 async def get_db():
-    return db
+    if settings.database_backend == "postgres":
+        return db
+    from .embedded import serving_db
+
+    return serving_db()
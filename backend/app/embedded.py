@@ -0,0 +1,291 @@
+"""
+Embedded read-only database snapshot
+
+Historical seasons never change, so the ``app`` routers can serve reads from
+a local DuckDB file exported from Postgres. The file is opened read-only and
+paged in through DuckDB's buffer manager, which avoids a network round trip
+per query. DuckDB runs the routers' Postgres SQL unchanged: ``$1`` parameters,
+``ILIKE``, ``LATERAL``, ``::`` casts and ``= ANY($1::text[])`` all work.
+
+``DATABASE_BACKEND`` picks what ``get_db`` hands to the routers:
+
+* ``postgres`` (default): Supabase only;
+* ``embedded``: the snapshot only, with no Postgres connection at all;
+* ``fallback``: Postgres, switching to the snapshot while Postgres is
+  unreachable (see ``Database.available``).
+
+Each build writes a new versioned file and atomically repoints the
+``EMBEDDED_PATH`` symlink at it. Servers open the new file on their next
+query. DuckDB caches open databases by path, so a version needs its own
+name to be opened next to the one it replaces.
+
+Usage (from the backend directory):
+    python -m app.embedded build [--output data/snapshot.duckdb]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import duckdb
+
+from .config import settings
+from .database import UNAVAILABLE, Database, db
+from .timing import record_query
+
+# Postgres information_schema types -> DuckDB; anything else is kept as text,
+# which is also how asyncpg returns json and enum columns
+_TYPES = {
+    "text": "VARCHAR",
+    "character varying": "VARCHAR",
+    "character": "VARCHAR",
+    "smallint": "SMALLINT",
+    "integer": "INTEGER",
+    "bigint": "BIGINT",
+    "boolean": "BOOLEAN",
+    "real": "REAL",
+    "double precision": "DOUBLE",
+    "numeric": "DOUBLE",
+    "date": "DATE",
+    "timestamp without time zone": "TIMESTAMP",
+    # Stored as UTC; DuckDB needs pytz to return aware datetimes
+    "timestamp with time zone": "TIMESTAMP",
+    "uuid": "UUID",
+}
+
+TABLES_QUERY = """
+SELECT c.table_name, c.column_name, c.data_type
+FROM information_schema.columns c
+JOIN information_schema.tables t
+  ON t.table_schema = c.table_schema AND t.table_name = c.table_name
+WHERE c.table_schema = 'public'
+  AND t.table_type = 'BASE TABLE'
+  AND c.table_name <> 'alembic_version'
+ORDER BY c.table_name, c.ordinal_position
+"""
+
+PRIMARY_KEYS_QUERY = """
+SELECT k.table_name, k.column_name
+FROM information_schema.table_constraints c
+JOIN information_schema.key_column_usage k
+  ON k.constraint_schema = c.constraint_schema
+ AND k.constraint_name = c.constraint_name
+WHERE c.table_schema = 'public' AND c.constraint_type = 'PRIMARY KEY'
+ORDER BY k.table_name, k.ordinal_position
+"""
+
+
+class EmbeddedDatabase:
+    """``Database`` lookalike over a read-only DuckDB snapshot.
+
+    DuckDB calls block, so each query runs in a worker thread on its own
+    cursor.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.connection: Optional[duckdb.DuckDBPyConnection] = None
+        self._identity: Optional[Tuple[str, int, int]] = None
+
+    async def connect(self):
+        """Open the snapshot, or the new one if it has been rebuilt since.
+
+        A connection left behind by a rebuild is not closed here: closing it
+        would abort queries still running on it, so it closes once they drop
+        their reference.
+        """
+        target = os.path.realpath(self.path)
+        stat = os.stat(target)
+        identity = (target, stat.st_ino, stat.st_mtime_ns)
+        if self.connection is None or identity != self._identity:
+            if self._identity is not None and self._identity[0] == target:
+                # Replaced in place rather than relinked; DuckDB would hand
+                # back the cached instance for the same path
+                self.connection.close()
+            self.connection = duckdb.connect(target, read_only=True)
+            self._identity = identity
+        return self.connection
+
+    async def disconnect(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    async def _run(self, query: str, args, rows: Optional[int]):
+        connection = await self.connect()
+
+        def run():
+            cursor = connection.cursor()
+            try:
+                cursor.execute(query, list(args))
+                if cursor.description is None:
+                    return []
+                names = [column[0] for column in cursor.description]
+                fetched = cursor.fetchall() if rows is None else cursor.fetchmany(rows)
+                return [dict(zip(names, row)) for row in fetched]
+            finally:
+                cursor.close()
+
+        started = time.perf_counter()
+        try:
+            return await asyncio.to_thread(run)
+        finally:
+            record_query(0.0, time.perf_counter() - started)
+
+    async def fetch_all(self, query: str, *args) -> List[Dict[str, Any]]:
+        """Execute query and return all rows"""
+        return await self._run(query, args, None)
+
+    async def fetch_one(self, query: str, *args) -> Optional[Dict[str, Any]]:
+        """Execute query and return one row"""
+        rows = await self._run(query, args, 1)
+        return rows[0] if rows else None
+
+    async def execute(self, query: str, *args) -> str:
+        """Execute query; the snapshot is read-only, so writes raise"""
+        await self._run(query, args, None)
+        return "OK"
+
+
+class FallbackDatabase:
+    """Postgres, or the snapshot while Postgres is unreachable.
+
+    A query that cannot reach Postgres is answered from the snapshot, and
+    Postgres is only tried again after ``retry`` seconds.
+    """
+
+    def __init__(self, primary: Database, snapshot: EmbeddedDatabase, retry: float):
+        self.primary = primary
+        self.snapshot = snapshot
+        self.retry = retry
+        self.down_until = 0.0
+
+    @property
+    def degraded(self) -> bool:
+        return time.monotonic() < self.down_until
+
+    async def _call(self, method: str, query: str, args):
+        if not self.degraded:
+            try:
+                return await getattr(self.primary, method)(query, *args)
+            except UNAVAILABLE as e:
+                self.down_until = time.monotonic() + self.retry
+                print(f"⚠️ Postgres unavailable ({e}); serving the embedded snapshot")
+        return await getattr(self.snapshot, method)(query, *args)
+
+    async def fetch_all(self, query: str, *args) -> List[Dict[str, Any]]:
+        return await self._call("fetch_all", query, args)
+
+    async def fetch_one(self, query: str, *args) -> Optional[Dict[str, Any]]:
+        return await self._call("fetch_one", query, args)
+
+    async def execute(self, query: str, *args) -> str:
+        return await self._call("execute", query, args)
+
+
+embedded_db = EmbeddedDatabase(settings.embedded_path)
+fallback_db = FallbackDatabase(db, embedded_db, settings.fallback_retry_seconds)
+
+
+def serving_db():
+    """The database ``get_db`` hands to the routers for ``DATABASE_BACKEND``"""
+    if settings.database_backend == "embedded":
+        return embedded_db
+    if settings.database_backend == "fallback":
+        return fallback_db
+    return db
+
+
+def publish(version: str, path: str) -> None:
+    """Atomically point the ``path`` symlink at a snapshot ``version`` file"""
+    previous = os.path.realpath(path) if os.path.islink(path) else None
+    link = f"{version}.link"
+    os.symlink(os.path.basename(version), link)
+    os.replace(link, path)
+    # Servers still reading the previous version keep its inode alive
+    if previous is not None and previous != os.path.realpath(path):
+        os.remove(previous)
+
+
+async def build_snapshot(path: str, database: Database = db) -> Dict[str, int]:
+    """Export every public table to a new DuckDB file and link ``path`` to it.
+
+    Tables are copied as CSV through a scratch directory, since that is the
+    fastest route out of Postgres and into DuckDB. Every table is read on one
+    connection inside a single ``REPEATABLE READ`` read-only transaction, so
+    the snapshot is consistent across tables. Returns rows per table.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    version = f"{path}.{time.time_ns()}"
+    counts = {}
+    try:
+        async with database.acquire() as connection, connection.transaction(
+            isolation="repeatable_read", readonly=True
+        ):
+            columns: Dict[str, List[Tuple[str, str]]] = {}
+            for row in await connection.fetch(TABLES_QUERY):
+                column_type = _TYPES.get(row["data_type"], "VARCHAR")
+                columns.setdefault(row["table_name"], []).append(
+                    (row["column_name"], column_type)
+                )
+            keys: Dict[str, List[str]] = {}
+            for row in await connection.fetch(PRIMARY_KEYS_QUERY):
+                keys.setdefault(row["table_name"], []).append(row["column_name"])
+
+            snapshot = duckdb.connect(version)
+            with tempfile.TemporaryDirectory() as scratch:
+                for table, table_columns in columns.items():
+                    definitions = [f'"{name}" {kind}' for name, kind in table_columns]
+                    if table in keys:
+                        quoted = ", ".join(f'"{name}"' for name in keys[table])
+                        definitions.append(f"PRIMARY KEY ({quoted})")
+                    snapshot.execute(
+                        f'CREATE TABLE "{table}" ({", ".join(definitions)})'
+                    )
+
+                    csv = os.path.join(scratch, f"{table}.csv")
+                    await connection.copy_from_table(
+                        table,
+                        columns=[name for name, _ in table_columns],
+                        output=csv,
+                        format="csv",
+                        null="\\N",
+                    )
+                    snapshot.execute(
+                        f"COPY \"{table}\" FROM '{csv}' "
+                        "(FORMAT csv, HEADER false, NULLSTR '\\N')"
+                    )
+                    counts[table] = snapshot.execute(
+                        f'SELECT count(*) FROM "{table}"'
+                    ).fetchone()[0]
+        snapshot.execute("CHECKPOINT")
+        snapshot.close()
+    except BaseException:
+        for leftover in (version, f"{version}.wal"):
+            if os.path.exists(leftover):
+                os.remove(leftover)
+        raise
+
+    publish(version, path)
+    return counts
+
+
+async def _main(args: argparse.Namespace) -> None:
+    try:
+        counts = await build_snapshot(args.output)
+        print(f"✅ Exported {sum(counts.values())} rows -> {args.output}")
+        for table, count in counts.items():
+            print(f"   {table}: {count}")
+    finally:
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Embedded database snapshot")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Export Postgres to a DuckDB file")
+    build.add_argument("--output", default=settings.embedded_path)
+    asyncio.run(_main(parser.parse_args()))
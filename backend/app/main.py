@@ -6,15 +6,27 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from .admission import AdmissionMiddleware
+from .analytics.bracket_sim import shutdown_pool
 from .config import settings
 from .database import db
-from .routers import schools, search, tournaments, wrestlers
+from .embedded import embedded_db
+from .routers import analytics, leaderboards, schools, search, tournaments, wrestlers
+from .timing import ServerTimingMiddleware
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    if settings.database_url:
+    if settings.database_backend != "postgres":
+        try:
+            await embedded_db.connect()
+            print(f"🦆 Embedded snapshot opened: {embedded_db.path}")
+        except Exception as e:
+            print(f"⚠️ Failed to open embedded snapshot: {e}")
+    if settings.database_backend == "embedded":
+        print("📝 Serving reads from the embedded snapshot only")
+    elif settings.database_url:
         try:
             await db.connect()
             print("🚀 Application started with database connection")
@@ -25,9 +37,11 @@ async def lifespan(app: FastAPI):
         print("📝 No database URL configured, running without database")
     yield
     # Shutdown
+    shutdown_pool()
     if db.pool:
         await db.disconnect()
         print("🔌 Database connection closed")
+    await embedded_db.disconnect()
 
 
 app = FastAPI(
@@ -37,6 +51,8 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Admission control sits inside CORS so rejections still carry CORS headers
+app.add_middleware(AdmissionMiddleware)
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -44,13 +60,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing", "Retry-After"],
 )
+app.add_middleware(ServerTimingMiddleware)
 
 # Include routers
 app.include_router(wrestlers.router, prefix="/api/wrestlers", tags=["wrestlers"])
 app.include_router(schools.router, prefix="/api/schools", tags=["schools"])
 app.include_router(tournaments.router, prefix="/api/tournaments", tags=["tournaments"])
 app.include_router(search.router, prefix="/api", tags=["search"])
+app.include_router(analytics.router, prefix="/api/analytics", tags=["analytics"])
+app.include_router(
+    leaderboards.router, prefix="/api/leaderboards", tags=["leaderboards"]
+)
 
 
 @app.get("/")
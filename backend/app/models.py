@@ -3,7 +3,7 @@ Pydantic models for API request/response validation
 Aligned with Supabase schema using TEXT IDs
 """
 from datetime import date
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Union
 
 from pydantic import BaseModel
 
@@ -115,6 +115,7 @@ class WrestlerProfile(BaseModel):
     city_of_origin: Optional[str] = None
     state_of_origin: Optional[str] = None
     role_id: Optional[str] = None
+    rating: Optional[float] = None
 
 
 class WrestlerStats(BaseModel):
@@ -126,6 +127,20 @@ class WrestlerStats(BaseModel):
     tech_falls: int = 0
     major_decisions: int = 0
     win_percentage: float = 0.0
+    rating: Optional[float] = None
+    peak_rating: Optional[float] = None
+
+
+class RatingPoint(BaseModel):
+    date: date
+    rating: float
+
+
+class WrestlerRatingHistory(BaseModel):
+    person_id: str
+    rating: Optional[float] = None
+    peak_rating: Optional[float] = None
+    history: List[RatingPoint] = []
 
 
 class WrestlerMatch(BaseModel):
@@ -142,6 +157,14 @@ class WrestlerMatch(BaseModel):
     weight_class: Optional[str] = None
 
 
+class WrestlerFull(BaseModel):
+    """Everything the wrestler profile page shows, in one response"""
+
+    profile: WrestlerProfile
+    stats: WrestlerStats
+    matches: List[WrestlerMatch] = []
+
+
 class SchoolProfile(BaseModel):
     school_id: str
     name: str
@@ -190,3 +213,108 @@ class WrestlerSearchResult(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+# Analytics models
+class UpsetGroup(BaseModel):
+    favorite_seed: Optional[int] = None
+    underdog_seed: Optional[int] = None
+    round: Optional[str] = None
+    weight_class: Optional[str] = None
+    matches: int = 0
+    upsets: int = 0
+    upset_rate: float = 0.0
+
+
+class UpsetReport(BaseModel):
+    by: str
+    weight_class: Optional[str] = None
+    matches: int = 0
+    upsets: int = 0
+    upset_rate: float = 0.0
+    groups: List[UpsetGroup] = []
+
+
+class StatsGroup(BaseModel):
+    key: Dict[str, Optional[Union[int, str]]] = {}
+    bouts: int = 0
+    wins: int = 0
+    losses: int = 0
+    win_percentage: float = 0.0
+    falls: int = 0
+    tech_falls: int = 0
+    major_decisions: int = 0
+    bonus_rate: float = 0.0
+    wrestlers: int = 0
+
+
+class StatsReport(BaseModel):
+    group_by: List[str] = []
+    filters: Dict[str, Any] = {}
+    groups: List[StatsGroup] = []
+
+
+class Placer(BaseModel):
+    person_id: str
+    weight_class: str
+    place: int
+
+
+class TeamScore(BaseModel):
+    rank: int
+    school_id: str
+    school_name: Optional[str] = None
+    points: float = 0.0
+    advancement_points: float = 0.0
+    bonus_points: float = 0.0
+    placement_points: float = 0.0
+    placers: List[Placer] = []
+
+
+class TeamStandings(BaseModel):
+    tournament_id: str
+    teams: List[TeamScore] = []
+
+
+class WrestlerPrediction(BaseModel):
+    participant_id: str
+    person_id: str
+    school_id: Optional[str] = None
+    seed: Optional[int] = None
+    rating: float
+    champion_probability: float = 0.0
+    placement_probabilities: List[float] = []  # 1st through 8th
+    all_american_probability: float = 0.0
+    expected_points: float = 0.0
+
+
+class TeamProjection(BaseModel):
+    school_id: Optional[str] = None
+    expected_points: float = 0.0
+
+
+class BracketPrediction(BaseModel):
+    tournament_id: str
+    weight_class: str
+    simulations: int
+    wrestlers: List[WrestlerPrediction] = []
+    teams: List[TeamProjection] = []
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    person_id: str
+    value: float
+    matches: int
+    wins: int
+
+
+class Leaderboard(BaseModel):
+    metric: str
+    label: str
+    season: Optional[int] = None
+    weight_class: Optional[str] = None
+    total: int = 0
+    limit: int
+    offset: int
+    entries: List[LeaderboardEntry] = []
@@ -0,0 +1,205 @@
+"""
+Name normalization for wrestler search
+
+``person.search_name`` holds a precomputed, space-separated list of search
+tokens for each person:
+
+* the name folded to lowercase ASCII words ("José Muñoz-Díaz" ->
+  ``jose munoz diaz``);
+* the uppercase Double Metaphone keys of each word, plus those of its
+  nickname group (``Mike`` also gets the keys of ``Michael``).
+
+Folded words are lowercase and keys uppercase, so the two never collide.
+``/api/search/wrestlers?mode=phonetic`` matches query words against the
+tokens through a GIN index on ``string_to_array(search_name, ' ')``, so
+"Jon", "John" and "Jonathan", or "Mueller" and "Muller", find each other.
+
+Usage (from the backend directory):
+    python -m app.names backfill
+"""
+import argparse
+import asyncio
+import re
+import unicodedata
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+from metaphone import doublemetaphone
+
+from .database import Database, db
+
+# Letters NFKD does not decompose into an ASCII base letter
+_LETTERS = str.maketrans(
+    {"ß": "ss", "æ": "ae", "œ": "oe", "ø": "o", "ł": "l", "đ": "d", "þ": "th"}
+)
+# Generational suffixes carry no sound worth matching
+SUFFIXES = frozenset({"jr", "sr", "ii", "iii", "iv", "v"})
+
+NICKNAMES: Tuple[Tuple[str, ...], ...] = (
+    ("alexander", "alex", "alec", "xander"),
+    ("andrew", "andy", "drew"),
+    ("anthony", "tony"),
+    ("benjamin", "ben", "benny"),
+    ("cameron", "cam"),
+    ("charles", "charlie", "chuck"),
+    ("christopher", "chris", "topher"),
+    ("daniel", "dan", "danny"),
+    ("david", "dave", "davey"),
+    ("dominic", "dom"),
+    ("donald", "don", "donnie"),
+    ("edward", "ed", "eddie", "ted"),
+    ("frederick", "fred", "freddie"),
+    ("gabriel", "gabe"),
+    ("gregory", "greg"),
+    ("james", "jim", "jimmy", "jamie"),
+    ("jacob", "jake"),
+    ("jeffrey", "jeff", "geoffrey"),
+    ("john", "jon", "johnny", "jack"),
+    ("jonathan", "jon", "jonny", "johnny"),
+    ("joseph", "joe", "joey"),
+    ("joshua", "josh"),
+    ("kenneth", "ken", "kenny"),
+    ("lawrence", "larry"),
+    ("matthew", "matt", "matty"),
+    ("maximilian", "max"),
+    ("maxwell", "max"),
+    ("michael", "mike", "mikey", "mick"),
+    ("nathaniel", "nathan", "nate"),
+    ("nicholas", "nick", "nicky", "nico"),
+    ("patrick", "pat"),
+    ("peter", "pete"),
+    ("richard", "rich", "rick", "ricky"),
+    ("robert", "rob", "robbie", "bob", "bobby"),
+    ("ronald", "ron", "ronnie"),
+    ("samuel", "sam", "sammy"),
+    ("steven", "stephen", "steve", "stevie"),
+    ("theodore", "theo", "ted", "teddy"),
+    ("thomas", "tom", "tommy"),
+    ("timothy", "tim", "timmy"),
+    ("vincent", "vince", "vinny"),
+    ("william", "will", "bill", "billy", "willie", "liam"),
+    ("zachary", "zach", "zack", "zak"),
+)
+
+
+def _nickname_index() -> Dict[str, FrozenSet[str]]:
+    index: Dict[str, Set[str]] = {}
+    for group in NICKNAMES:
+        for name in group:
+            index.setdefault(name, set()).update(group)
+    return {name: frozenset(names) for name, names in index.items()}
+
+
+_RELATED = _nickname_index()
+
+
+def fold(text: Optional[str]) -> List[str]:
+    """Lowercase ASCII words: accents stripped, apostrophes dropped"""
+    if not text:
+        return []
+    text = unicodedata.normalize("NFKD", text.lower().translate(_LETTERS))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = re.sub(r"['’`]", "", text)
+    return re.findall(r"[a-z0-9]+", text)
+
+
+def phonetic_keys(word: str) -> List[str]:
+    """Double Metaphone keys of a folded word (primary first)"""
+    if word in SUFFIXES or not word.isalpha():
+        return []
+    return [key for key in doublemetaphone(word) if key]
+
+
+def word_keys(word: str) -> List[str]:
+    """Keys of a word and of every name in its nickname groups"""
+    keys = phonetic_keys(word)
+    for name in sorted(_RELATED.get(word, ())):
+        keys += phonetic_keys(name)
+    return keys
+
+
+def _unique(tokens: Sequence[str]) -> List[str]:
+    return list(dict.fromkeys(tokens))
+
+
+def search_name(first_name: Optional[str], last_name: Optional[str]) -> str:
+    """The ``person.search_name`` value for a name"""
+    words = fold(first_name) + fold(last_name)
+    keys = [key for word in words for key in word_keys(word)]
+    return " ".join(_unique(words + keys))
+
+
+class NameQuery:
+    """A search string split into what the phonetic search matches on.
+
+    ``terms`` holds, per query word, the tokens any of which must be in a
+    person's ``search_name``; ``exact`` and ``sounds`` rank the matches,
+    the words as typed above those only matching through a nickname.
+    """
+
+    def __init__(self, q: str):
+        words = [word for word in fold(q) if word not in SUFFIXES]
+        self.exact = _unique(words)
+        self.sounds = _unique([key for word in words for key in phonetic_keys(word)])
+        self.terms = [_unique([word] + word_keys(word)) for word in self.exact]
+
+
+PERSONS_QUERY = """
+SELECT p.person_id, p.first_name, p.last_name, p.search_name
+FROM person p
+"""
+
+TOURNAMENT_PERSONS_QUERY = """
+SELECT DISTINCT p.person_id, p.first_name, p.last_name, p.search_name
+FROM match m
+JOIN participant_match pm ON pm.match_id = m.match_id
+JOIN participant part ON part.participant_id = pm.participant_id
+JOIN role r ON r.role_id = part.role_id
+JOIN person p ON p.person_id = r.person_id
+WHERE m.tournament_id = ANY($1::text[])
+"""
+
+UPDATE_QUERY = """
+UPDATE person p
+SET search_name = v.search_name
+FROM unnest($1::text[], $2::text[]) AS v(person_id, search_name)
+WHERE p.person_id = v.person_id
+"""
+
+
+async def refresh_search_names(
+    database: Database = db, tournament_ids: Optional[Sequence[str]] = None
+) -> int:
+    """Recompute ``search_name`` for everyone, or the given tournaments' entrants.
+
+    Only rows whose value changes are written. Returns how many were.
+    """
+    if tournament_ids is None:
+        persons = await database.fetch_all(PERSONS_QUERY)
+    else:
+        persons = await database.fetch_all(
+            TOURNAMENT_PERSONS_QUERY, list(tournament_ids)
+        )
+    ids, values = [], []
+    for person in persons:
+        value = search_name(person["first_name"], person["last_name"])
+        if value != person["search_name"]:
+            ids.append(person["person_id"])
+            values.append(value)
+    if ids:
+        await database.execute(UPDATE_QUERY, ids, values)
+    return len(ids)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    try:
+        updated = await refresh_search_names()
+        print(f"✅ Updated search_name for {updated} people")
+    finally:
+        await db.disconnect()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Wrestler search names")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("backfill", help="Recompute person.search_name")
+    asyncio.run(_main(parser.parse_args()))
@@ -1,6 +1,6 @@
 """
 API routers for the Wrestling Data Hub
 """
-from . import schools, search, tournaments, wrestlers
+from . import analytics, leaderboards, schools, search, tournaments, wrestlers
 
-__all__ = ["wrestlers", "schools", "tournaments", "search"]
+__all__ = ["wrestlers", "schools", "tournaments", "search", "analytics", "leaderboards"]
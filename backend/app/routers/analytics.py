@@ -0,0 +1,72 @@
+"""
+Analytics API endpoints
+"""
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from ..analytics.facts import GROUPINGS, fact_store
+from ..analytics.snapshot import snapshot_cache
+from ..analytics.upsets import UpsetAnalytics
+from ..database import Database, get_db
+from ..models import StatsReport, UpsetReport
+
+router = APIRouter()
+
+
+@router.get("/upsets", response_model=UpsetReport)
+async def get_upsets(
+    by: str = Query(
+        "seed",
+        pattern="^(seed|round|weight_class)$",
+        description="Group by seed pairing, round or weight class",
+    ),
+    weight_class: Optional[str] = Query(None, description="Filter by weight class"),
+    db: Database = Depends(get_db),
+):
+    """Upset rates across all tournaments"""
+    analytics = await snapshot_cache.derived(db, "upsets", UpsetAnalytics)
+    return analytics.report(by, weight_class)
+
+
+@router.get("/stats", response_model=StatsReport)
+async def get_stats(
+    group_by: str = Query(
+        "weight_class",
+        description=f"Comma-separated groupings: {', '.join(GROUPINGS)}",
+    ),
+    weight_class: Optional[str] = Query(None, description="Filter by weight class"),
+    conference: Optional[str] = Query(None, description="Filter by conference"),
+    school_id: Optional[str] = Query(None, description="Filter by school"),
+    person_id: Optional[str] = Query(None, description="Filter by wrestler"),
+    tournament_id: Optional[str] = Query(None, description="Filter by tournament"),
+    round: Optional[str] = Query(None, description="Filter by round"),
+    year_from: Optional[int] = Query(None, description="First season"),
+    year_to: Optional[int] = Query(None, description="Last season"),
+    limit: int = Query(1000, ge=1, le=10000, description="Maximum groups"),
+):
+    """Bout statistics for any cut, from the columnar facts (not Postgres)"""
+    groupings = [g.strip() for g in group_by.split(",") if g.strip()]
+    filters = {
+        "weight_class": weight_class,
+        "conference": conference,
+        "school_id": school_id,
+        "person_id": person_id,
+        "tournament_id": tournament_id,
+        "round": round,
+    }
+    try:
+        groups = await asyncio.to_thread(
+            fact_store.stats, groupings, filters, year_from, year_to, limit
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if groups is None:
+        raise HTTPException(status_code=503, detail="Stats facts not built yet")
+    filters.update(year_from=year_from, year_to=year_to)
+    return {
+        "group_by": groupings,
+        "filters": {k: v for k, v in filters.items() if v is not None},
+        "groups": groups,
+    }
@@ -0,0 +1,48 @@
+"""
+Leaderboards API endpoints
+"""
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Path, Query
+
+from ..analytics.leaderboards import METRICS, leaderboard_store
+from ..models import Leaderboard
+
+router = APIRouter()
+
+
+@router.get("/{metric}", response_model=Leaderboard)
+async def get_leaderboard(
+    metric: str = Path(..., pattern=f"^({'|'.join(METRICS)})$"),
+    season: Optional[int] = Query(None, description="Season year"),
+    weight_class: Optional[str] = Query(None, description="Filter by weight class"),
+    limit: int = Query(25, ge=1, le=100, description="Maximum number of results"),
+    offset: int = Query(0, ge=0, description="Number of results to skip"),
+):
+    """Top wrestlers for a metric, served from the precomputed boards"""
+    book = leaderboard_store.get()
+    if book is None:
+        raise HTTPException(status_code=503, detail="Leaderboards not built yet")
+    entries = book.board(metric, season, weight_class) or []
+
+    return {
+        "metric": metric,
+        "label": METRICS[metric].label,
+        "season": season,
+        "weight_class": weight_class,
+        "total": len(entries),
+        "limit": limit,
+        "offset": offset,
+        "entries": [
+            {
+                "rank": rank,
+                "person_id": book.persons[entry.person],
+                "value": entry.value,
+                "matches": entry.matches,
+                "wins": entry.wins,
+            }
+            for rank, entry in enumerate(
+                entries[offset : offset + limit], start=offset + 1
+            )
+        ],
+    }
@@ -8,20 +8,41 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 
 from ..database import Database, get_db
 from ..models import School, SchoolStats, WrestlerProfile
+from ..serialization import (
+    Fields,
+    respond_many,
+    respond_one,
+    select_list,
+    sparse_fields,
+    trusted_output,
+)
 
 router = APIRouter()
 
 
+SCHOOL_COLUMNS = {
+    "school_id": "school_id",
+    "name": "name",
+    "location": "location",
+    "mascot": "mascot",
+    "school_type": "school_type",
+    "school_url": "school_url",
+}
+
+
 @router.get("/schools", response_model=List[School])
 async def get_schools(
     limit: int = Query(20, le=100, description="Maximum number of results"),
     offset: int = Query(0, ge=0, description="Number of results to skip"),
     name: Optional[str] = Query(None, description="Filter by school name"),
     state: Optional[str] = Query(None, description="Filter by state"),
+    fields: Fields = Depends(sparse_fields(School)),
+    trusted: bool = Depends(trusted_output),
     db: Database = Depends(get_db),
 ):
     """Get schools with optional filtering"""
-    query = "SELECT id, name, location, state FROM schools WHERE 1=1"
+    columns = select_list(SCHOOL_COLUMNS, fields)
+    query = f"SELECT {columns} FROM school WHERE 1=1"
     params = []
 
     if name:
@@ -29,26 +50,32 @@ async def get_schools(
         params.append(f"%{name}%")
 
     if state:
-        query += " AND state ILIKE $" + str(len(params) + 1)
-        params.append(f"%{state}%")
+        # location is "City, ST"; match the state after the last comma only
+        query += " AND location ILIKE '%, ' || $" + str(len(params) + 1)
+        params.append(state.strip())
 
     query += f" ORDER BY name LIMIT ${len(params) + 1} OFFSET ${len(params) + 2}"
     params.extend([limit, offset])
 
     rows = await db.fetch_all(query, *params)
-    return rows
+    return respond_many(School, rows, trusted, fields=fields)
 
 
 @router.get("/schools/{school_id}", response_model=School)
-async def get_school(school_id: UUID, db: Database = Depends(get_db)):
+async def get_school(
+    school_id: str,
+    fields: Fields = Depends(sparse_fields(School)),
+    db: Database = Depends(get_db),
+):
     """Get school by ID"""
-    query = "SELECT id, name, location, state FROM schools WHERE id = $1"
+    columns = select_list(SCHOOL_COLUMNS, fields)
+    query = f"SELECT {columns} FROM school WHERE school_id = $1"
 
     school = await db.fetch_one(query, school_id)
     if not school:
         raise HTTPException(status_code=404, detail="School not found")
 
-    return school
+    return respond_one(School, school, fields)
 
 
 @router.get("/schools/{school_id}/stats", response_model=SchoolStats)
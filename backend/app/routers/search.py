@@ -5,8 +5,19 @@ from typing import List
 
 from fastapi import APIRouter, Depends, Query
 
+from ..analytics.dimensions import dimension_store
 from ..database import Database, get_db
 from ..models import SearchResponse, SearchResult, WrestlerSearchResult
+from ..names import NameQuery
+from ..serialization import (
+    Fields,
+    project_many,
+    render,
+    respond_many,
+    select_list,
+    sparse_fields,
+    trusted_output,
+)
 
 router = APIRouter()
 
@@ -15,10 +26,24 @@ router = APIRouter()
 async def search_all(
     q: str = Query(..., min_length=2, description="Search query"),
     limit: int = Query(10, le=50, description="Maximum results per category"),
+    trusted: bool = Depends(trusted_output),
     db: Database = Depends(get_db),
 ):
     """Universal search across wrestlers, schools, and tournaments"""
+    dimensions = dimension_store.get()
+    if dimensions is not None:
+        # Served from the shared snapshot; lists a wrestler once, with their
+        # latest school
+        wrestlers = dimensions.wrestler_names(q, limit)
+        schools = dimensions.schools(q, limit)
+        tournaments = dimensions.tournaments(q, limit)
+    else:
+        wrestlers, schools, tournaments = await _search_all_queries(db, q, limit)
+    return _search_all_response(q, wrestlers, schools, tournaments, trusted)
 
+
+async def _search_all_queries(db: Database, q: str, limit: int):
+    """Wrestler, school and tournament matches straight from the database"""
     # Search wrestlers
     wrestler_query = """
     SELECT DISTINCT
@@ -37,15 +62,6 @@ async def search_all(
     """
 
     wrestlers = await db.fetch_all(wrestler_query, f"%{q}%", limit)
-    wrestler_results = [
-        SearchResult(
-            type="wrestler",
-            id=w["id"],
-            name=w["name"],
-            additional_info=w["additional_info"],
-        )
-        for w in wrestlers
-    ]
 
     # Search schools
     school_query = """
@@ -60,15 +76,6 @@ async def search_all(
     """
 
     schools = await db.fetch_all(school_query, f"%{q}%", limit)
-    school_results = [
-        SearchResult(
-            type="school",
-            id=s["id"],
-            name=s["name"],
-            additional_info=s["additional_info"],
-        )
-        for s in schools
-    ]
 
     # Search tournaments
     tournament_query = """
@@ -83,104 +90,200 @@ async def search_all(
     """
 
     tournaments = await db.fetch_all(tournament_query, f"%{q}%", limit)
-    tournament_results = [
-        SearchResult(
-            type="tournament",
-            id=t["id"],
-            name=t["name"],
-            additional_info=t["additional_info"],
-        )
-        for t in tournaments
-    ]
-
-    return SearchResponse(
-        query=q,
-        wrestlers=wrestler_results,
-        schools=school_results,
-        tournaments=tournament_results,
+    return wrestlers, schools, tournaments
+
+
+def _search_all_response(q: str, wrestlers, schools, tournaments, trusted: bool):
+    if not trusted:
+        return {
+            "query": q,
+            "wrestlers": [{**w, "type": "wrestler"} for w in wrestlers],
+            "schools": [{**s, "type": "school"} for s in schools],
+            "tournaments": [{**t, "type": "tournament"} for t in tournaments],
+        }
+
+    return render(
+        {
+            "query": q,
+            "wrestlers": project_many(SearchResult, wrestlers, type="wrestler"),
+            "schools": project_many(SearchResult, schools, type="school"),
+            "tournaments": project_many(SearchResult, tournaments, type="tournament"),
+        }
     )
 
 
+# Both wrestler searches select from ``p`` (a person) and ``latest`` (their
+# latest season)
+WRESTLER_RESULT_COLUMNS = {
+    "person_id": "p.person_id",
+    "first_name": "p.first_name",
+    "last_name": "p.last_name",
+    "last_school": "latest.last_school",
+    "last_year": "latest.last_year",
+    "last_weight_class": "latest.last_weight_class",
+}
+
+
 @router.get("/search/wrestlers", response_model=List[WrestlerSearchResult])
 async def search_wrestlers(
     q: str = Query(..., min_length=2, description="Search query"),
     limit: int = Query(25, le=50, description="Maximum results"),
+    mode: str = Query(
+        "contains",
+        pattern="^(contains|phonetic)$",
+        description="contains: substring match; phonetic: sound-alike names",
+    ),
+    fields: Fields = Depends(sparse_fields(WrestlerSearchResult)),
+    trusted: bool = Depends(trusted_output),
     db: Database = Depends(get_db),
 ):
     """Search wrestlers with disambiguation hints (last school, year, weight class)"""
+    if mode == "phonetic":
+        return await _search_wrestlers_phonetic(db, q, limit, fields, trusted)
+
+    dimensions = dimension_store.get()
+    if dimensions is not None:
+        wrestlers = dimensions.wrestlers(q, limit)
+        return respond_many(WrestlerSearchResult, wrestlers, trusted, fields=fields)
+
+    # Match names first, then look up each match's latest season; ranking every
+    # wrestler's history before filtering scanned all participants. The
+    # matches are materialized so the trigram indexes find them: left to
+    # itself the planner walks the whole name index waiting for the LIMIT.
     query = """
-    WITH wrestler_latest AS (
-      SELECT DISTINCT ON (p.person_id)
-        p.person_id,
-        p.first_name,
-        p.last_name,
+    WITH matches AS MATERIALIZED (
+      SELECT person_id, first_name, last_name
+      FROM person
+      WHERE (first_name || ' ' || last_name) ILIKE $1
+         OR first_name ILIKE $1
+         OR last_name ILIKE $1
+    )
+    SELECT
+      {columns}
+    FROM matches p
+    JOIN LATERAL (
+      SELECT
         s.name as last_school,
         part.year as last_year,
         part.weight_class as last_weight_class
-      FROM person p
-      JOIN role r ON p.person_id = r.person_id
+      FROM role r
       JOIN participant part ON r.role_id = part.role_id
       JOIN school s ON part.school_id = s.school_id
-      WHERE r.role_type = 'wrestler'
-      ORDER BY p.person_id, part.year DESC
-    )
-    SELECT
-      person_id,
-      first_name,
-      last_name,
-      last_school,
-      last_year,
-      last_weight_class
-    FROM wrestler_latest
-    WHERE (first_name || ' ' || last_name) ILIKE $1
-       OR COALESCE(first_name, '') ILIKE $1
-       OR COALESCE(last_name, '') ILIKE $1
-    ORDER BY last_name, first_name
+      WHERE r.person_id = p.person_id AND r.role_type = 'wrestler'
+      ORDER BY part.year DESC
+      LIMIT 1
+    ) latest ON true
+    ORDER BY p.last_name, p.first_name
     LIMIT $2
     """
 
-    wrestlers = await db.fetch_all(query, f"%{q}%", limit)
-    return [
-        WrestlerSearchResult(
-            person_id=w["person_id"],
-            first_name=w["first_name"],
-            last_name=w["last_name"],
-            last_school=w["last_school"],
-            last_year=w["last_year"],
-            last_weight_class=w["last_weight_class"],
-        )
-        for w in wrestlers
-    ]
+    columns = select_list(WRESTLER_RESULT_COLUMNS, fields)
+    wrestlers = await db.fetch_all(query.format(columns=columns), f"%{q}%", limit)
+    return respond_many(WrestlerSearchResult, wrestlers, trusted, fields=fields)
+
+
+# Candidates are ranked and cut to the limit before their latest season is
+# looked up, so common keys stay cheap. Each per-word overlap condition is
+# served by the GIN index on the search_name tokens.
+_PHONETIC_QUERY = """
+WITH matches AS (
+  SELECT
+    p.person_id,
+    p.first_name,
+    p.last_name,
+    (SELECT count(*) FROM unnest($2::text[]) AS w(word)
+      WHERE w.word = ANY(string_to_array(p.search_name, ' '))) * 2
+    + (SELECT count(*) FROM unnest($3::text[]) AS k(sound)
+      WHERE k.sound = ANY(string_to_array(p.search_name, ' '))) AS rank
+  FROM person p
+  WHERE {terms}
+    AND EXISTS (
+      SELECT 1
+      FROM role r
+      JOIN participant part ON r.role_id = part.role_id
+      JOIN school s ON part.school_id = s.school_id
+      WHERE r.person_id = p.person_id AND r.role_type = 'wrestler'
+    )
+  ORDER BY rank DESC, p.last_name, p.first_name
+  LIMIT $1
+)
+SELECT
+  {columns}
+FROM matches p
+JOIN LATERAL (
+  SELECT
+    s.name as last_school,
+    part.year as last_year,
+    part.weight_class as last_weight_class
+  FROM role r
+  JOIN participant part ON r.role_id = part.role_id
+  JOIN school s ON part.school_id = s.school_id
+  WHERE r.person_id = p.person_id AND r.role_type = 'wrestler'
+  ORDER BY part.year DESC
+  LIMIT 1
+) latest ON true
+ORDER BY p.rank DESC, p.last_name, p.first_name
+"""
+
+
+async def _search_wrestlers_phonetic(
+    db: Database, q: str, limit: int, fields: Fields, trusted: bool
+):
+    """Match query words against the precomputed ``person.search_name`` tokens"""
+    name = NameQuery(q)
+    if not name.terms:
+        return respond_many(WrestlerSearchResult, [], trusted, fields=fields)
+    terms = " AND ".join(
+        f"string_to_array(p.search_name, ' ') && ${i}::text[]"
+        for i in range(4, 4 + len(name.terms))
+    )
+    columns = select_list(WRESTLER_RESULT_COLUMNS, fields)
+    wrestlers = await db.fetch_all(
+        _PHONETIC_QUERY.format(terms=terms, columns=columns),
+        limit,
+        name.exact,
+        name.sounds,
+        *name.terms,
+    )
+    return respond_many(WrestlerSearchResult, wrestlers, trusted, fields=fields)
+
+
+SCHOOL_RESULT_COLUMNS = {
+    "type": "'school' AS type",
+    "id": "school_id AS id",
+    "name": "name",
+    "additional_info": "location AS additional_info",
+}
 
 
 @router.get("/search/schools", response_model=List[SearchResult])
 async def search_schools(
     q: str = Query(..., min_length=2, description="Search query"),
     limit: int = Query(20, le=100, description="Maximum results"),
+    fields: Fields = Depends(sparse_fields(SearchResult)),
+    trusted: bool = Depends(trusted_output),
     db: Database = Depends(get_db),
 ):
     """Search schools specifically"""
+    dimensions = dimension_store.get()
+    if dimensions is not None:
+        schools = dimensions.schools(q, limit)
+        return respond_many(
+            SearchResult, schools, trusted, fields=fields, type="school"
+        )
+
     query = """
     SELECT
-        school_id as id,
-        name,
-        location as additional_info
+        {columns}
     FROM school
     WHERE name ILIKE $1 OR location ILIKE $1
     ORDER BY name
     LIMIT $2
     """
 
-    schools = await db.fetch_all(query, f"%{q}%", limit)
-    return [
-        SearchResult(
-            type="school",
-            id=s["id"],
-            name=s["name"],
-            additional_info=s["additional_info"],
-        )
-        for s in schools
-    ]
+    columns = select_list(SCHOOL_RESULT_COLUMNS, fields)
+    schools = await db.fetch_all(query.format(columns=columns), f"%{q}%", limit)
+    return respond_many(SearchResult, schools, trusted, fields=fields, type="school")
 
 
 @router.get("/search/test-db", response_model=dict)
@@ -262,19 +365,24 @@ async def search_people_simple(
     db: Database = Depends(get_db),
 ):
     """Simple search in person table only (for testing during migration)"""
+    # search_name also holds uppercase phonetic keys, which a case-insensitive
+    # substring would match; mode=phonetic on /search/wrestlers searches it.
+    # Materialized for the trigram indexes, as in search_wrestlers.
     query = """
-    SELECT
-      person_id,
-      first_name,
-      last_name,
-      search_name,
-      city_of_origin,
-      state_of_origin
-    FROM person
-    WHERE (first_name || ' ' || last_name) ILIKE $1
-       OR COALESCE(search_name, '') ILIKE $1
-       OR COALESCE(first_name, '') ILIKE $1
-       OR COALESCE(last_name, '') ILIKE $1
+    WITH matches AS MATERIALIZED (
+      SELECT
+        person_id,
+        first_name,
+        last_name,
+        search_name,
+        city_of_origin,
+        state_of_origin
+      FROM person
+      WHERE (first_name || ' ' || last_name) ILIKE $1
+         OR first_name ILIKE $1
+         OR last_name ILIKE $1
+    )
+    SELECT * FROM matches
     ORDER BY last_name, first_name
     LIMIT $2
     """
@@ -2,26 +2,53 @@
 Tournaments API endpoints
 """
 from typing import List, Optional
-from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 
+from ..analytics.bracket_sim import predict_bracket
+from ..analytics.team_scores import get_team_scores
+from ..codes import (
+    result_type_label,
+    round_label,
+    weight_class_code,
+    weight_class_label,
+)
 from ..database import Database, get_db
-from ..models import Tournament
+from ..models import BracketPrediction, TeamStandings, Tournament
+from ..serialization import (
+    Fields,
+    respond_many,
+    respond_one,
+    select_list,
+    sparse_fields,
+    trusted_output,
+)
 
 router = APIRouter()
 
 
+TOURNAMENT_COLUMNS = {
+    "tournament_id": "tournament_id",
+    "name": "name",
+    "date": "date",
+    "year": "year",
+    "location": "location",
+}
+
+
 @router.get("/tournaments", response_model=List[Tournament])
 async def get_tournaments(
     limit: int = Query(20, le=100, description="Maximum number of results"),
     offset: int = Query(0, ge=0, description="Number of results to skip"),
     year: Optional[int] = Query(None, description="Filter by year"),
     name: Optional[str] = Query(None, description="Filter by tournament name"),
+    fields: Fields = Depends(sparse_fields(Tournament)),
+    trusted: bool = Depends(trusted_output),
     db: Database = Depends(get_db),
 ):
     """Get tournaments with optional filtering"""
-    query = "SELECT id, name, year, location, division FROM tournaments WHERE 1=1"
+    columns = select_list(TOURNAMENT_COLUMNS, fields)
+    query = f"SELECT {columns} FROM tournament WHERE 1=1"
     params = []
 
     if year:
@@ -33,69 +60,156 @@ async def get_tournaments(
         params.append(f"%{name}%")
 
     query += (
-        f" ORDER BY year DESC, name LIMIT ${len(params) + 1} OFFSET ${len(params) + 2}"
+        f" ORDER BY date DESC, name LIMIT ${len(params) + 1} OFFSET ${len(params) + 2}"
     )
     params.extend([limit, offset])
 
     rows = await db.fetch_all(query, *params)
-    return rows
+    return respond_many(Tournament, rows, trusted, fields=fields)
 
 
 @router.get("/tournaments/{tournament_id}", response_model=Tournament)
-async def get_tournament(tournament_id: UUID, db: Database = Depends(get_db)):
+async def get_tournament(
+    tournament_id: str,
+    fields: Fields = Depends(sparse_fields(Tournament)),
+    db: Database = Depends(get_db),
+):
     """Get tournament by ID"""
-    query = "SELECT id, name, year, location, division FROM tournaments WHERE id = $1"
+    columns = select_list(TOURNAMENT_COLUMNS, fields)
+    query = f"SELECT {columns} FROM tournament WHERE tournament_id = $1"
 
     tournament = await db.fetch_one(query, tournament_id)
     if not tournament:
         raise HTTPException(status_code=404, detail="Tournament not found")
 
-    return tournament
+    return respond_one(Tournament, tournament, fields)
+
+
+BRACKET_QUERY = """
+SELECT
+    m.match_id,
+    m.round_code,
+    m.round,
+    m.result_type_code,
+    m.result_type,
+    w.weight_class_code,
+    w.weight_class,
+    wp.first_name || ' ' || wp.last_name AS winner_name,
+    lp.first_name || ' ' || lp.last_name AS loser_name,
+    ws.name AS winner_school,
+    ls.name AS loser_school,
+    wpm.score AS winner_score,
+    lpm.score AS loser_score
+FROM match m
+JOIN participant_match wpm
+  ON wpm.match_id = m.match_id
+ AND (wpm.is_winner OR wpm.participant_id = m.winner_id)
+JOIN participant w ON w.participant_id = wpm.participant_id
+JOIN role wr ON wr.role_id = w.role_id
+JOIN person wp ON wp.person_id = wr.person_id
+LEFT JOIN school ws ON ws.school_id = w.school_id
+LEFT JOIN participant_match lpm
+  ON lpm.match_id = m.match_id AND lpm.participant_id <> wpm.participant_id
+LEFT JOIN participant l ON l.participant_id = lpm.participant_id
+LEFT JOIN role lr ON lr.role_id = l.role_id
+LEFT JOIN person lp ON lp.person_id = lr.person_id
+LEFT JOIN school ls ON ls.school_id = l.school_id
+WHERE m.tournament_id = $1
+"""
 
 
 @router.get("/tournaments/{tournament_id}/brackets")
 async def get_tournament_brackets(
-    tournament_id: UUID,
+    tournament_id: str,
     weight_class: Optional[str] = Query(None, description="Filter by weight class"),
     db: Database = Depends(get_db),
 ):
-    """Get tournament brackets (simplified structure for now)"""
-    query = """
-    SELECT
-        m.id,
-        m.round,
-        m.weight_class,
-        winner_p.first_name || ' ' || winner_p.last_name as winner_name,
-        loser_p.first_name || ' ' || loser_p.last_name as loser_name,
-        winner_s.name as winner_school,
-        loser_s.name as loser_school,
-        m.match_result,
-        m.score
-    FROM matches m
-    JOIN participants winner_pt ON m.winner_id = winner_pt.id
-    JOIN participants loser_pt ON m.loser_id = loser_pt.id
-    JOIN people winner_p ON winner_pt.person_id = winner_p.id
-    JOIN people loser_p ON loser_pt.person_id = loser_p.id
-    JOIN schools winner_s ON winner_pt.school_id = winner_s.id
-    JOIN schools loser_s ON loser_pt.school_id = loser_s.id
-    WHERE m.tournament_id = $1
-    """
+    """Get tournament brackets, weight classes by pounds and rounds in order"""
+    query = BRACKET_QUERY
     params = [tournament_id]
 
     if weight_class:
-        query += " AND m.weight_class = $2"
-        params.append(weight_class)
+        code = weight_class_code(weight_class)
+        if code is None:
+            raise HTTPException(status_code=400, detail="Unknown weight class")
+        query += " AND w.weight_class_code = $2"
+        params.append(code)
 
-    query += " ORDER BY m.weight_class, m.round"
+    # A round without a code (not one ``app.codes`` knows) sorts last
+    query += (
+        " ORDER BY w.weight_class_code, NULLIF(m.round_code, 0) NULLS LAST,"
+        " m.bracket_order"
+    )
 
     matches = await db.fetch_all(query, *params)
 
-    # Group by weight class
+    # Group by weight class; codes sort numerically, labels are for display
     brackets = {}
     for match in matches:
-        wc = match["weight_class"] or "Unknown"
-        if wc not in brackets:
-            brackets[wc] = []
-        brackets[wc].append(match)
+        wc = (
+            weight_class_label(match["weight_class_code"], match["weight_class"])
+            or "Unknown"
+        )
+        score = None
+        if match["winner_score"] is not None and match["loser_score"] is not None:
+            score = f"{match['winner_score']}-{match['loser_score']}"
+        brackets.setdefault(wc, []).append(
+            {
+                "match_id": match["match_id"],
+                "round": round_label(match["round_code"], match["round"]),
+                "weight_class": wc,
+                "winner_name": match["winner_name"],
+                "loser_name": match["loser_name"],
+                "winner_school": match["winner_school"],
+                "loser_school": match["loser_school"],
+                "match_result": result_type_label(
+                    match["result_type_code"], match["result_type"]
+                ),
+                "score": score,
+            }
+        )
 
     return {"tournament_id": tournament_id, "brackets": brackets}
+
+
+@router.get("/tournaments/{tournament_id}/team-scores", response_model=TeamStandings)
+async def get_tournament_team_scores(
+    tournament_id: str, db: Database = Depends(get_db)
+):
+    """Get NCAA team standings (advancement, bonus and placement points)"""
+    standings = await get_team_scores(db, tournament_id)
+    if standings is None:
+        raise HTTPException(status_code=404, detail="Tournament not found")
+
+    school_ids = [team["school_id"] for team in standings["teams"]]
+    names = await db.fetch_all(
+        "SELECT school_id, name FROM school WHERE school_id = ANY($1::text[])",
+        school_ids,
+    )
+    name_by_id = {row["school_id"]: row["name"] for row in names}
+
+    return {
+        "tournament_id": tournament_id,
+        "teams": [
+            {**team, "school_name": name_by_id.get(team["school_id"])}
+            for team in standings["teams"]
+        ],
+    }
+
+
+@router.get(
+    "/tournaments/{tournament_id}/predictions", response_model=BracketPrediction
+)
+async def get_bracket_prediction(
+    tournament_id: str,
+    weight_class: str = Query(..., description="Weight class to simulate"),
+    simulations: int = Query(
+        20000, ge=1000, le=200000, description="Number of simulated tournaments"
+    ),
+    db: Database = Depends(get_db),
+):
+    """Monte Carlo placement and team-point projections for a seeded bracket"""
+    prediction = await predict_bracket(db, tournament_id, weight_class, simulations)
+    if prediction is None:
+        raise HTTPException(status_code=404, detail="Bracket not found")
+    return prediction
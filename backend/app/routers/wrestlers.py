@@ -1,17 +1,72 @@
 """
 Wrestlers API endpoints
 """
-from typing import List, Optional
-from uuid import UUID
+import asyncio
+from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 
+from ..analytics.ratings import rating_store
+from ..codes import (
+    ResultType,
+    result_type_label,
+    round_label,
+    weight_class_code,
+    weight_class_label,
+)
 from ..database import Database, get_db
-from ..models import WrestlerMatch, WrestlerProfile, WrestlerStats
+from ..models import (
+    WrestlerFull,
+    WrestlerMatch,
+    WrestlerProfile,
+    WrestlerRatingHistory,
+    WrestlerStats,
+)
+from ..sections import matches_cache, profile_cache, stats_cache
+from ..serialization import (
+    Fields,
+    project,
+    project_many,
+    render,
+    respond_many,
+    respond_one,
+    select_list,
+    sparse_fields,
+    trusted_output,
+)
 
 router = APIRouter()
 
 
+WRESTLER_COLUMNS = {
+    "person_id": "p.person_id",
+    "first_name": "p.first_name",
+    "last_name": "p.last_name",
+    "search_name": "p.search_name",
+    "date_of_birth": "p.date_of_birth",
+    "city_of_origin": "p.city_of_origin",
+    "state_of_origin": "p.state_of_origin",
+    "role_id": "r.role_id",
+    # Looked up in the rating book
+    "rating": "p.person_id",
+}
+
+WRESTLERS_QUERY = """
+SELECT {columns}
+FROM person p
+JOIN role r ON r.person_id = p.person_id AND r.role_type = 'wrestler'
+WHERE 1=1
+"""
+
+
+def _add_ratings(rows, fields: Fields) -> None:
+    if fields is not None and "rating" not in fields:
+        return
+    book = rating_store.get()
+    for row in rows:
+        row["rating"] = book.rating(row["person_id"]) if book else None
+
+
 @router.get("/wrestlers", response_model=List[WrestlerProfile])
 async def get_wrestlers(
     limit: int = Query(20, le=100, description="Maximum number of results"),
@@ -19,21 +74,12 @@ async def get_wrestlers(
     name: Optional[str] = Query(None, description="Filter by wrestler name"),
     school: Optional[str] = Query(None, description="Filter by school name"),
     weight_class: Optional[str] = Query(None, description="Filter by weight class"),
+    fields: Fields = Depends(sparse_fields(WrestlerProfile)),
+    trusted: bool = Depends(trusted_output),
     db: Database = Depends(get_db),
 ):
     """Get wrestlers with optional filtering"""
-    query = """
-    SELECT DISTINCT
-        p.id,
-        p.first_name,
-        p.last_name,
-        s.name as school_name,
-        s.location as school_location
-    FROM people p
-    LEFT JOIN participants pt ON p.id = pt.person_id
-    LEFT JOIN schools s ON pt.school_id = s.id
-    WHERE 1=1
-    """
+    query = WRESTLERS_QUERY.format(columns=select_list(WRESTLER_COLUMNS, fields))
     params = []
 
     if name:
@@ -47,12 +93,26 @@ async def get_wrestlers(
         params.append(f"%{name}%")
 
     if school:
-        query += " AND s.name ILIKE $" + str(len(params) + 1)
+        query += (
+            " AND EXISTS (SELECT 1 FROM participant part"
+            " JOIN school s ON s.school_id = part.school_id"
+            " WHERE part.role_id = r.role_id AND s.name ILIKE $"
+            + str(len(params) + 1)
+            + ")"
+        )
         params.append(f"%{school}%")
 
     if weight_class:
-        query += " AND pt.weight_class = $" + str(len(params) + 1)
-        params.append(weight_class)
+        code = weight_class_code(weight_class)
+        if code is None:
+            raise HTTPException(status_code=400, detail="Unknown weight class")
+        query += (
+            " AND EXISTS (SELECT 1 FROM participant part"
+            " WHERE part.role_id = r.role_id AND part.weight_class_code = $"
+            + str(len(params) + 1)
+            + ")"
+        )
+        params.append(code)
 
     query += (
         f" ORDER BY p.last_name, p.first_name LIMIT ${len(params) + 1} "
@@ -61,63 +121,75 @@ async def get_wrestlers(
     params.extend([limit, offset])
 
     rows = await db.fetch_all(query, *params)
-    return rows
+    _add_ratings(rows, fields)
+    return respond_many(WrestlerProfile, rows, trusted, fields=fields)
+
+
+async def _load_profile(
+    db: Database, wrestler_id: str, fields: Fields = None
+) -> Optional[Dict[str, Any]]:
+    query = WRESTLERS_QUERY.format(columns=select_list(WRESTLER_COLUMNS, fields))
+    query += " AND p.person_id = $1 LIMIT 1"
+    wrestler = await db.fetch_one(query, wrestler_id)
+    if wrestler:
+        _add_ratings([wrestler], fields)
+    return wrestler
+
+
+async def _profile(db: Database, wrestler_id: str) -> Optional[Dict[str, Any]]:
+    """The cached profile section"""
+    return await profile_cache.get(wrestler_id, lambda: _load_profile(db, wrestler_id))
 
 
 @router.get("/wrestlers/{wrestler_id}", response_model=WrestlerProfile)
-async def get_wrestler(wrestler_id: UUID, db: Database = Depends(get_db)):
+async def get_wrestler(
+    wrestler_id: str,
+    fields: Fields = Depends(sparse_fields(WrestlerProfile)),
+    db: Database = Depends(get_db),
+):
     """Get wrestler by ID"""
-    query = """
-    SELECT
-        p.id,
-        p.first_name,
-        p.last_name,
-        s.name as school_name,
-        s.location as school_location
-    FROM people p
-    LEFT JOIN participants pt ON p.id = pt.person_id
-    LEFT JOIN schools s ON pt.school_id = s.id
-    WHERE p.id = $1
-    LIMIT 1
-    """
-
-    wrestler = await db.fetch_one(query, wrestler_id)
+    if fields is None:
+        wrestler = await _profile(db, wrestler_id)
+    else:
+        wrestler = await _load_profile(db, wrestler_id, fields)
     if not wrestler:
         raise HTTPException(status_code=404, detail="Wrestler not found")
 
-    return wrestler
+    return respond_one(WrestlerProfile, wrestler, fields)
 
 
-@router.get("/wrestlers/{wrestler_id}/stats", response_model=WrestlerStats)
-async def get_wrestler_stats(wrestler_id: UUID, db: Database = Depends(get_db)):
-    """Get wrestler statistics"""
-    query = """
-    WITH wrestler_matches AS (
-        SELECT
-            CASE
-                WHEN m.winner_id = pt.id THEN 'W'
-                WHEN m.loser_id = pt.id THEN 'L'
-            END as result,
-            m.match_result
-        FROM participants pt
-        LEFT JOIN matches m ON (pt.id = m.winner_id OR pt.id = m.loser_id)
-        WHERE pt.person_id = $1 AND m.id IS NOT NULL
-    )
+STATS_QUERY = """
+WITH bouts AS (
     SELECT
-        COUNT(*) as total_matches,
-        COUNT(CASE WHEN result = 'W' THEN 1 END) as wins,
-        COUNT(CASE WHEN result = 'L' THEN 1 END) as losses,
-        COUNT(CASE WHEN result = 'W' AND match_result = 'Fall' THEN 1 END) as pins,
-        COUNT(
-            CASE WHEN result = 'W' AND match_result = 'Tech Fall' THEN 1 END
-        ) as tech_falls,
-        COUNT(
-            CASE WHEN result = 'W' AND match_result = 'Major Decision' THEN 1 END
-        ) as major_decisions
-    FROM wrestler_matches
-    """
+        COALESCE(pm.is_winner, false)
+            OR pm.participant_id IS NOT DISTINCT FROM m.winner_id AS won,
+        m.result_type_code
+    FROM role r
+    JOIN participant part ON part.role_id = r.role_id
+    JOIN participant_match pm ON pm.participant_id = part.participant_id
+    JOIN match m ON m.match_id = pm.match_id
+    WHERE r.person_id = $1 AND m.result_type_code IS DISTINCT FROM $2
+)
+SELECT
+    count(*) AS total_matches,
+    count(*) FILTER (WHERE won) AS wins,
+    count(*) FILTER (WHERE NOT won) AS losses,
+    count(*) FILTER (WHERE won AND result_type_code = $3) AS pins,
+    count(*) FILTER (WHERE won AND result_type_code = $4) AS tech_falls,
+    count(*) FILTER (WHERE won AND result_type_code = $5) AS major_decisions
+FROM bouts
+"""
+
 
-    stats = await db.fetch_one(query, wrestler_id)
+async def _load_stats(db: Database, wrestler_id: str) -> Dict[str, Any]:
+    stats = await db.fetch_one(
+        STATS_QUERY,
+        wrestler_id,
+        ResultType.BYE,
+        ResultType.FALL,
+        ResultType.TECH_FALL,
+        ResultType.MAJOR_DECISION,
+    )
     if not stats:
         stats = {
             "total_matches": 0,
@@ -132,9 +204,10 @@ async def get_wrestler_stats(wrestler_id: UUID, db: Database = Depends(get_db)):
     total = stats["total_matches"] or 0
     wins = stats["wins"] or 0
     win_percentage = (wins / total * 100) if total > 0 else 0.0
+    book = rating_store.get()
 
     return {
-        "wrestler_id": wrestler_id,
+        "person_id": wrestler_id,
         "total_matches": total,
         "wins": wins,
         "losses": stats["losses"] or 0,
@@ -142,57 +215,162 @@ async def get_wrestler_stats(wrestler_id: UUID, db: Database = Depends(get_db)):
         "tech_falls": stats["tech_falls"] or 0,
         "major_decisions": stats["major_decisions"] or 0,
         "win_percentage": round(win_percentage, 1),
+        "rating": book.rating(wrestler_id) if book else None,
+        "peak_rating": book.peak(wrestler_id) if book else None,
+    }
+
+
+async def _stats(db: Database, wrestler_id: str) -> Dict[str, Any]:
+    """The cached stats section"""
+    return await stats_cache.get(wrestler_id, lambda: _load_stats(db, wrestler_id))
+
+
+@router.get("/wrestlers/{wrestler_id}/stats", response_model=WrestlerStats)
+async def get_wrestler_stats(wrestler_id: str, db: Database = Depends(get_db)):
+    """Get wrestler statistics (byes are not bouts)"""
+    return await _stats(db, wrestler_id)
+
+
+@router.get("/wrestlers/{wrestler_id}/ratings", response_model=WrestlerRatingHistory)
+async def get_wrestler_ratings(wrestler_id: str):
+    """Get wrestler's current, peak and historical Elo rating"""
+    book = rating_store.get()
+    if book is None or book.index(wrestler_id) is None:
+        raise HTTPException(status_code=404, detail="No rating for wrestler")
+
+    return {
+        "person_id": wrestler_id,
+        "rating": book.rating(wrestler_id),
+        "peak_rating": book.peak(wrestler_id),
+        "history": [
+            {"date": day, "rating": rating} for day, rating in book.series(wrestler_id)
+        ],
     }
 
 
+# Fields computed in Python map to the columns they are computed from
+MATCH_COLUMNS = {
+    "match_id": "m.match_id",
+    "opponent_first_name": "op.first_name AS opponent_first_name",
+    "opponent_last_name": "op.last_name AS opponent_last_name",
+    "opponent_school": "os.name AS opponent_school",
+    "result": (
+        "COALESCE(pm.is_winner, false)"
+        " OR pm.participant_id IS NOT DISTINCT FROM m.winner_id AS won"
+    ),
+    "decision": "m.result_type_code, m.result_type",
+    "score": "pm.score, opm.score AS opponent_score",
+    "tournament_name": "t.name AS tournament_name",
+    "round": "m.round_code, m.round",
+    "year": "t.year",
+    "weight_class": "part.weight_class_code, part.weight_class",
+}
+
+MATCHES_QUERY = """
+SELECT
+    {columns}
+FROM role r
+JOIN participant part ON part.role_id = r.role_id
+JOIN participant_match pm ON pm.participant_id = part.participant_id
+JOIN match m ON m.match_id = pm.match_id
+JOIN tournament t ON t.tournament_id = m.tournament_id
+JOIN participant_match opm
+  ON opm.match_id = m.match_id AND opm.participant_id <> pm.participant_id
+JOIN participant opart ON opart.participant_id = opm.participant_id
+JOIN role opr ON opr.role_id = opart.role_id
+JOIN person op ON op.person_id = opr.person_id
+LEFT JOIN school os ON os.school_id = opart.school_id
+WHERE r.person_id = $1
+ORDER BY t.date, NULLIF(m.round_code, 0) NULLS LAST, m.bracket_order
+LIMIT $2
+"""
+
+
+async def _load_matches(
+    db: Database, wrestler_id: str, limit: int, fields: Fields = None
+) -> List[Dict[str, Any]]:
+    query = MATCHES_QUERY.format(columns=select_list(MATCH_COLUMNS, fields))
+    rows = await db.fetch_all(query, wrestler_id, limit)
+    matches = []
+    for row in rows:
+        score = None
+        if row.get("score") is not None and row.get("opponent_score") is not None:
+            score = f"{row['score']}-{row['opponent_score']}"
+        matches.append(
+            {
+                "match_id": row.get("match_id"),
+                "opponent_first_name": row.get("opponent_first_name"),
+                "opponent_last_name": row.get("opponent_last_name"),
+                "opponent_school": row.get("opponent_school"),
+                "result": "W" if row.get("won") else "L",
+                "decision": result_type_label(
+                    row.get("result_type_code"), row.get("result_type")
+                ),
+                "score": score,
+                "tournament_name": row.get("tournament_name"),
+                "round": round_label(row.get("round_code"), row.get("round")),
+                "year": row.get("year"),
+                "weight_class": weight_class_label(
+                    row.get("weight_class_code"), row.get("weight_class")
+                ),
+            }
+        )
+    return matches
+
+
+async def _matches(db: Database, wrestler_id: str, limit: int) -> List[Dict[str, Any]]:
+    """The cached match history section"""
+    return await matches_cache.get(
+        (wrestler_id, limit), lambda: _load_matches(db, wrestler_id, limit)
+    )
+
+
 @router.get("/wrestlers/{wrestler_id}/matches", response_model=List[WrestlerMatch])
 async def get_wrestler_matches(
-    wrestler_id: UUID,
+    wrestler_id: str,
     limit: int = Query(100, le=500, description="Maximum number of matches"),
+    fields: Fields = Depends(sparse_fields(WrestlerMatch)),
+    trusted: bool = Depends(trusted_output),
     db: Database = Depends(get_db),
 ):
-    """Get wrestler's match history"""
-    query = """
-    SELECT
-        m.id,
-        CASE
-            WHEN m.winner_id = pt.id THEN op_p.first_name
-            ELSE winner_p.first_name
-        END as opponent_first_name,
-        CASE
-            WHEN m.winner_id = pt.id THEN op_p.last_name
-            ELSE winner_p.last_name
-        END as opponent_last_name,
-        CASE
-            WHEN m.winner_id = pt.id THEN op_s.name
-            ELSE winner_s.name
-        END as opponent_school,
-        CASE
-            WHEN m.winner_id = pt.id THEN 'W'
-            ELSE 'L'
-        END as result,
-        m.match_result as decision,
-        m.score,
-        t.name as tournament_name,
-        m.round,
-        t.year,
-        m.weight_class
-    FROM participants pt
-    JOIN matches m ON (pt.id = m.winner_id OR pt.id = m.loser_id)
-    JOIN tournaments t ON m.tournament_id = t.id
-    LEFT JOIN participants winner_pt ON m.winner_id = winner_pt.id
-    LEFT JOIN participants loser_pt ON m.loser_id = loser_pt.id
-    LEFT JOIN people winner_p ON winner_pt.person_id = winner_p.id
-    LEFT JOIN people op_p ON loser_pt.person_id = op_p.id
-    LEFT JOIN schools winner_s ON winner_pt.school_id = winner_s.id
-    LEFT JOIN schools op_s ON loser_pt.school_id = op_s.id
-    WHERE pt.person_id = $1
-    ORDER BY t.year ASC, m.round
-    LIMIT $2
+    """Get wrestler's match history, in the order the bouts were wrestled"""
+    if fields is None:
+        matches = await _matches(db, wrestler_id, limit)
+    else:
+        matches = await _load_matches(db, wrestler_id, limit, fields)
+    return respond_many(WrestlerMatch, matches, trusted, fields=fields)
+
+
+# Mounted under /api/wrestlers, so the path is /api/wrestlers/{id}/full
+@router.get("/{wrestler_id}/full", response_model=WrestlerFull)
+async def get_wrestler_full(
+    wrestler_id: str,
+    limit: int = Query(100, le=500, description="Maximum number of matches"),
+    trusted: bool = Depends(trusted_output),
+    db: Database = Depends(get_db),
+):
+    """Profile, stats and match history for the profile page in one response.
+
+    The profile is loaded first so an unknown id costs one query; stats and
+    matches then load concurrently, each on its own pool connection. All
+    three come from the same caches as the single-section routes.
     """
+    profile = await _profile(db, wrestler_id)
+    if not profile:
+        raise HTTPException(status_code=404, detail="Wrestler not found")
+    stats, matches = await asyncio.gather(
+        _stats(db, wrestler_id), _matches(db, wrestler_id, limit)
+    )
 
-    matches = await db.fetch_all(query, wrestler_id, limit)
-    return matches
+    if not trusted:
+        return {"profile": profile, "stats": stats, "matches": matches}
+    return render(
+        {
+            "profile": project(WrestlerProfile, profile),
+            "stats": project(WrestlerStats, stats),
+            "matches": project_many(WrestlerMatch, matches),
+        }
+    )
 
 
 @router.get("/profile-simple/{person_id}")
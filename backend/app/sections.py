@@ -0,0 +1,89 @@
+"""
+In-memory caches for the sections of a wrestler's profile
+
+``/api/wrestlers/{id}/full`` assembles the profile page from the same
+sections the profile, stats and matches routes serve on their own. Each
+section has its own cache, so every route reuses what the others computed
+and one section can expire or be dropped without the rest. Entries live for
+``PROFILE_CACHE_SECONDS`` (0 disables caching); the least recently used are
+evicted past ``PROFILE_CACHE_SIZE`` per section.
+
+Ingest runs in its own process, so clearing its caches would not reach the
+API workers. ``invalidate_sections`` also replaces a stamp file
+(``PROFILE_CACHE_STAMP_PATH``), and every lookup compares the file's identity
+with the one its entries were cached under, as ``DimensionStore`` does for
+the dimensions snapshot.
+"""
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable, Optional, Tuple
+
+from .config import settings
+
+
+class SectionCache:
+    """Results of one section's loader, keyed by its arguments.
+
+    The TTL and size limit are read from settings on every lookup.
+    """
+
+    def __init__(self):
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._stamp = _stamp()
+
+    async def get(self, key: Hashable, load: Callable[[], Awaitable[Any]]) -> Any:
+        """The cached value for ``key``, loading it when missing or expired.
+
+        ``None`` (nothing found) is not cached. Callers share the cached
+        value and must not modify it.
+        """
+        ttl = settings.profile_cache_seconds
+        stamp = _stamp()
+        if stamp != self._stamp:
+            self._entries.clear()
+            self._stamp = stamp
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            self._entries.move_to_end(key)
+            return entry[1]
+        value = await load()
+        # Not cached if the data changed while it loaded
+        if value is not None and ttl > 0 and stamp == self._stamp:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > settings.profile_cache_size:
+                self._entries.popitem(last=False)
+        return value
+
+    def invalidate(self) -> None:
+        self._entries.clear()
+
+
+def _stamp() -> Optional[Tuple[int, int, int]]:
+    try:
+        stat = os.stat(settings.profile_cache_stamp_path)
+    except OSError:
+        return None
+    return (stat.st_dev, stat.st_ino, stat.st_mtime_ns)
+
+
+profile_cache = SectionCache()
+stats_cache = SectionCache()
+matches_cache = SectionCache()
+
+SECTION_CACHES = (profile_cache, stats_cache, matches_cache)
+
+
+def invalidate_sections() -> None:
+    """Drop every cached section in every process, e.g. after new results"""
+    for cache in SECTION_CACHES:
+        cache.invalidate()
+    # A new file (new inode) each time, so a change is seen even within the
+    # file system's timestamp resolution
+    path = settings.profile_cache_stamp_path
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temporary = f"{path}.{os.getpid()}"
+    with open(temporary, "w") as fh:
+        fh.write(f"{time.time()}\n")
+    os.replace(temporary, path)
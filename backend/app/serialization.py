@@ -0,0 +1,179 @@
+"""
+Trusted-output serialization for rows read from our own schema
+
+Rows returned by our queries already match the response models, so validating
+them once when building the model and again against ``response_model`` is pure
+overhead. In trusted mode each row is projected onto the model's fields using a
+cached per-model field plan (no validation, no model instances) and dumped
+straight to JSON bytes; the route returns a ready ``Response`` that FastAPI
+passes through untouched. With trusted output off, routes return the plain
+rows and FastAPI validates them against ``response_model`` as usual.
+
+``TRUSTED_OUTPUT`` sets the mode for every route; routes named in
+``VALIDATED_ROUTES`` keep validating. Routes resolve their mode with the
+``trusted_output`` dependency and pass it to ``respond_many``.
+
+A ``fields=a,b`` query parameter (``sparse_fields``) narrows a response to
+some of the model's fields. Routes build their SELECT list from the same
+names with ``select_list``, so unrequested columns are neither read from
+Postgres nor serialized. A sparse response is always rendered directly:
+the rows no longer carry the model's required fields.
+"""
+from functools import lru_cache
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from fastapi import Query, Request, Response
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel
+
+from src.core.responses import dumps
+
+from .config import settings
+
+Fields = Optional[Tuple[str, ...]]
+
+
+@lru_cache(maxsize=None)
+def field_plan(
+    model: Type[BaseModel], fields: Fields = None
+) -> Tuple[Tuple[str, Any], ...]:
+    """Cached ``(field name, default)`` pairs used to project rows onto a model"""
+    return tuple(
+        (name, None if field.is_required() else field.get_default())
+        for name, field in model.model_fields.items()
+        if fields is None or name in fields
+    )
+
+
+def project(
+    model: Type[BaseModel],
+    row: Mapping[str, Any],
+    fields: Fields = None,
+    **values: Any,
+) -> Dict[str, Any]:
+    """Shape a trusted row like ``model`` without validating it"""
+    plan = field_plan(model, fields)
+    data = {name: row.get(name, default) for name, default in plan}
+    if values:
+        data.update(
+            (name, value)
+            for name, value in values.items()
+            if fields is None or name in fields
+        )
+    return data
+
+
+def project_many(
+    model: Type[BaseModel],
+    rows: Iterable[Mapping[str, Any]],
+    fields: Fields = None,
+    **values: Any,
+) -> List[Dict[str, Any]]:
+    """Project every trusted row; ``values`` are set on each"""
+    return [project(model, row, fields, **values) for row in rows]
+
+
+def parse_fields(model: Type[BaseModel], fields: Optional[str]) -> Fields:
+    """``fields=a,b`` as ``model`` field names in model order; ``None`` is all.
+
+    Unknown or missing names are rejected like any invalid query parameter.
+    """
+    if fields is None:
+        return None
+    names = {name.strip() for name in fields.split(",")} - {""}
+    unknown = sorted(names - model.model_fields.keys())
+    if unknown or not names:
+        message = f"Unknown fields: {', '.join(unknown)}" if unknown else "No fields"
+        raise RequestValidationError(
+            [
+                {
+                    "type": "value_error",
+                    "loc": ("query", "fields"),
+                    "msg": message,
+                    "input": fields,
+                }
+            ]
+        )
+    # Model order, so equal requests share one cached field plan
+    return tuple(name for name in model.model_fields if name in names)
+
+
+def sparse_fields(model: Type[BaseModel]) -> Callable[..., Fields]:
+    """Dependency resolving a route's ``fields`` query parameter for ``model``"""
+
+    def dependency(
+        fields: Optional[str] = Query(
+            None, description="Comma-separated fields to return (default: all)"
+        )
+    ) -> Fields:
+        return parse_fields(model, fields)
+
+    return dependency
+
+
+def select_list(columns: Mapping[str, str], fields: Fields = None) -> str:
+    """The SELECT items for ``fields``, from a map of field -> SQL select item.
+
+    A field computed in Python maps to every column it is computed from.
+    """
+    items = columns.values() if fields is None else (columns[f] for f in fields)
+    return ",\n    ".join(dict.fromkeys(items))
+
+
+def is_trusted(trusted: Optional[bool] = None) -> bool:
+    """Resolve a route's trusted flag against the global setting"""
+    return settings.trusted_output if trusted is None else trusted
+
+
+@lru_cache(maxsize=8)
+def _route_names(names: str) -> FrozenSet[str]:
+    return frozenset(name.strip() for name in names.split(",")) - {""}
+
+
+def trusted_output(request: Request) -> bool:
+    """Dependency resolving whether the current route skips validation"""
+    route = request.scope.get("route")
+    validated = _route_names(settings.validated_routes)
+    return is_trusted() and getattr(route, "name", None) not in validated
+
+
+def render(content: Any) -> Response:
+    """Dump already-shaped content straight to a JSON response"""
+    return Response(content=dumps(content), media_type="application/json")
+
+
+def respond_many(
+    model: Type[BaseModel],
+    rows: List[Dict[str, Any]],
+    trusted: Optional[bool] = None,
+    fields: Fields = None,
+    **values: Any,
+) -> Any:
+    """Return ``rows`` as a list of ``model``, or of its ``fields``.
+
+    Pass ``trusted`` (from ``trusted_output``) to override the global setting
+    for a single route.
+    """
+    if fields is None and not is_trusted(trusted):
+        return [{**row, **values} for row in rows] if values else rows
+    return render(project_many(model, rows, fields, **values))
+
+
+def respond_one(
+    model: Type[BaseModel], row: Dict[str, Any], fields: Fields = None
+) -> Any:
+    """Return ``row`` as ``model``, or only its ``fields``"""
+    if fields is None:
+        return row
+    return render(project(model, row, fields))
@@ -0,0 +1,72 @@
+"""
+Per-request database timings, reported in a ``Server-Timing`` header
+
+``Database`` records how long each query waited for a pool connection and
+how long it held it; the middleware adds them up per request:
+
+    Server-Timing: db-wait;dur=0.41, db;dur=3.20;desc="2 queries", app;dur=4.87
+
+Load tests read ``db-wait`` to tell pool exhaustion apart from slow queries.
+"""
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+@dataclass
+class RequestTimings:
+    pool_wait: float = 0.0
+    db: float = 0.0
+    queries: int = 0
+
+    def header(self, total: float) -> str:
+        return (
+            f"db-wait;dur={self.pool_wait * 1000:.2f}, "
+            f'db;dur={self.db * 1000:.2f};desc="{self.queries} queries", '
+            f"app;dur={total * 1000:.2f}"
+        )
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def record_query(pool_wait: float, duration: float) -> None:
+    """Add one query's pool wait and connection time to the current request"""
+    timings = _current.get()
+    if timings is not None:
+        timings.pool_wait += pool_wait
+        timings.db += duration
+        timings.queries += 1
+
+
+class ServerTimingMiddleware:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current.set(timings)
+        started = time.perf_counter()
+
+        async def send_with_timings(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing", timings.header(time.perf_counter() - started)
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timings)
+        finally:
+            _current.reset(token)
@@ -0,0 +1,77 @@
+"""
+Benchmark API response serialization on a 1,000-match payload
+
+Compares the previous path (validated ``APIResponse`` model, ``jsonable_encoder``
+and stdlib ``json``) with ``APIResponse.success`` rendering through orjson.
+
+Run from the backend directory:
+    python -m benchmarks.bench_responses
+"""
+import timeit
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+from uuid import UUID, uuid4
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from src.schemas.base import APIResponse
+
+MATCH_COUNT = 1000
+ROUNDS = 50
+
+
+class LegacyAPIResponse(BaseModel):
+    """The envelope as it was built before the fast path"""
+
+    data: Any
+    meta: Dict[str, Any]
+    errors: Optional[List[str]] = None
+
+
+def build_payload(count: int = MATCH_COUNT) -> List[Dict[str, Any]]:
+    """Build match rows shaped like the bracket and match-history endpoints"""
+    start = date(2024, 3, 21)
+    return [
+        {
+            "match_id": uuid4(),
+            "tournament_id": UUID(int=i // 200),
+            "round": f"Champ R{i % 6 + 1}",
+            "round_order": i % 6 + 1,
+            "bracket_order": i % 32,
+            "weight_class": str(125 + (i % 10) * 8),
+            "result_type": ("Decision", "Major Decision", "Tech Fall", "Fall")[i % 4],
+            "winner_name": f"Wrestler {i}",
+            "loser_name": f"Opponent {i}",
+            "score": f"{i % 12}-{i % 5}",
+            "date": start + timedelta(days=i % 3),
+            "recorded_at": datetime(2024, 3, 21, 12, 0) + timedelta(seconds=i),
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_render(payload: List[Dict[str, Any]]) -> bytes:
+    model = LegacyAPIResponse(
+        data=payload,
+        meta={"timestamp": datetime.utcnow().isoformat() + "Z", "version": "1.0"},
+    )
+    return JSONResponse(jsonable_encoder(model)).body
+
+
+def fast_render(payload: List[Dict[str, Any]]) -> bytes:
+    return APIResponse.success(payload).body
+
+
+def main() -> None:
+    payload = build_payload()
+    assert len(fast_render(payload)) > 0
+    for name, func in (("legacy", legacy_render), ("fast", fast_render)):
+        best = min(timeit.repeat(lambda: func(payload), number=ROUNDS, repeat=5))
+        per_call_ms = best / ROUNDS * 1000
+        print(f"{name:>8}: {per_call_ms:8.3f} ms per {MATCH_COUNT}-match response")
+
+
+if __name__ == "__main__":
+    main()
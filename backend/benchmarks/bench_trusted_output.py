@@ -0,0 +1,74 @@
+"""
+Benchmark trusted-output serialization against response-model validation
+
+Measures the work done per ``/api/search/wrestlers`` response after the rows
+come back from the database: the validated path builds models, then FastAPI
+re-validates and serializes them against ``response_model``; the trusted path
+projects the rows with a cached field plan and dumps them with orjson.
+
+Run from the backend directory:
+    python -m benchmarks.bench_trusted_output
+"""
+import asyncio
+import json
+import timeit
+from typing import Any, Dict, List
+
+from fastapi.routing import APIRoute, serialize_response
+
+from app.main import app
+from app.models import WrestlerSearchResult
+from app.serialization import project_many, render
+
+ROW_COUNT = 50
+ROUNDS = 200
+
+
+def build_rows(count: int = ROW_COUNT) -> List[Dict[str, Any]]:
+    return [
+        {
+            "person_id": f"person-{i}",
+            "first_name": f"First{i}",
+            "last_name": f"Last{i}",
+            "last_school": f"School {i % 40}",
+            "last_year": 1990 + i % 30,
+            "last_weight_class": str(125 + (i % 10) * 8),
+        }
+        for i in range(count)
+    ]
+
+
+def response_field():
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.path == "/api/search/wrestlers":
+            return route.response_field
+    raise LookupError("search_wrestlers route not found")
+
+
+def main() -> None:
+    rows = build_rows()
+    field = response_field()
+    loop = asyncio.new_event_loop()
+
+    def validated() -> bytes:
+        content = [WrestlerSearchResult(**row) for row in rows]
+        encoded = loop.run_until_complete(
+            serialize_response(field=field, response_content=content)
+        )
+        return json.dumps(encoded).encode()
+
+    def trusted() -> bytes:
+        return render(project_many(WrestlerSearchResult, rows)).body
+
+    assert json.loads(validated()) == json.loads(trusted())
+    results = {}
+    for name, func in (("validated", validated), ("trusted", trusted)):
+        best = min(timeit.repeat(func, number=ROUNDS, repeat=5))
+        results[name] = ROUNDS / best
+        print(f"{name:>10}: {results[name]:10.0f} responses/s ({ROW_COUNT} rows)")
+    print(f"   speedup: {results['trusted'] / results['validated']:.1f}x")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
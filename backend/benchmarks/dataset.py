@@ -0,0 +1,735 @@
+"""
+Synthetic NCAA dataset generator
+
+Emits person, role, school, tournament, participant, match and
+participant_match rows shaped like the Supabase schema (see
+``SUPABASE_SCHEMA.md``), for benchmarks and load tests that need realistic
+volume. Every year has one tournament per conference plus the NCAA
+championships. Each weight class in each tournament is a full bracket:
+
+* entrants are ranked by perceived strength, the top ones seeded, and placed
+  in standard bracket order with byes going to the top seeds (a 33-man NCAA
+  field opens with a single pigtail bout);
+* championship losers drop into a consolation bracket that runs down to
+  3rd, 5th and 7th place bouts, so every bracket has eight placers;
+* bouts are decided by the wrestlers' latent skill, and the gap between them
+  shifts the result from decisions towards majors, tech falls and falls.
+
+Wrestlers have one- to five-season careers (mostly four) and improve each
+season; weight classes follow the NCAA's 1999 realignment. Participant rows
+are per tournament entry, since that is where the seed lives. Output is
+deterministic for a given seed.
+
+``generate`` returns the rows in memory; ``write`` saves one COPY text file
+per table plus ``manifest.json``. ``load`` copies a written dataset into
+existing tables (create them first, e.g. from the plan suite's schema).
+
+Run from the backend directory:
+    python -m benchmarks.dataset generate data/ncaa --years 50 --seed 7
+    python -m benchmarks.dataset load data/ncaa --database-url postgresql://...
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import asyncpg
+import numpy as np
+
+from app.codes import ResultType
+from app.names import search_name
+
+# Foreign-key order: each table only references tables before it
+TABLES: Dict[str, Tuple[str, ...]] = {
+    "person": (
+        "person_id",
+        "first_name",
+        "last_name",
+        "search_name",
+        "date_of_birth",
+        "city_of_origin",
+        "state_of_origin",
+    ),
+    "role": ("role_id", "person_id", "role_type"),
+    "school": ("school_id", "name", "location", "mascot", "school_type", "school_url"),
+    "tournament": ("tournament_id", "name", "date", "year", "location"),
+    "participant": (
+        "participant_id",
+        "role_id",
+        "school_id",
+        "year",
+        "weight_class",
+        "seed",
+    ),
+    "match": (
+        "match_id",
+        "round",
+        "round_order",
+        "bracket_order",
+        "tournament_id",
+        "result_type",
+        "fall_time",
+        "tech_time",
+        "winner_id",
+    ),
+    "participant_match": (
+        "match_id",
+        "participant_id",
+        "is_winner",
+        "score",
+        "next_match_id",
+    ),
+}
+
+Dataset = Dict[str, List[tuple]]
+
+# Weight classes before and after the 1999 realignment, lightest first
+WEIGHTS_1999 = ("125", "133", "141", "149", "157", "165", "174", "184", "197", "285")
+WEIGHTS_PRE_1999 = (
+    "118",
+    "126",
+    "134",
+    "142",
+    "150",
+    "158",
+    "167",
+    "177",
+    "190",
+    "275",
+)
+
+CONFERENCES = ("Big Ten", "Big 12", "EIWA", "ACC", "Pac-12", "MAC", "SoCon", "EWL")
+
+FIRST_NAMES = (
+    "Aaron Adam Alex Andrew Austin Ben Blake Brandon Brian Caleb Carter Chase "
+    "Chris Cole Colin Connor Cody Dakota Dan David Derek Dylan Eric Ethan Evan "
+    "Gabe Grant Hunter Isaac Jack Jacob Jake Jason Jordan Josh Justin Kyle Logan "
+    "Luke Mark Mason Matt Max Michael Nate Nick Noah Owen Pat Ryan Sam Sean Seth "
+    "Spencer Tanner Tom Travis Tyler Vince Wyatt Zach"
+).split()
+_SURNAME_STEMS = (
+    "Ander Bran Carl Dav Ell Fair Gil Hart Ing John Kell Lind Mart Nel Oak Pet "
+    "Rich Steph Thom Wal Bur Cor Dun Fos Gar Ham Lang Mor Pen Rob"
+).split()
+_SURNAME_ENDINGS = ("son", "man", "ley", "ford", "berg", "er", "ton", "ski", "well")
+LAST_NAMES = [stem + end for stem in _SURNAME_STEMS for end in _SURNAME_ENDINGS]
+
+PLACES = (
+    ("Ames", "IA"),
+    ("Iowa City", "IA"),
+    ("State College", "PA"),
+    ("Pittsburgh", "PA"),
+    ("Lehigh Valley", "PA"),
+    ("Stillwater", "OK"),
+    ("Norman", "OK"),
+    ("Columbus", "OH"),
+    ("Athens", "OH"),
+    ("Ann Arbor", "MI"),
+    ("East Lansing", "MI"),
+    ("Minneapolis", "MN"),
+    ("Lincoln", "NE"),
+    ("Madison", "WI"),
+    ("Champaign", "IL"),
+    ("Bloomington", "IN"),
+    ("West Lafayette", "IN"),
+    ("Piscataway", "NJ"),
+    ("College Park", "MD"),
+    ("Ithaca", "NY"),
+    ("Princeton", "NJ"),
+    ("Raleigh", "NC"),
+    ("Chapel Hill", "NC"),
+    ("Blacksburg", "VA"),
+    ("Charlottesville", "VA"),
+    ("Columbia", "MO"),
+    ("Fargo", "ND"),
+    ("Brookings", "SD"),
+    ("Laramie", "WY"),
+    ("Tempe", "AZ"),
+    ("Corvallis", "OR"),
+    ("Boise", "ID"),
+    ("Fresno", "CA"),
+    ("Boone", "NC"),
+    ("Clarion", "PA"),
+    ("Cedar Falls", "IA"),
+    ("Kent", "OH"),
+    ("DeKalb", "IL"),
+    ("Mount Pleasant", "MI"),
+    ("Edwardsville", "IL"),
+)
+MASCOTS = (
+    "Cyclones, Hawkeyes, Nittany Lions, Panthers, Mountain Hawks, Cowboys, "
+    "Sooners, Buckeyes, Bobcats, Wolverines, Spartans, Gophers, Huskers, "
+    "Badgers, Illini, Hoosiers, Boilermakers, Scarlet Knights, Terrapins, "
+    "Big Red, Tigers, Wolfpack, Tar Heels, Hokies, Cavaliers, Bison, "
+    "Jackrabbits, Sun Devils, Beavers, Broncos, Bulldogs, Mountaineers"
+).split(", ")
+
+# Share of bouts by result before skill differences are taken into account;
+# the bonus results grow more likely as the gap widens
+_RESULTS = (
+    (ResultType.DECISION, 0.62),
+    (ResultType.MAJOR_DECISION, 0.13),
+    (ResultType.TECH_FALL, 0.06),
+    (ResultType.FALL, 0.14),
+    (ResultType.FORFEIT, 0.02),
+    (ResultType.INJURY_DEFAULT, 0.02),
+    (ResultType.DISQUALIFICATION, 0.01),
+)
+_BONUS = {ResultType.MAJOR_DECISION, ResultType.TECH_FALL, ResultType.FALL}
+# Logistic slope of P(win) against the skill gap, and how strongly the gap
+# favours bonus results
+WIN_SLOPE = 1.6
+BONUS_SLOPE = 0.4
+# Season-to-season improvement and tournament-day form
+GROWTH = 0.3
+FORM = 0.35
+
+CAREER_SEASONS = (1, 2, 3, 4, 5)
+CAREER_WEIGHTS = (0.1, 0.15, 0.2, 0.45, 0.1)
+
+
+@dataclass
+class DatasetConfig:
+    years: int = 50
+    last_year: int = 2025
+    schools: int = 80
+    conferences: int = 6
+    # Championship field per weight; None follows history (32, 33 from 2011)
+    ncaa_field: Optional[int] = None
+    conference_seeds: int = 4
+    ncaa_seeds: int = 16
+    seed: int = 0
+
+    @property
+    def first_year(self) -> int:
+        return self.last_year - self.years + 1
+
+
+@dataclass
+class _Wrestler:
+    role_id: str
+    skill: float
+    seasons_left: int
+
+
+@dataclass
+class _Entry:
+    participant_id: str
+    role_id: str
+    form: float
+    row: list
+
+
+@dataclass
+class _Bracket:
+    """Rows of one tournament weight class"""
+
+    tournament_id: str
+    match_rows: List[tuple] = field(default_factory=list)
+    pm_rows: List[list] = field(default_factory=list)
+    round_order: int = 0
+
+
+def weight_classes(year: int) -> Tuple[str, ...]:
+    return WEIGHTS_1999 if year >= 1999 else WEIGHTS_PRE_1999
+
+
+def ncaa_field(config: DatasetConfig, year: int) -> int:
+    if config.ncaa_field is not None:
+        return config.ncaa_field
+    return 33 if year >= 2011 else 32
+
+
+def seeding_order(size: int) -> List[int]:
+    """Rank (1-based) of the entrant in each slot of a ``size`` bracket.
+
+    Adjacent slots meet in the first round: 1 v size, size/2 v size/2+1, ...
+    """
+    order = [1]
+    while len(order) < size:
+        total = len(order) * 2 + 1
+        order = [rank for seed in order for rank in (seed, total - seed)]
+    return order
+
+
+def championship_rounds(entrants: int) -> List[str]:
+    size = 1 << max(entrants - 1, 1).bit_length()
+    count = size.bit_length() - 1
+    names = ["Quarterfinal", "Semifinal", "1st Place Match"][-count:]
+    early = count - len(names)
+    # A first round that is mostly byes is a pigtail round
+    pigtail = early > 0 and entrants - size // 2 < size // 8
+    numbered = [f"Champ. Round {k}" for k in range(1, early + 1 - pigtail)]
+    return ["Pigtail"] * pigtail + numbered + names
+
+
+class _Generator:
+    def __init__(self, config: DatasetConfig):
+        self.config = config
+        self.rng = np.random.default_rng(config.seed)
+        self.tables: Dataset = {table: [] for table in TABLES}
+        self.counters: Dict[str, int] = {}
+        self.last_pm: Dict[str, list] = {}
+
+    def next_id(self, prefix: str, width: int) -> str:
+        n = self.counters.get(prefix, 0) + 1
+        self.counters[prefix] = n
+        return f"{prefix}{n:0{width}d}"
+
+    def choice(self, items: Sequence[Any]) -> Any:
+        return items[int(self.rng.integers(len(items)))]
+
+    # People, schools and tournaments -----------------------------------------
+
+    def person(self, role_type: str, birth_year: int) -> str:
+        person_id = self.next_id("p", 7)
+        first, last = self.choice(FIRST_NAMES), self.choice(LAST_NAMES)
+        city, state = self.choice(PLACES)
+        born = date(birth_year, 1, 1) + timedelta(days=int(self.rng.integers(365)))
+        self.tables["person"].append(
+            (person_id, first, last, search_name(first, last), born, city, state)
+        )
+        role_id = self.next_id("r", 7)
+        self.tables["role"].append((role_id, person_id, role_type))
+        return role_id
+
+    def recruit(self, year: int) -> _Wrestler:
+        seasons = int(self.rng.choice(CAREER_SEASONS, p=CAREER_WEIGHTS))
+        role_id = self.person("wrestler", year - 19)
+        return _Wrestler(role_id, float(self.rng.normal()), seasons)
+
+    def schools(self) -> List[Tuple[str, int]]:
+        """(school_id, conference) pairs"""
+        config = self.config
+        names = [f"{city} State" for city, _ in PLACES] + [
+            f"University of {city}" for city, _ in PLACES
+        ]
+        schools = []
+        for index in range(config.schools):
+            city, state = PLACES[index % len(PLACES)]
+            name = names[index % len(names)]
+            if index >= len(names):
+                name = f"{name} {index // len(names) + 1}"
+            school_id = self.next_id("s", 4)
+            slug = "".join(ch for ch in name.lower() if ch.isalnum())
+            self.tables["school"].append(
+                (
+                    school_id,
+                    name,
+                    f"{city}, {state}",
+                    MASCOTS[index % len(MASCOTS)],
+                    "D1",
+                    f"https://{slug}.edu",
+                )
+            )
+            conference = index % config.conferences if config.conferences else -1
+            schools.append((school_id, conference))
+        # Coaches have no participant rows but are people too
+        for _ in range(config.schools * max(config.years // 10, 1)):
+            self.person("coach", config.first_year - 45)
+        return schools
+
+    def tournament(self, year: int, key: str, name: str, day: date) -> str:
+        tournament_id = f"t{year}-{key}"
+        city, state = self.choice(PLACES)
+        self.tables["tournament"].append(
+            (tournament_id, name, day, year, f"{city}, {state}")
+        )
+        return tournament_id
+
+    def participant(
+        self, wrestler: _Wrestler, school: Tuple[str, int], year: int, weight: str
+    ) -> _Entry:
+        participant_id = self.next_id("pt", 8)
+        row = [participant_id, wrestler.role_id, school[0], year, weight, None]
+        self.tables["participant"].append(row)
+        form = wrestler.skill + float(self.rng.normal(0.0, FORM))
+        return _Entry(participant_id, wrestler.role_id, form, row)
+
+    # Bouts --------------------------------------------------------------------
+
+    def result(self, gap: float) -> ResultType:
+        weights = [
+            share * math.exp(BONUS_SLOPE * gap) if result in _BONUS else share
+            for result, share in _RESULTS
+        ]
+        draw = self.rng.random() * sum(weights)
+        for (result, _), weight in zip(_RESULTS, weights):
+            draw -= weight
+            if draw < 0:
+                return result
+        return ResultType.DECISION
+
+    def clock(self, low: int, high: int) -> str:
+        seconds = int(self.rng.integers(low, high))
+        return f"{seconds // 60}:{seconds % 60:02d}"
+
+    def scores(self, result: ResultType) -> Tuple[Optional[int], Optional[int]]:
+        rng = self.rng
+        if result == ResultType.DECISION:
+            loser = int(rng.integers(0, 8))
+            return loser + min(int(rng.geometric(0.35)), 7), loser
+        if result == ResultType.MAJOR_DECISION:
+            loser = int(rng.integers(0, 7))
+            return loser + int(rng.integers(8, 15)), loser
+        if result == ResultType.TECH_FALL:
+            loser = int(rng.integers(0, 8))
+            return loser + int(rng.integers(15, 19)), loser
+        if result == ResultType.FALL:
+            return int(rng.integers(0, 11)), int(rng.integers(0, 6))
+        return None, None
+
+    def bout(
+        self,
+        bracket: _Bracket,
+        round_name: str,
+        order: int,
+        a: Optional[_Entry],
+        b: Optional[_Entry],
+    ) -> Tuple[_Entry, Optional[_Entry]]:
+        """Record one bout (or a bye when a side is missing); (winner, loser)"""
+        match_id = self.next_id("m", 8)
+        fall_time = tech_time = None
+        if a is None or b is None:
+            winner, loser = a or b, None
+            result = ResultType.BYE
+            winner_score = loser_score = None
+        else:
+            p_a = 1.0 / (1.0 + math.exp(-WIN_SLOPE * (a.form - b.form)))
+            winner, loser = (a, b) if self.rng.random() < p_a else (b, a)
+            result = self.result(max(winner.form - loser.form, 0.0))
+            winner_score, loser_score = self.scores(result)
+            if result == ResultType.FALL:
+                fall_time = self.clock(15, 420)
+            elif result == ResultType.TECH_FALL:
+                tech_time = self.clock(120, 420)
+        bracket.match_rows.append(
+            (
+                match_id,
+                round_name,
+                bracket.round_order,
+                order,
+                bracket.tournament_id,
+                result.label,
+                fall_time,
+                tech_time,
+                winner.participant_id,
+            )
+        )
+        for entry, won, score in (
+            (winner, True, winner_score),
+            (loser, False, loser_score),
+        ):
+            if entry is None:
+                continue
+            previous = self.last_pm.get(entry.participant_id)
+            if previous is not None:
+                previous[4] = match_id
+            row = [match_id, entry.participant_id, won, score, None]
+            self.last_pm[entry.participant_id] = row
+            bracket.pm_rows.append(row)
+        return winner, loser
+
+    def round(
+        self, bracket: _Bracket, name: str, pairs: List[Tuple[Any, Any]]
+    ) -> Tuple[List[_Entry], List[_Entry]]:
+        bracket.round_order += 1
+        winners, losers = [], []
+        for order, (a, b) in enumerate(pairs, 1):
+            winner, loser = self.bout(bracket, name, order, a, b)
+            winners.append(winner)
+            if loser is not None:
+                losers.append(loser)
+        return winners, losers
+
+    # Brackets -----------------------------------------------------------------
+
+    def bracket(
+        self, tournament_id: str, entrants: List[_Entry]
+    ) -> Tuple[_Bracket, _Entry]:
+        """Wrestle one weight class; ``entrants`` are ranked strongest first"""
+        bracket = _Bracket(tournament_id)
+        names = championship_rounds(len(entrants))
+        size = 1 << (len(names))
+        slots = [
+            entrants[rank - 1] if rank <= len(entrants) else None
+            for rank in seeding_order(size)
+        ]
+        pool: List[_Entry] = []
+        quarters_losers: List[_Entry] = []
+        place_5: List[_Entry] = []
+        cons_round = 0
+
+        def cons(name: str, pairs):
+            nonlocal cons_round
+            cons_round += 1
+            return self.round(bracket, name or f"Cons. Round {cons_round}", pairs)
+
+        for index, name in enumerate(names[:-1]):
+            slots, losers = self.round(bracket, name, _pairs(slots))
+            semis = index == len(names) - 2
+            if not pool:
+                pool = losers
+                continue
+            # Thin the pool among itself until it matches the new losers,
+            # then wrestle it against them (crossed, to avoid rematches)
+            while len(pool) > len(losers) and len(pool) > 1:
+                pool, quarters_losers = cons(
+                    "Cons. Quarters" if semis else "", _pairs(pool)
+                )
+            pairs = _cross(pool, losers[::-1])
+            pool, pool_losers = cons("Cons. Semis" if semis else "", pairs)
+            if semis:
+                place_5 = pool_losers
+            else:
+                quarters_losers = pool_losers
+
+        bracket.round_order += 1
+        final_order = bracket.round_order
+        if len(names) == 2:
+            quarters_losers = []
+        for place, pair in ((7, quarters_losers), (5, place_5), (3, pool)):
+            if len(pair) == 2:
+                self.bout(bracket, f"{_ordinal(place)} Place Match", 1, *pair)
+        bracket.round_order = final_order + 1
+        champion, _ = self.bout(bracket, names[-1], 1, *slots)
+        return bracket, champion
+
+    def wrestle(
+        self, tournament_id: str, entrants: List[_Entry], seeds: int
+    ) -> Optional[_Entry]:
+        """Seed, place and wrestle one weight class; returns the champion"""
+        if len(entrants) < 2:
+            return None
+        # Seeds go by perceived strength; unseeded wrestlers are drawn at random
+        perceived = [e.form + float(self.rng.normal(0.0, FORM)) for e in entrants]
+        ranked = [e for _, e in sorted(zip(perceived, entrants), key=lambda p: -p[0])]
+        seeded, rest = ranked[:seeds], ranked[seeds:]
+        rest = [rest[i] for i in self.rng.permutation(len(rest))]
+        for seed, entry in enumerate(seeded, 1):
+            entry.row[5] = seed
+        bracket, champion = self.bracket(tournament_id, seeded + rest)
+        self.tables["match"].extend(bracket.match_rows)
+        self.tables["participant_match"].extend(bracket.pm_rows)
+        return champion
+
+    # Seasons ------------------------------------------------------------------
+
+    def season(self, year: int, schools, lineups: Dict[Tuple[str, int], _Wrestler]):
+        config = self.config
+        weights = weight_classes(year)
+        march = date(year, 3, 1)
+        conference_day = march + timedelta(days=(6 - march.weekday()) % 7 + 7)
+        ncaa_day = conference_day + timedelta(days=12)
+
+        # Starters this season: one per school and weight class
+        for school_id, _ in schools:
+            for slot in range(len(weights)):
+                wrestler = lineups.get((school_id, slot))
+                if wrestler is None or wrestler.seasons_left == 0:
+                    wrestler = lineups[(school_id, slot)] = self.recruit(year)
+                else:
+                    wrestler.skill += GROWTH
+                wrestler.seasons_left -= 1
+
+        conference_ids = [
+            self.tournament(
+                year,
+                f"c{k + 1}",
+                f"{year} {_conference(k)} Championships",
+                conference_day,
+            )
+            for k in range(config.conferences)
+        ]
+        ncaa_id = self.tournament(
+            year, "ncaa", f"{year} NCAA Division I Championships", ncaa_day
+        )
+        field_size = ncaa_field(config, year)
+
+        for slot, weight in enumerate(weights):
+            champions = set()
+            for k, tournament_id in enumerate(conference_ids):
+                entrants = [
+                    self.participant(lineups[(school[0], slot)], school, year, weight)
+                    for school in schools
+                    if school[1] == k
+                ]
+                champion = self.wrestle(
+                    tournament_id, entrants, config.conference_seeds
+                )
+                if champion is not None:
+                    champions.add(champion.role_id)
+            # Conference champions qualify automatically; at-large bids go to
+            # the strongest of the rest
+            starters = sorted(
+                ((lineups[(school[0], slot)], school) for school in schools),
+                key=lambda pair: -pair[0].skill,
+            )
+            qualified = [pair for pair in starters if pair[0].role_id in champions]
+            at_large = [pair for pair in starters if pair[0].role_id not in champions]
+            qualified += at_large[: max(field_size - len(qualified), 0)]
+            entrants = [
+                self.participant(wrestler, school, year, weight)
+                for wrestler, school in qualified
+            ]
+            self.wrestle(ncaa_id, entrants, config.ncaa_seeds)
+
+    def generate(self) -> Dataset:
+        schools = self.schools()
+        lineups: Dict[Tuple[str, int], _Wrestler] = {}
+        for year in range(self.config.first_year, self.config.last_year + 1):
+            self.season(year, schools, lineups)
+        tables = self.tables
+        tables["participant"] = [tuple(row) for row in tables["participant"]]
+        tables["participant_match"] = [
+            tuple(row) for row in tables["participant_match"]
+        ]
+        return tables
+
+
+def _pairs(items: List[Any]) -> List[Tuple[Any, Any]]:
+    padded = list(items) + [None] * (len(items) % 2)
+    return [(padded[i], padded[i + 1]) for i in range(0, len(padded), 2)]
+
+
+def _cross(pool: List[_Entry], losers: List[_Entry]) -> List[Tuple[Any, Any]]:
+    """Pair the pool against new losers; the unmatched get byes"""
+    count = max(len(pool), len(losers))
+    pool = pool + [None] * (count - len(pool))
+    losers = losers + [None] * (count - len(losers))
+    return list(zip(pool, losers))
+
+
+def _ordinal(place: int) -> str:
+    return {1: "1st", 3: "3rd", 5: "5th", 7: "7th"}[place]
+
+
+def _conference(index: int) -> str:
+    if index < len(CONFERENCES):
+        return CONFERENCES[index]
+    return f"Conference {index + 1}"
+
+
+def generate(config: DatasetConfig = DatasetConfig()) -> Dataset:
+    """Rows for every table, keyed by table name in foreign-key order"""
+    return _Generator(config).generate()
+
+
+# COPY text format ------------------------------------------------------------
+
+_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def copy_value(value: Any) -> str:
+    if value is None:
+        return "\\N"
+    if value is True:
+        return "t"
+    if value is False:
+        return "f"
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value).translate(_ESCAPES)
+
+
+def write(dataset: Dataset, directory: str, config: Optional[DatasetConfig] = None):
+    """Write ``<table>.copy`` files and a manifest listing them in load order"""
+    os.makedirs(directory, exist_ok=True)
+    manifest: Dict[str, Any] = {"tables": []}
+    if config is not None:
+        manifest["config"] = asdict(config)
+    for table, rows in dataset.items():
+        filename = f"{table}.copy"
+        with open(os.path.join(directory, filename), "w", encoding="utf-8") as fh:
+            fh.writelines("\t".join(map(copy_value, row)) + "\n" for row in rows)
+        manifest["tables"].append(
+            {
+                "table": table,
+                "file": filename,
+                "columns": TABLES[table],
+                "rows": len(rows),
+            }
+        )
+    with open(os.path.join(directory, "manifest.json"), "w") as fh:
+        json.dump(manifest, fh, indent=2)
+        fh.write("\n")
+    return manifest
+
+
+async def load(
+    directory: str, database_url: str, truncate: bool = False
+) -> Dict[str, int]:
+    """COPY a written dataset into existing tables in one transaction"""
+    with open(os.path.join(directory, "manifest.json")) as fh:
+        manifest = json.load(fh)
+    entries = manifest["tables"]
+    connection = await asyncpg.connect(database_url)
+    try:
+        async with connection.transaction():
+            if truncate:
+                names = ", ".join(entry["table"] for entry in entries)
+                await connection.execute(f"TRUNCATE {names} CASCADE")
+            for entry in entries:
+                await connection.copy_to_table(
+                    entry["table"],
+                    source=os.path.join(directory, entry["file"]),
+                    columns=entry["columns"],
+                    format="text",
+                )
+        for entry in entries:
+            await connection.execute(f"ANALYZE {entry['table']}")
+    finally:
+        await connection.close()
+    return {entry["table"]: entry["rows"] for entry in entries}
+
+
+def _main(args: argparse.Namespace) -> None:
+    if args.command == "generate":
+        config = DatasetConfig(
+            years=args.years,
+            last_year=args.last_year,
+            schools=args.schools,
+            conferences=args.conferences,
+            ncaa_field=args.ncaa_field,
+            seed=args.seed,
+        )
+        started = time.perf_counter()
+        dataset = generate(config)
+        manifest = write(dataset, args.directory, config)
+        elapsed = time.perf_counter() - started
+        for entry in manifest["tables"]:
+            print(f"{entry['table']:>18}: {entry['rows']:>9,} rows")
+        print(f"wrote {args.directory} in {elapsed:.1f}s")
+    else:
+        url = args.database_url or os.getenv("DATABASE_URL", "")
+        if not url:
+            raise SystemExit("pass --database-url or set DATABASE_URL")
+        counts = asyncio.run(load(args.directory, url, args.truncate))
+        print(f"loaded {sum(counts.values()):,} rows into {len(counts)} tables")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Synthetic NCAA wrestling data")
+    commands = parser.add_subparsers(dest="command", required=True)
+    gen = commands.add_parser("generate", help="Write COPY files for every table")
+    gen.add_argument("directory")
+    gen.add_argument("--years", type=int, default=DatasetConfig.years)
+    gen.add_argument("--last-year", type=int, default=DatasetConfig.last_year)
+    gen.add_argument("--schools", type=int, default=DatasetConfig.schools)
+    gen.add_argument("--conferences", type=int, default=DatasetConfig.conferences)
+    gen.add_argument("--ncaa-field", type=int, help="Entrants per NCAA weight")
+    gen.add_argument("--seed", type=int, default=DatasetConfig.seed)
+    load_cmd = commands.add_parser(
+        "load", help="COPY a generated dataset into Postgres"
+    )
+    load_cmd.add_argument("directory")
+    load_cmd.add_argument("--database-url")
+    load_cmd.add_argument(
+        "--truncate", action="store_true", help="Empty the tables first"
+    )
+    _main(parser.parse_args())
@@ -0,0 +1,410 @@
+"""
+Load test replaying the frontend's traffic against a running API
+
+Virtual users loop over four call patterns, picked by ``--mix`` weights:
+
+* typeahead: a name typed a keystroke at a time, each keystroke from the
+  second on firing ``/api/search`` (which needs two characters) without
+  waiting for the previous response, then the wrestler search for the
+  finished prefix;
+* profile: a profile page's section requests fanned out at once
+  (``PROFILE_ROUTES``);
+* profile_full: the same page loaded with the one combined request
+  (``FULL_PROFILE_ROUTE``), off by default;
+* bracket: polling a recent tournament's team scores every few seconds, as
+  an open bracket page does.
+
+Names, people and tournaments are sampled from the database the API serves.
+The report gives throughput plus, per route, p50/p95/p99 latency of the 2xx
+responses, error rate and the time spent waiting for a pool connection, read from the
+``Server-Timing`` header (see ``app/timing.py``). Results are saved as JSON
+so runs can be compared.
+
+Run from the backend directory, against e.g. ``uvicorn app.main:app`` started
+with ``RATE_LIMIT_PER_SECOND=0``: every virtual user shares one address, so a
+per-client rate limit would turn most of the run into 429s.
+    python -m benchmarks.loadtest run --users 50 --duration 60 \\
+        --database-url postgresql://...
+    python -m benchmarks.loadtest compare results/old.json results/new.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import asyncpg
+import httpx
+import numpy as np
+
+# Requests a wrestler profile page makes when it opens, or the one request
+# that replaces them
+PROFILE_ROUTES = (
+    "/api/wrestlers/wrestlers/{person_id}",
+    "/api/wrestlers/wrestlers/{person_id}/stats",
+    "/api/wrestlers/wrestlers/{person_id}/matches",
+)
+FULL_PROFILE_ROUTE = "/api/wrestlers/{person_id}/full"
+TYPEAHEAD_ROUTE = "/api/search"
+SEARCH_ROUTE = "/api/search/wrestlers"
+BRACKET_ROUTE = "/api/tournaments/tournaments/{tournament_id}/team-scores"
+
+# The search routes reject shorter queries (422)
+MIN_QUERY_LENGTH = 2
+
+DEFAULT_MIX = {"typeahead": 5.0, "profile": 3.0, "bracket": 2.0}
+
+# Seconds between keystrokes, between page views, and between bracket polls
+KEYSTROKE_INTERVAL = 0.12
+THINK_TIME = 2.0
+POLL_INTERVAL = 5.0
+POLLS_PER_VISIT = 6
+
+_DB_WAIT = re.compile(r"db-wait;dur=([\d.]+)")
+
+PEOPLE_QUERY = """
+SELECT p.person_id, p.last_name
+FROM person p
+WHERE EXISTS (
+    SELECT 1 FROM role r
+    WHERE r.person_id = p.person_id AND r.role_type = 'wrestler'
+)
+ORDER BY md5(p.person_id || $2)
+LIMIT $1
+"""
+
+TOURNAMENTS_QUERY = """
+SELECT tournament_id FROM tournament ORDER BY date DESC LIMIT $1
+"""
+
+
+class Sample(NamedTuple):
+    route: str
+    status: int  # 0 when the request failed without a response
+    latency: float
+    pool_wait: Optional[float]
+
+
+@dataclass
+class Workload:
+    """Identifiers the virtual users pick from"""
+
+    people: List[Tuple[str, str]]
+    tournaments: List[str]
+
+
+@dataclass
+class LoadConfig:
+    base_url: str = "http://localhost:8000"
+    users: int = 20
+    duration: float = 60.0
+    ramp_up: float = 5.0
+    mix: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    timeout: float = 10.0
+    seed: int = 0
+
+
+async def load_workload(
+    database_url: str, people: int = 2_000, tournaments: int = 20, seed: int = 0
+) -> Workload:
+    connection = await asyncpg.connect(database_url)
+    try:
+        people_rows = await connection.fetch(PEOPLE_QUERY, people, str(seed))
+        tournament_rows = await connection.fetch(TOURNAMENTS_QUERY, tournaments)
+    finally:
+        await connection.close()
+    return Workload(
+        people=[(row["person_id"], row["last_name"]) for row in people_rows],
+        tournaments=[row["tournament_id"] for row in tournament_rows],
+    )
+
+
+class LoadTest:
+    def __init__(
+        self, config: LoadConfig, workload: Workload, client: httpx.AsyncClient
+    ):
+        self.config = config
+        self.workload = workload
+        self.client = client
+        self.samples: List[Sample] = []
+        self.scenarios = {
+            "typeahead": self.typeahead,
+            "profile": self.profile,
+            "profile_full": self.profile_full,
+            "bracket": self.bracket,
+        }
+        unknown = set(config.mix) - set(self.scenarios)
+        if unknown:
+            raise ValueError(f"unknown scenarios: {', '.join(sorted(unknown))}")
+        if not workload.people and any(
+            config.mix.get(name) for name in ("typeahead", "profile", "profile_full")
+        ):
+            raise ValueError("the workload has no people to search for")
+        if not workload.tournaments and config.mix.get("bracket"):
+            raise ValueError("the workload has no tournaments to poll")
+
+    async def request(self, route: str, path: str, **params: Any) -> None:
+        started = time.perf_counter()
+        try:
+            response = await self.client.get(path, params=params or None)
+        except httpx.HTTPError:
+            self.samples.append(Sample(route, 0, time.perf_counter() - started, None))
+            return
+        latency = time.perf_counter() - started
+        wait = _DB_WAIT.search(response.headers.get("server-timing", ""))
+        pool_wait = float(wait.group(1)) / 1000 if wait else None
+        self.samples.append(Sample(route, response.status_code, latency, pool_wait))
+
+    async def typeahead(self, rng: np.random.Generator, deadline: float) -> None:
+        _, name = self.workload.people[int(rng.integers(len(self.workload.people)))]
+        typed = name[: int(rng.integers(3, max(len(name), 3) + 1))]
+        keystrokes = []
+        for end in range(MIN_QUERY_LENGTH, len(typed) + 1):
+            keystrokes.append(
+                asyncio.create_task(
+                    self.request(TYPEAHEAD_ROUTE, TYPEAHEAD_ROUTE, q=typed[:end])
+                )
+            )
+            await asyncio.sleep(rng.exponential(KEYSTROKE_INTERVAL))
+        await asyncio.gather(*keystrokes)
+        await self.request(SEARCH_ROUTE, SEARCH_ROUTE, q=typed)
+
+    async def profile(self, rng: np.random.Generator, deadline: float) -> None:
+        person_id, _ = self.workload.people[
+            int(rng.integers(len(self.workload.people)))
+        ]
+        await asyncio.gather(
+            *(
+                self.request(route, route.format(person_id=person_id))
+                for route in PROFILE_ROUTES
+            )
+        )
+
+    async def profile_full(self, rng: np.random.Generator, deadline: float) -> None:
+        person_id, _ = self.workload.people[
+            int(rng.integers(len(self.workload.people)))
+        ]
+        await self.request(
+            FULL_PROFILE_ROUTE, FULL_PROFILE_ROUTE.format(person_id=person_id)
+        )
+
+    async def bracket(self, rng: np.random.Generator, deadline: float) -> None:
+        # Most viewers follow the latest tournaments
+        tournaments = self.workload.tournaments
+        index = min(int(rng.geometric(0.3)) - 1, len(tournaments) - 1)
+        path = BRACKET_ROUTE.format(tournament_id=tournaments[index])
+        for _ in range(POLLS_PER_VISIT):
+            await self.request(BRACKET_ROUTE, path)
+            if time.perf_counter() + POLL_INTERVAL > deadline:
+                break
+            await asyncio.sleep(POLL_INTERVAL * rng.uniform(0.8, 1.2))
+
+    async def user(self, index: int, deadline: float) -> None:
+        rng = np.random.default_rng([self.config.seed, index])
+        names = list(self.config.mix)
+        weights = np.array([self.config.mix[name] for name in names], dtype=float)
+        weights /= weights.sum()
+        await asyncio.sleep(self.config.ramp_up * index / max(self.config.users, 1))
+        while time.perf_counter() < deadline:
+            scenario = self.scenarios[names[int(rng.choice(len(names), p=weights))]]
+            await scenario(rng, deadline)
+            await asyncio.sleep(rng.exponential(THINK_TIME))
+
+    async def run(self) -> float:
+        """Run every virtual user until the deadline; returns elapsed seconds"""
+        started = time.perf_counter()
+        deadline = started + self.config.duration
+        await asyncio.gather(
+            *(self.user(i, deadline) for i in range(self.config.users))
+        )
+        return time.perf_counter() - started
+
+
+def _percentiles(values: Sequence[float]) -> Dict[str, Optional[float]]:
+    if not len(values):
+        return {"p50": None, "p95": None, "p99": None, "max": None}
+    ms = np.asarray(values, dtype=float) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        "p50": round(float(p50), 2),
+        "p95": round(float(p95), 2),
+        "p99": round(float(p99), 2),
+        "max": round(float(ms.max()), 2),
+    }
+
+
+def is_error(status: int) -> bool:
+    return status == 0 or status >= 500 or status == 429
+
+
+def summarize(samples: Sequence[Sample], elapsed: float) -> Dict[str, Any]:
+    """Throughput, latency, error and pool-wait figures overall and per route"""
+    by_route: Dict[str, List[Sample]] = {}
+    for sample in samples:
+        by_route.setdefault(sample.route, []).append(sample)
+
+    def figures(group: Sequence[Sample]) -> Dict[str, Any]:
+        statuses: Dict[str, int] = {}
+        for sample in group:
+            statuses[str(sample.status)] = statuses.get(str(sample.status), 0) + 1
+        errors = sum(is_error(sample.status) for sample in group)
+        waits = [s.pool_wait for s in group if s.pool_wait is not None]
+        return {
+            "requests": len(group),
+            "throughput": round(len(group) / elapsed, 2) if elapsed else None,
+            "error_rate": round(errors / len(group), 4) if group else 0.0,
+            "statuses": statuses,
+            # Rejections and errors return early; they would flatter latency
+            "latency_ms": _percentiles(
+                [s.latency for s in group if 200 <= s.status < 300]
+            ),
+            "pool_wait_ms": _percentiles(waits),
+        }
+
+    return {
+        "elapsed": round(elapsed, 2),
+        "total": figures(samples),
+        "routes": {route: figures(group) for route, group in sorted(by_route.items())},
+    }
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    lines = [
+        f"{'route':<46} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} "
+        f"{'errors':>7} {'wait p95':>9}"
+    ]
+    rows = list(summary["routes"].items()) + [("TOTAL", summary["total"])]
+    for route, figures in rows:
+        latency, wait = figures["latency_ms"], figures["pool_wait_ms"]
+        lines.append(
+            f"{route:<46} {figures['throughput']:>8} {_ms(latency['p50'])} "
+            f"{_ms(latency['p95'])} {_ms(latency['p99'])} "
+            f"{figures['error_rate']:>7.1%} {_ms(wait['p95']):>9}"
+        )
+    return "\n".join(lines)
+
+
+def _ms(value: Optional[float]) -> str:
+    return f"{'-' if value is None else f'{value:.1f}':>8}"
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any]) -> str:
+    """Per-route throughput and p95 changes between two saved runs"""
+    lines = [f"{'route':<46} {'req/s':>17} {'p95 ms':>19} {'errors':>15}"]
+    routes = sorted(set(old["summary"]["routes"]) | set(new["summary"]["routes"]))
+    for route in routes + ["TOTAL"]:
+        before = _route(old, route)
+        after = _route(new, route)
+        if before is None or after is None:
+            lines.append(
+                f"{route:<46} only in {'new' if before is None else 'old'} run"
+            )
+            continue
+        lines.append(
+            f"{route:<46} "
+            f"{_change(before['throughput'], after['throughput']):>17} "
+            f"{_change(before['latency_ms']['p95'], after['latency_ms']['p95']):>19} "
+            f"{before['error_rate']:>6.1%} -> {after['error_rate']:.1%}"
+        )
+    return "\n".join(lines)
+
+
+def _route(result: Dict[str, Any], route: str) -> Optional[Dict[str, Any]]:
+    if route == "TOTAL":
+        return result["summary"]["total"]
+    return result["summary"]["routes"].get(route)
+
+
+def _change(before: Optional[float], after: Optional[float]) -> str:
+    if before is None or after is None:
+        return "-"
+    if not before:
+        return f"{before:g} -> {after:g}"
+    return f"{before:g} -> {after:g} ({(after - before) / before:+.0%})"
+
+
+def save(result: Dict[str, Any], directory: str) -> str:
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = os.path.join(directory, f"loadtest-{stamp}.json")
+    with open(path, "w") as fh:
+        json.dump(result, fh, indent=2)
+        fh.write("\n")
+    return path
+
+
+async def run(config: LoadConfig, workload: Workload) -> Dict[str, Any]:
+    started = datetime.now(timezone.utc).isoformat()
+    limits = httpx.Limits(max_connections=config.users * 8)
+    async with httpx.AsyncClient(
+        base_url=config.base_url, timeout=config.timeout, limits=limits
+    ) as client:
+        test = LoadTest(config, workload, client)
+        elapsed = await test.run()
+    return {
+        "started": started,
+        "config": asdict(config),
+        "summary": summarize(test.samples, elapsed),
+    }
+
+
+def _parse_mix(text: str) -> Dict[str, float]:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+async def _main(args: argparse.Namespace) -> None:
+    if args.command == "compare":
+        with open(args.old) as fh:
+            old = json.load(fh)
+        with open(args.new) as fh:
+            new = json.load(fh)
+        print(compare(old, new))
+        return
+
+    url = args.database_url or os.getenv("DATABASE_URL", "")
+    if not url:
+        raise SystemExit("pass --database-url or set DATABASE_URL")
+    config = LoadConfig(
+        base_url=args.base_url,
+        users=args.users,
+        duration=args.duration,
+        ramp_up=args.ramp_up,
+        mix=_parse_mix(args.mix) if args.mix else dict(DEFAULT_MIX),
+        seed=args.seed,
+    )
+    workload = await load_workload(url, seed=args.seed)
+    result = await run(config, workload)
+    print(format_summary(result["summary"]))
+    print(f"saved {save(result, args.output)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Replay frontend traffic against the API"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_cmd = commands.add_parser("run", help="Run a load test and save the results")
+    run_cmd.add_argument("--base-url", default=LoadConfig.base_url)
+    run_cmd.add_argument("--database-url", help="Database to sample ids from")
+    run_cmd.add_argument("--users", type=int, default=LoadConfig.users)
+    run_cmd.add_argument("--duration", type=float, default=LoadConfig.duration)
+    run_cmd.add_argument("--ramp-up", type=float, default=LoadConfig.ramp_up)
+    run_cmd.add_argument(
+        "--mix",
+        help="Scenario weights, e.g. typeahead=5,profile=3,bracket=2 "
+        "(profile_full=3 in place of profile for the combined request)",
+    )
+    run_cmd.add_argument("--seed", type=int, default=LoadConfig.seed)
+    run_cmd.add_argument("--output", default="results", help="Directory for results")
+    compare_cmd = commands.add_parser("compare", help="Compare two saved runs")
+    compare_cmd.add_argument("old")
+    compare_cmd.add_argument("new")
+    asyncio.run(_main(parser.parse_args()))
@@ -0,0 +1,429 @@
+"""
+Microbenchmark suite for the hot code paths, with baseline comparison
+
+Each case times one call of a hot path with canned inputs, no database or
+network involved:
+
+* ``fetch_all``: ``Database.fetch_all`` turning asyncpg records into dicts;
+* ``search.*``: the search routes end to end, validated and trusted output;
+* ``api_response``: building and rendering an ``APIResponse`` envelope;
+* ``brackets.group``: grouping a tournament's matches by weight class;
+* ``jwt.*``: access-token encode and verify;
+* ``json.large``: encoding a 20,000-row payload.
+
+A case is timed in ``SAMPLES`` batches, each long enough (~``SAMPLE_SECONDS``)
+to swamp timer noise, round-robin across the cases. A fixed pure-Python
+workload is timed alongside them, and times are rescaled by it, so a machine
+that is running slower overall does not read as a regression. ``--save``
+stores the batches as the baseline; later runs compare against it with a
+Mann-Whitney U test and flag a case as a regression when it is
+significantly slower (p < ``ALPHA``) by more than ``THRESHOLD``. Baselines
+are per machine, so they live in the untracked ``.benchmarks/`` directory.
+
+Run from the backend directory:
+    python -m benchmarks.suite --save      # record a baseline
+    python -m benchmarks.suite             # compare, exit 1 on regressions
+    python -m benchmarks.suite -k search   # only cases matching "search"
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import timeit
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from datetime import timedelta
+from typing import Any, Callable, Coroutine, Dict, List, Optional
+
+import numpy as np
+from asyncpg.protocol.protocol import _create_record
+from fastapi.routing import APIRoute, serialize_response
+
+from app.analytics.dimensions import dimension_store
+from app.codes import ResultType, Round
+from app.database import Database
+from app.main import app
+from app.routers.search import search_all, search_wrestlers
+from app.routers.tournaments import get_tournament_brackets
+from src.core.responses import dumps
+from src.core.security import create_access_token, verify_token
+from src.schemas.base import APIResponse
+
+from .bench_responses import build_payload
+
+SAMPLES = 20
+SAMPLE_SECONDS = 0.02
+ALPHA = 0.01
+THRESHOLD = 0.15
+BASELINE_PATH = os.path.join(".benchmarks", "baseline.json")
+
+# Pure-Python workload timed alongside the cases as a machine-speed yardstick
+REFERENCE = "reference"
+
+Case = Callable[[], Callable[[], Any]]
+CASES: Dict[str, Case] = {}
+
+
+def case(name: str) -> Callable[[Case], Case]:
+    """Register a setup function returning the zero-argument call to time"""
+
+    def register(setup: Case) -> Case:
+        CASES[name] = setup
+        return setup
+
+    return register
+
+
+def run_sync(coroutine: Coroutine) -> Any:
+    """Drive a coroutine that never suspends, without an event loop"""
+    try:
+        coroutine.send(None)
+    except StopIteration as done:
+        return done.value
+    coroutine.close()
+    raise RuntimeError("benchmarked coroutine suspended")
+
+
+# Canned inputs ----------------------------------------------------------------
+
+
+def records(rows: List[Dict[str, Any]]) -> list:
+    """asyncpg records with the rows' columns, as ``connection.fetch`` returns"""
+    mapping = OrderedDict((name, i) for i, name in enumerate(rows[0]))
+    return [_create_record(mapping, tuple(row.values())) for row in rows]
+
+
+class FakeConnection:
+    def __init__(self, result: list):
+        self.result = result
+
+    async def fetch(self, query: str, *args) -> list:
+        return self.result
+
+
+class FakePool:
+    def __init__(self, result: list):
+        self.connection = FakeConnection(result)
+
+    @asynccontextmanager
+    async def acquire(self):
+        yield self.connection
+
+
+def fake_database(rows: List[Dict[str, Any]]) -> Database:
+    database = Database()
+    database.pool = FakePool(records(rows))
+    return database
+
+
+def wrestler_rows(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "person_id": f"p{i:07d}",
+            "first_name": f"First{i}",
+            "last_name": f"Last{i}",
+            "last_school": f"School {i % 40}",
+            "last_year": 1990 + i % 30,
+            "last_weight_class": str(125 + (i % 10) * 8),
+        }
+        for i in range(count)
+    ]
+
+
+def bracket_rows(count: int) -> List[Dict[str, Any]]:
+    weights = (125, 133, 141, 149, 157, 165, 174, 184, 197, 285)
+    rounds = list(Round)[1:]
+    return [
+        {
+            "match_id": f"m{i:08d}",
+            "round_code": rounds[i % len(rounds)],
+            "round": rounds[i % len(rounds)].label,
+            "result_type_code": ResultType.DECISION,
+            "result_type": "Dec",
+            "weight_class_code": weights[i % len(weights)],
+            "weight_class": str(weights[i % len(weights)]),
+            "winner_name": f"Winner {i}",
+            "loser_name": f"Loser {i}",
+            "winner_school": f"School {i % 40}",
+            "loser_school": f"School {(i + 7) % 40}",
+            "winner_score": i % 9 + 1,
+            "loser_score": i % 4,
+        }
+        for i in range(count)
+    ]
+
+
+def _response_field(path: str):
+    for route in app.routes:
+        if isinstance(route, APIRoute) and route.path == path:
+            return route.response_field
+    raise LookupError(f"route {path} not found")
+
+
+# Cases ------------------------------------------------------------------------
+
+
+@case("fetch_all")
+def bench_fetch_all():
+    database = fake_database(wrestler_rows(500))
+    return lambda: run_sync(database.fetch_all("SELECT"))
+
+
+@contextmanager
+def _no_dimensions():
+    """Send the search routes to the database even if DIMENSIONS_PATH exists"""
+    get = dimension_store.get
+    dimension_store.get = lambda: None
+    try:
+        yield
+    finally:
+        dimension_store.get = get
+
+
+def _search(path: str, route: Callable, rows, trusted: bool, **params: Any):
+    database = fake_database(rows)
+    field = _response_field(path)
+
+    def call():
+        with _no_dimensions():
+            content = run_sync(route(db=database, trusted=trusted, **params))
+        if trusted:
+            return content.body
+        return run_sync(serialize_response(field=field, response_content=content))
+
+    return call
+
+
+@case("search.wrestlers.validated")
+def bench_search_wrestlers_validated():
+    rows = wrestler_rows(50)
+    return _search(
+        "/api/search/wrestlers",
+        search_wrestlers,
+        rows,
+        False,
+        q="la",
+        limit=50,
+        fields=None,
+    )
+
+
+@case("search.wrestlers.trusted")
+def bench_search_wrestlers_trusted():
+    rows = wrestler_rows(50)
+    return _search(
+        "/api/search/wrestlers",
+        search_wrestlers,
+        rows,
+        True,
+        q="la",
+        limit=50,
+        fields=None,
+    )
+
+
+@case("search.all.trusted")
+def bench_search_all_trusted():
+    rows = [
+        {"id": f"x{i}", "name": f"Name {i}", "additional_info": f"Info {i}"}
+        for i in range(10)
+    ]
+    return _search("/api/search", search_all, rows, True, q="na", limit=10)
+
+
+@case("api_response")
+def bench_api_response():
+    payload = build_payload(1000)
+    return lambda: APIResponse.success(payload).body
+
+
+@case("brackets.group")
+def bench_brackets_group():
+    database = fake_database(bracket_rows(2000))
+    return lambda: run_sync(
+        get_tournament_brackets("t1", weight_class=None, db=database)
+    )
+
+
+@case("jwt.encode")
+def bench_jwt_encode():
+    return lambda: create_access_token("user-1", timedelta(minutes=30))
+
+
+@case("jwt.verify")
+def bench_jwt_verify():
+    token = create_access_token("user-1", timedelta(minutes=30))
+    return lambda: verify_token(token)
+
+
+@case("json.large")
+def bench_json_large():
+    payload = build_payload(20_000)
+    return lambda: dumps(payload)
+
+
+# Measurement and statistics ---------------------------------------------------
+
+
+def reference_workload() -> list:
+    rows = [{"id": i, "name": f"name-{i * 7919 % 1000}"} for i in range(200)]
+    return sorted(rows, key=lambda row: row["name"])
+
+
+def calibrate(call: Callable[[], Any]) -> int:
+    """Calls per batch so that one batch takes at least ``SAMPLE_SECONDS``"""
+    call()  # warm caches before timing
+    timer = timeit.Timer(call)
+    number = 1
+    while timer.timeit(number) < SAMPLE_SECONDS and number < 1_000_000:
+        number *= 2
+    return number
+
+
+def measure(
+    calls: Dict[str, Callable[[], Any]], samples: int = SAMPLES
+) -> Dict[str, List[float]]:
+    """Seconds per call for each of ``samples`` batches of every case.
+
+    Batches are taken round-robin across the cases, so drift in machine speed
+    (frequency scaling, noisy neighbours) spreads over all of them instead of
+    landing on whichever case happened to run at the time.
+    """
+    timers = {name: timeit.Timer(call) for name, call in calls.items()}
+    numbers = {name: calibrate(call) for name, call in calls.items()}
+    results: Dict[str, List[float]] = {name: [] for name in calls}
+    for _ in range(samples):
+        for name, timer in timers.items():
+            results[name].append(timer.timeit(numbers[name]) / numbers[name])
+    return results
+
+
+def mann_whitney_p(a: List[float], b: List[float]) -> float:
+    """Two-sided p-value of the Mann-Whitney U test (normal approximation)"""
+    n1, n2 = len(a), len(b)
+    values = np.concatenate([a, b])
+    order = values.argsort()
+    ranks = np.empty(len(values))
+    ranks[order] = np.arange(1, len(values) + 1)
+    # Tied values share their average rank
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    sums = np.bincount(inverse, weights=ranks)
+    ranks = (sums / counts)[inverse]
+    u = ranks[:n1].sum() - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    ties = (counts**3 - counts).sum() / (n * (n - 1)) if n > 1 else 0.0
+    variance = n1 * n2 / 12 * ((n + 1) - ties)
+    if variance <= 0:
+        return 1.0
+    z = (abs(u - n1 * n2 / 2) - 0.5) / math.sqrt(variance)
+    return math.erfc(max(z, 0.0) / math.sqrt(2))
+
+
+def verdict(
+    baseline: List[float],
+    current: List[float],
+    speed: float = 1.0,
+    threshold: float = THRESHOLD,
+) -> Dict[str, Any]:
+    """Compare two sample sets; ``speed`` rescales ``current`` to the
+    baseline machine's speed (baseline / current reference time)"""
+    current = [t * speed for t in current]
+    before, after = float(np.median(baseline)), float(np.median(current))
+    change = after / before - 1
+    p = mann_whitney_p(baseline, current)
+    status = "ok"
+    if p < ALPHA and change > threshold:
+        status = "REGRESSION"
+    elif p < ALPHA and change < -threshold:
+        status = "faster"
+    return {
+        "baseline": before,
+        "current": after,
+        "change": change,
+        "p": p,
+        "status": status,
+    }
+
+
+def machine() -> Dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def run(
+    pattern: Optional[str] = None, samples: int = SAMPLES
+) -> Dict[str, List[float]]:
+    """Samples for every case matching ``pattern``, plus the reference"""
+    calls = {
+        name: setup() for name, setup in CASES.items() if not pattern or pattern in name
+    }
+    calls[REFERENCE] = reference_workload
+    return measure(calls, samples)
+
+
+def _us(seconds: float) -> str:
+    return f"{seconds * 1e6:>12.1f}"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Microbenchmarks for hot paths")
+    parser.add_argument("-k", dest="pattern", help="Only cases containing this")
+    parser.add_argument("--save", action="store_true", help="Record as the baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--samples", type=int, default=SAMPLES)
+    parser.add_argument(
+        "--threshold", type=float, default=THRESHOLD, help="Slowdown to flag"
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args.pattern, args.samples)
+    reference = float(np.median(results.pop(REFERENCE)))
+
+    if args.save:
+        stored = {"machine": machine(), "cases": {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as fh:
+                stored["cases"] = json.load(fh)["cases"]
+        for name, samples in results.items():
+            stored["cases"][name] = {"samples": samples, "reference": reference}
+            print(f"{name:<28} {_us(float(np.median(samples)))} us")
+        os.makedirs(os.path.dirname(args.baseline) or ".", exist_ok=True)
+        with open(args.baseline, "w") as fh:
+            json.dump(stored, fh, indent=2)
+            fh.write("\n")
+        print(f"saved baseline to {args.baseline}")
+        return 0
+
+    baseline: Dict[str, Any] = {"cases": {}}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)
+        if baseline.get("machine") != machine():
+            print("warning: baseline was recorded on a different machine or Python")
+    print(f"{'case':<28} {'baseline us':>12} {'current us':>12} {'change':>8} {'p':>8}")
+    regressions = 0
+    for name, samples in results.items():
+        stored = baseline["cases"].get(name)
+        if stored is None:
+            median = _us(float(np.median(samples)))
+            print(f"{name:<28} {'-':>12} {median}   (no baseline)")
+            continue
+        # Times are compared at the baseline machine's speed
+        speed = stored["reference"] / reference
+        result = verdict(stored["samples"], samples, speed, args.threshold)
+        regressions += result["status"] == "REGRESSION"
+        print(
+            f"{name:<28} {_us(result['baseline'])} {_us(result['current'])} "
+            f"{result['change']:>+8.1%} {result['p']:>8.4f}  {result['status']}"
+        )
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""
+Index usage and bloat report for the Supabase database
+
+Lists every user index with its scan counts (since the statistics were last
+reset), size and estimated bloat, and flags indexes that are never scanned
+or were left INVALID by a failed concurrent build.
+
+Bloat is estimated from the planner statistics: the number of pages a
+freshly built B-tree would need for ``reltuples`` entries of the columns'
+average width, compared to the pages the index actually occupies. Indexes
+on expressions and non-B-tree indexes have no estimate. Run ``ANALYZE``
+first for accurate numbers.
+
+Usage (from the backend directory):
+    python -m scripts.index_report [--schema public] [--json]
+"""
+import argparse
+import asyncio
+import math
+from typing import Any, Dict, List, Optional
+
+import orjson
+
+from app.database import Database, db
+
+INDEX_QUERY = """
+SELECT
+    s.schemaname AS schema,
+    s.relname AS table_name,
+    s.indexrelname AS index_name,
+    s.idx_scan,
+    s.idx_tup_read,
+    s.idx_tup_fetch,
+    pg_relation_size(s.indexrelid) AS size_bytes,
+    c.reltuples,
+    c.relpages,
+    am.amname AS method,
+    i.indisunique AS is_unique,
+    i.indisprimary AS is_primary,
+    i.indisvalid AS is_valid,
+    0 = ANY (i.indkey::int2[]) AS has_expression,
+    (
+        SELECT sum(st.avg_width)
+        FROM unnest(i.indkey::int2[]) AS k(attnum)
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum
+        JOIN pg_stats st ON st.schemaname = s.schemaname
+            AND st.tablename = s.relname AND st.attname = a.attname
+    ) AS key_width
+FROM pg_stat_user_indexes s
+JOIN pg_index i ON i.indexrelid = s.indexrelid
+JOIN pg_class c ON c.oid = s.indexrelid
+JOIN pg_am am ON am.oid = c.relam
+WHERE s.schemaname = $1
+ORDER BY pg_relation_size(s.indexrelid) DESC
+"""
+
+SETTINGS_QUERY = """
+SELECT
+    current_setting('block_size')::int AS block_size,
+    (SELECT stats_reset FROM pg_stat_database
+     WHERE datname = current_database()) AS stats_reset
+"""
+
+# B-tree page layout: page header, special space and the default fillfactor
+_PAGE_HEADER = 24
+_BTREE_SPECIAL = 16
+_INDEX_TUPLE_HEADER = 8
+_LINE_POINTER = 4
+_FILLFACTOR = 0.9
+
+
+def _maxalign(size: float) -> int:
+    return int(math.ceil(size / 8.0) * 8)
+
+
+def estimate_bloat(row: Dict[str, Any], block_size: int) -> Optional[float]:
+    """Estimated fraction of a B-tree index's pages that are bloat"""
+    if (
+        row["method"] != "btree"
+        or row["has_expression"]
+        or row["key_width"] is None
+        or row["relpages"] <= 1
+        or row["reltuples"] < 0
+    ):
+        return None
+    tuple_size = _INDEX_TUPLE_HEADER + _maxalign(row["key_width"]) + _LINE_POINTER
+    usable = (block_size - _PAGE_HEADER - _BTREE_SPECIAL) * _FILLFACTOR
+    # One metapage plus the leaf level; inner pages are ignored (~1%)
+    expected = 1 + math.ceil(row["reltuples"] * tuple_size / usable)
+    return max(row["relpages"] - expected, 0) / row["relpages"]
+
+
+def annotate(rows: List[Dict[str, Any]], block_size: int) -> List[Dict[str, Any]]:
+    report = []
+    for row in rows:
+        flags = []
+        if not row["is_valid"]:
+            flags.append("INVALID")
+        if not row["idx_scan"] and not (row["is_unique"] or row["is_primary"]):
+            # Unique indexes enforce constraints even when never scanned
+            flags.append("UNUSED")
+        bloat = estimate_bloat(row, block_size)
+        report.append(
+            {
+                "table": row["table_name"],
+                "index": row["index_name"],
+                "scans": row["idx_scan"],
+                "tuples_read": row["idx_tup_read"],
+                "tuples_fetched": row["idx_tup_fetch"],
+                "size_bytes": row["size_bytes"],
+                "bloat_ratio": None if bloat is None else round(bloat, 3),
+                "bloat_bytes": (
+                    None if bloat is None else int(bloat * row["size_bytes"])
+                ),
+                "flags": flags,
+            }
+        )
+    return report
+
+
+def _size(n: Optional[int]) -> str:
+    if n is None:
+        return "-"
+    for unit in ("B", "kB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return str(n)
+
+
+def format_report(report: List[Dict[str, Any]], stats_reset: Any) -> str:
+    lines = [
+        f"Scan counts since {stats_reset or 'statistics were first collected'}",
+        "",
+        f"{'table':<20} {'index':<44} {'scans':>10} {'size':>10} "
+        f"{'bloat':>7} {'bloat size':>11}  flags",
+    ]
+    for entry in report:
+        bloat = entry["bloat_ratio"]
+        lines.append(
+            f"{entry['table']:<20} {entry['index']:<44} {entry['scans']:>10} "
+            f"{_size(entry['size_bytes']):>10} "
+            f"{'-' if bloat is None else f'{bloat:.0%}':>7} "
+            f"{_size(entry['bloat_bytes']):>11}  {' '.join(entry['flags'])}"
+        )
+    return "\n".join(lines)
+
+
+async def index_report(
+    database: Database = db, schema: str = "public"
+) -> Dict[str, Any]:
+    settings_row = await database.fetch_one(SETTINGS_QUERY)
+    rows = await database.fetch_all(INDEX_QUERY, schema)
+    return {
+        "stats_reset": settings_row["stats_reset"],
+        "indexes": annotate(rows, settings_row["block_size"]),
+    }
+
+
+async def _main(args: argparse.Namespace) -> None:
+    try:
+        report = await index_report(db, args.schema)
+    finally:
+        await db.disconnect()
+    if args.json:
+        print(orjson.dumps(report, option=orjson.OPT_INDENT_2).decode())
+    else:
+        print(format_report(report["indexes"], report["stats_reset"]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report index usage and bloat")
+    parser.add_argument("--schema", default="public")
+    parser.add_argument("--json", action="store_true", help="Machine-readable output")
+    asyncio.run(_main(parser.parse_args()))
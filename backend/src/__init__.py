@@ -0,0 +1,4 @@
+import time
+
+# Process start, for the startup timings in src.core.startup
+STARTED = time.perf_counter()
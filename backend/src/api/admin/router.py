@@ -1,9 +1,38 @@
 """
 Admin-specific endpoints
 """
-from fastapi import APIRouter
+from typing import Optional
 
-router = APIRouter()
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...core.database import get_db
+from ...core.security import require_admin
+from ...jobs import tasks  # registers the built-in jobs
+from ...jobs import cancel, enqueue, list_jobs, registry
+from ...models.job import Job
+from ...schemas.base import APIResponse
+from ...schemas.job import JobCreate, JobResponse
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+def _job(job: Job) -> dict:
+    return JobResponse.model_validate(job).model_dump()
+
+
+async def _enqueue(db: AsyncSession, job_in: JobCreate):
+    spec = registry.get(job_in.kind)
+    if spec is None:
+        return APIResponse.error([f"Unknown job kind: {job_in.kind}"], status_code=400)
+    job = await enqueue(
+        db,
+        job_in.kind,
+        job_in.payload,
+        max_attempts=job_in.max_attempts or spec.max_attempts,
+        delay_seconds=job_in.delay_seconds,
+    )
+    return APIResponse.success(_job(job), status_code=202)
 
 
 @router.get("/users")
@@ -19,12 +48,62 @@ async def system_health():
 
 
 @router.post("/data/import")
-async def import_data():
-    """Import data (admin only)"""
-    return {"message": "Data import - to be implemented"}
+async def import_data(
+    path: str = Query(..., description="CSV file name inside the import directory"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Import data (admin only); runs as a background job"""
+    try:
+        tasks.import_path(path)
+    except ValueError as exc:
+        return APIResponse.error([str(exc)], status_code=400)
+    return await _enqueue(db, JobCreate(kind="import_matches", payload={"path": path}))
 
 
 @router.post("/data/export")
-async def export_data():
-    """Export data (admin only)"""
-    return {"message": "Data export - to be implemented"}
+async def export_data(
+    tournament_id: Optional[str] = Query(None, description="Limit to a tournament"),
+    db: AsyncSession = Depends(get_db),
+):
+    """Export data (admin only); runs as a background job"""
+    payload = {"tournament_id": tournament_id} if tournament_id else {}
+    return await _enqueue(db, JobCreate(kind="export_matches", payload=payload))
+
+
+@router.post("/jobs")
+async def create_job(job_in: JobCreate, db: AsyncSession = Depends(get_db)):
+    """Enqueue a background job"""
+    return await _enqueue(db, job_in)
+
+
+@router.get("/jobs")
+async def get_jobs(
+    status: Optional[str] = Query(None, description="Filter by status"),
+    kind: Optional[str] = Query(None, description="Filter by job kind"),
+    page: int = Query(1, ge=1),
+    size: int = Query(50, ge=1, le=200),
+    db: AsyncSession = Depends(get_db),
+):
+    """List jobs, newest first"""
+    jobs = await list_jobs(db, status, kind, offset=(page - 1) * size, limit=size)
+    return APIResponse.success(
+        [_job(job) for job in jobs], meta={"page": page, "size": size}
+    )
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str, db: AsyncSession = Depends(get_db)):
+    """Job status, progress and result"""
+    job = await db.get(Job, job_id)
+    if job is None:
+        return APIResponse.error(["Job not found"], status_code=404)
+    return APIResponse.success(_job(job))
+
+
+@router.post("/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str, db: AsyncSession = Depends(get_db)):
+    """Cancel a queued job, or ask the worker running it to stop"""
+    job = await cancel(db, job_id)
+    if job is None:
+        return APIResponse.error(["Job not found"], status_code=404)
+    return APIResponse.success(_job(job))
@@ -1,36 +1,143 @@
 """
 Match management endpoints
 """
-from fastapi import APIRouter
+from typing import List, Optional
+
+from fastapi import APIRouter, Body, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...core.database import get_db
+from ...schemas.base import (
+    BULK_MAX_ITEMS,
+    APIResponse,
+    BulkDelete,
+    Fields,
+    PaginationParams,
+    sparse_fields,
+)
+from ...schemas.match import (
+    MatchBulkUpdate,
+    MatchCreate,
+    MatchResponse,
+    MatchUpdate,
+    MatchUpsert,
+)
+from ...services.match import match_service
 
 router = APIRouter()
 
+BulkBody = Body(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+def _match(match, fields: Fields = None) -> dict:
+    if fields is not None:
+        # Already a plain row of just the requested columns
+        return match
+    return MatchResponse.model_validate(match).model_dump()
+
 
 @router.get("/")
-async def list_matches():
+async def list_matches(
+    tournament_id: Optional[str] = Query(None, description="Filter by tournament"),
+    page: int = Query(1, ge=1),
+    size: int = Query(20, ge=1, le=100),
+    fields: Fields = Depends(sparse_fields(MatchResponse)),
+    db: AsyncSession = Depends(get_db),
+):
     """List matches"""
-    return {"message": "List matches - to be implemented"}
+    pagination = PaginationParams(page=page, size=size)
+    if tournament_id:
+        matches = await match_service.get_multi_for_tournament(
+            db, tournament_id, pagination, fields
+        )
+    else:
+        matches = await match_service.get_multi(db, pagination, fields)
+    return APIResponse.success(
+        [_match(m, fields) for m in matches], meta={"page": page, "size": size}
+    )
+
+
+@router.post("/bulk")
+async def create_matches(
+    matches_in: List[MatchCreate] = BulkBody, db: AsyncSession = Depends(get_db)
+):
+    """Create many matches in one transaction (e.g. a full session of bouts)"""
+    matches = await match_service.create_many(db, matches_in)
+    return APIResponse.success(
+        [_match(m) for m in matches], meta={"count": len(matches)}, status_code=201
+    )
+
+
+@router.patch("/bulk")
+async def update_matches(
+    updates: List[MatchBulkUpdate] = BulkBody, db: AsyncSession = Depends(get_db)
+):
+    """Apply partial updates, e.g. record many results, in one transaction"""
+    changes = {
+        item.id: MatchUpdate.model_validate(
+            item.model_dump(exclude_unset=True, exclude={"id"})
+        )
+        for item in updates
+    }
+    matches = await match_service.update_many(db, changes)
+    return APIResponse.success(
+        [_match(m) for m in matches], meta={"count": len(matches)}
+    )
+
+
+@router.put("/bulk")
+async def upsert_matches(
+    matches_in: List[MatchUpsert] = BulkBody, db: AsyncSession = Depends(get_db)
+):
+    """Create matches or overwrite existing ones by ID in one transaction"""
+    matches = await match_service.upsert_many(db, matches_in)
+    return APIResponse.success(
+        [_match(m) for m in matches], meta={"count": len(matches)}
+    )
+
+
+@router.delete("/bulk")
+async def delete_matches(request: BulkDelete, db: AsyncSession = Depends(get_db)):
+    """Delete matches by ID in one transaction"""
+    deleted = await match_service.delete_many(db, request.ids)
+    return APIResponse.success({"deleted": deleted})
 
 
 @router.get("/{match_id}")
-async def get_match(match_id: str):
+async def get_match(
+    match_id: str,
+    fields: Fields = Depends(sparse_fields(MatchResponse)),
+    db: AsyncSession = Depends(get_db),
+):
     """Get match by ID"""
-    return {"message": f"Get match {match_id} - to be implemented"}
+    match = await match_service.get(db, match_id, fields)
+    if match is None:
+        return APIResponse.error(["Match not found"], status_code=404)
+    return APIResponse.success(_match(match, fields))
 
 
 @router.post("/")
-async def create_match():
+async def create_match(match_in: MatchCreate, db: AsyncSession = Depends(get_db)):
     """Create new match"""
-    return {"message": "Create match - to be implemented"}
+    match = await match_service.create(db, match_in)
+    return APIResponse.success(_match(match), status_code=201)
 
 
 @router.put("/{match_id}")
-async def update_match(match_id: str):
-    """Update match"""
-    return {"message": f"Update match {match_id} - to be implemented"}
+async def update_match(
+    match_id: str, match_in: MatchUpdate, db: AsyncSession = Depends(get_db)
+):
+    """Update match, e.g. record its result"""
+    match = await match_service.get(db, match_id)
+    if match is None:
+        return APIResponse.error(["Match not found"], status_code=404)
+    match = await match_service.update(db, match, match_in)
+    return APIResponse.success(_match(match))
 
 
 @router.delete("/{match_id}")
-async def delete_match(match_id: str):
+async def delete_match(match_id: str, db: AsyncSession = Depends(get_db)):
     """Delete match"""
-    return {"message": f"Delete match {match_id} - to be implemented"}
+    if not await match_service.delete(db, match_id):
+        return APIResponse.error(["Match not found"], status_code=404)
+    return APIResponse.success({"id": match_id, "deleted": True})
@@ -1,36 +1,151 @@
 """
 Participant endpoints
 """
-from fastapi import APIRouter
+from typing import List, Optional
+
+from fastapi import APIRouter, Body, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...core.database import get_db
+from ...schemas.base import (
+    BULK_MAX_ITEMS,
+    APIResponse,
+    BulkDelete,
+    Fields,
+    PaginationParams,
+    sparse_fields,
+)
+from ...schemas.participant import (
+    ParticipantBulkUpdate,
+    ParticipantCreate,
+    ParticipantResponse,
+    ParticipantUpdate,
+)
+from ...services.participant import participant_service
 
 router = APIRouter()
 
+BulkBody = Body(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+def _participant(participant, fields: Fields = None) -> dict:
+    if fields is not None:
+        # Already a plain row of just the requested columns
+        return participant
+    return ParticipantResponse.model_validate(participant).model_dump()
+
 
 @router.get("/")
-async def list_participants():
+async def list_participants(
+    tournament_id: Optional[str] = Query(None, description="Filter by tournament"),
+    page: int = Query(1, ge=1),
+    size: int = Query(20, ge=1, le=100),
+    fields: Fields = Depends(sparse_fields(ParticipantResponse)),
+    db: AsyncSession = Depends(get_db),
+):
     """List participants"""
-    return {"message": "List participants - to be implemented"}
+    pagination = PaginationParams(page=page, size=size)
+    if tournament_id:
+        participants = await participant_service.get_multi_for_tournament(
+            db, tournament_id, pagination, fields
+        )
+    else:
+        participants = await participant_service.get_multi(db, pagination, fields)
+    return APIResponse.success(
+        [_participant(item, fields) for item in participants],
+        meta={"page": page, "size": size},
+    )
+
+
+@router.post("/bulk")
+async def create_participants(
+    participants_in: List[ParticipantCreate] = BulkBody,
+    db: AsyncSession = Depends(get_db),
+):
+    """Create many participants in one transaction"""
+    participants = await participant_service.create_many(db, participants_in)
+    return APIResponse.success(
+        [_participant(item) for item in participants],
+        meta={"count": len(participants)},
+        status_code=201,
+    )
+
+
+@router.patch("/bulk")
+async def update_participants(
+    updates: List[ParticipantBulkUpdate] = BulkBody, db: AsyncSession = Depends(get_db)
+):
+    """Apply partial updates to many participants in one transaction"""
+    changes = {
+        item.id: ParticipantUpdate.model_validate(
+            item.model_dump(exclude_unset=True, exclude={"id"})
+        )
+        for item in updates
+    }
+    participants = await participant_service.update_many(db, changes)
+    return APIResponse.success(
+        [_participant(item) for item in participants], meta={"count": len(participants)}
+    )
+
+
+@router.put("/bulk")
+async def upsert_participants(
+    participants_in: List[ParticipantCreate] = BulkBody,
+    db: AsyncSession = Depends(get_db),
+):
+    """Create participants or update existing ones by tournament, weight and name"""
+    participants = await participant_service.upsert_many(db, participants_in)
+    return APIResponse.success(
+        [_participant(item) for item in participants], meta={"count": len(participants)}
+    )
+
+
+@router.delete("/bulk")
+async def delete_participants(request: BulkDelete, db: AsyncSession = Depends(get_db)):
+    """Delete participants by ID in one transaction"""
+    deleted = await participant_service.delete_many(db, request.ids)
+    return APIResponse.success({"deleted": deleted})
 
 
 @router.get("/{participant_id}")
-async def get_participant(participant_id: str):
+async def get_participant(
+    participant_id: str,
+    fields: Fields = Depends(sparse_fields(ParticipantResponse)),
+    db: AsyncSession = Depends(get_db),
+):
     """Get participant by ID"""
-    return {"message": f"Get participant {participant_id} - to be implemented"}
+    participant = await participant_service.get(db, participant_id, fields)
+    if participant is None:
+        return APIResponse.error(["Participant not found"], status_code=404)
+    return APIResponse.success(_participant(participant, fields))
 
 
 @router.post("/")
-async def create_participant():
+async def create_participant(
+    participant_in: ParticipantCreate, db: AsyncSession = Depends(get_db)
+):
     """Create new participant"""
-    return {"message": "Create participant - to be implemented"}
+    participant = await participant_service.create(db, participant_in)
+    return APIResponse.success(_participant(participant), status_code=201)
 
 
 @router.put("/{participant_id}")
-async def update_participant(participant_id: str):
+async def update_participant(
+    participant_id: str,
+    participant_in: ParticipantUpdate,
+    db: AsyncSession = Depends(get_db),
+):
     """Update participant"""
-    return {"message": f"Update participant {participant_id} - to be implemented"}
+    participant = await participant_service.get(db, participant_id)
+    if participant is None:
+        return APIResponse.error(["Participant not found"], status_code=404)
+    participant = await participant_service.update(db, participant, participant_in)
+    return APIResponse.success(_participant(participant))
 
 
 @router.delete("/{participant_id}")
-async def delete_participant(participant_id: str):
+async def delete_participant(participant_id: str, db: AsyncSession = Depends(get_db)):
     """Delete participant"""
-    return {"message": f"Delete participant {participant_id} - to be implemented"}
+    if not await participant_service.delete(db, participant_id):
+        return APIResponse.error(["Participant not found"], status_code=404)
+    return APIResponse.success({"id": participant_id, "deleted": True})
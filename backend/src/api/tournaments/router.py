@@ -1,36 +1,173 @@
 """
 Tournament CRUD endpoints
 """
-from fastapi import APIRouter
+from typing import List, Optional
+
+from fastapi import APIRouter, Body, Depends, Header, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...core.config import settings
+from ...core.database import get_db
+from ...core.events import broker, event_stream
+from ...schemas.base import (
+    BULK_MAX_ITEMS,
+    APIResponse,
+    BulkDelete,
+    Fields,
+    PaginationParams,
+    sparse_fields,
+)
+from ...schemas.tournament import (
+    TournamentBulkUpdate,
+    TournamentCreate,
+    TournamentResponse,
+    TournamentUpdate,
+)
+from ...services.tournament import tournament_service
 
 router = APIRouter()
 
+BulkBody = Body(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+def _tournament(tournament, fields: Fields = None) -> dict:
+    if fields is not None:
+        # Already a plain row of just the requested columns
+        return tournament
+    return TournamentResponse.model_validate(tournament).model_dump()
+
 
 @router.get("/")
-async def list_tournaments():
+async def list_tournaments(
+    year: Optional[int] = Query(None, description="Filter by year"),
+    page: int = Query(1, ge=1),
+    size: int = Query(20, ge=1, le=100),
+    fields: Fields = Depends(sparse_fields(TournamentResponse)),
+    db: AsyncSession = Depends(get_db),
+):
     """List tournaments"""
-    return {"message": "List tournaments - to be implemented"}
+    pagination = PaginationParams(page=page, size=size)
+    if year is not None:
+        tournaments = await tournament_service.get_multi_for_year(
+            db, year, pagination, fields
+        )
+    else:
+        tournaments = await tournament_service.get_multi(db, pagination, fields)
+    return APIResponse.success(
+        [_tournament(item, fields) for item in tournaments],
+        meta={"page": page, "size": size},
+    )
+
+
+@router.post("/bulk")
+async def create_tournaments(
+    tournaments_in: List[TournamentCreate] = BulkBody,
+    db: AsyncSession = Depends(get_db),
+):
+    """Create many tournaments in one transaction"""
+    tournaments = await tournament_service.create_many(db, tournaments_in)
+    return APIResponse.success(
+        [_tournament(item) for item in tournaments],
+        meta={"count": len(tournaments)},
+        status_code=201,
+    )
+
+
+@router.patch("/bulk")
+async def update_tournaments(
+    updates: List[TournamentBulkUpdate] = BulkBody, db: AsyncSession = Depends(get_db)
+):
+    """Apply partial updates to many tournaments in one transaction"""
+    changes = {
+        item.id: TournamentUpdate.model_validate(
+            item.model_dump(exclude_unset=True, exclude={"id"})
+        )
+        for item in updates
+    }
+    tournaments = await tournament_service.update_many(db, changes)
+    return APIResponse.success(
+        [_tournament(item) for item in tournaments], meta={"count": len(tournaments)}
+    )
+
+
+@router.put("/bulk")
+async def upsert_tournaments(
+    tournaments_in: List[TournamentCreate] = BulkBody,
+    db: AsyncSession = Depends(get_db),
+):
+    """Create tournaments or update existing ones matched by name and year"""
+    tournaments = await tournament_service.upsert_many(db, tournaments_in)
+    return APIResponse.success(
+        [_tournament(item) for item in tournaments], meta={"count": len(tournaments)}
+    )
+
+
+@router.delete("/bulk")
+async def delete_tournaments(request: BulkDelete, db: AsyncSession = Depends(get_db)):
+    """Delete tournaments by ID in one transaction"""
+    deleted = await tournament_service.delete_many(db, request.ids)
+    return APIResponse.success({"deleted": deleted})
 
 
 @router.get("/{tournament_id}")
-async def get_tournament(tournament_id: str):
+async def get_tournament(
+    tournament_id: str,
+    fields: Fields = Depends(sparse_fields(TournamentResponse)),
+    db: AsyncSession = Depends(get_db),
+):
     """Get tournament by ID"""
-    return {"message": f"Get tournament {tournament_id} - to be implemented"}
+    tournament = await tournament_service.get(db, tournament_id, fields)
+    if tournament is None:
+        return APIResponse.error(["Tournament not found"], status_code=404)
+    return APIResponse.success(_tournament(tournament, fields))
 
 
 @router.post("/")
-async def create_tournament():
+async def create_tournament(
+    tournament_in: TournamentCreate, db: AsyncSession = Depends(get_db)
+):
     """Create new tournament"""
-    return {"message": "Create tournament - to be implemented"}
+    tournament = await tournament_service.create(db, tournament_in)
+    return APIResponse.success(_tournament(tournament), status_code=201)
 
 
 @router.put("/{tournament_id}")
-async def update_tournament(tournament_id: str):
+async def update_tournament(
+    tournament_id: str,
+    tournament_in: TournamentUpdate,
+    db: AsyncSession = Depends(get_db),
+):
     """Update tournament"""
-    return {"message": f"Update tournament {tournament_id} - to be implemented"}
+    tournament = await tournament_service.get(db, tournament_id)
+    if tournament is None:
+        return APIResponse.error(["Tournament not found"], status_code=404)
+    tournament = await tournament_service.update(db, tournament, tournament_in)
+    return APIResponse.success(_tournament(tournament))
 
 
 @router.delete("/{tournament_id}")
-async def delete_tournament(tournament_id: str):
+async def delete_tournament(tournament_id: str, db: AsyncSession = Depends(get_db)):
     """Delete tournament"""
-    return {"message": f"Delete tournament {tournament_id} - to be implemented"}
+    if not await tournament_service.delete(db, tournament_id):
+        return APIResponse.error(["Tournament not found"], status_code=404)
+    return APIResponse.success({"id": tournament_id, "deleted": True})
+
+
+@router.get("/{tournament_id}/events")
+async def tournament_events(
+    tournament_id: str,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID"),
+    since: Optional[str] = Query(
+        None, description="Resume after this event id (when headers can't be set)"
+    ),
+):
+    """Live bracket updates as Server-Sent Events"""
+    subscription = broker.subscribe(
+        tournament_id, last_event_id if last_event_id is not None else since
+    )
+    return StreamingResponse(
+        event_stream(subscription, settings.sse_heartbeat_seconds),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -38,6 +38,27 @@ class Settings(BaseSettings):
     api_version: str = "1.0"
     api_description: str = "Backend API for wrestling tournament management platform"
 
+    # Live updates (Server-Sent Events)
+    sse_queue_size: int = 256  # events buffered per client before it is dropped
+    sse_replay_size: int = 1024  # events kept per tournament for Last-Event-ID
+    sse_heartbeat_seconds: float = 15.0
+    sse_retry_ms: int = 3000
+
+    # Startup
+    lazy_startup: bool = False  # defer router imports and warm-up past launch
+    pool_warm_connections: int = 2  # connections opened before /ready passes
+    warm_up_retry_seconds: float = 1.0  # first delay after a failed warm-up
+    warm_up_retry_max_seconds: float = 30.0  # the delay doubles up to this
+
+    # Background jobs
+    job_concurrency: int = 2  # jobs run at once by each worker process
+    job_poll_seconds: float = 1.0
+    job_lease_seconds: float = 60.0  # running jobs without a heartbeat are requeued
+    job_max_attempts: int = 3
+    job_retry_backoff_seconds: float = 10.0
+    export_dir: str = "exports"
+    import_dir: str = "imports"  # import_matches only reads files under here
+
     @property
     def cors_origins_list(self) -> List[str]:
         """Convert CORS origins string to list"""
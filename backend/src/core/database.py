@@ -41,7 +41,8 @@ async def init_db():
     """Initialize database tables"""
     async with engine.begin() as conn:
         # Import all models here to ensure they are registered
-        # from ..models import *  # noqa
+        from .. import models  # noqa: F401
+
         await conn.run_sync(Base.metadata.create_all)
 
 
@@ -0,0 +1,175 @@
+"""
+In-process event broker for live updates
+
+Publishers hand an event to the broker once; it is encoded to a
+Server-Sent Events frame a single time and fanned out to every subscriber of
+the topic (a tournament). Each subscriber reads from its own bounded queue,
+so a slow client never blocks the publisher or other clients: when a queue
+is full the subscriber is dropped, and its stream ends after the events
+already queued. The client then reconnects with ``Last-Event-ID`` and the
+missed events are replayed from a bounded per-topic history; if they have
+already left the history the client receives a ``reset`` event and should
+refetch the full state.
+
+Event ids are ``<epoch>:<sequence>``. Sequences restart with the process and
+each worker process numbers its own events, so an id from another epoch (a
+restart, or a reconnect that reached a different worker) cannot be replayed
+from and gets a ``reset`` as well.
+"""
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, Optional, Set
+from uuid import uuid4
+
+from .config import settings
+from .responses import dumps
+
+RESET = "reset"
+
+
+@dataclass(frozen=True)
+class Event:
+    """A published event, pre-rendered as an SSE frame"""
+
+    id: int  # sequence within the topic and the broker's epoch
+    frame: bytes
+
+
+def _frame(epoch: str, event_id: int, event: str, payload: Any) -> bytes:
+    return b"id: %s:%d\nevent: %s\ndata: %s\n\n" % (
+        epoch.encode(),
+        event_id,
+        event.encode(),
+        dumps(payload),
+    )
+
+
+class Subscription:
+    """One subscriber's bounded view of a topic"""
+
+    def __init__(self, topic: str, queue_size: int):
+        self.topic = topic
+        self.queue: asyncio.Queue = asyncio.Queue(queue_size)
+        self.dropped = False
+
+    @property
+    def closed(self) -> bool:
+        return self.dropped and self.queue.empty()
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Event]:
+        """Next event, or ``None`` on timeout or once the subscription closed"""
+        if self.closed:
+            return None
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class _Topic:
+    def __init__(self, replay_size: int):
+        self.last_id = 0
+        self.history: Deque[Event] = deque(maxlen=replay_size)
+        self.subscribers: Set[Subscription] = set()
+
+
+class EventBroker:
+    """Fans events out to subscribers per topic"""
+
+    def __init__(self, queue_size: int, replay_size: int, epoch: Optional[str] = None):
+        self.queue_size = queue_size
+        self.replay_size = replay_size
+        self.epoch = epoch or uuid4().hex[:12]
+        self._topics: Dict[str, _Topic] = {}
+
+    def _topic(self, name: str) -> _Topic:
+        topic = self._topics.get(name)
+        if topic is None:
+            topic = self._topics[name] = _Topic(self.replay_size)
+        return topic
+
+    def publish(self, topic_name: str, event: str, payload: Any) -> Event:
+        """Record an event and queue it for every subscriber without waiting"""
+        topic = self._topic(topic_name)
+        topic.last_id += 1
+        published = Event(
+            topic.last_id, _frame(self.epoch, topic.last_id, event, payload)
+        )
+        topic.history.append(published)
+        for subscription in list(topic.subscribers):
+            try:
+                subscription.queue.put_nowait(published)
+            except asyncio.QueueFull:
+                self._drop(topic, subscription)
+        return published
+
+    def _sequence(self, event_id: str) -> Optional[int]:
+        """The sequence of an id from this broker's epoch, else ``None``"""
+        epoch, _, sequence = event_id.rpartition(":")
+        if epoch != self.epoch or not sequence.isdigit():
+            return None
+        return int(sequence)
+
+    def subscribe(
+        self, topic_name: str, last_event_id: Optional[str] = None
+    ) -> Subscription:
+        """Subscribe, first replaying what a reconnecting client missed"""
+        topic = self._topic(topic_name)
+        subscription = Subscription(topic_name, self.queue_size)
+        last = None if last_event_id is None else self._sequence(last_event_id)
+        if last_event_id is not None and last != topic.last_id:
+            missed = [e for e in topic.history if last is not None and e.id > last]
+            complete = (
+                last is not None
+                and last < topic.last_id
+                and missed
+                and missed[0].id == last + 1
+            )
+            if complete and len(missed) <= self.queue_size:
+                for event in missed:
+                    subscription.queue.put_nowait(event)
+            else:
+                reset = Event(
+                    topic.last_id,
+                    _frame(
+                        self.epoch,
+                        topic.last_id,
+                        RESET,
+                        {"last_event_id": f"{self.epoch}:{topic.last_id}"},
+                    ),
+                )
+                subscription.queue.put_nowait(reset)
+        topic.subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        topic = self._topics.get(subscription.topic)
+        if topic is not None:
+            topic.subscribers.discard(subscription)
+
+    def subscriber_count(self, topic_name: str) -> int:
+        topic = self._topics.get(topic_name)
+        return len(topic.subscribers) if topic else 0
+
+    def _drop(self, topic: _Topic, subscription: Subscription) -> None:
+        subscription.dropped = True
+        topic.subscribers.discard(subscription)
+
+
+broker = EventBroker(settings.sse_queue_size, settings.sse_replay_size)
+
+
+async def event_stream(subscription: Subscription, heartbeat: float):
+    """SSE body for a subscription: frames, keep-alive comments, then close"""
+    try:
+        yield b"retry: %d\n\n" % settings.sse_retry_ms
+        while not subscription.closed:
+            event = await subscription.get(timeout=heartbeat)
+            if event is None:
+                if not subscription.closed:
+                    yield b": keep-alive\n\n"
+                continue
+            yield event.frame
+    finally:
+        broker.unsubscribe(subscription)
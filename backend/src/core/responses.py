@@ -0,0 +1,57 @@
+"""
+High-performance JSON responses
+"""
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+API_VERSION = "1.0"
+
+
+def _default(obj: Any) -> Any:
+    """Fallback for types orjson does not serialize natively"""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="python")
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize content straight to JSON bytes"""
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSON response rendered with orjson.
+
+    Dates, datetimes and UUIDs are serialized natively; Pydantic models are
+    dumped without a second pass through FastAPI's ``jsonable_encoder``.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def envelope(
+    data: Any,
+    meta: Optional[Dict[str, Any]] = None,
+    errors: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Build the standard ``data``/``meta``/``errors`` envelope as a plain dict.
+
+    The timestamp is left as an aware ``datetime`` so orjson renders it
+    (with a ``Z`` suffix) during serialization instead of formatting it here.
+    """
+    base_meta = {"timestamp": datetime.now(timezone.utc), "version": API_VERSION}
+    if meta:
+        base_meta.update(meta)
+    return {"data": data, "meta": base_meta, "errors": errors}
@@ -2,21 +2,31 @@
 Security utilities for JWT and password handling
 """
 from datetime import datetime, timedelta
-from typing import Any, Union
+from functools import lru_cache
+from typing import Any, Optional, Union
 
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 
 from .config import settings
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# jose and passlib are imported on first use so they stay off the startup path
+
+
+@lru_cache(maxsize=None)
+def password_context():
+    """Password hashing context"""
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
 def create_access_token(
     subject: Union[str, Any], expires_delta: timedelta = None
 ) -> str:
     """Create JWT access token"""
+    from jose import jwt
+
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
@@ -31,6 +41,8 @@ def create_access_token(
 
 def verify_token(token: str) -> Union[str, None]:
     """Verify JWT token and return subject"""
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(
             token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm]
@@ -42,9 +54,29 @@ def verify_token(token: str) -> Union[str, None]:
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify password against hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
     """Generate password hash"""
-    return pwd_context.hash(password)
+    return password_context().hash(password)
+
+
+def require_admin(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(
+        HTTPBearer(auto_error=False)
+    ),
+) -> str:
+    """Dependency that admits only a bearer token issued to the admin user"""
+    subject = verify_token(credentials.credentials) if credentials else None
+    if subject is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    if subject != settings.admin_email:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required"
+        )
+    return subject
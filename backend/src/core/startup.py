@@ -0,0 +1,172 @@
+"""
+Startup phases, readiness and warm-up
+
+The app starts in one of two modes:
+
+* eager (default): routers are imported with ``src.main`` and the lifespan
+  warms everything before the server accepts connections;
+* lazy (``LAZY_STARTUP=true``): ``src.main`` imports only FastAPI, so the
+  server answers ``/health`` within moments of launch. Routers, SQLAlchemy,
+  the database pool and the JWT/password libraries are loaded by a background
+  warm-up, and ``/ready`` reports 503 until it finishes.
+
+Either way each phase is timed and reported by ``/ready``, so a slow deploy
+can be traced to imports, pool creation or statement warm-up. A failed
+warm-up (e.g. Postgres not reachable yet) is retried in the background with
+backoff while the app keeps serving, and ``/ready`` passes once it succeeds.
+"""
+import asyncio
+import importlib
+import time
+from contextlib import AsyncExitStack, contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+from fastapi import FastAPI
+
+from .. import STARTED
+from .config import settings
+
+# (module, prefix, tags) of every API router, in mount order
+ROUTERS: Sequence[Tuple[str, str, Sequence[str]]] = (
+    ("src.api.auth.router", "/api/auth", ["authentication"]),
+    ("src.api.tournaments.router", "/api/tournaments", ["tournaments"]),
+    ("src.api.matches.router", "/api/matches", ["matches"]),
+    ("src.api.participants.router", "/api/participants", ["participants"]),
+    ("src.api.admin.router", "/api/admin", ["admin"]),
+)
+
+_PLACEHOLDER_DATABASE = "postgresql+asyncpg://user:password"
+
+
+@dataclass
+class Startup:
+    started: float = STARTED
+    # Phase name -> milliseconds, in the order the phases ran
+    phases: Dict[str, float] = field(default_factory=dict)
+    ready: bool = False
+    error: Optional[str] = None
+    routers_mounted: bool = False
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = round((time.perf_counter() - started) * 1000, 1)
+            print(f"Startup phase {name}: {self.phases[name]} ms")
+
+    def mark(self, name: str) -> None:
+        """Record a phase that ran from process import until now"""
+        self.phases[name] = round((time.perf_counter() - self.started) * 1000, 1)
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "status": "ready" if self.ready else "starting",
+            "mode": "lazy" if settings.lazy_startup else "eager",
+            "phases_ms": dict(self.phases),
+            "uptime_ms": round((time.perf_counter() - self.started) * 1000, 1),
+            "error": self.error,
+        }
+
+
+startup = Startup()
+
+
+def database_configured() -> bool:
+    return not settings.database_url.startswith(_PLACEHOLDER_DATABASE)
+
+
+def include_routers(app: FastAPI) -> None:
+    for module, prefix, tags in ROUTERS:
+        app.include_router(
+            importlib.import_module(module).router, prefix=prefix, tags=list(tags)
+        )
+    # Routes mounted after the schema was generated must show up in /docs
+    app.openapi_schema = None
+
+
+async def load_routers(app: FastAPI) -> None:
+    """Import the routers off the event loop, then mount them on it"""
+    for module, _, _ in ROUTERS:
+        await asyncio.to_thread(importlib.import_module, module)
+    include_routers(app)
+
+
+async def warm_pool() -> None:
+    """Open pooled connections and run the hot read statements on each.
+
+    asyncpg prepares statements per connection and SQLAlchemy caches their
+    compiled form, so the first real requests skip both.
+    """
+    from ..schemas.base import PaginationParams
+    from ..services.match import match_service
+    from ..services.participant import participant_service
+    from ..services.tournament import tournament_service
+    from .database import AsyncSession, engine
+
+    # NullPool and SQLite's static pools have no size to fill
+    size = getattr(engine.pool, "size", lambda: 1)()
+    count = max(min(settings.pool_warm_connections, size), 1)
+    first_page = PaginationParams(size=1)
+    async with AsyncExitStack() as stack:
+        with startup.phase("open pool"):
+            connections = await asyncio.gather(
+                *(stack.enter_async_context(engine.connect()) for _ in range(count))
+            )
+        with startup.phase("warm statements"):
+            for connection in connections:
+                session = AsyncSession(bind=connection)
+                for service in (tournament_service, match_service, participant_service):
+                    await service.get_multi(session, first_page)
+                    await service.count(session)
+                await session.close()
+
+
+def warm_caches() -> None:
+    """Load the JWT and password-hashing libraries ahead of the first login"""
+    from .security import create_access_token, password_context, verify_token
+
+    password_context()
+    verify_token(create_access_token("warm-up"))
+
+
+async def warm_up(app: FastAPI) -> bool:
+    """Everything that has to happen before the app reports ready.
+
+    One attempt; returns whether it succeeded. Safe to run again after a
+    failure.
+    """
+    try:
+        if settings.lazy_startup and not startup.routers_mounted:
+            with startup.phase("import routers"):
+                await load_routers(app)
+            startup.routers_mounted = True
+        if database_configured():
+            from .database import init_db
+
+            with startup.phase("init database"):
+                await init_db()
+            await warm_pool()
+        with startup.phase("warm caches"):
+            await asyncio.to_thread(warm_caches)
+    except Exception as e:
+        startup.error = f"{type(e).__name__}: {e}"
+        print(f"Startup warm-up failed: {startup.error}")
+        return False
+    startup.error = None
+    startup.ready = True
+    startup.mark("ready")
+    return True
+
+
+async def keep_warming(app: FastAPI) -> None:
+    """Run ``warm_up`` until it succeeds, backing off after each failure"""
+    delay = settings.warm_up_retry_seconds
+    while not startup.ready:
+        if startup.error is not None:
+            print(f"Retrying warm-up in {delay:g} s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, settings.warm_up_retry_max_seconds)
+        await warm_up(app)
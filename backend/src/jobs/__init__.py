@@ -0,0 +1,15 @@
+"""
+Background jobs stored in the database and run by worker processes
+"""
+from .queue import cancel, enqueue, list_jobs
+from .registry import JobCancelled, JobContext, JobRegistry, registry
+
+__all__ = [
+    "JobCancelled",
+    "JobContext",
+    "JobRegistry",
+    "cancel",
+    "enqueue",
+    "list_jobs",
+    "registry",
+]
@@ -0,0 +1,225 @@
+"""
+Durable job queue stored in the ``jobs`` table
+
+Workers claim queued jobs with ``SELECT ... FOR UPDATE SKIP LOCKED`` (on
+PostgreSQL; other databases ignore the locking clause) followed by a
+conditional ``UPDATE ... WHERE status = 'queued'``, so two workers can never
+both start the same job. Per-kind concurrency caps are counted and claimed
+under a ``pg_advisory_xact_lock`` for the kind, so concurrent workers cannot
+overshoot them either.
+"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.config import settings
+from ..models.job import FINISHED, Job, JobStatus
+from .registry import JobRegistry
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+async def enqueue(
+    db: AsyncSession,
+    kind: str,
+    payload: Optional[Dict[str, Any]] = None,
+    max_attempts: Optional[int] = None,
+    delay_seconds: float = 0.0,
+) -> Job:
+    """Add a job to the queue"""
+    job = Job(
+        kind=kind,
+        status=JobStatus.QUEUED.value,
+        payload=payload or {},
+        max_attempts=max_attempts or settings.job_max_attempts,
+        run_after=utcnow() + timedelta(seconds=delay_seconds),
+    )
+    db.add(job)
+    await db.commit()
+    await db.refresh(job)
+    return job
+
+
+async def list_jobs(
+    db: AsyncSession,
+    status: Optional[str] = None,
+    kind: Optional[str] = None,
+    offset: int = 0,
+    limit: int = 50,
+) -> List[Job]:
+    query = select(Job).order_by(Job.created_at.desc(), Job.id)
+    if status:
+        query = query.where(Job.status == status)
+    if kind:
+        query = query.where(Job.kind == kind)
+    result = await db.execute(query.offset(offset).limit(limit))
+    return result.scalars().all()
+
+
+async def cancel(db: AsyncSession, job_id: str) -> Optional[Job]:
+    """Cancel a queued job now, or flag a running one for its worker"""
+    job = await db.get(Job, job_id)
+    if job is None or job.status in FINISHED:
+        return job
+    if job.status == JobStatus.QUEUED.value:
+        job.status = JobStatus.CANCELLED.value
+        job.finished_at = utcnow()
+    job.cancel_requested = True
+    await db.commit()
+    await db.refresh(job)
+    return job
+
+
+async def claim(
+    db: AsyncSession, worker_id: str, limit: int, registry: JobRegistry
+) -> List[Job]:
+    """Atomically move up to ``limit`` due jobs to running for ``worker_id``"""
+    if limit <= 0:
+        return []
+    if db.bind.dialect.name == "postgresql":
+        # Hold a transaction lock per capped kind so no other worker can claim
+        # between the running count below and this transaction's commit
+        for kind in sorted(registry.specs):
+            if registry.specs[kind].concurrency is not None:
+                key = func.hashtext(f"jobs:{kind}")
+                await db.execute(select(func.pg_advisory_xact_lock(key)))
+    running = dict(
+        (
+            await db.execute(
+                select(Job.kind, func.count())
+                .where(Job.status == JobStatus.RUNNING.value)
+                .group_by(Job.kind)
+            )
+        ).all()
+    )
+    room = {}
+    for kind, spec in registry.specs.items():
+        if spec.concurrency is None:
+            room[kind] = limit
+        elif spec.concurrency > running.get(kind, 0):
+            room[kind] = spec.concurrency - running.get(kind, 0)
+    if not room:
+        return []
+
+    now = utcnow()
+    candidates = (
+        await db.execute(
+            select(Job.id, Job.kind)
+            .where(
+                Job.status == JobStatus.QUEUED.value,
+                Job.kind.in_(list(room)),
+                Job.run_after <= now,
+            )
+            .order_by(Job.run_after, Job.created_at)
+            .limit(limit * 4)
+            .with_for_update(skip_locked=True)
+        )
+    ).all()
+
+    claimed = []
+    for job_id, kind in candidates:
+        if len(claimed) >= limit or room[kind] <= 0:
+            continue
+        result = await db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.status == JobStatus.QUEUED.value)
+            .values(
+                status=JobStatus.RUNNING.value,
+                locked_by=worker_id,
+                heartbeat_at=now,
+                started_at=func.coalesce(Job.started_at, now),
+                attempts=Job.attempts + 1,
+                error=None,
+            )
+        )
+        if result.rowcount == 1:
+            room[kind] -= 1
+            claimed.append(job_id)
+    await db.commit()
+    if not claimed:
+        return []
+    jobs = await db.execute(select(Job).where(Job.id.in_(claimed)))
+    return jobs.scalars().all()
+
+
+async def heartbeat(db: AsyncSession, worker_id: str, job_ids: List[str]) -> List[str]:
+    """Extend the lease on running jobs; returns those asked to cancel"""
+    if not job_ids:
+        return []
+    await db.execute(
+        update(Job)
+        .where(Job.id.in_(job_ids), Job.locked_by == worker_id)
+        .values(heartbeat_at=utcnow())
+    )
+    await db.commit()
+    result = await db.execute(
+        select(Job.id).where(Job.id.in_(job_ids), Job.cancel_requested.is_(True))
+    )
+    return list(result.scalars())
+
+
+async def finish(
+    db: AsyncSession,
+    job_id: str,
+    status: JobStatus,
+    result: Optional[Dict[str, Any]] = None,
+    error: Optional[str] = None,
+) -> None:
+    values = {"status": status.value, "finished_at": utcnow(), "locked_by": None}
+    if status == JobStatus.SUCCEEDED:
+        values.update(progress=1.0, result=result)
+    if error is not None:
+        values["error"] = error
+    await db.execute(update(Job).where(Job.id == job_id).values(**values))
+    await db.commit()
+
+
+async def retry_or_fail(db: AsyncSession, job: Job, error: str) -> JobStatus:
+    """Requeue with exponential backoff, or fail once attempts are used up"""
+    if job.attempts >= job.max_attempts:
+        await finish(db, job.id, JobStatus.FAILED, error=error)
+        return JobStatus.FAILED
+    backoff = settings.job_retry_backoff_seconds * 2 ** (job.attempts - 1)
+    await db.execute(
+        update(Job)
+        .where(Job.id == job.id)
+        .values(
+            status=JobStatus.QUEUED.value,
+            locked_by=None,
+            error=error,
+            run_after=utcnow() + timedelta(seconds=backoff),
+        )
+    )
+    await db.commit()
+    return JobStatus.QUEUED
+
+
+async def release(db: AsyncSession, job_id: str) -> None:
+    """Hand an interrupted job back to the queue without using an attempt"""
+    await db.execute(
+        update(Job)
+        .where(Job.id == job_id)
+        .values(
+            status=JobStatus.QUEUED.value,
+            locked_by=None,
+            attempts=Job.attempts - 1,
+        )
+    )
+    await db.commit()
+
+
+async def recover_stale(db: AsyncSession, lease_seconds: float) -> int:
+    """Requeue running jobs whose worker stopped sending heartbeats"""
+    expired = utcnow() - timedelta(seconds=lease_seconds)
+    stale = or_(Job.heartbeat_at.is_(None), Job.heartbeat_at < expired)
+    result = await db.execute(
+        update(Job)
+        .where(Job.status == JobStatus.RUNNING.value, stale)
+        .values(status=JobStatus.QUEUED.value, locked_by=None, run_after=utcnow())
+    )
+    await db.commit()
+    return result.rowcount
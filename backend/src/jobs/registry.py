@@ -0,0 +1,105 @@
+"""
+Job handlers and the context they run with
+"""
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from ..models.job import Job
+
+Handler = Callable[["JobContext", Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]]
+
+
+class JobCancelled(Exception):
+    """Raised inside a handler once cancellation has been requested"""
+
+
+@dataclass
+class JobSpec:
+    kind: str
+    handler: Handler
+    max_attempts: Optional[int] = None
+    concurrency: Optional[int] = None  # running jobs of this kind, across workers
+
+
+class JobRegistry:
+    """Maps job kinds to their handlers"""
+
+    def __init__(self):
+        self._specs: Dict[str, JobSpec] = {}
+
+    def job(
+        self,
+        kind: str,
+        max_attempts: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ):
+        """Register an ``async def handler(ctx, payload)`` for ``kind``"""
+
+        def register(handler: Handler) -> Handler:
+            self._specs[kind] = JobSpec(kind, handler, max_attempts, concurrency)
+            return handler
+
+        return register
+
+    def get(self, kind: str) -> Optional[JobSpec]:
+        return self._specs.get(kind)
+
+    def __contains__(self, kind: str) -> bool:
+        return kind in self._specs
+
+    @property
+    def specs(self) -> Dict[str, JobSpec]:
+        return dict(self._specs)
+
+
+registry = JobRegistry()
+
+
+class JobContext:
+    """Handed to a running handler for progress reporting and cancellation"""
+
+    def __init__(
+        self,
+        job_id: str,
+        attempt: int,
+        sessions: async_sessionmaker,
+        min_interval: float = 0.5,
+    ):
+        self.job_id = job_id
+        self.attempt = attempt
+        self._sessions = sessions
+        self._min_interval = min_interval
+        self._last_report = 0.0
+
+    async def progress(
+        self, done: float, total: Optional[float] = None, message: str = None
+    ) -> None:
+        """Record progress (``done / total``, or a 0-1 fraction).
+
+        Writes are throttled; raises ``JobCancelled`` once an admin has
+        cancelled the job, so long loops stop at their next report.
+        """
+        fraction = done / total if total else done
+        now = time.monotonic()
+        if now - self._last_report < self._min_interval and fraction < 1:
+            return
+        self._last_report = now
+        async with self._sessions() as session:
+            await session.execute(
+                update(Job)
+                .where(Job.id == self.job_id)
+                .values(progress=min(max(fraction, 0.0), 1.0), message=message)
+            )
+            await session.commit()
+            if await self.cancel_requested(session):
+                raise JobCancelled()
+
+    async def cancel_requested(self, session: AsyncSession) -> bool:
+        result = await session.execute(
+            select(Job.cancel_requested).where(Job.id == self.job_id)
+        )
+        return bool(result.scalar())
@@ -0,0 +1,101 @@
+"""
+Built-in background jobs: match import/export and analytics rebuilds
+"""
+import asyncio
+import csv
+import os
+from typing import Any, Dict
+
+from sqlalchemy import func, select
+
+from ..core.config import settings
+from ..core.database import AsyncSessionLocal
+from ..models.match import Match
+from ..schemas.match import MatchCreate, MatchResponse
+from .registry import JobContext, registry
+
+BATCH_SIZE = 1000
+EXPORT_FIELDS = list(MatchResponse.model_fields)
+
+
+@registry.job("export_matches", concurrency=2)
+async def export_matches(ctx: JobContext, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Write matches (optionally one tournament's) to a CSV file"""
+    tournament_id = payload.get("tournament_id")
+    os.makedirs(settings.export_dir, exist_ok=True)
+    path = os.path.join(settings.export_dir, f"matches-{ctx.job_id}.csv")
+
+    async with AsyncSessionLocal() as db:
+        query = select(Match)
+        if tournament_id:
+            query = query.where(Match.tournament_id == tournament_id)
+        total = await db.scalar(select(func.count()).select_from(query.subquery()))
+        written, last_id = 0, None
+        with open(path, "w", newline="") as fh:
+            writer = csv.DictWriter(fh, fieldnames=EXPORT_FIELDS)
+            writer.writeheader()
+            while True:
+                page = query.order_by(Match.id).limit(BATCH_SIZE)
+                if last_id is not None:
+                    page = page.where(Match.id > last_id)
+                matches = (await db.execute(page)).scalars().all()
+                if not matches:
+                    break
+                for match in matches:
+                    writer.writerow(MatchResponse.model_validate(match).model_dump())
+                written += len(matches)
+                last_id = matches[-1].id
+                await ctx.progress(written, total, f"Exported {written} matches")
+    return {"path": path, "rows": written}
+
+
+def import_path(name: str) -> str:
+    """Resolve ``name`` inside the import directory, refusing anything outside it"""
+    root = os.path.realpath(settings.import_dir)
+    path = os.path.realpath(os.path.join(root, name))
+    if os.path.commonpath([root, path]) != root or path == root:
+        raise ValueError(f"Import files must be inside {settings.import_dir}")
+    return path
+
+
+@registry.job("import_matches", max_attempts=1, concurrency=1)
+async def import_matches(ctx: JobContext, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Load matches from a CSV file in ``import_dir`` with ``MatchCreate`` columns"""
+    with open(import_path(payload["path"]), newline="") as fh:
+        rows = [
+            MatchCreate.model_validate({k: v or None for k, v in row.items()})
+            for row in csv.DictReader(fh)
+        ]
+    async with AsyncSessionLocal() as db:
+        for start in range(0, len(rows), BATCH_SIZE):
+            batch = rows[start : start + BATCH_SIZE]
+            db.add_all(Match(**row.model_dump()) for row in batch)
+            await db.commit()
+            done = start + len(batch)
+            await ctx.progress(done, len(rows), f"Imported {done} matches")
+    return {"rows": len(rows)}
+
+
+@registry.job("rebuild_stats", max_attempts=2, concurrency=1)
+async def rebuild_stats(ctx: JobContext, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild ratings, leaderboards and team scores from the match history"""
+    from app.analytics.leaderboards import build_leaderboards, leaderboard_store
+    from app.analytics.ratings import EloEngine, rating_store
+    from app.analytics.snapshot import load_snapshot
+    from app.analytics.team_scores import backfill
+    from app.config import settings as app_settings
+    from app.database import db
+
+    snapshot = await load_snapshot(db)
+    await ctx.progress(1, 4, f"Loaded {len(snapshot)} matches")
+    book = await asyncio.to_thread(EloEngine().rebuild, snapshot)
+    rating_store.save(book)
+    await ctx.progress(2, 4, "Rebuilt ratings")
+    boards = await asyncio.to_thread(
+        build_leaderboards, snapshot, app_settings.leaderboard_size
+    )
+    leaderboard_store.save(boards)
+    await ctx.progress(3, 4, "Rebuilt leaderboards")
+    scored = await asyncio.to_thread(backfill, snapshot, payload.get("workers"))
+    await ctx.progress(4, 4, "Scored tournaments")
+    return {"matches": len(snapshot), "wrestlers": len(book.persons), "scored": scored}
@@ -0,0 +1,153 @@
+"""
+Job worker processes
+
+Each worker process runs up to ``concurrency`` jobs at a time on its own
+event loop, polling the ``jobs`` table for work, sending heartbeats for the
+jobs it holds and cancelling any that an admin asked to stop. Failed jobs are
+retried with exponential backoff; jobs held by a worker that died are
+requeued once their lease expires.
+
+Usage (from the backend directory):
+    python -m src.jobs.worker [--processes N] [--concurrency N]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import signal
+import socket
+import traceback
+from typing import Dict, Optional
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from ..core.config import settings
+from ..core.database import AsyncSessionLocal
+from ..models.job import Job, JobStatus
+from . import queue
+from .registry import JobCancelled, JobContext, JobRegistry, registry
+
+LOST = "Gave up after the worker running it was lost"
+FAILED = "job failed, see the worker log"
+
+
+class Worker:
+    """Claims and runs jobs from one event loop"""
+
+    def __init__(
+        self,
+        sessions: async_sessionmaker = AsyncSessionLocal,
+        jobs: JobRegistry = registry,
+        concurrency: int = settings.job_concurrency,
+        poll_seconds: float = settings.job_poll_seconds,
+        lease_seconds: float = settings.job_lease_seconds,
+        worker_id: Optional[str] = None,
+    ):
+        self.sessions = sessions
+        self.jobs = jobs
+        self.concurrency = concurrency
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._running: Dict[str, asyncio.Task] = {}
+        self._stopping = False
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Work until ``stop`` is set, then hand unfinished jobs back"""
+        while not stop.is_set():
+            await self.tick()
+            try:
+                await asyncio.wait_for(stop.wait(), self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+        self._stopping = True
+        for task in self._running.values():
+            task.cancel()
+        await asyncio.gather(*self._running.values(), return_exceptions=True)
+
+    async def tick(self) -> None:
+        """One scheduling pass: recover, heartbeat, cancel, claim"""
+        async with self.sessions() as db:
+            await queue.recover_stale(db, self.lease_seconds)
+            for job_id in await queue.heartbeat(
+                db, self.worker_id, list(self._running)
+            ):
+                self._running[job_id].cancel()
+            free = self.concurrency - len(self._running)
+            for job in await queue.claim(db, self.worker_id, free, self.jobs):
+                task = asyncio.create_task(self.execute(job))
+                self._running[job.id] = task
+                task.add_done_callback(lambda _, job_id=job.id: self._done(job_id))
+
+    async def drain(self) -> None:
+        """Run until no job is due or running (used by tests and one-off runs)"""
+        while True:
+            await self.tick()
+            if not self._running:
+                return
+            await asyncio.wait(list(self._running.values()))
+
+    def _done(self, job_id: str) -> None:
+        self._running.pop(job_id, None)
+
+    async def execute(self, job: Job) -> None:
+        spec = self.jobs.get(job.kind)
+        context = JobContext(job.id, job.attempts, self.sessions)
+        if job.attempts > job.max_attempts:
+            async with self.sessions() as db:
+                await queue.finish(db, job.id, JobStatus.FAILED, error=LOST)
+            return
+        try:
+            result = await spec.handler(context, dict(job.payload or {}))
+        except (JobCancelled, asyncio.CancelledError):
+            async with self.sessions() as db:
+                if self._stopping:
+                    await queue.release(db, job.id)
+                else:
+                    await queue.finish(db, job.id, JobStatus.CANCELLED)
+        except Exception as exc:
+            # The admin API serves job errors, so they name the exception type
+            # only; the message and traceback, which can quote the job's input,
+            # go to the worker log.
+            traceback.print_exc()
+            async with self.sessions() as db:
+                await queue.retry_or_fail(db, job, f"{type(exc).__name__}: {FAILED}")
+        else:
+            async with self.sessions() as db:
+                await queue.finish(db, job.id, JobStatus.SUCCEEDED, result=result)
+
+
+def _work(concurrency: int) -> None:
+    from . import tasks  # noqa: F401  registers the built-in jobs
+
+    async def main():
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+        await Worker(concurrency=concurrency).run(stop)
+
+    asyncio.run(main())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run background job workers")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=settings.job_concurrency)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=_work, args=(args.concurrency,), daemon=False)
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    print(f"⚙️ Started {len(processes)} job worker(s)")
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+            process.join()
@@ -1,40 +1,45 @@
 """
 Main FastAPI application entry point
 """
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .api.admin import router as admin_router
-from .api.auth import router as auth_router
-from .api.matches import router as matches_router
-from .api.participants import router as participants_router
-from .api.tournaments import router as tournaments_router
 from .core.config import settings
-from .core.database import close_db, init_db
+from .core.responses import FastJSONResponse
+from .core.startup import (
+    database_configured,
+    include_routers,
+    keep_warming,
+    startup,
+    warm_up,
+)
 from .schemas.base import APIResponse
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
-    # Startup
-    try:
-        # Only initialize database if DATABASE_URL is set to a real database
-        if not settings.database_url.startswith("postgresql+asyncpg://user:password"):
-            await init_db()
-            print("Database initialized successfully")
-        else:
-            print("Skipping database initialization (using default config)")
-    except Exception as e:
-        print(f"Database initialization failed: {e}")
+    # Startup: in lazy mode the server starts answering /health at once and
+    # /ready passes when the background warm-up is done. A failed warm-up is
+    # retried in the background while the app serves what it can.
+    warming = None
+    if settings.lazy_startup or not await warm_up(app):
+        warming = asyncio.create_task(keep_warming(app))
 
     yield
 
     # Shutdown
+    if warming is not None:
+        warming.cancel()
+        with suppress(asyncio.CancelledError):
+            await warming
     try:
-        if not settings.database_url.startswith("postgresql+asyncpg://user:password"):
+        if database_configured():
+            from .core.database import close_db
+
             await close_db()
             print("Database connections closed")
         else:
@@ -49,6 +54,7 @@ app = FastAPI(
     description=settings.api_description,
     version=settings.api_version,
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # Add CORS middleware
@@ -60,16 +66,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Include API routers
-app.include_router(auth_router.router, prefix="/api/auth", tags=["authentication"])
-app.include_router(
-    tournaments_router.router, prefix="/api/tournaments", tags=["tournaments"]
-)
-app.include_router(matches_router.router, prefix="/api/matches", tags=["matches"])
-app.include_router(
-    participants_router.router, prefix="/api/participants", tags=["participants"]
-)
-app.include_router(admin_router.router, prefix="/api/admin", tags=["admin"])
+# Include API routers; lazy startup mounts them during warm-up instead
+if not settings.lazy_startup:
+    include_routers(app)
+startup.mark("import app")
 
 
 @app.get("/")
@@ -94,3 +94,11 @@ async def health_check():
             "version": settings.api_version,
         }
     )
+
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness check: 503 until routers, pool and caches are warm"""
+    return APIResponse.success(
+        startup.report(), status_code=200 if startup.ready else 503
+    )
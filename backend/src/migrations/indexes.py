@@ -0,0 +1,61 @@
+"""
+Helpers for building and dropping indexes without blocking writes
+
+``CREATE INDEX CONCURRENTLY`` cannot run inside a transaction, so revisions
+call these inside ``op.get_context().autocommit_block()``. A concurrent build
+that fails leaves an INVALID index behind; ``create_index`` drops such a
+leftover before retrying so a rerun of the migration recovers cleanly.
+"""
+from typing import Iterable, NamedTuple
+
+from alembic import op
+from sqlalchemy import text
+
+
+class Index(NamedTuple):
+    name: str
+    table: str
+    # Everything after ``ON <table>``, e.g. "(person_id) INCLUDE (role_id)"
+    definition: str
+
+
+def _is_invalid(name: str) -> bool:
+    if op.get_context().as_sql:
+        return False
+    return bool(
+        op.get_bind()
+        .execute(
+            text(
+                "SELECT NOT i.indisvalid FROM pg_index i "
+                "JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE c.relname = :name AND pg_table_is_visible(c.oid)"
+            ),
+            {"name": name},
+        )
+        .scalar()
+    )
+
+
+def create_index(index: Index) -> None:
+    if _is_invalid(index.name):
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index.name}")
+    op.execute(
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index.name} "
+        f"ON {index.table} {index.definition}"
+    )
+
+
+def drop_index(index: Index) -> None:
+    op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index.name}")
+
+
+def create_indexes(indexes: Iterable[Index]) -> None:
+    with op.get_context().autocommit_block():
+        for index in indexes:
+            create_index(index)
+
+
+def drop_indexes(indexes: Iterable[Index]) -> None:
+    with op.get_context().autocommit_block():
+        for index in reversed(list(indexes)):
+            drop_index(index)
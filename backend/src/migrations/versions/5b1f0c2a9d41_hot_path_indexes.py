@@ -0,0 +1,75 @@
+"""Hot-path indexes for the join keys used by the routers and analytics
+
+Revision ID: 5b1f0c2a9d41
+Revises:
+Create Date: 2026-10-18 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from src.migrations.indexes import Index, create_indexes, drop_indexes
+
+# revision identifiers, used by Alembic.
+revision: str = "5b1f0c2a9d41"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    # person -> role joins in search and profiles, filtered to wrestlers
+    Index(
+        "ix_role_person_id_role_type",
+        "role",
+        "(person_id, role_type) INCLUDE (role_id)",
+    ),
+    # role -> participant joins; latest season per wrestler (year DESC)
+    Index(
+        "ix_participant_role_id_year",
+        "participant",
+        "(role_id, year DESC) INCLUDE (participant_id, school_id, weight_class)",
+    ),
+    # School rosters by season
+    Index(
+        "ix_participant_school_id_year",
+        "participant",
+        "(school_id, year DESC) INCLUDE (role_id, weight_class)",
+    ),
+    # Season / weight-class slices
+    Index("ix_participant_year_weight_class", "participant", "(year, weight_class)"),
+    # Per-tournament match loads, in the snapshot's ORDER BY
+    Index(
+        "ix_match_tournament_id_round_order",
+        "match",
+        "(tournament_id, round_order, match_id)",
+    ),
+    Index("ix_match_winner_id", "match", "(winner_id) WHERE winner_id IS NOT NULL"),
+    # The primary key leads with match_id; lookups by participant need their own
+    Index(
+        "ix_participant_match_participant_id",
+        "participant_match",
+        "(participant_id) INCLUDE (match_id, is_winner, score)",
+    ),
+    # Bracket traversal (byes and advancement follow next_match_id)
+    Index(
+        "ix_participant_match_next_match_id",
+        "participant_match",
+        "(next_match_id) WHERE next_match_id IS NOT NULL",
+    ),
+    # Tournament search and listings order by year DESC, name
+    Index(
+        "ix_tournament_year_name",
+        "tournament",
+        "(year DESC, name) INCLUDE (tournament_id)",
+    ),
+    # Snapshot ordering by tournament date
+    Index("ix_tournament_date", "tournament", "(date, tournament_id)"),
+    Index("ix_school_name", "school", "(name) INCLUDE (school_id, location)"),
+]
+
+
+def upgrade() -> None:
+    create_indexes(INDEXES)
+
+
+def downgrade() -> None:
+    drop_indexes(INDEXES)
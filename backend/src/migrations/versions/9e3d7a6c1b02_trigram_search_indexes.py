@@ -0,0 +1,46 @@
+"""Trigram indexes for the ILIKE name searches
+
+Revision ID: 9e3d7a6c1b02
+Revises: 5b1f0c2a9d41
+Create Date: 2026-10-18 10:30:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from src.migrations.indexes import Index, create_indexes, drop_indexes
+
+# revision identifiers, used by Alembic.
+revision: str = "9e3d7a6c1b02"
+down_revision: Union[str, None] = "5b1f0c2a9d41"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The search queries use leading-wildcard ILIKE patterns, which only a
+# trigram index can serve. Expressions must match the queries exactly.
+INDEXES = [
+    Index(
+        "ix_person_full_name_trgm",
+        "person",
+        "USING gin ((first_name || ' ' || last_name) gin_trgm_ops)",
+    ),
+    Index("ix_person_first_name_trgm", "person", "USING gin (first_name gin_trgm_ops)"),
+    Index("ix_person_last_name_trgm", "person", "USING gin (last_name gin_trgm_ops)"),
+    Index(
+        "ix_person_search_name_trgm", "person", "USING gin (search_name gin_trgm_ops)"
+    ),
+    Index("ix_school_name_trgm", "school", "USING gin (name gin_trgm_ops)"),
+    Index("ix_school_location_trgm", "school", "USING gin (location gin_trgm_ops)"),
+    Index("ix_tournament_name_trgm", "tournament", "USING gin (name gin_trgm_ops)"),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    create_indexes(INDEXES)
+
+
+def downgrade() -> None:
+    # pg_trgm is left installed; other objects may depend on it
+    drop_indexes(INDEXES)
@@ -0,0 +1,30 @@
+"""Name-ordered person index for the wrestler listing
+
+Revision ID: a9c3e5f17b24
+Revises: f2b7c4e9a613
+Create Date: 2026-10-19 18:00:00
+
+"""
+from typing import Sequence, Union
+
+from src.migrations.indexes import Index, create_indexes, drop_indexes
+
+# revision identifiers, used by Alembic.
+revision: str = "a9c3e5f17b24"
+down_revision: Union[str, None] = "f2b7c4e9a613"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# /wrestlers pages through every wrestler by last, then first name; without
+# an index in that order each page sorts the whole person table.
+INDEXES = [
+    Index("ix_person_last_name_first_name", "person", "(last_name, first_name)"),
+]
+
+
+def upgrade() -> None:
+    create_indexes(INDEXES)
+
+
+def downgrade() -> None:
+    drop_indexes(INDEXES)
@@ -0,0 +1,35 @@
+"""GIN index over the search_name tokens for phonetic wrestler search
+
+Revision ID: c4a8e2f71d30
+Revises: 9e3d7a6c1b02
+Create Date: 2026-10-19 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from src.migrations.indexes import Index, create_indexes, drop_indexes
+
+# revision identifiers, used by Alembic.
+revision: str = "c4a8e2f71d30"
+down_revision: Union[str, None] = "9e3d7a6c1b02"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# search_name is a list of folded words and Double Metaphone keys (see
+# app/names.py); the phonetic search tests it with array overlap (&&).
+# The expression must match the query exactly.
+INDEXES = [
+    Index(
+        "ix_person_search_name_tokens",
+        "person",
+        "USING gin (string_to_array(search_name, ' '))",
+    ),
+]
+
+
+def upgrade() -> None:
+    create_indexes(INDEXES)
+
+
+def downgrade() -> None:
+    drop_indexes(INDEXES)
@@ -0,0 +1,83 @@
+"""Lookup tables and SMALLINT code columns for weight class, round and result
+
+Revision ID: e71b5d9a0c43
+Revises: c4a8e2f71d30
+Create Date: 2026-10-19 11:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e71b5d9a0c43"
+down_revision: Union[str, None] = "c4a8e2f71d30"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copies of app.codes.Round and ResultType; weight class codes are
+# pounds and are added by ``python -m app.codes backfill`` as they appear
+ROUNDS = [
+    (0, "Unknown"),
+    (1, "Pigtail"),
+    (2, "Champ. Round 1"),
+    (3, "Champ. Round 2"),
+    (4, "Cons. Round 1"),
+    (5, "Quarterfinal"),
+    (6, "Cons. Round 2"),
+    (7, "Cons. Round 3"),
+    (8, "Semifinal"),
+    (9, "Cons. Round 4"),
+    (10, "Cons. Round 5"),
+    (11, "Cons. Quarters"),
+    (12, "Cons. Semis"),
+    (13, "7th Place Match"),
+    (14, "5th Place Match"),
+    (15, "3rd Place Match"),
+    (16, "1st Place Match"),
+]
+RESULT_TYPES = [
+    (0, "Unknown"),
+    (1, "Decision"),
+    (2, "Major Decision"),
+    (3, "Tech Fall"),
+    (4, "Fall"),
+    (5, "Forfeit"),
+    (6, "Disqualification"),
+    (7, "Injury Default"),
+    (8, "Bye"),
+]
+
+
+def _lookup(table: str, rows) -> None:
+    op.execute(
+        f"CREATE TABLE {table} (code SMALLINT PRIMARY KEY, label TEXT NOT NULL)"
+    )
+    if rows:
+        values = ", ".join(f"({code}, '{label}')" for code, label in rows)
+        op.execute(f"INSERT INTO {table} (code, label) VALUES {values}")
+
+
+def upgrade() -> None:
+    _lookup("weight_class_lookup", [])
+    _lookup("round_lookup", ROUNDS)
+    _lookup("result_type_lookup", RESULT_TYPES)
+    # Nullable with no default: adding them rewrites nothing, and the foreign
+    # keys only have NULLs to check until the backfill
+    op.execute(
+        "ALTER TABLE participant ADD COLUMN weight_class_code SMALLINT "
+        "REFERENCES weight_class_lookup (code)"
+    )
+    op.execute(
+        "ALTER TABLE match "
+        "ADD COLUMN round_code SMALLINT REFERENCES round_lookup (code), "
+        "ADD COLUMN result_type_code SMALLINT REFERENCES result_type_lookup (code)"
+    )
+
+
+def downgrade() -> None:
+    op.execute(
+        "ALTER TABLE match DROP COLUMN result_type_code, DROP COLUMN round_code"
+    )
+    op.execute("ALTER TABLE participant DROP COLUMN weight_class_code")
+    op.execute("DROP TABLE result_type_lookup, round_lookup, weight_class_lookup")
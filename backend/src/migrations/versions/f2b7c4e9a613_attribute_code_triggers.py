@@ -0,0 +1,261 @@
+"""Fill the attribute codes in the database and keep them in sync
+
+Revision ID: f2b7c4e9a613
+Revises: e71b5d9a0c43
+Create Date: 2026-10-19 15:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2b7c4e9a613"
+down_revision: Union[str, None] = "e71b5d9a0c43"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copies of app.codes. Rounds are renumbered to make room for the
+# championship rounds before the quarterfinals and the consolation rounds
+# after Cons. Round 5 that brackets bigger than 33 wrestle.
+ROUNDS = [
+    (0, "Unknown"),
+    (1, "Pigtail"),
+    (2, "Champ. Round 1"),
+    (3, "Champ. Round 2"),
+    (4, "Champ. Round 3"),
+    (5, "Champ. Round 4"),
+    (6, "Champ. Round 5"),
+    (7, "Cons. Round 1"),
+    (8, "Quarterfinal"),
+    (9, "Cons. Round 2"),
+    (10, "Cons. Round 3"),
+    (11, "Semifinal"),
+    (12, "Cons. Round 4"),
+    (13, "Cons. Round 5"),
+    (14, "Cons. Round 6"),
+    (15, "Cons. Round 7"),
+    (16, "Cons. Round 8"),
+    (17, "Cons. Round 9"),
+    (18, "Cons. Round 10"),
+    (19, "Cons. Quarters"),
+    (20, "Cons. Semis"),
+    (21, "7th Place Match"),
+    (22, "5th Place Match"),
+    (23, "3rd Place Match"),
+    (24, "1st Place Match"),
+]
+CHAMP_ROUNDS = [2, 3, 4, 5, 6]  # Champ. Round 1..5
+CONS_ROUNDS = [7, 9, 10, 12, 13, 14, 15, 16, 17, 18]  # Cons. Round 1..10
+RESULT_TYPE_ALIASES = {
+    "dec": 1,
+    "decision": 1,
+    "sv": 1,
+    "tb": 1,
+    "md": 2,
+    "major": 2,
+    "major decision": 2,
+    "tf": 3,
+    "tech": 3,
+    "tech fall": 3,
+    "technical fall": 3,
+    "f": 4,
+    "fall": 4,
+    "pin": 4,
+    "ff": 5,
+    "fft": 5,
+    "forfeit": 5,
+    "med fft": 5,
+    "medical forfeit": 5,
+    "dq": 6,
+    "disqualification": 6,
+    "inj": 7,
+    "injury default": 7,
+    "bye": 8,
+}
+HEAVYWEIGHT_ALIASES = ["heavyweight", "hvy", "hwt", "unl", "unlimited"]
+
+# The revision before this one numbered rounds 0-16
+OLD_ROUNDS = [
+    (0, "Unknown"),
+    (1, "Pigtail"),
+    (2, "Champ. Round 1"),
+    (3, "Champ. Round 2"),
+    (4, "Cons. Round 1"),
+    (5, "Quarterfinal"),
+    (6, "Cons. Round 2"),
+    (7, "Cons. Round 3"),
+    (8, "Semifinal"),
+    (9, "Cons. Round 4"),
+    (10, "Cons. Round 5"),
+    (11, "Cons. Quarters"),
+    (12, "Cons. Semis"),
+    (13, "7th Place Match"),
+    (14, "5th Place Match"),
+    (15, "3rd Place Match"),
+    (16, "1st Place Match"),
+]
+
+
+def _array(codes) -> str:
+    return "ARRAY[" + ", ".join(str(code) for code in codes) + "]"
+
+
+HEAVYWEIGHTS = ", ".join(f"'{alias}'" for alias in HEAVYWEIGHT_ALIASES)
+RESULT_TYPE_CASES = "\n        ".join(
+    f"WHEN '{alias}' THEN {code}" for alias, code in RESULT_TYPE_ALIASES.items()
+)
+
+
+# The same normalisation and rules as app.codes, one function per attribute
+FUNCTIONS = [
+    r"""
+CREATE FUNCTION attribute_key(label TEXT) RETURNS TEXT
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT btrim(regexp_replace(
+        lower(replace(replace(label, '-', ' '), '.', '')), '\s+', ' ', 'g'
+    ))
+$$
+""",
+    f"""
+CREATE FUNCTION attribute_weight_class_code(label TEXT) RETURNS SMALLINT
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT CASE
+        WHEN attribute_key(label) IN ({HEAVYWEIGHTS}) THEN 285
+        ELSE substring(attribute_key(label) FROM '^(\\d{{2,3}})\\y')::SMALLINT
+    END
+$$
+""",
+    f"""
+CREATE FUNCTION attribute_result_type_code(label TEXT) RETURNS SMALLINT
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT CASE attribute_key(label)
+        {RESULT_TYPE_CASES}
+        ELSE 0
+    END::SMALLINT
+$$
+""",
+    f"""
+CREATE FUNCTION attribute_round_code(label TEXT) RETURNS SMALLINT
+LANGUAGE plpgsql IMMUTABLE AS $$
+DECLARE
+    key TEXT := attribute_key(label);
+    place TEXT;
+    consolation BOOLEAN;
+    number INTEGER;
+BEGIN
+    IF key IS NULL OR key = '' THEN
+        RETURN 0;
+    END IF;
+    place := substring(key FROM '\\y(1st|3rd|5th|7th)\\y.*\\yplace\\y');
+    IF place IS NOT NULL THEN
+        RETURN CASE place WHEN '1st' THEN 24 WHEN '3rd' THEN 23
+                          WHEN '5th' THEN 22 ELSE 21 END;
+    END IF;
+    IF key ~ '\\yfinals?\\y|^championship$' AND strpos(key, 'semi') = 0 THEN
+        RETURN 24;
+    END IF;
+    IF key ~ '\\y(pigtail|prelim\\w*)\\y' THEN
+        RETURN 1;
+    END IF;
+    consolation := key ~ '\\ycons\\w*\\y';
+    IF strpos(key, 'semi') > 0 THEN
+        RETURN CASE WHEN consolation THEN 20 ELSE 11 END;
+    END IF;
+    IF strpos(key, 'quarter') > 0 THEN
+        RETURN CASE WHEN consolation THEN 19 ELSE 8 END;
+    END IF;
+    number := (regexp_match(key, '\\y(round |r)(\\d{{1,2}})\\y'))[2]::INTEGER;
+    IF consolation THEN
+        RETURN COALESCE(({_array(CONS_ROUNDS)})[number], 0);
+    END IF;
+    RETURN COALESCE(({_array(CHAMP_ROUNDS)})[number], 0);
+END
+$$
+""",
+    """
+CREATE FUNCTION participant_attribute_codes() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.weight_class_code := attribute_weight_class_code(NEW.weight_class);
+    IF NEW.weight_class_code IS NOT NULL THEN
+        INSERT INTO weight_class_lookup (code, label)
+        VALUES (NEW.weight_class_code, NEW.weight_class_code::TEXT)
+        ON CONFLICT (code) DO NOTHING;
+    END IF;
+    RETURN NEW;
+END
+$$
+""",
+    """
+CREATE FUNCTION match_attribute_codes() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.round_code := attribute_round_code(NEW.round);
+    NEW.result_type_code := attribute_result_type_code(NEW.result_type);
+    RETURN NEW;
+END
+$$
+""",
+]
+
+
+def _set_labels(rows) -> None:
+    values = ", ".join(f"({code}, '{label}')" for code, label in rows)
+    op.execute(
+        f"INSERT INTO round_lookup (code, label) VALUES {values} "
+        "ON CONFLICT (code) DO UPDATE SET label = EXCLUDED.label"
+    )
+
+
+def upgrade() -> None:
+    for function in FUNCTIONS:
+        op.execute(function)
+    _set_labels(ROUNDS)
+
+    # Backfill every row, touching only those whose code changes
+    op.execute(
+        "INSERT INTO weight_class_lookup (code, label) "
+        "SELECT DISTINCT code, code::TEXT FROM ("
+        "SELECT attribute_weight_class_code(weight_class) AS code FROM participant"
+        ") AS codes WHERE code IS NOT NULL ON CONFLICT (code) DO NOTHING"
+    )
+    op.execute(
+        "UPDATE participant "
+        "SET weight_class_code = attribute_weight_class_code(weight_class) "
+        "WHERE weight_class_code "
+        "IS DISTINCT FROM attribute_weight_class_code(weight_class)"
+    )
+    op.execute(
+        "UPDATE match SET round_code = attribute_round_code(round), "
+        "result_type_code = attribute_result_type_code(result_type) "
+        "WHERE round_code IS DISTINCT FROM attribute_round_code(round) "
+        "OR result_type_code IS DISTINCT FROM attribute_result_type_code(result_type)"
+    )
+
+    # From here on every writer gets codes, whichever process it runs in
+    op.execute(
+        "CREATE TRIGGER participant_attribute_codes "
+        "BEFORE INSERT OR UPDATE OF weight_class ON participant "
+        "FOR EACH ROW EXECUTE FUNCTION participant_attribute_codes()"
+    )
+    op.execute(
+        "CREATE TRIGGER match_attribute_codes "
+        "BEFORE INSERT OR UPDATE OF round, result_type ON match "
+        "FOR EACH ROW EXECUTE FUNCTION match_attribute_codes()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER match_attribute_codes ON match")
+    op.execute("DROP TRIGGER participant_attribute_codes ON participant")
+    op.execute("DROP FUNCTION match_attribute_codes(), participant_attribute_codes()")
+    # Round codes go back to the old numbering; rerun the old
+    # ``python -m app.codes backfill`` to fill them again
+    op.execute("UPDATE match SET round_code = NULL")
+    op.execute(f"DELETE FROM round_lookup WHERE code > {len(OLD_ROUNDS) - 1}")
+    _set_labels(OLD_ROUNDS)
+    op.execute(
+        "DROP FUNCTION attribute_round_code(TEXT), attribute_result_type_code(TEXT), "
+        "attribute_weight_class_code(TEXT), attribute_key(TEXT)"
+    )
@@ -0,0 +1,9 @@
+"""
+SQLAlchemy models
+"""
+from .job import Job, JobStatus
+from .match import Match
+from .participant import Participant
+from .tournament import Tournament
+
+__all__ = ["Job", "JobStatus", "Match", "Participant", "Tournament"]
@@ -4,8 +4,7 @@ Base SQLAlchemy models
 from datetime import datetime
 from uuid import uuid4
 
-from sqlalchemy import DateTime
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import DateTime, Uuid
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
@@ -18,7 +17,7 @@ class BaseModel(Base):
     __abstract__ = True
 
     id: Mapped[str] = mapped_column(
-        UUID(as_uuid=False),
+        Uuid(as_uuid=False),
         primary_key=True,
         default=lambda: str(uuid4()),
         nullable=False,
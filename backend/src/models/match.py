@@ -0,0 +1,26 @@
+"""
+Match model
+"""
+from typing import Optional
+
+from sqlalchemy import Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import BaseModel
+
+
+class Match(BaseModel):
+    """A bout within a tournament bracket"""
+
+    __tablename__ = "matches"
+
+    tournament_id: Mapped[str] = mapped_column(String(36), index=True, nullable=False)
+    weight_class: Mapped[Optional[str]] = mapped_column(String(20))
+    round: Mapped[Optional[str]] = mapped_column(String(50))
+    bracket_order: Mapped[Optional[int]] = mapped_column(Integer)
+    participant_a_id: Mapped[Optional[str]] = mapped_column(String(36))
+    participant_b_id: Mapped[Optional[str]] = mapped_column(String(36))
+    winner_id: Mapped[Optional[str]] = mapped_column(String(36))
+    result_type: Mapped[Optional[str]] = mapped_column(String(30))
+    score: Mapped[Optional[str]] = mapped_column(String(30))
+    next_match_id: Mapped[Optional[str]] = mapped_column(String(36))
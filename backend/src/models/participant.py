@@ -0,0 +1,27 @@
+"""
+Participant model
+"""
+from typing import Optional
+
+from sqlalchemy import Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import BaseModel
+
+
+class Participant(BaseModel):
+    """A wrestler's entry in one weight class of a tournament"""
+
+    __tablename__ = "participants"
+    __table_args__ = (
+        UniqueConstraint(
+            "tournament_id", "weight_class", "name", name="uq_participants_entry"
+        ),
+    )
+
+    tournament_id: Mapped[str] = mapped_column(String(36), index=True, nullable=False)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    weight_class: Mapped[str] = mapped_column(String(20), nullable=False)
+    school: Mapped[Optional[str]] = mapped_column(String(255))
+    seed: Mapped[Optional[int]] = mapped_column(Integer)
+    person_id: Mapped[Optional[str]] = mapped_column(String(36))
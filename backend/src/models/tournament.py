@@ -0,0 +1,23 @@
+"""
+Tournament model
+"""
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import Date, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import BaseModel
+
+
+class Tournament(BaseModel):
+    """A tournament, identified naturally by its name and year"""
+
+    __tablename__ = "tournaments"
+    __table_args__ = (UniqueConstraint("name", "year", name="uq_tournaments_name"),)
+
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    year: Mapped[int] = mapped_column(Integer, nullable=False)
+    location: Mapped[Optional[str]] = mapped_column(String(255))
+    division: Mapped[Optional[str]] = mapped_column(String(20))
+    start_date: Mapped[Optional[date]] = mapped_column(Date)
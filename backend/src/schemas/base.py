@@ -2,9 +2,13 @@
 Base Pydantic schemas for request/response models
 """
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
 
-from pydantic import BaseModel, ConfigDict
+from fastapi import Query
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, ConfigDict, Field
+
+from ..core.responses import FastJSONResponse, envelope
 
 
 class BaseSchema(BaseModel):
@@ -21,40 +25,50 @@ class TimestampSchema(BaseSchema):
 
 
 class APIResponse(BaseSchema):
-    """Standardized API response format"""
+    """Standardized API response format.
+
+    The model documents the envelope shape; ``success`` and ``error`` build the
+    envelope as a plain dict and render it directly to bytes, skipping model
+    validation and FastAPI's ``jsonable_encoder`` pass.
+    """
 
     data: Any
     meta: Dict[str, Any]
     errors: Optional[List[str]] = None
 
     @classmethod
-    def success(cls, data: Any, meta: Optional[Dict[str, Any]] = None) -> "APIResponse":
+    def success(
+        cls,
+        data: Any,
+        meta: Optional[Dict[str, Any]] = None,
+        status_code: int = 200,
+    ) -> FastJSONResponse:
         """Create successful response"""
-        return cls(
-            data=data,
-            meta={
-                "timestamp": datetime.utcnow().isoformat() + "Z",
-                "version": "1.0",
-                **(meta or {}),
-            },
-        )
+        return FastJSONResponse(envelope(data, meta), status_code=status_code)
 
     @classmethod
     def error(
-        cls, errors: List[str], meta: Optional[Dict[str, Any]] = None
-    ) -> "APIResponse":
+        cls,
+        errors: List[str],
+        meta: Optional[Dict[str, Any]] = None,
+        status_code: int = 200,
+    ) -> FastJSONResponse:
         """Create error response"""
-        return cls(
-            data=None,
-            meta={
-                "timestamp": datetime.utcnow().isoformat() + "Z",
-                "version": "1.0",
-                **(meta or {}),
-            },
-            errors=errors,
+        return FastJSONResponse(
+            envelope(None, meta, errors=errors), status_code=status_code
         )
 
 
+# Largest number of items accepted by one bulk request
+BULK_MAX_ITEMS = 5000
+
+
+class BulkDelete(BaseSchema):
+    """IDs to delete in one request"""
+
+    ids: List[str] = Field(..., min_length=1, max_length=BULK_MAX_ITEMS)
+
+
 class PaginationParams(BaseSchema):
     """Pagination parameters"""
 
@@ -73,3 +87,41 @@ class PaginationMeta(BaseSchema):
     size: int
     total: int
     pages: int
+
+
+Fields = Optional[Tuple[str, ...]]
+
+
+def sparse_fields(schema: Type[BaseModel]) -> Callable[..., Fields]:
+    """Dependency reading ``fields=a,b`` and checking the names against ``schema``.
+
+    Resolves to the names in schema order, or ``None`` (every field) when the
+    parameter is absent; unknown names are a validation error like any other
+    bad query parameter.
+    """
+
+    def dependency(
+        fields: Optional[str] = Query(
+            None, description="Comma-separated fields to return (default: all)"
+        )
+    ) -> Fields:
+        if fields is None:
+            return None
+        names = {name.strip() for name in fields.split(",")} - {""}
+        unknown = sorted(names - schema.model_fields.keys())
+        if unknown or not names:
+            raise RequestValidationError(
+                [
+                    {
+                        "type": "value_error",
+                        "loc": ("query", "fields"),
+                        "msg": f"Unknown fields: {', '.join(unknown)}"
+                        if unknown
+                        else "No fields",
+                        "input": fields,
+                    }
+                ]
+            )
+        return tuple(name for name in schema.model_fields if name in names)
+
+    return dependency
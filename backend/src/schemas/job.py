@@ -0,0 +1,38 @@
+"""
+Background job schemas
+"""
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from pydantic import Field
+
+from .base import BaseSchema, TimestampSchema
+
+
+class JobCreate(BaseSchema):
+    """Enqueue a job"""
+
+    kind: str
+    payload: Dict[str, Any] = Field(default_factory=dict)
+    max_attempts: Optional[int] = Field(None, ge=1, le=10)
+    delay_seconds: float = Field(0.0, ge=0)
+
+
+class JobResponse(TimestampSchema):
+    """Job state as returned by the admin API"""
+
+    id: str
+    kind: str
+    status: str
+    payload: Dict[str, Any]
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    progress: float
+    message: Optional[str] = None
+    attempts: int
+    max_attempts: int
+    run_after: datetime
+    cancel_requested: bool
+    locked_by: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
@@ -0,0 +1,57 @@
+"""
+Match schemas
+"""
+from typing import Optional
+
+from .base import BaseSchema, TimestampSchema
+
+
+class MatchBase(BaseSchema):
+    """Fields shared by match requests and responses"""
+
+    tournament_id: str
+    weight_class: Optional[str] = None
+    round: Optional[str] = None
+    bracket_order: Optional[int] = None
+    participant_a_id: Optional[str] = None
+    participant_b_id: Optional[str] = None
+    winner_id: Optional[str] = None
+    result_type: Optional[str] = None
+    score: Optional[str] = None
+    next_match_id: Optional[str] = None
+
+
+class MatchCreate(MatchBase):
+    """Create a match"""
+
+
+class MatchUpdate(BaseSchema):
+    """Partial match update, e.g. recording a result"""
+
+    weight_class: Optional[str] = None
+    round: Optional[str] = None
+    bracket_order: Optional[int] = None
+    participant_a_id: Optional[str] = None
+    participant_b_id: Optional[str] = None
+    winner_id: Optional[str] = None
+    result_type: Optional[str] = None
+    score: Optional[str] = None
+    next_match_id: Optional[str] = None
+
+
+class MatchResponse(MatchBase, TimestampSchema):
+    """Match as returned by the API"""
+
+    id: str
+
+
+class MatchUpsert(MatchCreate):
+    """Create a match, or overwrite the supplied fields of an existing ``id``"""
+
+    id: Optional[str] = None
+
+
+class MatchBulkUpdate(MatchUpdate):
+    """One entry of a bulk update"""
+
+    id: str
@@ -0,0 +1,43 @@
+"""
+Participant schemas
+"""
+from typing import Optional
+
+from .base import BaseSchema, TimestampSchema
+
+
+class ParticipantBase(BaseSchema):
+    """Fields shared by participant requests and responses"""
+
+    tournament_id: str
+    name: str
+    weight_class: str
+    school: Optional[str] = None
+    seed: Optional[int] = None
+    person_id: Optional[str] = None
+
+
+class ParticipantCreate(ParticipantBase):
+    """Create a participant"""
+
+
+class ParticipantUpdate(BaseSchema):
+    """Partial participant update"""
+
+    name: Optional[str] = None
+    weight_class: Optional[str] = None
+    school: Optional[str] = None
+    seed: Optional[int] = None
+    person_id: Optional[str] = None
+
+
+class ParticipantBulkUpdate(ParticipantUpdate):
+    """One entry of a bulk update"""
+
+    id: str
+
+
+class ParticipantResponse(ParticipantBase, TimestampSchema):
+    """Participant as returned by the API"""
+
+    id: str
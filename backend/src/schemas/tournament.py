@@ -0,0 +1,43 @@
+"""
+Tournament schemas
+"""
+from datetime import date
+from typing import Optional
+
+from .base import BaseSchema, TimestampSchema
+
+
+class TournamentBase(BaseSchema):
+    """Fields shared by tournament requests and responses"""
+
+    name: str
+    year: int
+    location: Optional[str] = None
+    division: Optional[str] = None
+    start_date: Optional[date] = None
+
+
+class TournamentCreate(TournamentBase):
+    """Create a tournament"""
+
+
+class TournamentUpdate(BaseSchema):
+    """Partial tournament update"""
+
+    name: Optional[str] = None
+    year: Optional[int] = None
+    location: Optional[str] = None
+    division: Optional[str] = None
+    start_date: Optional[date] = None
+
+
+class TournamentBulkUpdate(TournamentUpdate):
+    """One entry of a bulk update"""
+
+    id: str
+
+
+class TournamentResponse(TournamentBase, TimestampSchema):
+    """Tournament as returned by the API"""
+
+    id: str
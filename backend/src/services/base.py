@@ -1,9 +1,11 @@
 """
 Base service classes for business logic
 """
-from typing import Generic, List, Optional, Type, TypeVar
+from typing import Any, Dict, Generic, List, Optional, Sequence, Tuple, Type, TypeVar
+from uuid import UUID, uuid4
 
-from sqlalchemy import func, select
+from sqlalchemy import Result, Select, delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from ..core.database import Base
@@ -13,26 +15,69 @@ ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType")
 UpdateSchemaType = TypeVar("UpdateSchemaType")
 
+# Rows per statement for bulk writes; keeps bound parameters under driver limits
+BULK_BATCH_SIZE = 500
+
+_UPSERT_DIALECTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def batched(items: Sequence, size: int = BULK_BATCH_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
 
 class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """Base service with common CRUD operations"""
 
+    # Columns identifying an existing row for ``upsert_many``
+    upsert_keys: Tuple[str, ...] = ("id",)
+
     def __init__(self, model: Type[ModelType]):
         self.model = model
 
-    async def get(self, db: AsyncSession, id: str) -> Optional[ModelType]:
-        """Get single record by ID"""
-        result = await db.execute(select(self.model).where(self.model.id == id))
-        return result.scalar_one_or_none()
+    def _select(self, fields: Optional[Sequence[str]] = None) -> Select:
+        """SELECT of whole records, or of only the ``fields`` columns"""
+        if fields is None:
+            return select(self.model)
+        columns = self.model.__table__.columns
+        return select(*(columns[name] for name in fields))
+
+    @staticmethod
+    def _rows(result: Result, fields: Optional[Sequence[str]] = None) -> list:
+        """Records, or plain ``{column: value}`` rows when ``fields`` narrowed them"""
+        if fields is None:
+            return result.scalars().all()
+        return [dict(row) for row in result.mappings()]
+
+    async def get(
+        self, db: AsyncSession, id: str, fields: Optional[Sequence[str]] = None
+    ) -> Optional[ModelType]:
+        """Get single record by ID (a plain row of ``fields`` if given)"""
+        result = await db.execute(self._select(fields).where(self.model.id == id))
+        rows = self._rows(result, fields)
+        return rows[0] if rows else None
 
     async def get_multi(
-        self, db: AsyncSession, pagination: PaginationParams
+        self,
+        db: AsyncSession,
+        pagination: PaginationParams,
+        fields: Optional[Sequence[str]] = None,
     ) -> List[ModelType]:
         """Get multiple records with pagination"""
         result = await db.execute(
-            select(self.model).offset(pagination.offset).limit(pagination.size)
+            self._select(fields).offset(pagination.offset).limit(pagination.size)
         )
-        return result.scalars().all()
+        return self._rows(result, fields)
+
+    async def get_many(self, db: AsyncSession, ids: Sequence[str]) -> List[ModelType]:
+        """Get the records with the given IDs (missing IDs are skipped)"""
+        found = []
+        for batch in batched(list(ids)):
+            result = await db.execute(
+                select(self.model).where(self.model.id.in_(batch))
+            )
+            found.extend(result.scalars().all())
+        return found
 
     async def count(self, db: AsyncSession) -> int:
         """Count total records"""
@@ -48,6 +93,25 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         await db.refresh(db_obj)
         return db_obj
 
+    async def create_many(
+        self, db: AsyncSession, objs_in: Sequence[CreateSchemaType]
+    ) -> List[ModelType]:
+        """Create records with batched INSERT ... RETURNING in one transaction"""
+        rows = [obj_in.model_dump() for obj_in in objs_in]
+        # IDs are assigned here so RETURNING rows can be put back in input order.
+        # RETURNING's sort_by_parameter_order cannot be used: on PostgreSQL its
+        # sentinel compares the string IDs with the UUIDs returned and fails.
+        # IDs given by the caller are made canonical so the lookup matches.
+        for row in rows:
+            row["id"] = str(UUID(str(row["id"]))) if row.get("id") else str(uuid4())
+        created: List[ModelType] = []
+        for batch in batched(rows):
+            result = await db.scalars(insert(self.model).returning(self.model), batch)
+            by_id = {record.id: record for record in result}
+            created.extend(by_id[row["id"]] for row in batch)
+        await db.commit()
+        return created
+
     async def update(
         self, db: AsyncSession, db_obj: ModelType, obj_in: UpdateSchemaType
     ) -> ModelType:
@@ -59,11 +123,109 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         await db.refresh(db_obj)
         return db_obj
 
+    async def update_many(
+        self, db: AsyncSession, updates: Dict[str, UpdateSchemaType]
+    ) -> List[ModelType]:
+        """Apply partial updates keyed by ID in one transaction.
+
+        Rows are grouped by the set of fields they change so each group is a
+        single executemany UPDATE by primary key. Returns the updated records;
+        unknown IDs are ignored.
+        """
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for id, obj_in in updates.items():
+            values = obj_in.model_dump(exclude_unset=True)
+            if values:
+                groups.setdefault(tuple(sorted(values)), []).append(
+                    {"id": id, **values}
+                )
+        existing = set(await self._existing_ids(db, list(updates)))
+        for rows in groups.values():
+            rows = [row for row in rows if row["id"] in existing]
+            for batch in batched(rows):
+                if batch:
+                    await db.execute(update(self.model), batch)
+        await db.commit()
+        return await self._fresh(db, [id for id in updates if id in existing])
+
+    async def upsert_many(
+        self, db: AsyncSession, objs_in: Sequence[CreateSchemaType]
+    ) -> List[ModelType]:
+        """Insert or update records with batched INSERT ... ON CONFLICT.
+
+        Conflicts are detected on ``upsert_keys``; a conflicting row has every
+        supplied column except its keys overwritten.
+        """
+        dialect = db.bind.dialect.name
+        make_insert = _UPSERT_DIALECTS.get(dialect)
+        if make_insert is None:
+            raise NotImplementedError(f"upsert_many is not supported on {dialect}")
+
+        rows = [obj_in.model_dump(exclude_unset=True) for obj_in in objs_in]
+        if "id" in self.upsert_keys:
+            for row in rows:
+                row["id"] = row.get("id") or str(uuid4())
+        # A statement may not touch the same row twice: the last write wins
+        unique = {tuple(row.get(key) for key in self.upsert_keys): row for row in rows}
+        # Rows in one statement must share columns; grouping by the supplied
+        # columns keeps an omitted field from overwriting a stored value
+        groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+        for row in unique.values():
+            groups.setdefault(tuple(sorted(row)), []).append(row)
+
+        upserted: List[ModelType] = []
+        for columns, group in groups.items():
+            for batch in batched(group):
+                statement = make_insert(self.model).values(batch)
+                changes = {
+                    column: statement.excluded[column]
+                    for column in columns
+                    if column not in self.upsert_keys and column != "id"
+                }
+                if hasattr(self.model, "updated_at"):
+                    changes["updated_at"] = func.now()
+                statement = statement.on_conflict_do_update(
+                    index_elements=list(self.upsert_keys), set_=changes
+                ).returning(self.model.id)
+                ids = (await db.execute(statement)).scalars().all()
+                upserted.extend(await self._fresh(db, ids))
+        await db.commit()
+        return upserted
+
     async def delete(self, db: AsyncSession, id: str) -> bool:
-        """Delete record by ID"""
-        db_obj = await self.get(db, id)
-        if db_obj:
-            await db.delete(db_obj)
-            await db.commit()
-            return True
-        return False
+        """Delete record by ID with a single DELETE statement"""
+        result = await db.execute(delete(self.model).where(self.model.id == id))
+        await db.commit()
+        return result.rowcount > 0
+
+    async def delete_many(self, db: AsyncSession, ids: Sequence[str]) -> int:
+        """Delete records by ID in one transaction; returns how many existed"""
+        deleted = 0
+        for batch in batched(list(ids)):
+            result = await db.execute(
+                delete(self.model).where(self.model.id.in_(batch))
+            )
+            deleted += result.rowcount
+        await db.commit()
+        return deleted
+
+    async def _existing_ids(self, db: AsyncSession, ids: Sequence[str]) -> List[str]:
+        found = []
+        for batch in batched(list(ids)):
+            result = await db.execute(
+                select(self.model.id).where(self.model.id.in_(batch))
+            )
+            found.extend(result.scalars().all())
+        return found
+
+    async def _fresh(self, db: AsyncSession, ids: Sequence[str]) -> List[ModelType]:
+        """Reload records after a bulk write, in the order of ``ids``"""
+        records = {}
+        for batch in batched(list(ids)):
+            result = await db.execute(
+                select(self.model)
+                .where(self.model.id.in_(batch))
+                .execution_options(populate_existing=True)
+            )
+            records.update({record.id: record for record in result.scalars()})
+        return [records[id] for id in ids if id in records]
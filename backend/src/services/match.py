@@ -0,0 +1,139 @@
+"""
+Match service: CRUD plus live bracket updates
+"""
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..core.events import broker
+from ..models.match import Match
+from ..schemas.base import PaginationParams
+from ..schemas.match import MatchCreate, MatchUpdate
+from .base import BaseService, batched
+
+# Fields a bracket view needs; only these are sent to live subscribers
+BRACKET_FIELDS = (
+    "weight_class",
+    "round",
+    "bracket_order",
+    "participant_a_id",
+    "participant_b_id",
+    "winner_id",
+    "result_type",
+    "score",
+    "next_match_id",
+)
+
+MATCH_EVENT = "match"
+
+
+def bracket_state(match: Match) -> Dict[str, Any]:
+    return {field: getattr(match, field) for field in BRACKET_FIELDS}
+
+
+def publish_match(
+    tournament_id: str, match_id: str, op: str, changes: Dict[str, Any]
+) -> None:
+    """Publish a compact bracket diff to the tournament's subscribers"""
+    payload = {"op": op, "id": match_id}
+    if changes:
+        payload["changes"] = changes
+    broker.publish(tournament_id, MATCH_EVENT, payload)
+
+
+def publish_write(before: Optional[Dict[str, Any]], match: Match) -> None:
+    """Publish a create (no ``before`` state) or the fields that changed"""
+    after = bracket_state(match)
+    if before is None:
+        changes = {k: v for k, v in after.items() if v is not None}
+        publish_match(match.tournament_id, match.id, "create", changes)
+    else:
+        changes = {k: v for k, v in after.items() if before[k] != v}
+        if changes:
+            publish_match(match.tournament_id, match.id, "update", changes)
+
+
+class MatchService(BaseService[Match, MatchCreate, MatchUpdate]):
+    """Match CRUD; every committed write is published once to the broker"""
+
+    async def get_multi_for_tournament(
+        self,
+        db: AsyncSession,
+        tournament_id: str,
+        pagination: PaginationParams,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Match]:
+        result = await db.execute(
+            self._select(fields)
+            .where(Match.tournament_id == tournament_id)
+            .order_by(Match.weight_class, Match.bracket_order)
+            .offset(pagination.offset)
+            .limit(pagination.size)
+        )
+        return self._rows(result, fields)
+
+    async def create(self, db: AsyncSession, obj_in: MatchCreate) -> Match:
+        match = await super().create(db, obj_in)
+        publish_write(None, match)
+        return match
+
+    async def create_many(
+        self, db: AsyncSession, objs_in: Sequence[MatchCreate]
+    ) -> List[Match]:
+        matches = await super().create_many(db, objs_in)
+        for match in matches:
+            publish_write(None, match)
+        return matches
+
+    async def update(
+        self, db: AsyncSession, db_obj: Match, obj_in: MatchUpdate
+    ) -> Match:
+        before = bracket_state(db_obj)
+        match = await super().update(db, db_obj, obj_in)
+        publish_write(before, match)
+        return match
+
+    async def update_many(
+        self, db: AsyncSession, updates: Dict[str, MatchUpdate]
+    ) -> List[Match]:
+        before = await self._states(db, list(updates))
+        matches = await super().update_many(db, updates)
+        for match in matches:
+            publish_write(before[match.id], match)
+        return matches
+
+    async def upsert_many(
+        self, db: AsyncSession, objs_in: Sequence[MatchCreate]
+    ) -> List[Match]:
+        ids = [obj.id for obj in objs_in if getattr(obj, "id", None)]
+        before = await self._states(db, ids)
+        matches = await super().upsert_many(db, objs_in)
+        for match in matches:
+            publish_write(before.get(match.id), match)
+        return matches
+
+    async def delete(self, db: AsyncSession, id: str) -> bool:
+        return await self.delete_many(db, [id]) > 0
+
+    async def delete_many(self, db: AsyncSession, ids: Sequence[str]) -> int:
+        deleted = []
+        for batch in batched(list(ids)):
+            result = await db.execute(
+                delete(Match)
+                .where(Match.id.in_(batch))
+                .returning(Match.id, Match.tournament_id)
+            )
+            deleted.extend(result.all())
+        await db.commit()
+        for match_id, tournament_id in deleted:
+            publish_match(tournament_id, match_id, "delete", {})
+        return len(deleted)
+
+    async def _states(self, db: AsyncSession, ids: Sequence[str]):
+        return {
+            match.id: bracket_state(match) for match in await self.get_many(db, ids)
+        }
+
+
+match_service = MatchService(Match)
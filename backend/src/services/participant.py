@@ -0,0 +1,38 @@
+"""
+Participant service
+"""
+from typing import List, Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.participant import Participant
+from ..schemas.base import PaginationParams
+from ..schemas.participant import ParticipantCreate, ParticipantUpdate
+from .base import BaseService
+
+
+class ParticipantService(
+    BaseService[Participant, ParticipantCreate, ParticipantUpdate]
+):
+    """Participant CRUD; bulk upserts match on tournament, weight and name"""
+
+    upsert_keys = ("tournament_id", "weight_class", "name")
+
+    async def get_multi_for_tournament(
+        self,
+        db: AsyncSession,
+        tournament_id: str,
+        pagination: PaginationParams,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Participant]:
+        result = await db.execute(
+            self._select(fields)
+            .where(Participant.tournament_id == tournament_id)
+            .order_by(Participant.weight_class, Participant.seed, Participant.name)
+            .offset(pagination.offset)
+            .limit(pagination.size)
+        )
+        return self._rows(result, fields)
+
+
+participant_service = ParticipantService(Participant)
@@ -0,0 +1,36 @@
+"""
+Tournament service
+"""
+from typing import List, Optional, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..models.tournament import Tournament
+from ..schemas.base import PaginationParams
+from ..schemas.tournament import TournamentCreate, TournamentUpdate
+from .base import BaseService
+
+
+class TournamentService(BaseService[Tournament, TournamentCreate, TournamentUpdate]):
+    """Tournament CRUD; bulk upserts match on name and year"""
+
+    upsert_keys = ("name", "year")
+
+    async def get_multi_for_year(
+        self,
+        db: AsyncSession,
+        year: int,
+        pagination: PaginationParams,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Tournament]:
+        result = await db.execute(
+            self._select(fields)
+            .where(Tournament.year == year)
+            .order_by(Tournament.start_date, Tournament.name)
+            .offset(pagination.offset)
+            .limit(pagination.size)
+        )
+        return self._rows(result, fields)
+
+
+tournament_service = TournamentService(Tournament)
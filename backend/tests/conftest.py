@@ -2,13 +2,17 @@
 Test configuration and fixtures
 """
 import asyncio
+from datetime import date
 from typing import AsyncGenerator
 
 import pytest
 import pytest_asyncio
 from fastapi.testclient import TestClient
 from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
+from app.config import settings as app_settings
+from src.core.database import Base
 from src.main import app
 
 
@@ -20,6 +24,37 @@ def event_loop():
     loop.close()
 
 
+@pytest.fixture(scope="session", autouse=True)
+def validate_app_output():
+    """Keep response-model validation on for trusted-output routes in tests"""
+    app_settings.trusted_output = False
+    yield
+
+
+@pytest.fixture(params=[False, True], ids=["validated", "trusted"])
+def output_mode(request, monkeypatch):
+    """Run a route test with validation on and in production's trusted mode"""
+    monkeypatch.setattr(app_settings, "trusted_output", request.param)
+    return request.param
+
+
+@pytest.fixture(scope="session", autouse=True)
+def no_rate_limit():
+    """Every test client shares one address; tests/test_admission.py covers it"""
+    app_settings.rate_limit_per_second = 0
+    yield
+
+
+@pytest.fixture(scope="session", autouse=True)
+def no_profile_cache(tmp_path_factory):
+    """Tests reuse wrestler ids across databases; tests/test_sections.py caches"""
+    app_settings.profile_cache_seconds = 0
+    # Ingest and every ratings save replace the stamp; keep it out of the tree
+    stamp = tmp_path_factory.mktemp("sections") / "profile_cache.stamp"
+    app_settings.profile_cache_stamp_path = str(stamp)
+    yield
+
+
 @pytest.fixture
 def client():
     """Test client for synchronous tests"""
@@ -33,6 +68,16 @@ async def async_client() -> AsyncGenerator[AsyncClient, None]:
         yield ac
 
 
+@pytest_asyncio.fixture
+async def sessions(tmp_path):
+    """Session factory for a fresh SQLite database with every table created"""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'src.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
 @pytest.fixture
 def test_data():
     """Sample test data"""
@@ -48,3 +93,33 @@ def test_data():
             "school": "Test University",
         },
     }
+
+
+@pytest.fixture
+def match_row():
+    """Factory for snapshot-query rows (one per participant per match)"""
+
+    def make(match_id, participant_id, person_id, won, **overrides):
+        row = {
+            "match_id": match_id,
+            "tournament_id": "t-1",
+            "tournament_date": date(2024, 3, 21),
+            "round": "Champ R1",
+            "round_order": 1,
+            "bracket_order": 1,
+            "result_type": "Decision",
+            "winner_id": participant_id if won else None,
+            "participant_id": participant_id,
+            "is_winner": won,
+            "score": None,
+            "next_match_id": None,
+            "person_id": person_id,
+            "school_id": "s-1",
+            "weight_class": "125",
+            "seed": None,
+            "year": 2024,
+        }
+        row.update(overrides)
+        return row
+
+    return make
@@ -0,0 +1,97 @@
+"""
+Test admission control and load shedding
+"""
+import asyncio
+
+import httpx
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.admission import AdmissionMiddleware, TokenBucket
+from app.config import settings
+from app.database import db
+
+
+def make_app():
+    app = FastAPI()
+    app.add_middleware(AdmissionMiddleware)
+    app.state.release = asyncio.Event()
+
+    @app.get("/health")
+    async def health():
+        return {"status": "healthy"}
+
+    @app.get("/fast")
+    async def fast():
+        return {"ok": True}
+
+    @app.get("/slow")
+    async def slow():
+        await app.state.release.wait()
+        return {"ok": True}
+
+    return app
+
+
+def test_token_bucket_refills():
+    bucket = TokenBucket(tokens=2, updated=0.0)
+    assert bucket.take(1.0, 2, 0.0) == 0
+    assert bucket.take(1.0, 2, 0.0) == 0
+    assert bucket.take(1.0, 2, 0.0) == 1.0
+    assert bucket.take(1.0, 2, 0.5) == 0.5
+    assert bucket.take(1.0, 2, 1.0) == 0
+    # Idle time refills no further than the burst
+    bucket.take(1.0, 2, 100.0)
+    assert bucket.tokens == 1
+
+
+def test_client_over_its_rate_gets_429(monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_per_second", 0.5)
+    monkeypatch.setattr(settings, "rate_limit_burst", 2)
+    client = TestClient(make_app())
+    assert [client.get("/fast").status_code for _ in range(2)] == [200, 200]
+    response = client.get("/fast")
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "2"
+    assert client.get("/health").status_code == 200
+
+    monkeypatch.setattr(settings, "rate_limit_trust_proxy", True)
+    other = {"X-Forwarded-For": "203.0.113.7, 10.0.0.1"}
+    assert client.get("/fast", headers=other).status_code == 200
+
+
+def test_pool_queue_sheds_load(monkeypatch):
+    monkeypatch.setattr(settings, "admission_max_pool_waiters", 5)
+    monkeypatch.setattr(db, "waiting", 6)
+    response = TestClient(make_app()).get("/fast")
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "2"
+
+
+async def test_concurrency_limit_queues_then_sheds(monkeypatch):
+    monkeypatch.setattr(settings, "admission_concurrency", 1)
+    monkeypatch.setattr(settings, "admission_queue", 1)
+    monkeypatch.setattr(settings, "admission_queue_timeout", 5)
+    app = make_app()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        running = asyncio.create_task(client.get("/slow"))
+        queued = asyncio.create_task(client.get("/fast"))
+        await asyncio.sleep(0.05)
+
+        # One in flight, one queued: the next is shed straight away
+        response = await client.get("/fast")
+        assert response.status_code == 503
+        assert not queued.done()
+
+        app.state.release.set()
+        assert (await running).status_code == 200
+        assert (await queued).status_code == 200
+
+        monkeypatch.setattr(settings, "admission_queue_timeout", 0.05)
+        app.state.release.clear()
+        running = asyncio.create_task(client.get("/slow"))
+        await asyncio.sleep(0.05)
+        assert (await client.get("/fast")).status_code == 503
+        app.state.release.set()
+        assert (await running).status_code == 200
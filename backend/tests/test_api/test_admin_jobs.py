@@ -0,0 +1,78 @@
+"""
+Test the admin job endpoints
+"""
+import pytest
+
+from src.core.config import settings
+from src.core.database import get_db
+from src.core.security import create_access_token
+from src.main import app
+
+ADMIN = {"Authorization": f"Bearer {create_access_token(settings.admin_email)}"}
+
+
+@pytest.fixture
+def admin_db(sessions):
+    async def override_db():
+        async with sessions() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_db
+    yield
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def admin_client(admin_db, async_client):
+    async_client.headers.update(ADMIN)
+    return async_client
+
+
+async def test_admin_routes_require_the_admin_token(admin_db, async_client):
+    response = await async_client.get("/api/admin/jobs")
+    assert response.status_code == 401
+    other = create_access_token("someone@example.com")
+    response = await async_client.get(
+        "/api/admin/jobs", headers={"Authorization": f"Bearer {other}"}
+    )
+    assert response.status_code == 403
+    response = await async_client.get("/api/admin/jobs", headers=ADMIN)
+    assert response.status_code == 200
+
+
+async def test_import_is_confined_to_the_import_dir(admin_client, tmp_path):
+    settings.import_dir, saved = str(tmp_path), settings.import_dir
+    try:
+        for path in ("/etc/passwd", "../secrets.csv", "."):
+            response = await admin_client.post(
+                "/api/admin/data/import", params={"path": path}
+            )
+            assert response.status_code == 400
+        response = await admin_client.post(
+            "/api/admin/data/import", params={"path": "matches.csv"}
+        )
+        assert response.status_code == 202
+    finally:
+        settings.import_dir = saved
+
+
+async def test_enqueue_inspect_and_cancel(admin_client):
+    response = await admin_client.post(
+        "/api/admin/data/export", params={"tournament_id": "t-1"}
+    )
+    assert response.status_code == 202
+    job = response.json()["data"]
+    assert (job["kind"], job["status"]) == ("export_matches", "queued")
+    assert job["payload"] == {"tournament_id": "t-1"}
+
+    listed = await admin_client.get("/api/admin/jobs", params={"status": "queued"})
+    assert [j["id"] for j in listed.json()["data"]] == [job["id"]]
+
+    cancelled = await admin_client.post(f"/api/admin/jobs/{job['id']}/cancel")
+    assert cancelled.json()["data"]["status"] == "cancelled"
+
+
+async def test_unknown_job_kind(admin_client):
+    response = await admin_client.post("/api/admin/jobs", json={"kind": "nope"})
+    assert response.status_code == 400
+    assert response.json()["errors"] == ["Unknown job kind: nope"]
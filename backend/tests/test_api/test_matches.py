@@ -0,0 +1,113 @@
+"""
+Test match endpoints and their live bracket updates
+"""
+import orjson
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from src.core.database import Base, get_db
+from src.core.events import broker
+from src.main import app
+
+
+@pytest.fixture
+def match_client(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'matches.db'}")
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def override_db():
+        async with sessions() as session:
+            yield session
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    app.dependency_overrides[get_db] = override_db
+    with TestClient(app) as client:
+        client.portal.call(create_tables)
+        yield client
+    app.dependency_overrides.clear()
+
+
+def payload(event):
+    data = event.frame.split(b"data: ", 1)[1]
+    return orjson.loads(data)
+
+
+def test_result_is_published_as_diff(match_client):
+    subscription = broker.subscribe("t-live")
+    created = match_client.post(
+        "/api/matches/",
+        json={"tournament_id": "t-live", "round": "Finals", "weight_class": "125"},
+    )
+    assert created.status_code == 201
+    match_id = created.json()["data"]["id"]
+
+    updated = match_client.put(
+        f"/api/matches/{match_id}",
+        json={"winner_id": "p-1", "result_type": "Fall", "round": "Finals"},
+    )
+    assert updated.status_code == 200
+    assert updated.json()["data"]["winner_id"] == "p-1"
+
+    create_event = subscription.queue.get_nowait()
+    update_event = subscription.queue.get_nowait()
+    assert payload(create_event) == {
+        "op": "create",
+        "id": match_id,
+        "changes": {"round": "Finals", "weight_class": "125"},
+    }
+    assert payload(update_event) == {
+        "op": "update",
+        "id": match_id,
+        "changes": {"winner_id": "p-1", "result_type": "Fall"},
+    }
+    broker.unsubscribe(subscription)
+
+
+def test_missing_match(match_client):
+    response = match_client.put("/api/matches/nope", json={"score": "3-2"})
+    assert response.status_code == 404
+    assert response.json()["errors"] == ["Match not found"]
+
+
+def test_bulk_endpoints(match_client):
+    created = match_client.post(
+        "/api/matches/bulk",
+        json=[{"tournament_id": "t-bulk", "weight_class": w} for w in ("125", "133")],
+    )
+    assert created.status_code == 201
+    ids = [m["id"] for m in created.json()["data"]]
+
+    updated = match_client.patch(
+        "/api/matches/bulk", json=[{"id": ids[1], "score": "7-3"}]
+    )
+    assert [m["score"] for m in updated.json()["data"]] == ["7-3"]
+
+    upserted = match_client.put(
+        "/api/matches/bulk",
+        json=[{"id": ids[0], "tournament_id": "t-bulk", "weight_class": "141"}],
+    )
+    assert upserted.json()["data"][0]["weight_class"] == "141"
+
+    deleted = match_client.request("DELETE", "/api/matches/bulk", json={"ids": ids})
+    assert deleted.json()["data"] == {"deleted": 2}
+    assert match_client.post("/api/matches/bulk", json=[]).status_code == 422
+
+
+def test_sparse_fields(match_client):
+    created = match_client.post(
+        "/api/matches/", json={"tournament_id": "t-sparse", "weight_class": "125"}
+    )
+    match_id = created.json()["data"]["id"]
+
+    listed = match_client.get(
+        "/api/matches/",
+        params={"tournament_id": "t-sparse", "fields": "weight_class,id"},
+    )
+    assert listed.json()["data"] == [{"id": match_id, "weight_class": "125"}]
+    fetched = match_client.get(f"/api/matches/{match_id}", params={"fields": "round"})
+    assert fetched.json()["data"] == {"round": None}
+    assert match_client.get("/api/matches/", params={"fields": "x"}).status_code == 422
@@ -0,0 +1,42 @@
+"""
+Test the school endpoints
+"""
+import duckdb
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database import get_db
+from app.embedded import EmbeddedDatabase
+from app.main import app
+
+SCHOOLS = [
+    ("s1", "Indiana", "Bloomington, IN"),
+    ("s2", "Princeton", "Princeton, NJ"),
+    ("s3", "Minnesota", "Minneapolis, MN"),
+]
+
+
+@pytest.fixture
+def schools_client(tmp_path, output_mode):
+    path = str(tmp_path / "schools.duckdb")
+    connection = duckdb.connect(path)
+    connection.execute(
+        "CREATE TABLE school (school_id VARCHAR, name VARCHAR, location VARCHAR, "
+        "mascot VARCHAR, school_type VARCHAR, school_url VARCHAR)"
+    )
+    for row in SCHOOLS:
+        connection.execute(
+            "INSERT INTO school VALUES ($1, $2, $3, NULL, NULL, NULL)", list(row)
+        )
+    connection.close()
+    database = EmbeddedDatabase(path)
+    app.dependency_overrides[get_db] = lambda: database
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_state_filter_matches_the_state_only(schools_client):
+    # "IN" appears in "Princeton" and "Minneapolis" too
+    response = schools_client.get("/api/schools/schools", params={"state": "in"})
+    assert response.status_code == 200
+    assert [school["name"] for school in response.json()] == ["Indiana"]
@@ -0,0 +1,144 @@
+"""
+Test search endpoints in both validated and trusted-output modes
+"""
+import duckdb
+import pytest
+from fastapi.testclient import TestClient
+
+from app.analytics.dimensions import dimension_store
+from app.config import settings
+from app.database import get_db
+from app.embedded import EmbeddedDatabase
+from app.main import app
+from app.names import search_name
+
+WRESTLER_ROWS = [
+    {
+        "person_id": "p-1",
+        "first_name": "Spencer",
+        "last_name": "Lee",
+        "last_school": "Iowa",
+        "last_year": 2024,
+        "last_weight_class": "125",
+    }
+]
+
+
+class FakeDatabase:
+    """Returns canned rows for every query"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    async def fetch_all(self, query, *args):
+        self.queries.append(query)
+        return self.rows
+
+
+@pytest.fixture(autouse=True)
+def no_dimensions(monkeypatch):
+    """Query the database even when a DIMENSIONS_PATH snapshot exists"""
+    monkeypatch.setattr(dimension_store, "get", lambda: None)
+
+
+@pytest.fixture
+def database():
+    return FakeDatabase(WRESTLER_ROWS)
+
+
+@pytest.fixture
+def search_client(database, output_mode):
+    app.dependency_overrides[get_db] = lambda: database
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def test_search_wrestlers(search_client):
+    """Both modes return the response model shape"""
+    response = search_client.get("/api/search/wrestlers", params={"q": "lee"})
+    assert response.status_code == 200
+    assert response.json() == WRESTLER_ROWS
+
+    response = search_client.get(
+        "/api/search/wrestlers", params={"q": "lee", "mode": "phonetic"}
+    )
+    assert response.status_code == 200
+    assert response.json() == WRESTLER_ROWS
+
+
+def test_search_all(output_mode):
+    """Every category in both modes, tagged with its type"""
+    row = {"id": "x-1", "name": "Lee", "additional_info": None}
+    app.dependency_overrides[get_db] = lambda: FakeDatabase([row])
+    try:
+        response = TestClient(app).get("/api/search", params={"q": "lee"})
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 200
+    body = response.json()
+    assert body["query"] == "lee"
+    for category, kind in (
+        ("wrestlers", "wrestler"),
+        ("schools", "school"),
+        ("tournaments", "tournament"),
+    ):
+        assert body[category] == [{**row, "type": kind}]
+
+
+def test_validated_routes_override_trusted_output(monkeypatch, database):
+    """A route named in VALIDATED_ROUTES validates even in trusted mode"""
+    monkeypatch.setattr(settings, "trusted_output", True)
+    database.rows = [{**WRESTLER_ROWS[0], "last_year": "not a year"}]
+    app.dependency_overrides[get_db] = lambda: database
+    try:
+        client = TestClient(app, raise_server_exceptions=False)
+        response = client.get("/api/search/wrestlers", params={"q": "lee"})
+        assert response.status_code == 200
+
+        monkeypatch.setattr(settings, "validated_routes", "search_wrestlers")
+        response = client.get("/api/search/wrestlers", params={"q": "lee"})
+        assert response.status_code == 500
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_sparse_fields_narrow_select_and_output(search_client, database):
+    params = {"q": "lee", "fields": "last_name, person_id"}
+    response = search_client.get("/api/search/wrestlers", params=params)
+    assert response.status_code == 200
+    assert response.json() == [{"person_id": "p-1", "last_name": "Lee"}]
+    # The outer select list, after the materialized name matches
+    select = database.queries[-1].split("FROM matches", 1)[0].rsplit("SELECT", 1)[1]
+    assert "p.last_name" in select and "p.first_name" not in select
+
+    params["fields"] = "person_id,ssn"
+    response = search_client.get("/api/search/wrestlers", params=params)
+    assert response.status_code == 422
+    assert "ssn" in response.json()["detail"][0]["msg"]
+
+
+def test_search_people_ignores_phonetic_keys(tmp_path):
+    path = str(tmp_path / "people.duckdb")
+    connection = duckdb.connect(path)
+    connection.execute(
+        "CREATE TABLE person (person_id VARCHAR, first_name VARCHAR,"
+        " last_name VARCHAR, search_name VARCHAR, city_of_origin VARCHAR,"
+        " state_of_origin VARCHAR)"
+    )
+    # "kyle dake KL TK"
+    connection.execute(
+        "INSERT INTO person VALUES ('p1', 'Kyle', 'Dake', $1, NULL, NULL)",
+        [search_name("Kyle", "Dake")],
+    )
+    connection.close()
+    database = EmbeddedDatabase(path)
+    app.dependency_overrides[get_db] = lambda: database
+    try:
+        client = TestClient(app)
+        found = client.get("/api/search/people", params={"q": "dak"}).json()
+        assert [person["person_id"] for person in found] == ["p1"]
+        # "tk" is only a Double Metaphone key
+        assert client.get("/api/search/people", params={"q": "tk"}).json() == []
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,32 @@
+"""
+Test the microbenchmark suite's cases and regression statistics
+"""
+import pytest
+
+from app.config import settings
+from benchmarks.suite import CASES, mann_whitney_p, verdict
+
+
+@pytest.mark.parametrize("name", sorted(CASES))
+def test_case_runs(name):
+    """Every case's setup builds a call that runs without an event loop"""
+    trusted = settings.trusted_output
+    CASES[name]()()
+    assert settings.trusted_output == trusted
+
+
+def test_mann_whitney():
+    same = [1.0, 1.1, 0.9, 1.05, 0.95] * 4
+    assert mann_whitney_p(same, same) == pytest.approx(1.0, abs=0.05)
+    slower = [t * 1.5 for t in same]
+    assert mann_whitney_p(same, slower) < 0.001
+
+
+def test_verdict():
+    baseline = [1.0 + i * 0.001 for i in range(20)]
+    assert verdict(baseline, [t * 1.3 for t in baseline])["status"] == "REGRESSION"
+    assert verdict(baseline, [t * 0.7 for t in baseline])["status"] == "faster"
+    assert verdict(baseline, [t * 1.05 for t in baseline])["status"] == "ok"
+    # 30% slower on a machine running 30% slower is no regression
+    result = verdict(baseline, [t * 1.3 for t in baseline], speed=1 / 1.3)
+    assert result["status"] == "ok"
@@ -0,0 +1,157 @@
+"""
+Test the weight class, round and result type codes
+"""
+import duckdb
+import pytest
+from fastapi.testclient import TestClient
+
+from app.codes import (
+    ResultType,
+    Round,
+    result_type_code,
+    result_type_label,
+    round_code,
+    round_label,
+    weight_class_code,
+)
+from app.database import get_db
+from app.embedded import EmbeddedDatabase
+from app.main import app
+from benchmarks.dataset import TABLES, DatasetConfig, generate
+
+
+def test_round_codes_sort_in_session_order():
+    stored = [
+        "1st Place Match",
+        "Cons. Semis",
+        "Semifinal",
+        "Cons. Round 2",
+        "Quarterfinal",
+        "Champ. Round 1",
+    ]
+    assert sorted(stored, key=round_code) == stored[::-1]
+    assert round_code("Consolation Quarterfinal") == Round.CONS_QUARTERFINAL
+    assert round_code("R2") == Round.CHAMP_ROUND_2
+    assert round_code("Finals") == Round.FINAL
+    assert round_code("3rd Place") == Round.THIRD_PLACE
+    assert round_code("Pigtail") == Round.PIGTAIL
+    assert round_code("?") == Round.UNKNOWN
+    assert Round.CONS_QUARTERFINAL.label == "Cons. Quarters"
+    assert round_code("Champ. Round 3") == Round.CHAMP_ROUND_3
+    assert round_code("Cons. Round 10") == Round.CONS_ROUND_10
+
+
+def test_every_generated_round_has_a_code():
+    # NCAA-sized brackets, and fields big enough for Champ. Round 4 and
+    # Cons. Round 7
+    column = TABLES["match"].index("round")
+    for field in (None, 128):
+        config = DatasetConfig(
+            years=1, last_year=2012, schools=80, conferences=2, ncaa_field=field
+        )
+        labels = {row[column] for row in generate(config)["match"]}
+        assert {label for label in labels if not round_code(label)} == set()
+        assert {round_label(round_code(label)) for label in labels} == labels
+
+
+def test_labels_fall_back_to_the_stored_text():
+    assert round_label(Round.SEMIFINAL, "Semis") == "Semifinal"
+    assert round_label(0, "Wrestleback 1") == "Wrestleback 1"
+    assert round_label(None, None) == "Unknown"
+    assert round_label(99, "Wrestleback 1") == "Wrestleback 1"
+    assert result_type_label(None, "Criteria") == "Criteria"
+
+
+def test_weight_class_and_result_codes():
+    assert weight_class_code("125") == 125
+    assert weight_class_code("149 lbs") == 149
+    assert weight_class_code("HWT") == weight_class_code("Unlimited") == 285
+    assert weight_class_code("open") is None
+    assert result_type_code("Tech. Fall") == ResultType.TECH_FALL
+    assert result_type_code("MD") == ResultType.MAJOR_DECISION
+    assert result_type_code(None) == ResultType.UNKNOWN
+
+
+# match_id, round, bracket_order, winner, loser, winner and loser scores
+MATCHES = [
+    ("m1", "1st Place Match", 1, "a", "b", 3, 1),
+    ("m5", "Wrestleback", 1, "b", "c", 2, 0),
+    ("m2", "Semifinal", 1, "a", "c", 5, 2),
+    ("m3", "Quarterfinal", 2, "b", "d", 9, 0),
+    ("m4", "Quarterfinal", 1, "e", "f", 4, 2),
+]
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = str(tmp_path / "brackets.duckdb")
+    connection = duckdb.connect(path)
+    connection.execute(
+        "CREATE TABLE person (person_id VARCHAR, first_name VARCHAR, "
+        "last_name VARCHAR)"
+    )
+    connection.execute("CREATE TABLE role (role_id VARCHAR, person_id VARCHAR)")
+    connection.execute(
+        "CREATE TABLE participant (participant_id VARCHAR, role_id VARCHAR, "
+        "school_id VARCHAR, weight_class VARCHAR, weight_class_code SMALLINT)"
+    )
+    connection.execute("CREATE TABLE school (school_id VARCHAR, name VARCHAR)")
+    connection.execute(
+        "CREATE TABLE match (match_id VARCHAR, tournament_id VARCHAR, "
+        "round VARCHAR, round_code SMALLINT, bracket_order INTEGER, "
+        "result_type VARCHAR, result_type_code SMALLINT, winner_id VARCHAR)"
+    )
+    connection.execute(
+        "CREATE TABLE participant_match (match_id VARCHAR, "
+        "participant_id VARCHAR, is_winner BOOLEAN, score INTEGER)"
+    )
+    connection.execute("INSERT INTO school VALUES ('s1', 'Penn State')")
+    for match_id, round_, order, winner, loser, won, lost in MATCHES:
+        connection.execute(
+            "INSERT INTO match VALUES ($1, 't1', $2, $3, $4, 'Dec', 1, $5)",
+            [match_id, round_, int(round_code(round_)), order, winner],
+        )
+        for participant_id, score in ((winner, won), (loser, lost)):
+            connection.execute(
+                "INSERT INTO participant_match VALUES ($1, $2, $3, $4)",
+                [match_id, participant_id, participant_id == winner, score],
+            )
+    for participant_id in "abcdef":
+        weight = 133 if participant_id in "ef" else 285
+        connection.execute("INSERT INTO person VALUES ($1, $1, 'X')", [participant_id])
+        connection.execute("INSERT INTO role VALUES ($1, $1)", [participant_id])
+        connection.execute(
+            "INSERT INTO participant VALUES ($1, $1, 's1', $2, $3)",
+            [participant_id, str(weight), weight],
+        )
+    connection.close()
+    return EmbeddedDatabase(path)
+
+
+def test_brackets_order_by_code(database):
+    app.dependency_overrides[get_db] = lambda: database
+    try:
+        client = TestClient(app)
+        response = client.get("/api/tournaments/tournaments/t1/brackets")
+        assert response.status_code == 200
+        brackets = response.json()["brackets"]
+        # Weight classes by pounds, rounds in the order they are wrestled
+        assert list(brackets) == ["133", "285"]
+        heavy = brackets["285"]
+        # A round without a code keeps its stored label and sorts last
+        assert [m["match_id"] for m in heavy] == ["m3", "m2", "m1", "m5"]
+        assert heavy[2]["round"] == "1st Place Match"
+        assert heavy[3]["round"] == "Wrestleback"
+        assert heavy[2]["match_result"] == "Decision"
+        assert heavy[2]["score"] == "3-1"
+
+        response = client.get(
+            "/api/tournaments/tournaments/t1/brackets", params={"weight_class": "HWT"}
+        )
+        assert list(response.json()["brackets"]) == ["285"]
+        response = client.get(
+            "/api/tournaments/tournaments/t1/brackets", params={"weight_class": "x"}
+        )
+        assert response.status_code == 400
+    finally:
+        app.dependency_overrides.clear()
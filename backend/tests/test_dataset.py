@@ -0,0 +1,115 @@
+"""
+Test the synthetic NCAA dataset generator
+"""
+from collections import Counter
+
+from app.analytics.snapshot import MatchSnapshot
+from app.analytics.team_scores import score_tournament
+from benchmarks.dataset import (
+    TABLES,
+    DatasetConfig,
+    championship_rounds,
+    generate,
+    seeding_order,
+    write,
+)
+
+CONFIG = DatasetConfig(years=2, last_year=2012, schools=24, conferences=2, seed=3)
+
+
+def as_dicts(dataset):
+    return {
+        table: [dict(zip(TABLES[table], row)) for row in dataset[table]]
+        for table in TABLES
+    }
+
+
+def snapshot_rows(tables, tournament_id):
+    """The snapshot query's join, done in Python"""
+    participants = {row["participant_id"]: row for row in tables["participant"]}
+    roles = {row["role_id"]: row for row in tables["role"]}
+    matches = {row["match_id"]: row for row in tables["match"]}
+    tournament = next(
+        row for row in tables["tournament"] if row["tournament_id"] == tournament_id
+    )
+    rows = []
+    for link in sorted(
+        tables["participant_match"], key=lambda r: (r["match_id"], r["participant_id"])
+    ):
+        match = matches[link["match_id"]]
+        if match["tournament_id"] != tournament_id:
+            continue
+        participant = participants[link["participant_id"]]
+        rows.append(
+            {
+                **match,
+                **link,
+                "tournament_date": tournament["date"],
+                "person_id": roles[participant["role_id"]]["person_id"],
+                "school_id": participant["school_id"],
+                "weight_class": participant["weight_class"],
+                "seed": participant["seed"],
+                "year": participant["year"],
+            }
+        )
+    return rows
+
+
+def test_bracket_helpers():
+    assert seeding_order(8) == [1, 8, 4, 5, 2, 7, 3, 6]
+    assert championship_rounds(33)[0] == "Pigtail"
+    assert championship_rounds(32)[:2] == ["Champ. Round 1", "Champ. Round 2"]
+    assert championship_rounds(2) == ["1st Place Match"]
+
+
+def test_deterministic_under_seed():
+    assert generate(CONFIG) == generate(CONFIG)
+    assert generate(CONFIG) != generate(DatasetConfig(**{**vars(CONFIG), "seed": 4}))
+
+
+def test_rows_reference_each_other():
+    tables = as_dicts(generate(CONFIG))
+    ids = {
+        table: {row[TABLES[table][0]] for row in tables[table]}
+        for table in ("person", "role", "school", "tournament", "participant", "match")
+    }
+    assert {row["person_id"] for row in tables["role"]} <= ids["person"]
+    assert {row["role_id"] for row in tables["participant"]} <= ids["role"]
+    assert {row["school_id"] for row in tables["participant"]} <= ids["school"]
+    assert {row["tournament_id"] for row in tables["match"]} <= ids["tournament"]
+
+    sides = Counter(row["match_id"] for row in tables["participant_match"])
+    winners = {
+        row["match_id"]: row["participant_id"]
+        for row in tables["participant_match"]
+        if row["is_winner"]
+    }
+    for match in tables["match"]:
+        assert winners[match["match_id"]] == match["winner_id"]
+        assert sides[match["match_id"]] == (1 if match["result_type"] == "Bye" else 2)
+    next_ids = {row["next_match_id"] for row in tables["participant_match"]}
+    assert next_ids - {None} <= ids["match"]
+
+
+def test_ncaa_brackets_have_eight_placers():
+    tables = as_dicts(generate(CONFIG))
+    standings = score_tournament(
+        MatchSnapshot.from_rows(snapshot_rows(tables, "t2012-ncaa"))
+    )
+    places = Counter(p["place"] for team in standings["teams"] for p in team["placers"])
+    assert places == {place: 10 for place in range(1, 9)}
+    # Careers span seasons: some 2012 entrants also wrestled in 2011
+    years = {}
+    for row in tables["participant"]:
+        years.setdefault(row["role_id"], set()).add(row["year"])
+    assert any(len(seasons) == 2 for seasons in years.values())
+
+
+def test_write_copy_files(tmp_path):
+    dataset = generate(DatasetConfig(years=1, schools=8, conferences=0))
+    manifest = write(dataset, str(tmp_path))
+    assert [entry["table"] for entry in manifest["tables"]] == list(TABLES)
+    lines = (tmp_path / "participant_match.copy").read_text().splitlines()
+    assert len(lines) == len(dataset["participant_match"])
+    assert all(len(line.split("\t")) == 5 for line in lines)
+    assert lines[-1].endswith("\t\\N")  # the final leads nowhere
@@ -0,0 +1,97 @@
+"""
+Test the embedded snapshot backend and the Postgres fallback
+"""
+import duckdb
+import pytest
+
+from app.config import settings
+from app.database import db, get_db
+from app.embedded import (
+    EmbeddedDatabase,
+    FallbackDatabase,
+    embedded_db,
+    fallback_db,
+    publish,
+)
+
+
+def make_version(path, names):
+    connection = duckdb.connect(path)
+    connection.execute("CREATE TABLE person (person_id VARCHAR, last_name VARCHAR)")
+    connection.executemany(
+        "INSERT INTO person VALUES ($1, $2)",
+        [[f"p{i}", name] for i, name in enumerate(names)],
+    )
+    connection.close()
+    return path
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    path = str(tmp_path / "snapshot.duckdb")
+    publish(make_version(f"{path}.1", ["Lee", "Steveson", "Dake"]), path)
+    return path
+
+
+async def test_postgres_queries_run_unchanged(snapshot_path):
+    database = EmbeddedDatabase(snapshot_path)
+    rows = await database.fetch_all(
+        "SELECT person_id FROM person WHERE last_name ILIKE $1 ORDER BY 1", "%e%"
+    )
+    assert rows == [{"person_id": "p0"}, {"person_id": "p1"}, {"person_id": "p2"}]
+    row = await database.fetch_one(
+        "SELECT count(*)::text AS n FROM person WHERE person_id = ANY($1::text[])",
+        ["p0", "p2", "p9"],
+    )
+    assert row == {"n": "2"}
+    assert await database.fetch_one("SELECT 1 WHERE false") is None
+    with pytest.raises(duckdb.Error):
+        await database.execute("DELETE FROM person")
+    await database.disconnect()
+
+
+async def test_rebuilt_snapshot_is_picked_up(snapshot_path):
+    database = EmbeddedDatabase(snapshot_path)
+    query = "SELECT count(*) AS n FROM person"
+    assert await database.fetch_one(query) == {"n": 3}
+    previous = database.connection
+
+    publish(make_version(f"{snapshot_path}.2", ["Lee"]), snapshot_path)
+    assert await database.fetch_one(query) == {"n": 1}
+    # The old version's connection still answers queries in flight
+    assert previous.execute(query).fetchone() == (3,)
+    await database.disconnect()
+
+
+class UnreachablePostgres:
+    def __init__(self):
+        self.calls = 0
+
+    async def fetch_all(self, query, *args):
+        self.calls += 1
+        raise ConnectionRefusedError("connection refused")
+
+
+async def test_fallback_serves_snapshot_while_postgres_is_down(snapshot_path):
+    primary = UnreachablePostgres()
+    database = FallbackDatabase(primary, EmbeddedDatabase(snapshot_path), retry=60)
+    query = "SELECT person_id FROM person WHERE last_name = $1"
+
+    assert await database.fetch_all(query, "Dake") == [{"person_id": "p2"}]
+    assert database.degraded
+    assert await database.fetch_all(query, "Lee") == [{"person_id": "p0"}]
+    assert primary.calls == 1  # not retried within the retry window
+
+    database.down_until = 0.0
+    await database.fetch_all(query, "Lee")
+    assert primary.calls == 2
+
+
+async def test_get_db_follows_backend(monkeypatch):
+    for backend, expected in (
+        ("postgres", db),
+        ("embedded", embedded_db),
+        ("fallback", fallback_db),
+    ):
+        monkeypatch.setattr(settings, "database_backend", backend)
+        assert await get_db() is expected
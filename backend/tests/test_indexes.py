@@ -0,0 +1,87 @@
+"""
+Test the index migrations and the index usage report
+"""
+import io
+import os
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+
+from scripts.index_report import annotate, estimate_bloat
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def alembic_config(output_buffer=None) -> Config:
+    config = Config(os.path.join(BACKEND, "alembic.ini"), output_buffer=output_buffer)
+    config.set_main_option("script_location", os.path.join(BACKEND, "src/migrations"))
+    return config
+
+
+def test_single_migration_head():
+    assert len(ScriptDirectory.from_config(alembic_config()).get_heads()) == 1
+
+
+def test_indexes_build_concurrently_outside_transactions(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "postgresql://user:pw@localhost/wrestling")
+    output = io.StringIO()
+    command.upgrade(alembic_config(output), "head", sql=True)
+    sql = output.getvalue()
+
+    in_transaction = False
+    creates = 0
+    for statement in sql.split(";"):
+        lines = [line for line in statement.splitlines() if not line.startswith("--")]
+        statement = " ".join(lines).strip()
+        if statement == "BEGIN":
+            in_transaction = True
+        elif statement == "COMMIT":
+            in_transaction = False
+        elif "CREATE INDEX" in statement:
+            assert "CONCURRENTLY IF NOT EXISTS" in statement
+            assert not in_transaction, statement
+            creates += 1
+    assert creates > 0
+
+
+def index_row(**overrides):
+    row = {
+        "table_name": "participant",
+        "index_name": "ix_participant_role_id_year",
+        "idx_scan": 12,
+        "idx_tup_read": 40,
+        "idx_tup_fetch": 40,
+        "size_bytes": 100 * 8192,
+        "reltuples": 10_000.0,
+        "relpages": 100,
+        "method": "btree",
+        "is_unique": False,
+        "is_primary": False,
+        "is_valid": True,
+        "has_expression": False,
+        "key_width": 20,
+    }
+    row.update(overrides)
+    return row
+
+
+def test_bloat_estimate():
+    # 10k entries of 8 + 24 + 4 bytes fit in ~50 pages; 100 pages is ~half bloat
+    bloat = estimate_bloat(index_row(), 8192)
+    assert 0.4 < bloat < 0.6
+    assert estimate_bloat(index_row(relpages=40), 8192) == 0
+    assert estimate_bloat(index_row(method="gin"), 8192) is None
+    assert estimate_bloat(index_row(has_expression=True), 8192) is None
+
+
+def test_report_flags_unused_and_invalid():
+    report = annotate(
+        [
+            index_row(idx_scan=0),
+            index_row(idx_scan=0, is_unique=True),
+            index_row(is_valid=False),
+        ],
+        8192,
+    )
+    assert [entry["flags"] for entry in report] == [["UNUSED"], [], ["INVALID"]]
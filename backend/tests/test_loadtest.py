@@ -0,0 +1,60 @@
+"""
+Test Server-Timing instrumentation and the load-test report
+"""
+from contextlib import asynccontextmanager
+
+from fastapi.testclient import TestClient
+
+from app.database import Database, get_db
+from app.main import app
+from benchmarks.loadtest import Sample, compare, summarize
+
+
+class FakeConnection:
+    async def fetch(self, query, *args):
+        return []
+
+
+class FakePool:
+    @asynccontextmanager
+    async def acquire(self):
+        yield FakeConnection()
+
+
+def test_server_timing_counts_queries():
+    database = Database()
+    database.pool = FakePool()
+    app.dependency_overrides[get_db] = lambda: database
+    try:
+        response = TestClient(app).get("/api/search/wrestlers", params={"q": "lee"})
+    finally:
+        app.dependency_overrides.clear()
+
+    timing = response.headers["server-timing"]
+    assert timing.startswith("db-wait;dur=")
+    assert 'desc="1 queries"' in timing
+
+
+def test_summary_per_route():
+    samples = [Sample("/a", 200, 0.010 * i, 0.001) for i in range(1, 101)]
+    samples += [Sample("/b", 500, 0.5, None), Sample("/b", 0, 10.0, None)]
+    samples += [Sample("/b", 404, 0.1, 0.0)]
+    summary = summarize(samples, elapsed=10.0)
+
+    route_a = summary["routes"]["/a"]
+    assert route_a["throughput"] == 10.0
+    assert route_a["latency_ms"]["p50"] == 505.0
+    assert route_a["pool_wait_ms"]["p95"] == 1.0
+    route_b = summary["routes"]["/b"]
+    assert route_b["error_rate"] == round(2 / 3, 4)
+    assert route_b["statuses"] == {"500": 1, "0": 1, "404": 1}
+    assert route_b["latency_ms"]["p50"] is None
+    assert summary["total"]["requests"] == 103
+
+
+def test_compare_runs():
+    old = {"summary": summarize([Sample("/a", 200, 0.1, 0.0)] * 10, 1.0)}
+    new = {"summary": summarize([Sample("/a", 200, 0.2, 0.0)] * 20, 1.0)}
+    report = compare(old, new)
+    assert "10 -> 20 (+100%)" in report
+    assert "100 -> 200 (+100%)" in report
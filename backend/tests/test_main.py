@@ -1,8 +1,11 @@
 """
 Test main application endpoints
 """
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
+from src.core import startup as startup_module
+from src.core.config import settings
 from src.main import app
 
 client = TestClient(app)
@@ -34,3 +37,114 @@ def test_api_docs():
     response = client.get("/docs")
     assert response.status_code == 200
     assert "text/html" in response.headers["content-type"]
+
+
+def test_response_envelope_timestamp():
+    """Test envelope timestamp is rendered as UTC with a Z suffix"""
+    response = client.get("/health")
+    assert response.headers["content-type"] == "application/json"
+    meta = response.json()["meta"]
+    assert meta["timestamp"].endswith("Z")
+    assert meta["version"] == "1.0"
+
+
+def test_ready_after_warm_up():
+    """Test readiness passes once the lifespan warm-up has run"""
+    with TestClient(app) as started:
+        response = started.get("/ready")
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["status"] == "ready"
+    assert {"import app", "warm caches", "ready"} <= set(data["phases_ms"])
+
+
+async def test_lazy_warm_up_mounts_routers(monkeypatch):
+    """Test lazy startup is not ready until warm-up has mounted the routers"""
+    state = startup_module.Startup()
+    monkeypatch.setattr(startup_module, "startup", state)
+    monkeypatch.setattr(settings, "lazy_startup", True)
+    monkeypatch.setattr(
+        settings, "database_url", "postgresql+asyncpg://user:password@x/db"
+    )
+    lazy_app = FastAPI()
+    assert not state.ready
+
+    await startup_module.warm_up(lazy_app)
+
+    assert state.ready and state.error is None
+    assert "import routers" in state.phases
+    paths = {route.path for route in lazy_app.routes}
+    assert "/api/tournaments/" in paths or "/api/tournaments" in paths
+
+
+async def test_failed_warm_up_stays_not_ready(monkeypatch):
+    """Test a warm-up failure is reported instead of flipping to ready"""
+    state = startup_module.Startup()
+    monkeypatch.setattr(startup_module, "startup", state)
+    monkeypatch.setattr(
+        settings, "database_url", "postgresql+asyncpg://user:password@x/db"
+    )
+
+    def broken():
+        raise RuntimeError("no secret")
+
+    monkeypatch.setattr(startup_module, "warm_caches", broken)
+    await startup_module.warm_up(FastAPI())
+
+    assert not state.ready
+    assert state.error == "RuntimeError: no secret"
+    assert state.report()["status"] == "starting"
+
+
+async def test_failed_init_db_is_retried(monkeypatch):
+    """Test a database that is down at boot is retried until /ready passes"""
+    from src.core import database
+
+    state = startup_module.Startup()
+    monkeypatch.setattr(startup_module, "startup", state)
+    monkeypatch.setattr(settings, "lazy_startup", True)
+    monkeypatch.setattr(settings, "database_url", "postgresql+asyncpg://api@db/app")
+    monkeypatch.setattr(settings, "warm_up_retry_seconds", 0.01)
+    attempts = []
+
+    async def init_db():
+        attempts.append(state.error)
+        if len(attempts) < 3:
+            raise ConnectionRefusedError("connection refused")
+
+    async def warm_pool():
+        pass
+
+    monkeypatch.setattr(database, "init_db", init_db)
+    monkeypatch.setattr(startup_module, "warm_pool", warm_pool)
+    lazy_app = FastAPI()
+
+    await startup_module.keep_warming(lazy_app)
+
+    assert state.ready and state.error is None
+    refused = "ConnectionRefusedError: connection refused"
+    assert attempts == [None, refused, refused]
+    # Routers are mounted once, not again on each retry
+    paths = [route.path for route in lazy_app.routes]
+    assert paths.count("/api/auth/login") == 1
+
+
+def test_app_serves_while_init_db_fails(monkeypatch):
+    """Test an eager start keeps serving and reports the failure on /ready"""
+    from src.core import database
+
+    # /ready reads the process-wide state imported by src.main
+    monkeypatch.setattr(startup_module.startup, "ready", False)
+    monkeypatch.setattr(startup_module.startup, "error", None)
+    monkeypatch.setattr(settings, "database_url", "postgresql+asyncpg://api@db/app")
+    monkeypatch.setattr(settings, "warm_up_retry_seconds", 60.0)
+
+    async def init_db():
+        raise ConnectionRefusedError("connection refused")
+
+    monkeypatch.setattr(database, "init_db", init_db)
+    with TestClient(app) as started:
+        assert started.get("/health").status_code == 200
+        response = started.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["data"]["error"].startswith("ConnectionRefusedError")
@@ -0,0 +1,94 @@
+"""
+Test name normalization and the phonetic wrestler search
+"""
+import duckdb
+import pytest
+from fastapi.testclient import TestClient
+
+from app.database import get_db
+from app.embedded import EmbeddedDatabase
+from app.main import app
+from app.names import NameQuery, fold, search_name
+
+
+def test_fold_strips_accents_and_punctuation():
+    assert fold("José Muñoz-Díaz") == ["jose", "munoz", "diaz"]
+    assert fold("D'Andre O’Connor Jr.") == ["dandre", "oconnor", "jr"]
+    assert fold("Łukasz Großmann") == ["lukasz", "grossmann"]
+    assert fold(None) == []
+
+
+def test_search_name_tokens():
+    tokens = search_name("Mike", "Müller").split()
+    assert tokens[:2] == ["mike", "muller"]
+    # Mike also carries Michael's key
+    assert {"MK", "MXL", "MLR"} <= set(tokens)
+    assert search_name("Jon", "Smith III").split()[:3] == ["jon", "smith", "iii"]
+
+
+def test_name_query_terms():
+    query = NameQuery("Jon Mueller Jr")
+    assert query.exact == ["jon", "mueller"]
+    assert query.sounds == ["JN", "AN", "MLR"]
+    assert "JN0N" in query.terms[0]  # Jonathan
+    assert NameQuery("!!").terms == []
+
+
+PEOPLE = [
+    ("p1", "Jonathan", "Mueller"),
+    ("p2", "John", "Muller"),
+    ("p3", "Jon", "Miller"),
+    ("p4", "Zain", "Retherford"),
+]
+
+
+@pytest.fixture
+def database(tmp_path):
+    path = str(tmp_path / "people.duckdb")
+    connection = duckdb.connect(path)
+    connection.execute(
+        "CREATE TABLE person (person_id VARCHAR, first_name VARCHAR, "
+        "last_name VARCHAR, search_name VARCHAR)"
+    )
+    connection.execute(
+        "CREATE TABLE role (role_id VARCHAR, person_id VARCHAR, role_type VARCHAR)"
+    )
+    connection.execute(
+        "CREATE TABLE participant (role_id VARCHAR, school_id VARCHAR, "
+        "year INTEGER, weight_class VARCHAR)"
+    )
+    connection.execute("CREATE TABLE school (school_id VARCHAR, name VARCHAR)")
+    connection.execute("INSERT INTO school VALUES ('s1', 'Penn State')")
+    for person_id, first, last in PEOPLE:
+        connection.execute(
+            "INSERT INTO person VALUES ($1, $2, $3, $4)",
+            [person_id, first, last, search_name(first, last)],
+        )
+        connection.execute("INSERT INTO role VALUES ($1, $1, 'wrestler')", [person_id])
+        connection.execute(
+            "INSERT INTO participant VALUES ($1, 's1', 2024, '149')", [person_id]
+        )
+    connection.close()
+    return EmbeddedDatabase(path)
+
+
+def test_phonetic_search_ranks_exact_spelling_first(database):
+    app.dependency_overrides[get_db] = lambda: database
+    try:
+        client = TestClient(app)
+
+        def search(q):
+            response = client.get(
+                "/api/search/wrestlers", params={"q": q, "mode": "phonetic"}
+            )
+            assert response.status_code == 200
+            return [w["person_id"] for w in response.json()]
+
+        # Miller sounds like Muller, but John Muller is spelled as typed
+        assert search("john muller") == ["p2", "p3", "p1"]
+        assert search("zane retherferd") == ["p4"]
+        # Jonathan matches Jon through the nickname groups
+        assert search("jon") == ["p3", "p1", "p2"]
+        assert search("!!") == []
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,156 @@
+"""
+Fixtures for the query-plan regression suite
+
+The suite needs a disposable Postgres database, named by
+``PLAN_TEST_DATABASE_URL`` (e.g. ``postgresql://postgres@localhost/plans``).
+Its tables are dropped and reseeded whenever the seeded scale changes, and
+the index migrations are applied on top. Without the variable every test
+here is skipped.
+"""
+import os
+import warnings
+from contextlib import asynccontextmanager
+from typing import Any, List, Sequence, Tuple
+
+import asyncpg
+import pytest
+import pytest_asyncio
+from sqlalchemy import event
+from sqlalchemy.engine.interfaces import ExecuteStyle
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.database import Database
+
+from .plans import DEFAULT_MAX_BUFFERS, Baselines, check, describe, explain, table_sizes
+from .seed import seed
+
+PLAN_DATABASE_URL = os.getenv("PLAN_TEST_DATABASE_URL")
+PLAN_SCALE = float(os.getenv("PLAN_TEST_SCALE", "1.0"))
+
+Query = Tuple[str, Sequence[Any]]
+
+_EXPLAINABLE = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+
+
+class RecordingDatabase(Database):
+    """The app's Database on the seeded pool, remembering every query it runs"""
+
+    def __init__(self, pool: asyncpg.Pool):
+        super().__init__()
+        self.pool = pool
+        self.queries: List[Query] = []
+
+    async def fetch_all(self, query: str, *args):
+        self.queries.append((query, args))
+        return await super().fetch_all(query, *args)
+
+    async def fetch_one(self, query: str, *args):
+        self.queries.append((query, args))
+        return await super().fetch_one(query, *args)
+
+
+@pytest_asyncio.fixture(scope="session")
+async def plan_pool():
+    if not PLAN_DATABASE_URL:
+        pytest.skip("set PLAN_TEST_DATABASE_URL to a scratch Postgres database")
+    await seed(PLAN_DATABASE_URL, PLAN_SCALE)
+    pool = await asyncpg.create_pool(PLAN_DATABASE_URL, min_size=1, max_size=4)
+    yield pool
+    await pool.close()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def plan_engine(plan_pool):
+    engine = create_async_engine(
+        PLAN_DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1)
+    )
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def baselines():
+    baselines = Baselines()
+    yield baselines
+    if baselines.updating:
+        baselines.save()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def assert_plans(plan_pool, baselines):
+    """Explain a case's queries and fail on bad plan shapes or regressions"""
+    async with plan_pool.acquire() as connection:
+        sizes = await table_sizes(connection)
+
+    async def assert_case(
+        name: str,
+        queries: List[Query],
+        max_buffers: int = DEFAULT_MAX_BUFFERS,
+        full_history: bool = False,
+    ) -> None:
+        assert queries, f"{name} issued no queries"
+        async with plan_pool.acquire() as connection:
+            summaries = [await explain(connection, q, args) for q, args in queries]
+
+        problems = [
+            problem
+            for summary in summaries
+            for problem in check(summary, sizes, max_buffers, full_history)
+        ]
+        if baselines.updating:
+            if not problems:
+                baselines.record(name, summaries)
+        else:
+            problems += baselines.compare(name, summaries)
+            if baselines.shape_changed(name, summaries):
+                warnings.warn(f"{name}: plan shape differs from baseline")
+        assert not problems, (
+            f"{name}: " + "; ".join(problems) + "\n" + describe(summaries)
+        )
+
+    return assert_case
+
+
+@pytest.fixture
+def recording_db(plan_pool):
+    return RecordingDatabase(plan_pool)
+
+
+@pytest.fixture
+def capture_statements(plan_engine):
+    """Run service calls in a rolled-back transaction, collecting their SQL.
+
+    Yields a session whose commits only release savepoints, and the list of
+    ``(statement, parameters)`` it executed; executemany statements
+    contribute their first parameter set.
+    """
+
+    @asynccontextmanager
+    async def capture():
+        statements: List[Query] = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if statement.split(None, 1)[0].upper() not in _EXPLAINABLE:
+                return  # savepoints and the like
+            if context.execute_style is ExecuteStyle.EXECUTEMANY:
+                parameters = parameters[0]
+            statements.append((statement, parameters))
+
+        async with plan_engine.connect() as connection:
+            transaction = await connection.begin()
+            session = AsyncSession(
+                bind=connection,
+                expire_on_commit=False,
+                join_transaction_mode="create_savepoint",
+            )
+            event.listen(connection.sync_connection, "before_cursor_execute", record)
+            try:
+                yield session, statements
+            finally:
+                event.remove(
+                    connection.sync_connection, "before_cursor_execute", record
+                )
+                await session.close()
+                await transaction.rollback()
+
+    return capture
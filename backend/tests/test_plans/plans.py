@@ -0,0 +1,178 @@
+"""
+EXPLAIN (ANALYZE, BUFFERS) helpers for the plan regression suite
+
+A plan is rejected when it
+
+* reads more than ``LARGE_SEQ_SCAN_ROWS`` rows through a sequential scan of a
+  table with at least ``LARGE_TABLE_ROWS`` rows (a seq scan under a LIMIT
+  that stops after a page is fine; one that walks the table is not), or
+* touches more shared/temp buffers than the case's budget.
+
+Full-history loads (the analytics snapshot) read every match by design, so
+their cases skip the first check and are held to their budget and baseline.
+
+Each case's buffer count and plan shape are stored in ``baselines.json``; a
+run that needs ``REGRESSION_FACTOR`` times the baseline buffers (plus a
+little slack for page-boundary noise) is a regression. Shape changes alone
+only warn, since they can follow from a Postgres upgrade or new statistics.
+Set ``PLAN_UPDATE_BASELINES=1`` to rewrite the baselines from the current run.
+"""
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import asyncpg
+
+LARGE_TABLE_ROWS = 10_000
+LARGE_SEQ_SCAN_ROWS = 1_000
+DEFAULT_MAX_BUFFERS = 1_000
+REGRESSION_FACTOR = 1.5
+REGRESSION_SLACK = 16
+
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+_EXPLAIN = "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) "
+
+
+@dataclass
+class PlanSummary:
+    query: str
+    plan: Dict[str, Any]
+    buffers: int
+    execution_ms: float
+    # (relation, rows read) for every sequential scan
+    seq_scans: List[Tuple[str, int]] = field(default_factory=list)
+    shape: List[str] = field(default_factory=list)
+
+
+def walk(node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", []):
+        yield from walk(child)
+
+
+def _label(node: Dict[str, Any]) -> str:
+    target = node.get("Index Name") or node.get("Relation Name")
+    return f"{node['Node Type']}({target})" if target else node["Node Type"]
+
+
+def summarize(query: str, explained: Dict[str, Any]) -> PlanSummary:
+    root = explained["Plan"]
+    buffers = sum(
+        root.get(key, 0)
+        for key in (
+            "Shared Hit Blocks",
+            "Shared Read Blocks",
+            "Temp Read Blocks",
+            "Temp Written Blocks",
+        )
+    )
+    summary = PlanSummary(
+        query=query,
+        plan=root,
+        buffers=buffers,
+        execution_ms=explained.get("Execution Time", 0.0),
+    )
+    for node in walk(root):
+        summary.shape.append(_label(node))
+        if node["Node Type"] == "Seq Scan":
+            loops = node.get("Actual Loops", 1)
+            read = node.get("Actual Rows", 0) + node.get("Rows Removed by Filter", 0)
+            summary.seq_scans.append((node["Relation Name"], int(read * loops)))
+    return summary
+
+
+async def explain(
+    connection: asyncpg.Connection, query: str, args: Sequence[Any] = ()
+) -> PlanSummary:
+    """Run the query under EXPLAIN ANALYZE and roll back anything it wrote"""
+    transaction = connection.transaction()
+    await transaction.start()
+    try:
+        result = await connection.fetchval(_EXPLAIN + query, *args)
+    finally:
+        await transaction.rollback()
+    return summarize(query, json.loads(result)[0])
+
+
+async def table_sizes(connection: asyncpg.Connection) -> Dict[str, int]:
+    rows = await connection.fetch(
+        "SELECT relname, reltuples::bigint AS reltuples FROM pg_class"
+        " WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace"
+    )
+    return {row["relname"]: row["reltuples"] for row in rows}
+
+
+def check(
+    summary: PlanSummary,
+    sizes: Dict[str, int],
+    max_buffers: int,
+    full_history: bool = False,
+) -> List[str]:
+    """Plan-shape violations for one query"""
+    problems = []
+    for relation, read in [] if full_history else summary.seq_scans:
+        if sizes.get(relation, 0) >= LARGE_TABLE_ROWS and read > LARGE_SEQ_SCAN_ROWS:
+            problems.append(
+                f"seq scan of {relation} read {read} of ~{sizes[relation]} rows"
+            )
+    if summary.buffers > max_buffers:
+        problems.append(f"touched {summary.buffers} buffers (budget {max_buffers})")
+    return problems
+
+
+class Baselines:
+    """Per-case buffer counts and plan shapes from a known-good run"""
+
+    def __init__(self, path: str = BASELINES_PATH):
+        self.path = path
+        try:
+            with open(path) as fh:
+                self.cases: Dict[str, Any] = json.load(fh)
+        except FileNotFoundError:
+            self.cases = {}
+        self.updating = os.getenv("PLAN_UPDATE_BASELINES") == "1"
+
+    def compare(self, name: str, summaries: List[PlanSummary]) -> List[str]:
+        """Regressions of ``summaries`` against the stored baseline for ``name``"""
+        baseline = self.cases.get(name)
+        if baseline is None:
+            return []
+        regressions = []
+        buffers = sum(summary.buffers for summary in summaries)
+        allowed = baseline["buffers"] * REGRESSION_FACTOR + REGRESSION_SLACK
+        if buffers > allowed:
+            regressions.append(
+                f"buffers regressed: {buffers} vs baseline {baseline['buffers']}"
+                f"\n  baseline plan: {baseline['shape']}"
+                f"\n  current plan:  {shapes(summaries)}"
+            )
+        return regressions
+
+    def shape_changed(self, name: str, summaries: List[PlanSummary]) -> bool:
+        baseline = self.cases.get(name)
+        return baseline is not None and baseline["shape"] != shapes(summaries)
+
+    def record(self, name: str, summaries: List[PlanSummary]) -> None:
+        self.cases[name] = {
+            "buffers": sum(summary.buffers for summary in summaries),
+            "shape": shapes(summaries),
+        }
+
+    def save(self) -> None:
+        with open(self.path, "w") as fh:
+            json.dump(self.cases, fh, indent=2, sort_keys=True)
+            fh.write("\n")
+
+
+def shapes(summaries: List[PlanSummary]) -> List[str]:
+    return [" > ".join(summary.shape) for summary in summaries]
+
+
+def describe(summaries: List[PlanSummary], limit: Optional[int] = 400) -> str:
+    parts = []
+    for summary in summaries:
+        query = " ".join(summary.query.split())
+        parts.append(f"{query[:limit]}\n  plan: {' > '.join(summary.shape)}")
+    return "\n".join(parts)
@@ -0,0 +1,291 @@
+"""
+Seed a scratch Postgres database with the Supabase schema at realistic volume
+
+Rows are generated server-side with ``generate_series`` from a fixed random
+seed, so every run produces the same data and plans are comparable between
+runs. ``scale`` multiplies every table (1.0 is roughly a full NCAA D1
+history: 40k people, 160k participations, 240k matches).
+"""
+import argparse
+import asyncio
+import os
+from typing import Optional
+
+import asyncpg
+from alembic import command
+from alembic.config import Config
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src import models  # noqa: F401  (registers the tables on Base.metadata)
+from src.core.database import Base
+
+SCHEMA = """
+DROP TABLE IF EXISTS participant_match, match, participant, tournament, school,
+    role, person, plan_seed, alembic_version CASCADE;
+DROP TABLE IF EXISTS matches, participants, tournaments, jobs CASCADE;
+
+CREATE TABLE person (
+    person_id TEXT PRIMARY KEY,
+    first_name TEXT NOT NULL,
+    last_name TEXT NOT NULL,
+    search_name TEXT,
+    date_of_birth DATE,
+    city_of_origin TEXT,
+    state_of_origin TEXT
+);
+CREATE TABLE role (
+    role_id TEXT PRIMARY KEY,
+    person_id TEXT NOT NULL REFERENCES person (person_id),
+    role_type TEXT CHECK (role_type IN ('wrestler', 'coach'))
+);
+CREATE TABLE school (
+    school_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    location TEXT,
+    mascot TEXT,
+    school_type TEXT,
+    school_url TEXT
+);
+CREATE TABLE tournament (
+    tournament_id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    date DATE NOT NULL,
+    year INTEGER,
+    location TEXT
+);
+CREATE TABLE participant (
+    participant_id TEXT PRIMARY KEY,
+    role_id TEXT NOT NULL REFERENCES role (role_id),
+    school_id TEXT NOT NULL REFERENCES school (school_id),
+    year INTEGER NOT NULL,
+    weight_class TEXT NOT NULL,
+    seed INTEGER
+);
+CREATE TABLE match (
+    match_id TEXT PRIMARY KEY,
+    round TEXT NOT NULL,
+    round_order INTEGER NOT NULL,
+    bracket_order INTEGER NOT NULL,
+    tournament_id TEXT NOT NULL REFERENCES tournament (tournament_id),
+    result_type TEXT,
+    fall_time TEXT,
+    tech_time TEXT,
+    winner_id TEXT REFERENCES participant (participant_id)
+);
+CREATE TABLE participant_match (
+    match_id TEXT REFERENCES match (match_id),
+    participant_id TEXT REFERENCES participant (participant_id),
+    is_winner BOOLEAN,
+    score INTEGER,
+    next_match_id TEXT REFERENCES match (match_id),
+    PRIMARY KEY (match_id, participant_id)
+);
+CREATE TABLE plan_seed (scale DOUBLE PRECISION NOT NULL);
+"""
+
+FIRST_NAMES = [
+    "Aaron", "Austin", "Brandon", "Bryce", "Carter", "Chance", "Cole", "Colin",
+    "Daton", "David", "Drake", "Dylan", "Ethan", "Gable", "Isaac", "Jacob",
+    "Jason", "Jordan", "Josh", "Kyle", "Logan", "Mason", "Max", "Michael",
+    "Nick", "Owen", "Patrick", "Real", "Ryan", "Sammy", "Spencer", "Tony",
+    "Trent", "Tyler", "Vito", "Wyatt", "Yianni", "Zahid", "Zach", "Zain",
+]  # fmt: skip
+# 1,000 surnames, so a full-surname search matches a few dozen people
+SURNAME_STEMS = [
+    "Ander", "Bar", "Brad", "Cal", "Car", "Dal", "Dun", "Ed", "Fitz", "Gal",
+    "Ham", "Hen", "Jo", "Kel", "Kem", "Lar", "Lew", "Mac", "Mar", "Mor",
+    "Nel", "Nick", "Ol", "Par", "Pat", "Ras", "Reth", "Rob", "Sam", "Stan",
+    "Stev", "Tay", "Val", "Wal", "Wil", "Yan", "Yor", "Zav", "Zel", "Zim",
+]  # fmt: skip
+SURNAME_ENDINGS = [
+    "son", "sen", "ton", "ley", "man", "berg", "ford", "wood", "well", "ridge",
+    "field", "stein", "ski", "lund", "by", "ham", "ner", "ick", "ett", "ard",
+    "ey", "ing", "er", "ell", "ow",
+]  # fmt: skip
+LAST_NAMES = [stem + ending for stem in SURNAME_STEMS for ending in SURNAME_ENDINGS]
+WEIGHT_CLASSES = ["125", "133", "141", "149", "157", "165", "174", "184", "197", "285"]
+ROUNDS = [
+    "Pigtail", "Champ. Round 1", "Champ. Round 2", "Quarterfinal", "Semifinal",
+    "Cons. Pig Tails", "Cons. Round 1", "Cons. Round 2", "Cons. Round 3",
+    "Cons. Round 4", "Cons. Round 5", "Cons. Semis", "1st Place Match",
+    "3rd Place Match", "5th Place Match", "7th Place Match",
+]  # fmt: skip
+RESULTS = [
+    "Decision", "Decision", "Decision", "Major Decision", "Tech Fall", "Fall",
+    "Fall", "Forfeit", "Injury Default", "Disqualification",
+]  # fmt: skip
+
+# Base row counts at scale 1.0
+PEOPLE = 40_000
+SCHOOLS = 400
+TOURNAMENTS = 1_200
+SEASONS_PER_WRESTLER = 4
+MATCHES = 240_000
+
+DATA = """
+SELECT setseed(0.42);
+
+INSERT INTO school
+SELECT 's' || n, 'University ' || n, 'City ' || (n % 97) || ', ST', 'Mascot ' || n,
+       'university', 'https://school' || n || '.example.edu'
+FROM generate_series(1, {schools}) AS n;
+
+INSERT INTO person
+SELECT 'p' || n, f, l, lower(f || ' ' || l),
+       DATE '1950-01-01' + (random() * 20000)::int, 'City ' || (n % 500), 'ST'
+FROM (
+    SELECT n,
+           {first_names}[1 + floor(random() * {n_first})::int] AS f,
+           {last_names}[1 + floor(random() * {n_last})::int] AS l
+    FROM generate_series(1, {people}) AS n
+) AS names;
+
+INSERT INTO role
+SELECT 'r' || n, 'p' || n, CASE WHEN n % 20 = 0 THEN 'coach' ELSE 'wrestler' END
+FROM generate_series(1, {people}) AS n;
+
+INSERT INTO tournament
+SELECT 't' || n, 'Championship ' || n, make_date(y, 3, 1 + n % 28), y,
+       'Arena ' || (n % 40)
+FROM (SELECT n, 1970 + n % 56 AS y FROM generate_series(1, {tournaments}) AS n) AS t;
+
+-- Each wrestler (every role but the coaches) competes for {seasons} seasons
+INSERT INTO participant
+SELECT 'pt' || n, 'r' || w, 's' || (1 + (w * 7919) % {schools}),
+       1970 + (w % 52) + (n - 1) % {seasons},
+       {weight_classes}[1 + w % 10],
+       CASE WHEN random() < 0.5 THEN 1 + floor(random() * 33)::int END
+FROM (
+    SELECT n, 1 + (n - 1) / {seasons} AS w
+    FROM generate_series(1, {people} * {seasons}) AS n
+) AS p
+WHERE w % 20 <> 0;
+
+CREATE TEMP TABLE wrestlers AS
+SELECT row_number() OVER (ORDER BY participant_id) AS k, participant_id
+FROM participant;
+CREATE INDEX ON wrestlers (k);
+ANALYZE wrestlers;
+
+CREATE TEMP TABLE bouts AS
+SELECT n, 1 + (n * 7) % c AS a, 1 + (n * 13 + 1) % c AS b
+FROM generate_series(1, {matches}) AS n, (SELECT count(*) AS c FROM wrestlers) AS w;
+
+INSERT INTO match
+SELECT 'm' || n, {rounds}[1 + n % {n_rounds}], 1 + n % {n_rounds}, n % 64,
+       't' || (1 + n % {tournaments}),
+       {results}[1 + floor(random() * {n_results})::int], NULL, NULL,
+       a.participant_id
+FROM bouts JOIN wrestlers a ON a.k = bouts.a;
+
+INSERT INTO participant_match
+SELECT 'm' || n, a.participant_id, true, 3 + n % 15,
+       CASE WHEN n % 4 <> 0 AND n < {matches} THEN 'm' || (n + 1) END
+FROM bouts JOIN wrestlers a ON a.k = bouts.a;
+
+INSERT INTO participant_match
+SELECT 'm' || n, b.participant_id, false, n % 7, NULL
+FROM bouts JOIN wrestlers b ON b.k = bouts.b
+WHERE bouts.a <> bouts.b;
+"""
+
+# The SQLAlchemy (src/) tables, filled from the Supabase tables
+SRC_DATA = """
+INSERT INTO tournaments (id, name, year, location, division, start_date)
+SELECT gen_random_uuid(), name, year, location, 'D1', date FROM tournament;
+
+CREATE TEMP TABLE tournament_ids AS
+SELECT row_number() OVER (ORDER BY id) - 1 AS k, id FROM tournaments;
+CREATE INDEX ON tournament_ids (k);
+ANALYZE tournament_ids;
+
+INSERT INTO participants (id, tournament_id, name, weight_class, school, seed)
+SELECT gen_random_uuid(), t.id, p.first_name || ' ' || p.last_name || ' ' || pt.year,
+       pt.weight_class, pt.school_id, pt.seed
+FROM participant pt
+JOIN role r ON r.role_id = pt.role_id
+JOIN person p ON p.person_id = r.person_id
+JOIN tournament_ids t ON t.k = (pt.year - 1970) * 7 % {tournaments}
+ON CONFLICT DO NOTHING;
+
+INSERT INTO matches (
+    id, tournament_id, weight_class, round, bracket_order, result_type, score
+)
+SELECT gen_random_uuid(), t.id, {weight_classes}[1 + m.bracket_order % 10],
+       m.round, m.bracket_order, m.result_type, '3-1'
+FROM match m
+JOIN tournament_ids t ON t.k = substr(m.tournament_id, 2)::int % {tournaments};
+"""
+
+
+def _array(values) -> str:
+    quoted = ", ".join("'" + value.replace("'", "''") + "'" for value in values)
+    return f"(ARRAY[{quoted}])"
+
+
+def alembic_config(url: str) -> Config:
+    backend = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    config = Config(os.path.join(backend, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(backend, "src/migrations"))
+    config.cmd_opts = argparse.Namespace(x=[f"url={url}"])
+    return config
+
+
+async def _seeded_scale(connection: asyncpg.Connection) -> Optional[float]:
+    if await connection.fetchval("SELECT to_regclass('plan_seed')") is None:
+        return None
+    return await connection.fetchval("SELECT scale FROM plan_seed")
+
+
+async def seed(url: str, scale: float = 1.0) -> None:
+    """Refill the schema unless it holds data at ``scale``, then migrate to head"""
+    counts = {
+        "people": int(PEOPLE * scale),
+        "schools": max(int(SCHOOLS * scale), 10),
+        "tournaments": max(int(TOURNAMENTS * scale), 10),
+        "matches": int(MATCHES * scale),
+        "seasons": SEASONS_PER_WRESTLER,
+        "first_names": _array(FIRST_NAMES),
+        "n_first": len(FIRST_NAMES),
+        "last_names": _array(LAST_NAMES),
+        "n_last": len(LAST_NAMES),
+        "weight_classes": _array(WEIGHT_CLASSES),
+        "rounds": _array(ROUNDS),
+        "n_rounds": len(ROUNDS),
+        "results": _array(RESULTS),
+        "n_results": len(RESULTS),
+    }
+    connection = await asyncpg.connect(url)
+    try:
+        seeded = await _seeded_scale(connection) == scale
+        if not seeded:
+            async with connection.transaction():
+                await connection.execute(SCHEMA)
+                await connection.execute(DATA.format(**counts))
+    finally:
+        await connection.close()
+
+    # Indexes are built by the migrations under test, on the filled tables;
+    # a database seeded before the latest migrations is brought up to date
+    await asyncio.to_thread(command.upgrade, alembic_config(url), "head")
+    if seeded:
+        connection = await asyncpg.connect(url)
+        try:
+            await connection.execute("ANALYZE")
+        finally:
+            await connection.close()
+        return
+
+    engine = create_async_engine(url.replace("postgresql://", "postgresql+asyncpg://"))
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+
+    connection = await asyncpg.connect(url)
+    try:
+        async with connection.transaction():
+            await connection.execute(SRC_DATA.format(**counts))
+            await connection.execute("INSERT INTO plan_seed VALUES ($1)", scale)
+        await connection.execute("VACUUM ANALYZE")
+    finally:
+        await connection.close()
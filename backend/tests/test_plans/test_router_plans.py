@@ -0,0 +1,119 @@
+"""
+Plans of the queries behind the app/ routers
+
+Every endpoint that queries Postgres is called through the app with a
+recording database; each query it issued is then explained. Caches in front
+of the database (search dimensions, team standings, the analytics snapshot)
+are emptied first so the routes reach it. Not covered: the
+``/search/test-db`` and ``/search/debug-wrestlers`` diagnostics, which count
+whole tables on purpose, and ``/schools/{id}/stats`` and
+``/schools/{id}/wrestlers``, which still query pre-migration
+``people``/``participants`` columns that no schema has.
+"""
+import pytest
+from httpx import AsyncClient
+
+from app.analytics import dimensions, team_scores
+from app.analytics.snapshot import load_snapshot, snapshot_cache
+from app.analytics.team_scores import TeamScoreStore
+from app.database import get_db
+from app.main import app
+
+# A tournament's matches are scattered across the heap: ~20 pages per bout
+TOURNAMENT_BUFFERS = 8_000
+
+ROUTES = [
+    ("search_all", "/api/search", {"q": "Morley"}),
+    ("search_wrestlers", "/api/search/wrestlers", {"q": "Morley"}),
+    (
+        "search_wrestlers_phonetic",
+        "/api/search/wrestlers",
+        {"q": "Morley", "mode": "phonetic"},
+    ),
+    ("search_schools", "/api/search/schools", {"q": "University 12"}),
+    ("search_people", "/api/search/people", {"q": "Morley"}),
+    ("wrestlers", "/api/wrestlers/wrestlers", {}),
+    ("wrestler_profile", "/api/wrestlers/wrestlers/p1234", {}),
+    ("wrestler_profile_simple", "/api/wrestlers/profile-simple/p1234", {}),
+    ("wrestler_stats", "/api/wrestlers/wrestlers/p1234/stats", {}),
+    ("wrestler_matches", "/api/wrestlers/wrestlers/p1234/matches", {}),
+    ("wrestler_full", "/api/wrestlers/p1234/full", {}),
+    ("schools", "/api/schools/schools", {}),
+    ("school", "/api/schools/schools/s12", {}),
+    ("tournaments", "/api/tournaments/tournaments", {}),
+    ("tournament", "/api/tournaments/tournaments/t17", {}),
+    ("tournament_brackets", "/api/tournaments/tournaments/t17/brackets", {}),
+    (
+        "tournament_brackets_weight",
+        "/api/tournaments/tournaments/t17/brackets",
+        {"weight_class": "125"},
+    ),
+    ("tournament_team_scores", "/api/tournaments/tournaments/t17/team-scores", {}),
+]
+
+# Routes that read a whole tournament's matches
+TOURNAMENT_ROUTES = {
+    "tournament_brackets",
+    "tournament_brackets_weight",
+    "tournament_team_scores",
+}
+
+# Routes served from the full-history snapshot, which reads every match
+FULL_HISTORY_ROUTES = [
+    (
+        "tournament_predictions",
+        "/api/tournaments/tournaments/t17/predictions",
+        {"weight_class": "125", "simulations": 1000},
+    ),
+    ("analytics_upsets", "/api/analytics/upsets", {}),
+]
+
+
+@pytest.fixture
+def uncached(monkeypatch, tmp_path):
+    """Route every read to the database rather than a cache"""
+    monkeypatch.setattr(dimensions.dimension_store, "get", lambda: None)
+    monkeypatch.setattr(team_scores, "team_score_store", TeamScoreStore(str(tmp_path)))
+    snapshot_cache.invalidate()
+    yield
+    snapshot_cache.invalidate()
+
+
+async def _get(recording_db, path, params):
+    app.dependency_overrides[get_db] = lambda: recording_db
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get(path, params=params)
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 200, response.text
+
+
+@pytest.mark.parametrize("name,path,params", ROUTES, ids=[r[0] for r in ROUTES])
+async def test_route_plans(name, path, params, recording_db, assert_plans, uncached):
+    await _get(recording_db, path, params)
+    if name in TOURNAMENT_ROUTES:
+        await assert_plans(name, recording_db.queries, max_buffers=TOURNAMENT_BUFFERS)
+    else:
+        await assert_plans(name, recording_db.queries)
+
+
+@pytest.mark.parametrize(
+    "name,path,params", FULL_HISTORY_ROUTES, ids=[r[0] for r in FULL_HISTORY_ROUTES]
+)
+async def test_full_history_route_plans(
+    name, path, params, recording_db, assert_plans, uncached
+):
+    await _get(recording_db, path, params)
+    await assert_plans(
+        name, recording_db.queries, max_buffers=100_000, full_history=True
+    )
+
+
+async def test_tournament_snapshot_plan(recording_db, assert_plans):
+    """Per-tournament loads back ingest and team scores"""
+    snapshot = await load_snapshot(recording_db, ["t17"])
+    assert len(snapshot) > 0
+    await assert_plans(
+        "tournament_snapshot", recording_db.queries, max_buffers=TOURNAMENT_BUFFERS
+    )
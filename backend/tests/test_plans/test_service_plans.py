@@ -0,0 +1,73 @@
+"""
+Plans of the statements BaseService and its subclasses issue
+
+Each call runs against the seeded src/ tables inside a transaction that is
+rolled back; the statements it executed are then explained one by one.
+``count`` is left out: counting every row is a full scan by design.
+"""
+from sqlalchemy import select, text
+
+from src.models import Match, Participant
+from src.schemas.base import PaginationParams
+from src.schemas.match import MatchCreate, MatchUpdate
+from src.schemas.participant import ParticipantCreate
+from src.services.match import match_service
+from src.services.participant import participant_service
+from src.services.tournament import tournament_service
+
+
+async def sample(session, column, n=100):
+    result = await session.execute(select(column).order_by(text("random()")).limit(n))
+    return result.scalars().all()
+
+
+async def test_get_plans(capture_statements, assert_plans):
+    async with capture_statements() as (session, statements):
+        ids = await sample(session, Match.id)
+        statements.clear()
+        await match_service.get(session, ids[0])
+        await match_service.get_many(session, ids)
+        await match_service.get_multi(session, PaginationParams(page=50, size=20))
+    await assert_plans("service_get", statements)
+
+
+async def test_list_for_parent_plans(capture_statements, assert_plans):
+    async with capture_statements() as (session, statements):
+        (tournament_id,) = await sample(session, Match.tournament_id, 1)
+        statements.clear()
+        page = PaginationParams(page=1, size=100)
+        await match_service.get_multi_for_tournament(session, tournament_id, page)
+        await participant_service.get_multi_for_tournament(session, tournament_id, page)
+        await tournament_service.get_multi_for_year(session, 2001, page)
+    await assert_plans("service_list_for_parent", statements)
+
+
+async def test_bulk_write_plans(capture_statements, assert_plans):
+    async with capture_statements() as (session, statements):
+        ids = await sample(session, Match.id)
+        participants = (
+            (await session.execute(select(Participant).limit(50))).scalars().all()
+        )
+        statements.clear()
+
+        await match_service.create_many(
+            session,
+            [MatchCreate(tournament_id="t-plan", weight_class="125") for _ in ids],
+        )
+        await match_service.update_many(
+            session, {id: MatchUpdate(score="4-2") for id in ids}
+        )
+        await participant_service.upsert_many(
+            session,
+            [
+                ParticipantCreate(
+                    tournament_id=p.tournament_id,
+                    name=p.name,
+                    weight_class=p.weight_class,
+                    seed=1,
+                )
+                for p in participants
+            ],
+        )
+        await match_service.delete_many(session, ids)
+    await assert_plans("service_bulk_writes", statements, max_buffers=5_000)
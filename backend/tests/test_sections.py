@@ -0,0 +1,187 @@
+"""
+Test the cached wrestler profile sections and the composite profile route
+"""
+import asyncio
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.analytics.ratings import RatingBook, rating_store
+from app.codes import ResultType, Round
+from app.config import settings
+from app.database import get_db
+from app.main import app
+from app.sections import SectionCache, invalidate_sections
+
+
+@pytest.fixture
+def caching(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "profile_cache_seconds", 60)
+    stamp = str(tmp_path / "profile_cache.stamp")
+    monkeypatch.setattr(settings, "profile_cache_stamp_path", stamp)
+    invalidate_sections()
+    yield
+    invalidate_sections()
+
+
+async def test_section_cache(caching, monkeypatch):
+    cache = SectionCache()
+    loads = []
+
+    async def load(value):
+        loads.append(value)
+        return value
+
+    assert await cache.get("a", lambda: load(1)) == 1
+    assert await cache.get("a", lambda: load(2)) == 1
+    # Nothing found is looked up again next time
+    assert await cache.get("b", lambda: load(None)) is None
+    assert await cache.get("b", lambda: load(3)) == 3
+
+    monkeypatch.setattr(settings, "profile_cache_size", 1)
+    await cache.get("c", lambda: load(4))
+    assert await cache.get("a", lambda: load(5)) == 5
+    cache.invalidate()
+    assert await cache.get("a", lambda: load(6)) == 6
+    assert loads == [1, None, 3, 4, 5, 6]
+
+
+INGEST_INVALIDATION = "from app.sections import invalidate_sections as i; i()"
+
+
+async def test_ingest_in_another_process_clears_the_cache(caching):
+    cache = SectionCache()
+
+    async def load(value):
+        return value
+
+    assert await cache.get("a", lambda: load(1)) == 1
+    subprocess.run(
+        [sys.executable, "-c", INGEST_INVALIDATION],
+        env={
+            **os.environ,
+            "PROFILE_CACHE_STAMP_PATH": settings.profile_cache_stamp_path,
+        },
+        check=True,
+    )
+    assert await cache.get("a", lambda: load(2)) == 2
+
+
+PROFILE = {
+    "person_id": "p1",
+    "first_name": "Spencer",
+    "last_name": "Lee",
+    "search_name": None,
+    "date_of_birth": None,
+    "city_of_origin": None,
+    "state_of_origin": None,
+    "role_id": "r1",
+}
+STATS = {
+    "total_matches": 2,
+    "wins": 2,
+    "losses": 0,
+    "pins": 1,
+    "tech_falls": 0,
+    "major_decisions": 0,
+}
+MATCH = {
+    "match_id": "m1",
+    "opponent_first_name": "Zane",
+    "opponent_last_name": "Smith",
+    "opponent_school": "Iowa",
+    "won": True,
+    "result_type_code": ResultType.FALL,
+    "score": 6,
+    "opponent_score": 0,
+    "tournament_name": "NCAA",
+    "round_code": Round.FINAL,
+    "year": 2024,
+    "weight_class_code": 125,
+}
+
+
+class SlowDatabase:
+    """Answers each section's query after a pause, counting overlapping queries"""
+
+    def __init__(self):
+        self.queries = 0
+        self.running = 0
+        self.most_running = 0
+
+    async def _query(self, result):
+        self.queries += 1
+        self.running += 1
+        self.most_running = max(self.most_running, self.running)
+        await asyncio.sleep(0.05)
+        self.running -= 1
+        return result
+
+    async def fetch_one(self, query, *args):
+        if "WITH bouts" in query:
+            return await self._query(dict(STATS))
+        return await self._query(dict(PROFILE) if args[0] == "p1" else None)
+
+    async def fetch_all(self, query, *args):
+        return await self._query([dict(MATCH)] if args[0] == "p1" else [])
+
+
+def test_full_profile_loads_sections_concurrently(caching, output_mode):
+    database = SlowDatabase()
+    app.dependency_overrides[get_db] = lambda: database
+    try:
+        client = TestClient(app)
+        response = client.get("/api/wrestlers/p1/full")
+        assert response.status_code == 200
+        body = response.json()
+        assert body["profile"]["last_name"] == "Lee"
+        assert body["stats"]["win_percentage"] == 100.0
+        assert body["matches"][0]["decision"] == "Fall"
+        assert body["matches"][0]["round"] == "1st Place Match"
+        # The profile first, then stats and matches together
+        assert database.most_running == 2
+
+        # Every section is cached, and shared with the single-section routes
+        client.get("/api/wrestlers/p1/full")
+        client.get("/api/wrestlers/wrestlers/p1/stats")
+        matches = client.get("/api/wrestlers/wrestlers/p1/matches")
+        assert matches.json() == body["matches"]
+        assert database.queries == 3
+
+        # An unknown wrestler costs only the profile query
+        response = client.get("/api/wrestlers/p2/full")
+        assert response.status_code == 404
+        assert database.queries == 4
+    finally:
+        app.dependency_overrides.clear()
+
+
+def test_saved_ratings_reach_cached_sections(caching, monkeypatch, tmp_path):
+    monkeypatch.setattr(rating_store, "path", str(tmp_path / "ratings.npz"))
+    database = SlowDatabase()
+    app.dependency_overrides[get_db] = lambda: database
+    try:
+        client = TestClient(app)
+        rating_store.save(rated(1500.0))
+        body = client.get("/api/wrestlers/p1/full").json()
+        assert body["profile"]["rating"] == 1500.0
+
+        rating_store.save(rated(1620.0))
+        body = client.get("/api/wrestlers/p1/full").json()
+        assert body["profile"]["rating"] == 1620.0
+        assert body["stats"]["peak_rating"] == 1620.0
+    finally:
+        app.dependency_overrides.clear()
+
+
+def rated(rating):
+    return RatingBook(
+        persons=["p1"],
+        ratings=np.array([rating]),
+        peaks=np.array([rating]),
+        bouts=np.array([2], dtype=np.int32),
+    )
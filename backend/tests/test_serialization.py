@@ -0,0 +1,39 @@
+"""
+Test trusted-output serialization
+"""
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import numpy as np
+import orjson
+
+from app.config import settings
+from app.models import WrestlerProfile
+from app.serialization import render, respond_many
+
+
+def test_render_encodes_database_types():
+    response = render(
+        {
+            "win_pct": Decimal("0.625"),
+            "years": (2023, 2024),
+            "counts": np.array([1, 2]),
+            "at": datetime(2024, 3, 16, tzinfo=timezone.utc),
+            1: "one",
+        }
+    )
+    assert orjson.loads(response.body) == {
+        "win_pct": 0.625,
+        "years": [2023, 2024],
+        "counts": [1, 2],
+        "at": "2024-03-16T00:00:00Z",
+        "1": "one",
+    }
+
+
+def test_trusted_rows_with_numeric_columns(monkeypatch):
+    monkeypatch.setattr(settings, "trusted_output", True)
+    # A NUMERIC rating arrives from asyncpg as a Decimal
+    rows = [{"person_id": "p1", "first_name": "A", "rating": Decimal("1612.5")}]
+    response = respond_many(WrestlerProfile, rows)
+    assert orjson.loads(response.body)[0]["rating"] == 1612.5
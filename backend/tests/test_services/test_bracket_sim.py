@@ -0,0 +1,79 @@
+"""
+Test Monte Carlo bracket prediction
+"""
+import asyncio
+
+import numpy as np
+
+from app.analytics.bracket_sim import run_simulations, seeded_bracket, simulate
+from app.analytics.snapshot import MatchSnapshot
+
+# Standard seeded first-round pairings, top to bottom
+PAIRINGS = {
+    8: [(1, 8), (4, 5), (3, 6), (2, 7)],
+    16: [
+        (1, 16),
+        (8, 9),
+        (5, 12),
+        (4, 13),
+        (3, 14),
+        (6, 11),
+        (7, 10),
+        (2, 15),
+    ],
+}
+
+
+def first_round(match_row, size):
+    rows = []
+    for order, pairing in enumerate(PAIRINGS[size], start=1):
+        for seed in pairing:
+            rows.append(
+                match_row(
+                    f"m{order}",
+                    f"p{seed}",
+                    f"w{seed}",
+                    False,
+                    bracket_order=order,
+                    seed=seed,
+                    school_id=f"s{seed % 2}",
+                )
+            )
+    return MatchSnapshot.from_rows(rows)
+
+
+def test_seeded_bracket_layout(match_row):
+    bracket = seeded_bracket(first_round(match_row, 8))
+    entrants = bracket.slots[:, 0]
+
+    assert [bracket.seeds[e] for e in entrants] == [1, 8, 4, 5, 3, 6, 2, 7]
+    assert (bracket.slots[:, 1] == -1).all()
+    assert (
+        bracket.ratings[bracket.seeds.index(1)]
+        > bracket.ratings[bracket.seeds.index(8)]
+    )
+
+
+def test_places_are_exclusive(match_row):
+    bracket = seeded_bracket(first_round(match_row, 16))
+    counts, _ = simulate(bracket.win_matrix(), bracket.slots, 2000, seed=7)
+
+    # Every place 1-8 is awarded once per run and nobody places twice
+    assert (counts[:, 1:].sum(axis=0) == 2000).all()
+    assert (counts.sum(axis=1) == 2000).all()
+
+
+def test_favorite_wins_most(match_row):
+    bracket = seeded_bracket(first_round(match_row, 8))
+    prediction = asyncio.run(run_simulations(bracket, 5000, seed=1))
+    wrestlers = prediction["wrestlers"]
+
+    assert wrestlers[0]["seed"] == 1
+    assert np.isclose(sum(w["champion_probability"] for w in wrestlers), 1.0)
+    assert all(len(w["placement_probabilities"]) == 8 for w in wrestlers)
+    assert prediction == asyncio.run(run_simulations(bracket, 5000, seed=1))
+    assert np.isclose(
+        sum(t["expected_points"] for t in prediction["teams"]),
+        sum(w["expected_points"] for w in wrestlers),
+        atol=0.05,
+    )
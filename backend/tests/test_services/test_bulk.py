@@ -0,0 +1,117 @@
+"""
+Test bulk writes on BaseService
+"""
+from src.core.events import broker
+from src.schemas.match import MatchBulkUpdate, MatchCreate, MatchUpdate
+from src.schemas.participant import ParticipantCreate
+from src.schemas.tournament import TournamentCreate, TournamentUpdate
+from src.services.base import BULK_BATCH_SIZE
+from src.services.match import match_service
+from src.services.participant import participant_service
+from src.services.tournament import tournament_service
+
+
+async def test_create_and_update_many(sessions):
+    async with sessions() as db:
+        created = await tournament_service.create_many(
+            db,
+            [TournamentCreate(name=f"Open {i}", year=2024) for i in range(3)],
+        )
+        assert [t.name for t in created] == ["Open 0", "Open 1", "Open 2"]
+        assert all(t.id for t in created)
+
+        updated = await tournament_service.update_many(
+            db,
+            {
+                created[0].id: TournamentUpdate(location="Ames"),
+                created[2].id: TournamentUpdate(location="Tulsa", year=2025),
+                "missing": TournamentUpdate(location="Nowhere"),
+            },
+        )
+        assert [(t.location, t.year) for t in updated] == [
+            ("Ames", 2024),
+            ("Tulsa", 2025),
+        ]
+        assert (await tournament_service.get(db, created[1].id)).location is None
+
+
+async def test_create_many_keeps_input_order_across_batches(sessions):
+    names = [f"Open {i}" for i in range(BULK_BATCH_SIZE + 3)]
+    async with sessions() as db:
+        created = await tournament_service.create_many(
+            db, [TournamentCreate(name=name, year=2024) for name in names]
+        )
+        assert [t.name for t in created] == names
+        assert len({t.id for t in created}) == len(names)
+
+
+async def test_upsert_many_matches_natural_key(sessions):
+    async with sessions() as db:
+        tournament = await tournament_service.create(
+            db, TournamentCreate(name="NCAA", year=2024)
+        )
+        first = await participant_service.upsert_many(
+            db,
+            [
+                ParticipantCreate(
+                    tournament_id=tournament.id,
+                    name="A. Wrestler",
+                    weight_class="125",
+                    school="Iowa",
+                    seed=1,
+                ),
+                ParticipantCreate(
+                    tournament_id=tournament.id, name="B. Wrestler", weight_class="125"
+                ),
+            ],
+        )
+        again = await participant_service.upsert_many(
+            db,
+            [
+                ParticipantCreate(
+                    tournament_id=tournament.id,
+                    name="A. Wrestler",
+                    weight_class="125",
+                    seed=2,
+                )
+            ],
+        )
+        assert again[0].id == first[0].id
+        assert again[0].seed == 2
+        # Fields left out of the upsert keep their stored values
+        assert again[0].school == "Iowa"
+        assert await participant_service.count(db) == 2
+
+
+async def test_bulk_match_writes_publish_events(sessions):
+    subscription = broker.subscribe("t-bulk")
+    async with sessions() as db:
+        matches = await match_service.create_many(
+            db,
+            [
+                MatchCreate(tournament_id="t-bulk", weight_class="133", round=r)
+                for r in ("R1", "R2")
+            ],
+        )
+        bulk = MatchBulkUpdate(id=matches[0].id, winner_id="p-9")
+        await match_service.update_many(
+            db,
+            {
+                bulk.id: MatchUpdate.model_validate(
+                    bulk.model_dump(exclude_unset=True, exclude={"id"})
+                )
+            },
+        )
+        deleted = await match_service.delete_many(
+            db, [m.id for m in matches] + ["missing"]
+        )
+        assert deleted == 2
+        assert await match_service.count(db) == 0
+
+    ops = [subscription.queue.get_nowait() for _ in range(5)]
+    assert subscription.queue.empty()
+    frames = b"".join(event.frame for event in ops)
+    assert frames.count(b'"op":"create"') == 2
+    assert frames.count(b'"op":"update"') == 1
+    assert frames.count(b'"op":"delete"') == 2
+    broker.unsubscribe(subscription)
@@ -0,0 +1,64 @@
+"""
+Test duplicate person detection
+"""
+import csv
+from datetime import date
+
+from app.analytics.dedupe import (
+    Person,
+    build_blocks,
+    find_candidates,
+    score_block,
+    write_candidates,
+)
+
+PEOPLE = [
+    Person("p1", "Michael", "Müller", None, ("psu",), 2019, 2022, ("t19", "t20")),
+    # Second import of p1: nickname, no umlaut, a later season
+    Person("p2", "Mike", "Muller", None, ("psu",), 2023, 2023, ("t23",)),
+    # Misspelt last name
+    Person("p3", "Spencer", "Leee", None, ("iowa",), 2019, 2019, ("t19b",)),
+    Person("p4", "Spencer", "Lee", None, ("iowa",), 2018, 2021, ("t18", "t21")),
+    # Same name and school, but they met in the same tournament
+    Person("p5", "David", "Taylor", None, ("psu",), 2010, 2014, ("t12",)),
+    Person("p6", "David", "Taylor", None, ("psu",), 2012, 2012, ("t12",)),
+    # Same name and school, decades apart
+    Person("p7", "John", "Smith", None, ("osu",), 1980, 1983, ("t80",)),
+    Person("p8", "John", "Smith", None, ("osu",), 2010, 2013, ("t10",)),
+    # Different school: never compared
+    Person("p9", "Mike", "Muller", None, ("iowa",), 2020, 2020, ("t20b",)),
+]
+
+
+def test_blocks_share_school_and_name_sound():
+    blocks = build_blocks(PEOPLE)
+    ids = [{p.person_id for p in block} for block in blocks]
+    assert {"p1", "p2"} in ids
+    assert {"p3", "p4"} in ids
+    assert not any("p9" in block for block in ids)
+
+
+def test_scores():
+    assert score_block(PEOPLE[:2])[0, 1] > 0.9
+    assert score_block(PEOPLE[4:6])[0, 1] == 0
+    assert score_block(PEOPLE[6:8])[0, 1] < 0.85
+
+    # Different birthdays rule a pair out; the same one lifts it
+    born = [p._replace(date_of_birth=date(2001, 5, d)) for p, d in zip(PEOPLE, (1, 2))]
+    assert score_block(born)[0, 1] == 0
+    same = [p._replace(date_of_birth=date(2001, 5, 1)) for p in PEOPLE[2:4]]
+    assert score_block(same)[0, 1] > score_block(PEOPLE[2:4])[0, 1]
+
+
+def test_candidates_in_process_and_pool(tmp_path):
+    expected = {("p1", "p2"), ("p3", "p4")}
+    for workers in (1, 2):
+        candidates = find_candidates(PEOPLE, workers=workers)
+        assert {(c.person_id, c.duplicate_id) for c in candidates} == expected
+        assert candidates == sorted(candidates, key=lambda c: -c.score)
+
+    path = str(tmp_path / "candidates.csv")
+    write_candidates(path, candidates, PEOPLE)
+    with open(path) as fh:
+        rows = list(csv.DictReader(fh))
+    assert {row["duplicate"] for row in rows} == {"Mike Muller", "Spencer Lee"}
@@ -0,0 +1,126 @@
+"""
+Test the shared dimensions snapshot
+"""
+import os
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.analytics import dimensions as dimensions_module
+from app.analytics.dimensions import Dimensions, DimensionStore, write_dimensions
+from app.database import get_db
+from app.main import app
+
+
+def person(person_id, first, last, name_rank, school=None, year=None, weight=None):
+    return {
+        "person_id": person_id,
+        "first_name": first,
+        "last_name": last,
+        "last_school": school,
+        "last_year": year,
+        "last_weight_class": weight,
+        "name_rank": name_rank,
+    }
+
+
+# In the snapshot queries' order: last name, then first name
+PERSONS = [
+    person("p2", "Zain", "Leeson", 2, "Iowa", 2024, "125"),
+    person("p1", "Spencer", "Lee", 1, "Iowa", 2024, "125"),
+    person("p3", "Aaron", "Lee", 0),
+]
+SCHOOLS = [
+    {"school_id": "s1", "name": "Cornell", "location": "Ithaca, NY"},
+    {"school_id": "s2", "name": "Iowa", "location": "Iowa City, IA"},
+    {"school_id": "s3", "name": "Lehigh", "location": None},
+]
+TOURNAMENTS = [
+    {
+        "tournament_id": "t2",
+        "name": "NCAA Championships",
+        "year": 2024,
+        "location": "Kansas City",
+        "date": date(2024, 3, 21),
+    },
+    {
+        "tournament_id": "t1",
+        "name": "NCAA Championships",
+        "year": 2023,
+        "location": None,
+        "date": date(2023, 3, 16),
+    },
+]
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = str(tmp_path / "dimensions.snap")
+    write_dimensions(path, PERSONS, SCHOOLS, TOURNAMENTS)
+    return path
+
+
+def test_wrestler_search(path):
+    dimensions = Dimensions(path)
+    # Case-insensitive; only wrestlers with a season; last-name order
+    assert [w["person_id"] for w in dimensions.wrestlers("LEE", 10)] == ["p2", "p1"]
+    assert dimensions.wrestlers("spencer l", 10) == [
+        {
+            "person_id": "p1",
+            "first_name": "Spencer",
+            "last_name": "Lee",
+            "last_school": "Iowa",
+            "last_year": 2024,
+            "last_weight_class": "125",
+        }
+    ]
+    assert dimensions.wrestlers("lee", 1)[0]["person_id"] == "p2"
+    assert dimensions.wrestlers("ee\x00", 10) == dimensions.wrestlers("ee", 10)
+
+
+def test_name_search_uses_full_name_order(path):
+    names = Dimensions(path).wrestler_names("lee", 10)
+    assert [n["name"] for n in names] == ["Aaron Lee", "Spencer Lee", "Zain Leeson"]
+    assert names[0]["additional_info"] is None
+
+
+def test_school_and_tournament_search(path):
+    dimensions = Dimensions(path)
+    # Name or location match; "Iowa" matches both fields but is listed once
+    assert [s["id"] for s in dimensions.schools("ia", 10)] == ["s2"]
+    assert [s["id"] for s in dimensions.schools("ith", 10)] == ["s1"]
+    assert dimensions.schools("leh", 10)[0]["additional_info"] is None
+    assert [t["additional_info"] for t in dimensions.tournaments("ncaa", 10)] == [
+        "2024 - Kansas City",
+        None,
+    ]
+    assert dimensions.tables["tournaments"]["date"][0] == date(2024, 3, 21)
+    assert dimensions.schools("zz", 10) == []
+
+
+def test_store_swaps_in_rebuilt_file(path):
+    store = DimensionStore(path)
+    first = store.get()
+    assert store.get() is first
+
+    write_dimensions(path, PERSONS[:1], SCHOOLS, TOURNAMENTS)
+    second = store.get()
+    assert second is not first
+    assert len(second.tables["persons"]) == 1
+    # The replaced mapping stays readable for requests still holding it
+    assert len(first.wrestlers("lee", 10)) == 2
+
+    os.remove(path)
+    assert DimensionStore(path).get() is None
+
+
+def test_search_route_reads_snapshot(path, monkeypatch):
+    monkeypatch.setattr(dimensions_module.dimension_store, "path", path)
+    app.dependency_overrides[get_db] = lambda: None  # no database needed
+    try:
+        response = TestClient(app).get("/api/search", params={"q": "lee"})
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 200
+    assert [w["id"] for w in response.json()["wrestlers"]] == ["p3", "p1", "p2"]
@@ -0,0 +1,76 @@
+"""
+Test the in-process live-update broker
+"""
+from src.core.events import EventBroker, event_stream
+
+
+def frames(subscription):
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return events
+
+
+async def test_fan_out_encodes_once():
+    broker = EventBroker(queue_size=8, replay_size=8, epoch="e1")
+    first, second = broker.subscribe("t-1"), broker.subscribe("t-1")
+    other = broker.subscribe("t-2")
+
+    event = broker.publish("t-1", "match", {"op": "update", "id": "m-1"})
+
+    assert event.frame.startswith(b"id: e1:1\nevent: match\ndata: ")
+    assert frames(first) == frames(second) == [event]
+    assert frames(other) == []
+
+
+async def test_slow_consumer_is_dropped():
+    broker = EventBroker(queue_size=2, replay_size=8)
+    slow, fast = broker.subscribe("t-1"), broker.subscribe("t-1")
+
+    for i in range(2):
+        broker.publish("t-1", "match", {"n": i})
+        frames(fast)
+    broker.publish("t-1", "match", {"n": 2})
+
+    assert slow.dropped and broker.subscriber_count("t-1") == 1
+    assert [e.id for e in frames(slow)] == [1, 2]
+    assert slow.closed
+    assert [e.id for e in frames(fast)] == [3]
+
+
+async def test_reconnect_replays_missed_events():
+    broker = EventBroker(queue_size=8, replay_size=3, epoch="e1")
+    for i in range(5):
+        broker.publish("t-1", "match", {"n": i})
+
+    assert [e.id for e in frames(broker.subscribe("t-1", "e1:3"))] == [4, 5]
+    assert frames(broker.subscribe("t-1", "e1:5")) == []
+    # Events 2 and 3 already left the history: ask the client to refetch
+    (reset,) = frames(broker.subscribe("t-1", "e1:1"))
+    assert b"event: reset" in reset.frame and reset.id == 5
+    assert reset.frame.startswith(b"id: e1:5\n")
+
+
+async def test_ids_from_another_epoch_reset():
+    # After a restart, or on another worker, sequence 3 is a different event
+    broker = EventBroker(queue_size=8, replay_size=8, epoch="e2")
+    for i in range(5):
+        broker.publish("t-1", "match", {"n": i})
+
+    for stale in ("e1:3", "e1:5", "3", "e2:x"):
+        (reset,) = frames(broker.subscribe("t-1", stale))
+        assert b"event: reset" in reset.frame
+    assert EventBroker(queue_size=1, replay_size=1).epoch != broker.epoch
+
+
+async def test_stream_ends_after_drop():
+    broker = EventBroker(queue_size=1, replay_size=8, epoch="e1")
+    subscription = broker.subscribe("t-1")
+    broker.publish("t-1", "match", {"n": 0})
+    broker.publish("t-1", "match", {"n": 1})
+
+    body = [chunk async for chunk in event_stream(subscription, heartbeat=0.01)]
+
+    assert body[0].startswith(b"retry:")
+    assert body[1].startswith(b"id: e1:1\n")
+    assert len(body) == 2
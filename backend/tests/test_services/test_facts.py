@@ -0,0 +1,131 @@
+"""
+Test the Parquet bout facts and their group-by engine
+"""
+import csv
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.analytics import facts as facts_module
+from app.analytics.facts import FactStore
+from app.main import app
+
+NULL = "\\N"
+
+
+def side(match_id, tournament, person, school, won, opponent, result="Decision"):
+    tournament_id, name, year = tournament
+    return [
+        match_id,
+        tournament_id,
+        name,
+        f"{year}-03-01",
+        year,
+        "Quarterfinal",
+        3,
+        result,
+        "125",
+        1 if won else NULL,
+        person,
+        school,
+        7 if won else 2,
+        "t" if won else "f",
+        opponent or NULL,
+        NULL,
+        NULL,
+        NULL,
+    ]
+
+
+BIG_TEN = ("t-b10", "2024 Big Ten Championships", 2024)
+NCAA = ("t-ncaa", "2024 NCAA Division I Championships", 2024)
+
+
+def bout(match_id, tournament, winner, loser, result="Decision"):
+    (w, ws), (loser_id, ls) = winner, loser
+    return [
+        side(match_id, tournament, w, ws, True, loser_id, result),
+        side(match_id, tournament, loser_id, ls, False, w, result),
+    ]
+
+
+LEE, RAMOS, DEAN = ("lee", "iowa"), ("ramos", "psu"), ("dean", "psu")
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="") as fh:
+        csv.writer(fh).writerows(rows)
+    return str(path)
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = FactStore(str(tmp_path / "facts"))
+    rows = (
+        bout("m1", BIG_TEN, LEE, RAMOS, "Fall")
+        + bout("m2", BIG_TEN, LEE, DEAN)
+        + bout("m3", NCAA, RAMOS, LEE, "Tech Fall")
+        # A bye is not a bout
+        + [side("m4", NCAA, DEAN[0], DEAN[1], True, None, "Bye")]
+    )
+    store.write(write_csv(tmp_path / "facts.csv", rows), ["t-b10", "t-ncaa"])
+    return store
+
+
+def by_key(groups):
+    return {tuple(g["key"].values()): g for g in groups}
+
+
+def test_group_by_school(store):
+    groups = by_key(store.stats(["school"]))
+    assert groups[("iowa",)]["bouts"] == 3
+    assert groups[("iowa",)]["wins"] == 2
+    assert groups[("iowa",)]["falls"] == 1
+    assert groups[("iowa",)]["win_percentage"] == 66.7
+    assert groups[("psu",)]["tech_falls"] == 1
+    assert groups[("psu",)]["bonus_rate"] == 100.0
+    assert store.stats([])[0]["bouts"] == 6
+
+
+def test_conference_comes_from_conference_tournament(store):
+    groups = by_key(store.stats(["conference", "tournament"]))
+    # NCAA bouts keep the schools' conference
+    assert groups[("Big Ten", "t-ncaa")]["bouts"] == 2
+    ncaa = store.stats(["school"], {"conference": "Big Ten", "tournament_id": "t-ncaa"})
+    assert {g["key"]["school"] for g in ncaa} == {"iowa", "psu"}
+    assert store.stats(["school"], year_from=2025) == []
+
+
+def test_refresh_rewrites_only_given_tournaments(store, tmp_path):
+    ncaa_file = os.path.join(store.directory, "t-ncaa.parquet")
+    before = os.stat(ncaa_file).st_mtime_ns
+
+    rows = bout("m1", BIG_TEN, RAMOS, LEE)
+    store.write(write_csv(tmp_path / "b10.csv", rows), ["t-b10"])
+    assert os.stat(ncaa_file).st_mtime_ns == before
+    assert store.stats([])[0]["bouts"] == 4
+
+    store.write(write_csv(tmp_path / "empty.csv", []), ["t-b10"])
+    assert [os.path.basename(f) for f in store.files()] == ["t-ncaa.parquet"]
+    store.prune([])
+    assert store.stats(["school"]) is None
+
+
+def test_unknown_grouping(store):
+    with pytest.raises(ValueError):
+        store.stats(["mascot"])
+
+
+def test_stats_route(store, monkeypatch):
+    monkeypatch.setattr(facts_module.fact_store, "directory", store.directory)
+    client = TestClient(app)
+    response = client.get(
+        "/api/analytics/stats", params={"group_by": "decade,result", "round": "x"}
+    )
+    assert response.status_code == 200
+    assert response.json()["groups"] == []
+
+    response = client.get("/api/analytics/stats", params={"group_by": "decade"})
+    assert response.json()["groups"][0]["key"] == {"decade": 2020}
+    assert client.get("/api/analytics/stats?group_by=x").status_code == 400
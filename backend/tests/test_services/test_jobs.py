@@ -0,0 +1,118 @@
+"""
+Test the background job queue and worker
+"""
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from src.core.config import settings
+from src.jobs import JobRegistry, cancel, enqueue, queue
+from src.jobs.worker import Worker
+from src.models.job import Job
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(settings, "job_retry_backoff_seconds", 0.0)
+
+
+async def status(sessions, job_id):
+    async with sessions() as db:
+        return await db.get(Job, job_id)
+
+
+async def test_job_succeeds_with_progress(sessions):
+    jobs = JobRegistry()
+
+    @jobs.job("count")
+    async def count(ctx, payload):
+        for i in range(payload["n"]):
+            await ctx.progress(i + 1, payload["n"], f"step {i + 1}")
+        return {"counted": payload["n"]}
+
+    async with sessions() as db:
+        job = await enqueue(db, "count", {"n": 3})
+    await Worker(sessions, jobs).drain()
+
+    job = await status(sessions, job.id)
+    assert (job.status, job.progress, job.result) == ("succeeded", 1.0, {"counted": 3})
+    assert job.message == "step 3" and job.attempts == 1
+
+
+async def test_failing_job_is_retried_then_failed(sessions):
+    jobs = JobRegistry()
+    calls = []
+
+    @jobs.job("flaky")
+    async def flaky(ctx, payload):
+        calls.append(ctx.attempt)
+        raise ValueError("boom")
+
+    async with sessions() as db:
+        job = await enqueue(db, "flaky", max_attempts=2)
+    await Worker(sessions, jobs).drain()
+
+    job = await status(sessions, job.id)
+    assert calls == [1, 2]
+    assert (job.status, job.attempts) == ("failed", 2)
+    # The message stays in the worker log; the admin API sees the type only
+    assert job.error == "ValueError: job failed, see the worker log"
+
+
+async def test_cancel_queued_and_running(sessions):
+    jobs = JobRegistry()
+    started = asyncio.Event()
+
+    @jobs.job("forever")
+    async def forever(ctx, payload):
+        started.set()
+        await asyncio.Event().wait()
+
+    async with sessions() as db:
+        queued = await enqueue(db, "forever", delay_seconds=3600)
+        running = await enqueue(db, "forever")
+        assert (await cancel(db, queued.id)).status == "cancelled"
+
+    worker = Worker(sessions, jobs)
+    await worker.tick()
+    await started.wait()
+    async with sessions() as db:
+        await cancel(db, running.id)
+    await worker.tick()  # the heartbeat sees the request and stops the task
+    await asyncio.gather(*worker._running.values())
+
+    assert (await status(sessions, running.id)).status == "cancelled"
+
+
+async def test_concurrency_limit_per_kind(sessions):
+    jobs = JobRegistry()
+    release = asyncio.Event()
+
+    @jobs.job("exclusive", concurrency=1)
+    async def exclusive(ctx, payload):
+        await release.wait()
+
+    async with sessions() as db:
+        for _ in range(3):
+            await enqueue(db, "exclusive")
+    worker = Worker(sessions, jobs, concurrency=5)
+    await worker.tick()
+    assert len(worker._running) == 1
+
+    release.set()
+    await worker.drain()
+    async with sessions() as db:
+        assert {job.status for job in await queue.list_jobs(db)} == {"succeeded"}
+
+
+async def test_lost_worker_lease_is_recovered(sessions):
+    async with sessions() as db:
+        job = await enqueue(db, "anything")
+        job.status, job.locked_by = "running", "dead-worker"
+        job.heartbeat_at = queue.utcnow() - timedelta(minutes=10)
+        await db.commit()
+        assert await queue.recover_stale(db, lease_seconds=60) == 1
+
+    job = await status(sessions, job.id)
+    assert (job.status, job.locked_by) == ("queued", None)
@@ -0,0 +1,111 @@
+"""
+Test precomputed leaderboards
+"""
+import random
+from datetime import date
+
+import pytest
+
+from app.analytics.leaderboards import LeaderboardBook, build_leaderboards
+from app.analytics.snapshot import MatchSnapshot
+from app.config import settings
+
+RESULTS = ["Decision", "Major Decision", "Tech Fall", "Fall"]
+
+
+@pytest.fixture(autouse=True)
+def min_matches(monkeypatch):
+    monkeypatch.setattr(settings, "leaderboard_min_matches", 3)
+
+
+def tournament_rows(match_row, number, rng, bouts=30, wrestlers=12):
+    rows = []
+    year = 2023 + number % 2
+    for bout in range(bouts):
+        a, b = rng.sample(range(wrestlers), 2)
+        weight = rng.choice(["125", "133"])
+        result = rng.choice(RESULTS)
+        for person, won in ((a, True), (b, False)):
+            rows.append(
+                match_row(
+                    f"t{number}-m{bout}",
+                    f"t{number}-p{person}",
+                    f"w{person}",
+                    won,
+                    tournament_id=f"t{number}",
+                    tournament_date=date(year, 1, 1 + number),
+                    result_type=result,
+                    weight_class=weight,
+                    year=year,
+                )
+            )
+    return rows
+
+
+def named(book):
+    return {
+        key: [(book.persons[e.person], e.value, e.matches, e.wins) for e in entries]
+        for key, entries in book.boards.items()
+    }
+
+
+def test_career_pins(match_row):
+    rows = [
+        match_row("m1", "p1", "a", True, result_type="Fall"),
+        match_row("m1", "p2", "b", False, result_type="Fall"),
+        match_row("m2", "p1", "a", True, result_type="Fall"),
+        match_row("m2", "p3", "c", False, result_type="Fall"),
+        match_row("m3", "p3", "c", True, result_type="Fall"),
+        match_row("m3", "p2", "b", False, result_type="Fall"),
+    ]
+    book = build_leaderboards(MatchSnapshot.from_rows(rows), size=10)
+    pins = book.board("pins")
+
+    assert [(book.persons[e.person], e.value) for e in pins] == [("a", 2), ("c", 1)]
+    assert book.board("pins", season=2024, weight_class="125") == pins
+    assert book.board("pins", weight_class="999") is None
+
+
+def test_incremental_matches_rebuild(match_row):
+    rng = random.Random(3)
+    batches = [
+        MatchSnapshot.from_rows(tournament_rows(match_row, number, rng))
+        for number in range(6)
+    ]
+    rng = random.Random(3)
+    all_rows = [row for n in range(6) for row in tournament_rows(match_row, n, rng)]
+
+    book = build_leaderboards(batches[0], size=3)
+    for batch in batches[1:]:
+        book.apply(batch)
+    book.apply(batches[-1])  # already ingested: no-op
+
+    expected = build_leaderboards(MatchSnapshot.from_rows(all_rows), size=3)
+    assert named(book) == named(expected)
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_random_histories_match_rebuild(match_row, seed):
+    # Small tournaments against full boards: members fall back one at a time
+    rng = random.Random(seed)
+    rows = [
+        tournament_rows(match_row, n, rng, bouts=rng.randint(1, 8), wrestlers=8)
+        for n in range(12)
+    ]
+    book = build_leaderboards(MatchSnapshot.from_rows(rows[0]), size=3)
+    for batch in rows[1:]:
+        book.apply(MatchSnapshot.from_rows(batch))
+
+    everything = MatchSnapshot.from_rows([row for batch in rows for row in batch])
+    assert named(book) == named(build_leaderboards(everything, size=3))
+
+
+def test_save_and_load(match_row, tmp_path):
+    rng = random.Random(5)
+    book = build_leaderboards(
+        MatchSnapshot.from_rows(tournament_rows(match_row, 0, rng)), size=5
+    )
+    path = str(tmp_path / "boards.npz")
+    book.save(path)
+
+    assert named(LeaderboardBook.load(path)) == named(book)
@@ -0,0 +1,145 @@
+"""
+Test the Elo rating engine
+"""
+import asyncio
+from datetime import date
+
+import duckdb
+import pytest
+from fastapi.testclient import TestClient
+
+from app.analytics.ratings import (
+    BASE_RATING,
+    EloEngine,
+    RatingBook,
+    rating_store,
+    rebuild_ratings,
+)
+from app.analytics.snapshot import MatchSnapshot
+from app.codes import ResultType
+from app.database import get_db
+from app.embedded import EmbeddedDatabase
+from app.main import app
+
+
+def bout(match_row, match_id, winner, loser, **overrides):
+    return [
+        match_row(match_id, f"{match_id}-{winner}", winner, True, **overrides),
+        match_row(match_id, f"{match_id}-{loser}", loser, False, **overrides),
+    ]
+
+
+def test_winner_gains_what_loser_drops(match_row):
+    snapshot = MatchSnapshot.from_rows(bout(match_row, "m1", "alice", "bob"))
+    book = EloEngine().rebuild(snapshot)
+
+    gain = book.rating("alice") - BASE_RATING
+    assert gain > 0
+    assert book.rating("bob") == pytest.approx(BASE_RATING - gain)
+    assert book.peak("alice") == book.rating("alice")
+
+
+def test_fall_moves_ratings_more_than_decision(match_row):
+    decision = MatchSnapshot.from_rows(bout(match_row, "m1", "a", "b"))
+    fall = MatchSnapshot.from_rows(bout(match_row, "m1", "a", "b", result_type="Fall"))
+    forfeit = MatchSnapshot.from_rows(
+        bout(match_row, "m1", "a", "b", result_type="Forfeit")
+    )
+
+    assert EloEngine().rebuild(fall).rating("a") > EloEngine().rebuild(decision).rating(
+        "a"
+    )
+    assert EloEngine().rebuild(forfeit).index("a") is not None
+    assert EloEngine().rebuild(forfeit).rating("a") == BASE_RATING
+
+
+def test_incremental_update_matches_rebuild(match_row, tmp_path):
+    first = bout(match_row, "m1", "a", "b") + bout(
+        match_row, "m2", "a", "c", round_order=2
+    )
+    second = bout(
+        match_row,
+        "m3",
+        "c",
+        "a",
+        tournament_id="t-2",
+        tournament_date=date(2025, 3, 20),
+    )
+    engine = EloEngine()
+    full = engine.rebuild(MatchSnapshot.from_rows(first + second))
+
+    path = str(tmp_path / "ratings.npz")
+    engine.rebuild(MatchSnapshot.from_rows(first)).save(path)
+    book = RatingBook.load(path)
+    engine.apply(book, MatchSnapshot.from_rows(first + second))
+
+    for person in ("a", "b", "c"):
+        assert book.rating(person) == full.rating(person)
+    assert [day for day, _ in book.series("a")] == [
+        date(2024, 3, 21),
+        date(2024, 3, 21),
+        date(2025, 3, 20),
+    ]
+
+
+def test_update_rejects_older_tournament(match_row):
+    engine = EloEngine()
+    book = engine.rebuild(
+        MatchSnapshot.from_rows(
+            bout(match_row, "m1", "a", "b", tournament_date=date(2025, 1, 1))
+        )
+    )
+    older = MatchSnapshot.from_rows(bout(match_row, "m2", "a", "b", tournament_id="x"))
+
+    with pytest.raises(ValueError):
+        engine.apply(book, older)
+
+
+SUPABASE_TABLES = [
+    "CREATE TABLE person (person_id VARCHAR, first_name VARCHAR, "
+    "last_name VARCHAR, search_name VARCHAR, date_of_birth DATE, "
+    "city_of_origin VARCHAR, state_of_origin VARCHAR)",
+    "CREATE TABLE role (role_id VARCHAR, person_id VARCHAR, role_type VARCHAR)",
+    "CREATE TABLE participant (participant_id VARCHAR, role_id VARCHAR, "
+    "school_id VARCHAR, weight_class VARCHAR, seed INTEGER, year INTEGER)",
+    "CREATE TABLE tournament (tournament_id VARCHAR, date DATE)",
+    "CREATE TABLE match (match_id VARCHAR, tournament_id VARCHAR, round VARCHAR, "
+    "round_order INTEGER, bracket_order INTEGER, result_type VARCHAR, "
+    "result_type_code SMALLINT, winner_id VARCHAR)",
+    "CREATE TABLE participant_match (match_id VARCHAR, participant_id VARCHAR, "
+    "is_winner BOOLEAN, score INTEGER, next_match_id VARCHAR)",
+    "INSERT INTO person VALUES ('p1', 'Spencer', 'Lee', NULL, NULL, NULL, NULL), "
+    "('p2', 'Zane', 'Smith', NULL, NULL, NULL, NULL)",
+    "INSERT INTO role VALUES ('r1', 'p1', 'wrestler'), ('r2', 'p2', 'wrestler')",
+    "INSERT INTO participant VALUES ('pt1', 'r1', 's1', '125', 1, 2024), "
+    "('pt2', 'r2', 's1', '125', 8, 2024)",
+    "INSERT INTO tournament VALUES ('t1', DATE '2024-03-21')",
+    "INSERT INTO match VALUES "
+    f"('m1', 't1', 'Champ. Round 1', 1, 1, 'Fall', {int(ResultType.FALL)}, 'pt1')",
+    "INSERT INTO participant_match VALUES ('m1', 'pt1', true, 6, NULL), "
+    "('m1', 'pt2', false, 0, NULL)",
+]
+
+
+def test_profile_and_stats_carry_ratings(monkeypatch, tmp_path):
+    """The rated routes read the Supabase schema the snapshot is loaded from"""
+    path = str(tmp_path / "supabase.duckdb")
+    connection = duckdb.connect(path)
+    for statement in SUPABASE_TABLES:
+        connection.execute(statement)
+    connection.close()
+    database = EmbeddedDatabase(path)
+    monkeypatch.setattr(rating_store, "path", str(tmp_path / "ratings.npz"))
+    book = asyncio.run(rebuild_ratings(database))
+    assert book.rating("p1") > BASE_RATING
+
+    app.dependency_overrides[get_db] = lambda: database
+    try:
+        client = TestClient(app)
+        profile = client.get("/api/wrestlers/wrestlers/p1").json()
+        stats = client.get("/api/wrestlers/wrestlers/p1/stats").json()
+    finally:
+        app.dependency_overrides.clear()
+    assert profile["rating"] == book.rating("p1")
+    assert (stats["wins"], stats["pins"]) == (1, 1)
+    assert stats["peak_rating"] == book.peak("p1")
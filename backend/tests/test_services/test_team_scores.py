@@ -0,0 +1,85 @@
+"""
+Test NCAA team scoring
+"""
+from app.analytics.snapshot import MatchSnapshot
+from app.analytics.team_scores import TeamScoreStore, score_tournament
+
+SCHOOLS = {"A": "x", "B": "y", "C": "x", "D": "z"}
+
+
+def bracket_rows(match_row):
+    def bout(match_id, round_name, round_order, winner, loser, result, next_id=None):
+        rows = [
+            match_row(
+                match_id,
+                f"p{winner}",
+                winner,
+                True,
+                round=round_name,
+                round_order=round_order,
+                result_type=result,
+                school_id=SCHOOLS[winner],
+                next_match_id=next_id,
+            )
+        ]
+        if loser:
+            rows.append(
+                match_row(
+                    match_id,
+                    f"p{loser}",
+                    loser,
+                    False,
+                    round=round_name,
+                    round_order=round_order,
+                    result_type=result,
+                    school_id=SCHOOLS[loser],
+                )
+            )
+        return rows
+
+    return (
+        bout("m0", "Champ R1", 1, "A", None, "Bye", next_id="m1")
+        + bout("m1", "Semifinal", 2, "A", "B", "Fall", next_id="m3")
+        + bout("m2", "Semifinal", 2, "C", "D", "Major Decision", next_id="m3")
+        + bout("m3", "Finals", 3, "A", "C", "Decision")
+        + bout("m4", "3rd Place", 3, "B", "D", "Tech Fall")
+    )
+
+
+def test_team_standings(match_row):
+    standings = score_tournament(MatchSnapshot.from_rows(bracket_rows(match_row)))
+    teams = {team["school_id"]: team for team in standings["teams"]}
+
+    assert [team["school_id"] for team in standings["teams"]] == ["x", "y", "z"]
+    assert teams["x"]["points"] == 34.0
+    assert teams["x"]["advancement_points"] == 3.0
+    assert teams["x"]["bonus_points"] == 3.0
+    assert teams["x"]["placement_points"] == 28.0
+    assert [p["place"] for p in teams["x"]["placers"]] == [1, 2]
+    assert teams["y"]["points"] == 11.5
+    assert teams["z"]["points"] == 9.0
+
+
+def test_store_round_trip(match_row, tmp_path):
+    store = TeamScoreStore(str(tmp_path))
+    standings = score_tournament(MatchSnapshot.from_rows(bracket_rows(match_row)))
+    store.put("t/1", standings)
+
+    assert TeamScoreStore(str(tmp_path)).get("t/1") == standings
+    assert store.get("missing") is None
+
+
+def test_invalidation_reaches_other_processes(match_row, tmp_path):
+    # Two stores on one directory stand in for two workers
+    store, other = TeamScoreStore(str(tmp_path)), TeamScoreStore(str(tmp_path))
+    standings = score_tournament(MatchSnapshot.from_rows(bracket_rows(match_row)))
+    store.put("t1", standings)
+    assert other.get("t1") == standings
+    version = store.version("t1")
+
+    store.invalidate("t1")
+    assert other.get("t1") is None and store.get("t1") is None
+    assert store.version("t1") != version
+
+    other.put("t1", standings)
+    assert store.get("t1") == standings
@@ -0,0 +1,50 @@
+"""
+Test seed-vs-outcome upset analytics
+"""
+from app.analytics.snapshot import MatchSnapshot
+from app.analytics.upsets import UpsetAnalytics
+
+
+def seeded_bout(match_row, match_id, winner_seed, loser_seed, **overrides):
+    return [
+        match_row(
+            match_id,
+            f"{match_id}-w",
+            f"{match_id}-w",
+            True,
+            seed=winner_seed,
+            **overrides,
+        ),
+        match_row(
+            match_id,
+            f"{match_id}-l",
+            f"{match_id}-l",
+            False,
+            seed=loser_seed,
+            **overrides,
+        ),
+    ]
+
+
+def test_upset_rates_by_seed_round_and_weight(match_row):
+    rows = (
+        seeded_bout(match_row, "m1", 1, 16)
+        + seeded_bout(match_row, "m2", 9, 8)
+        + seeded_bout(match_row, "m3", None, 5, round="Champ R2", round_order=2)
+        + seeded_bout(match_row, "m4", 2, None, weight_class="285")
+        + seeded_bout(match_row, "m5", None, None)
+    )
+    analytics = UpsetAnalytics(MatchSnapshot.from_rows(rows))
+
+    by_seed = analytics.report("seed")
+    assert (by_seed["matches"], by_seed["upsets"]) == (4, 2)
+    assert {
+        (g["favorite_seed"], g["underdog_seed"]): g["upsets"] for g in by_seed["groups"]
+    } == {(1, 16): 0, (8, 9): 1, (5, None): 1, (2, None): 0}
+
+    by_round = analytics.report("round")
+    assert [g["round"] for g in by_round["groups"]] == ["Champ R1", "Champ R2"]
+    assert by_round["groups"][1]["upset_rate"] == 100.0
+
+    heavy = analytics.report("weight_class", weight_class="285")
+    assert heavy["matches"] == 1 and heavy["upsets"] == 0